@@ -0,0 +1,54 @@
+"""Run the routes' blocking work (SQLite, embedding HTTP calls, Grobid) off the event loop.
+
+Every route is `async def` and hands its synchronous work to `run_blocking`,
+which runs it on an anyio worker thread. Each endpoint group has its own
+`CapacityLimiter` (sized by `ApiConfig`), so a burst of slow ingestions
+cannot take the threads searches need. Requests over a limit wait on the
+limiter without blocking the loop; the loop keeps accepting requests and
+serving other groups.
+
+Build services inside the blocking function (call the `api.dependencies`
+getters there): pooled SQLite connections belong to the thread that opened
+them, and worker threads are reused, so each keeps its warm connection.
+"""
+import functools
+from typing import Any, Callable, Dict
+
+from anyio import CapacityLimiter, to_thread
+
+from smart_library.config import ApiConfig
+
+LIMITS: Dict[str, int] = {
+    "search": ApiConfig.SEARCH_THREADS,
+    "documents": ApiConfig.DOCUMENT_THREADS,
+    "ingest": ApiConfig.INGEST_THREADS,
+    "labels": 1,  # session file edits are serialised by api.session.update_session (shared with search)
+}
+
+_limiters: Dict[str, CapacityLimiter] = {}
+
+
+def limiter(group: str) -> CapacityLimiter:
+    """The limiter of endpoint `group` (created on first use, inside the event loop)."""
+    lim = _limiters.get(group)
+    if lim is None:
+        lim = _limiters[group] = CapacityLimiter(LIMITS[group])
+    return lim
+
+
+async def run_blocking(group: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run `fn(*args, **kwargs)` on a worker thread, at most `LIMITS[group]` at a time."""
+    return await to_thread.run_sync(functools.partial(fn, *args, **kwargs), limiter=limiter(group))
+
+
+def stats() -> Dict[str, Dict[str, int]]:
+    """Per group: thread limit, threads busy and requests waiting (for /health)."""
+    out = {}
+    for group, limit in LIMITS.items():
+        lim = _limiters.get(group)
+        out[group] = {
+            "limit": limit,
+            "busy": int(lim.borrowed_tokens) if lim else 0,
+            "waiting": lim.statistics().tasks_waiting if lim else 0,
+        }
+    return out
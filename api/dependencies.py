@@ -1,25 +1,60 @@
 """Shared dependencies for API routes."""
 from smart_library.application.services.search_service import SearchService
+from smart_library.application.services.federated_search_service import FederatedSearchService
+from smart_library.application.services.federated_document_service import FederatedDocumentService
 from smart_library.application.services.document_app_service import DocumentAppService
 from smart_library.application.services.text_app_service import TextAppService
 from smart_library.application.services.entity_app_service import EntityAppService
 from smart_library.application.services.ingestion_app_service import IngestionAppService
 from smart_library.application.services.ranking_service import RankingService
+from smart_library.application.services.vector_service import VectorService
+from smart_library.infrastructure.db.connection_manager import pooled_connection
+from smart_library.infrastructure.db.shards import load_catalog
+from smart_library.infrastructure.db.writer import get_writer
+from smart_library.infrastructure.repositories.document_repository import DocumentRepository
+from smart_library.infrastructure.repositories.relationship_repository import RelationshipRepository
+from smart_library.infrastructure.repositories.text_repository import TextRepository
+from smart_library.infrastructure.repositories.vector_repository import VectorRepository
+
+# Read-only services share the worker thread's pooled "serve" connection
+# (mmap reads, query_only); writes are queued to the single writer thread
+# (`infrastructure.db.writer`), which groups them into transactions.
+# Connections are per thread: routes call these getters inside the worker
+# thread that runs their blocking work (`api.concurrency.run_blocking`).
 
 
 def get_search_service() -> SearchService:
-    """Get search service instance."""
-    return SearchService()
+    """Get search service instance (federated over all shards in a sharded library)."""
+    catalog = load_catalog()
+    if catalog.is_sharded:
+        return FederatedSearchService(catalog)
+    conn = pooled_connection("serve")
+    return SearchService(
+        vector_service=VectorService(VectorRepository(conn)),
+        text_service=TextAppService(TextRepository(conn)),
+        relationship_repo=RelationshipRepository(conn),
+    )
+
+
+def get_federated_document_service() -> FederatedDocumentService:
+    """Document lookups, listings and deletes over all shards of a sharded library."""
+    return FederatedDocumentService(load_catalog())
 
 
-def get_document_service() -> DocumentAppService:
-    """Get document service instance."""
-    return DocumentAppService()
+def get_document_service(doc_id: str = None) -> DocumentAppService:
+    """Get document service instance (on the shard holding `doc_id` in a sharded library)."""
+    catalog = load_catalog()
+    if doc_id is not None and catalog.is_sharded:
+        return FederatedDocumentService(catalog).document_service(doc_id)
+    return DocumentAppService(DocumentRepository(pooled_connection("serve")))
 
 
-def get_text_service() -> TextAppService:
-    """Get text service instance."""
-    return TextAppService()
+def get_text_service(text_id: str = None) -> TextAppService:
+    """Get text service instance (on the shard holding `text_id` in a sharded library)."""
+    catalog = load_catalog()
+    if text_id is not None and catalog.is_sharded:
+        return FederatedDocumentService(catalog).text_service(text_id)
+    return TextAppService(TextRepository(pooled_connection("serve")))
 
 
 def get_entity_service() -> EntityAppService:
@@ -29,7 +64,7 @@ def get_entity_service() -> EntityAppService:
 
 def get_ingestion_service(debug: bool = False) -> IngestionAppService:
     """Get ingestion service instance."""
-    return IngestionAppService(debug=debug)
+    return IngestionAppService(debug=debug, conn=pooled_connection("serve"), writer=get_writer())
 
 
 def get_ranking_service() -> RankingService:
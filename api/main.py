@@ -44,6 +44,22 @@ async def startup_event():
     else:
         logger.info(f"Database found at {DB_PATH}")
 
+    # Purge documents deleted (tombstoned) by earlier requests or runs
+    from smart_library.application.services.purge_service import get_purge_worker
+    get_purge_worker().start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the purge worker, drain the write queue, then close the pooled database connections of all worker threads."""
+    from smart_library.application.services.purge_service import close_purge_worker
+    from smart_library.infrastructure.db.connection_manager import close_pooled_connections
+    from smart_library.infrastructure.db.writer import close_writer
+
+    close_purge_worker()
+    close_writer()
+    closed = close_pooled_connections()
+    logging.getLogger("api.shutdown").info("Closed %d pooled database connections", closed)
+
 # Include routers
 app.include_router(search.router, prefix="/api/search", tags=["search"])
 app.include_router(documents.router, prefix="/api/documents", tags=["documents"])
@@ -62,5 +78,6 @@ async def root():
 
 @app.get("/health")
 async def health():
-    """Health check endpoint."""
-    return {"status": "healthy"}
+    """Health check endpoint, with the busy/waiting counts of the worker thread limits."""
+    from api.concurrency import stats
+    return {"status": "healthy", "threads": stats()}
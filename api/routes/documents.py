@@ -1,29 +1,78 @@
 """Document API routes."""
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, HTTPException, UploadFile, File, Query
 from fastapi.responses import FileResponse
 from pathlib import Path
 from typing import Optional
+import hashlib
 import tempfile
 import os
-import shutil
 from api.schemas import (
     DocumentAddRequest,
     DocumentAddResponse,
     DocumentListResponse,
     DocumentDetailResponse,
+    CitationGraphResponse,
+    CoCitedDocument,
     TextContentResponse
 )
+from api.concurrency import run_blocking
 from api.dependencies import (
     get_document_service,
-    get_text_service,
-    get_ingestion_service
+    get_federated_document_service,
+    get_text_service
 )
-from smart_library.application.services.document_app_service import DocumentAppService
-from smart_library.application.services.text_app_service import TextAppService
 from smart_library.application.services.ingestion_app_service import IngestionAppService
+from smart_library.infrastructure.db.connection_manager import pooled_connection
+from smart_library.infrastructure.db.shards import load_catalog
+from smart_library.infrastructure.db.writer import get_writer
+from smart_library.joins.paper_citations import cited_documents, citing_documents, co_cited_documents
 
 router = APIRouter()
 
+# Columns the document list needs (projected, decoded lazily)
+LIST_COLUMNS = ("title", "authors", "year", "page_count", "source_path", "doi", "created_at")
+
+# Uploads are copied to disk in 1 MiB pieces so memory use does not grow with the PDF size.
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+def _ingest(pdf_path, debug: bool = False, **kwargs) -> str:
+    """Ingest a PDF (Grobid, embedding, writes via the writer thread); blocking."""
+    svc = IngestionAppService(debug=debug, conn=pooled_connection("serve"), writer=get_writer())
+    try:
+        return svc.ingest_from_grobid(pdf_path, embed=True, **kwargs)
+    finally:
+        svc.close()
+
+
+def _copy_upload(source, target_dir: Path):
+    """Copy the spooled upload `source` into a temp file inside `target_dir`, hashing as it goes; blocking.
+
+    The temp file lives on the same filesystem as the final location so it can
+    be moved into place with an atomic `os.replace` instead of a copy. The
+    whole copy runs in one worker-thread call rather than one hop per chunk.
+    Returns `(temp_path, sha256_hex, size_in_bytes)`.
+    """
+    target_dir.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+    source.seek(0)
+    with tempfile.NamedTemporaryFile(dir=target_dir, prefix=".upload-", suffix=".pdf.part", delete=False) as temp_file:
+        temp_path = Path(temp_file.name)
+        try:
+            while True:
+                chunk = source.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                temp_file.write(chunk)
+                size += len(chunk)
+        except BaseException:
+            temp_file.close()
+            temp_path.unlink(missing_ok=True)
+            raise
+    return temp_path, digest.hexdigest(), size
+
 
 @router.post("/upload/", response_model=DocumentAddResponse)
 async def upload_document(
@@ -48,25 +97,28 @@ async def upload_document(
             message="Only PDF files are supported"
         )
     
+    from smart_library.config import DOC_PDF_DIR
+
     temp_path = None
     try:
-        # Save uploaded file to temporary location
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-            content = await file.read()
-            temp_file.write(content)
-            temp_path = temp_file.name
+        # Copy the upload next to its final location, hashing on the fly. Starlette
+        # has already spooled the multipart body, so this is the second write.
+        temp_path, file_hash, size = await run_blocking("documents", _copy_upload, file.file, DOC_PDF_DIR)
+        if size == 0:
+            return DocumentAddResponse(
+                success=False,
+                document_id=None,
+                message="Uploaded file is empty"
+            )
         
-        # Ingest the document
-        svc = IngestionAppService(debug=debug)
-        doc_id = svc.ingest_from_grobid(temp_path, embed=True, source_path=file.filename)
+        # Ingest the document on an ingest worker thread
+        doc_id = await run_blocking("ingest", _ingest, temp_path, debug=debug, source_path=file.filename,
+                                    file_hash=file_hash)
         
-        # Store PDF in document storage directory
+        # Store PDF in document storage directory (atomic rename, no copy)
         try:
-            from smart_library.config import DOC_PDF_DIR
-            DOC_PDF_DIR.mkdir(parents=True, exist_ok=True)
-            # Store with document ID as filename
-            pdf_storage_path = DOC_PDF_DIR / f"{doc_id}.pdf"
-            shutil.copy(temp_path, pdf_storage_path)
+            await run_blocking("documents", os.replace, temp_path, DOC_PDF_DIR / f"{doc_id}.pdf")
+            temp_path = None
         except Exception as e:
             # Log but don't fail if PDF storage fails
             print(f"Warning: Failed to store PDF: {e}")
@@ -85,7 +137,8 @@ async def upload_document(
         )
     
     finally:
-        # Clean up temporary file
+        await file.close()
+        # Clean up temporary file if it was not moved into place
         if temp_path and os.path.exists(temp_path):
             try:
                 os.unlink(temp_path)
@@ -94,10 +147,7 @@ async def upload_document(
 
 
 @router.post("/add/", response_model=DocumentAddResponse)
-async def add_document(
-    request: DocumentAddRequest,
-    ingestion_service: IngestionAppService = Depends(get_ingestion_service)
-):
+async def add_document(request: DocumentAddRequest):
     """
     Add a new document by ingesting a PDF file from a path.
     
@@ -112,9 +162,7 @@ async def add_document(
         if not pdf_path.exists():
             raise HTTPException(status_code=404, detail=f"File not found: {request.path}")
         
-        # Create ingestion service with debug flag
-        svc = IngestionAppService(debug=request.debug)
-        doc_id = svc.ingest_from_grobid(str(pdf_path), embed=True, source_path=str(pdf_path))
+        doc_id = await run_blocking("ingest", _ingest, str(pdf_path), debug=request.debug, source_path=str(pdf_path))
         
         return DocumentAddResponse(
             success=True,
@@ -147,7 +195,7 @@ async def get_pdf(
         from smart_library.config import DOC_PDF_DIR
         pdf_path = DOC_PDF_DIR / f"{doc_id}.pdf"
         
-        if not pdf_path.exists():
+        if not await run_blocking("documents", _pdf_available, doc_id, pdf_path):
             raise HTTPException(status_code=404, detail=f"PDF not found for document: {doc_id}")
         
         return FileResponse(
@@ -162,50 +210,66 @@ async def get_pdf(
         raise HTTPException(status_code=500, detail=f"Failed to serve PDF: {str(e)}")
 
 
+def _pdf_available(doc_id: str, pdf_path: Path) -> bool:
+    """The document exists (on whichever shard holds it) and its PDF is stored."""
+    return pdf_path.exists() and get_document_service(doc_id).exists(doc_id)
+
+
 @router.get("/", response_model=DocumentListResponse)
 async def list_documents(
-    limit: int = 50,
-    document_service: DocumentAppService = Depends(get_document_service)
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    order: str = "created",
+    descending: bool = False
 ):
     """
-    List all documents.
+    List documents one page at a time.
     
     Args:
-        limit: Maximum number of documents to return
+        limit: Page size
+        cursor: `next_cursor` of the previous page (omit for the first page)
+        order: Sort order: "created", "title" or "year"
+        descending: Reverse the order
         
     Returns:
-        List of documents
+        The page of documents, the cursor of the next page and the library total
     """
+    return await run_blocking("documents", _list_documents, limit, cursor, order, descending)
+
+
+def _list_documents(limit: int, cursor: Optional[str], order: str, descending: bool) -> DocumentListResponse:
+    # A sharded library is listed across all shards (pages merged on the shared cursor)
+    pager = get_federated_document_service() if load_catalog().is_sharded else get_document_service().repo
     try:
-        from smart_library.infrastructure.repositories.document_repository import DocumentRepository
-        repo = DocumentRepository()
-        docs = repo.list(limit=limit)
-        
-        documents = []
-        for doc in docs:
-            documents.append({
-                "id": doc.id,
-                "title": doc.title,
-                "authors": doc.authors,
-                "year": doc.year,
-                "page_count": doc.page_count,
-                "source_path": doc.source_path
-            })
-        
-        return DocumentListResponse(
-            documents=documents,
-            total=len(documents)
-        )
-    
+        page = pager.page(limit=limit, after=cursor, order=order, descending=descending, columns=LIST_COLUMNS)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list documents: {str(e)}")
 
+    documents = []
+    for doc in page.items:
+        documents.append({
+            "id": doc.id,
+            "title": doc.title,
+            "authors": doc.authors,
+            "year": doc.year,
+            "page_count": doc.page_count,
+            "source_path": doc.source_path,
+            "doi": doc.doi,
+            "created_at": doc.created_at,
+        })
+
+    return DocumentListResponse(
+        documents=documents,
+        total=page.total,
+        next_cursor=page.next_cursor,
+        order=order
+    )
+
 
 @router.get("/{doc_id}", response_model=DocumentDetailResponse)
-async def get_document(
-    doc_id: str,
-    document_service: DocumentAppService = Depends(get_document_service)
-):
+async def get_document(doc_id: str):
     """
     Get document details by ID.
     
@@ -215,6 +279,11 @@ async def get_document(
     Returns:
         Document details
     """
+    return await run_blocking("documents", _get_document, doc_id)
+
+
+def _get_document(doc_id: str) -> DocumentDetailResponse:
+    document_service = get_document_service(doc_id)
     try:
         doc = document_service.get_document(doc_id)
         if not doc:
@@ -237,13 +306,49 @@ async def get_document(
         raise HTTPException(status_code=500, detail=f"Failed to get document: {str(e)}")
 
 
+@router.get("/{doc_id}/citations", response_model=CitationGraphResponse)
+async def get_document_citations(doc_id: str, limit: int = 20):
+    """
+    Get the library documents a document cites, is cited by, and is co-cited with.
+
+    Args:
+        doc_id: Document ID
+        limit: Maximum number of co-cited documents
+
+    Returns:
+        Citation edges resolved against the library
+    """
+    return await run_blocking("documents", _get_document_citations, doc_id, limit)
+
+
+def _get_document_citations(doc_id: str, limit: int) -> CitationGraphResponse:
+    # Citation edges are linked within a shard: read them on the shard holding the document
+    document_service = get_document_service(doc_id)
+    try:
+        if not document_service.exists(doc_id):
+            raise HTTPException(status_code=404, detail=f"Document not found: {doc_id}")
+        conn = document_service.repo.conn
+        return CitationGraphResponse(
+            document_id=doc_id,
+            cited=cited_documents(conn, doc_id),
+            citing=citing_documents(conn, doc_id),
+            co_cited=[CoCitedDocument(id=i, count=n) for i, n in co_cited_documents(conn, doc_id, limit)],
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get citations: {str(e)}")
+
+
 @router.delete("/{doc_id}")
-async def delete_document(
-    doc_id: str,
-    document_service: DocumentAppService = Depends(get_document_service)
-):
+async def delete_document(doc_id: str):
     """
     Delete a document by ID.
+
+    Writes a tombstone (one indexed UPDATE) and returns: search and listings
+    skip the document at once. Its rows, vectors and PDF are removed by the
+    background purge worker in small batches.
     
     Args:
         doc_id: Document ID
@@ -252,47 +357,31 @@ async def delete_document(
         Success status
     """
     try:
-        from smart_library.infrastructure.repositories.document_repository import DocumentRepository
-        from smart_library.infrastructure.db.db import get_connection
-        from smart_library.config import DOC_PDF_DIR
-        
-        # Use a single connection for the entire operation
-        conn = get_connection()
-        
-        # Delete the document (this will remove vectors for descendants via _delete_entity)
-        repo = DocumentRepository(conn)
-        repo.delete(doc_id)
-        # Commit after delete
-        conn.commit()
-        
-        # Then run cleanup to catch any edge cases
-        from smart_library.infrastructure.repositories.vector_repository import VectorRepository
-        vector_repo = VectorRepository(conn)
-        orphans_removed = vector_repo.cleanup_orphaned_vectors()
-        
-        # Delete associated PDF file
-        try:
-            pdf_path = DOC_PDF_DIR / f"{doc_id}.pdf"
-            if pdf_path.exists():
-                pdf_path.unlink()
-        except Exception as e:
-            print(f"Warning: Failed to delete PDF file for {doc_id}: {e}")
-        
-        message = f"Document deleted: {doc_id}"
-        if orphans_removed > 0:
-            message += f" ({orphans_removed} orphaned vectors cleaned up)"
-        
-        return {"success": True, "message": message}
-    
+        from smart_library.application.services.purge_service import get_purge_worker
+
+        deleted = await run_blocking("documents", _tombstone, doc_id)
+        if not deleted:
+            raise HTTPException(status_code=404, detail=f"Document not found: {doc_id}")
+        get_purge_worker().wake()
+
+        return {"success": True, "message": f"Document deleted: {doc_id} (purge pending)"}
+
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to delete document: {str(e)}")
 
 
+def _tombstone(doc_id: str) -> bool:
+    """Tombstone the document on the shard holding it (the writer thread for the main shard)."""
+    if load_catalog().is_sharded:
+        return get_federated_document_service().tombstone(doc_id) is not None
+    from smart_library.infrastructure.repositories.document_repository import DocumentRepository
+    return get_writer().execute(lambda conn: DocumentRepository(conn).tombstone(doc_id))
+
+
 @router.get("/text/{text_id}", response_model=TextContentResponse)
-async def get_text(
-    text_id: str,
-    text_service: TextAppService = Depends(get_text_service)
-):
+async def get_text(text_id: str):
     """
     Get text content by ID.
     
@@ -302,6 +391,11 @@ async def get_text(
     Returns:
         Text content and metadata
     """
+    return await run_blocking("documents", _get_text, text_id)
+
+
+def _get_text(text_id: str) -> TextContentResponse:
+    text_service = get_text_service(text_id)
     try:
         text = text_service.get_text(text_id)
         if not text:
@@ -1,25 +1,22 @@
 """Search API routes."""
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, HTTPException
+from api.concurrency import run_blocking
 from api.schemas import SearchRequest, SearchResponse, SearchResult, RerankRequest
-from api.dependencies import get_search_service, get_text_service, get_entity_service, get_ranking_service, get_document_service
-from smart_library.application.services.search_service import SearchService
-from smart_library.application.services.text_app_service import TextAppService
-from smart_library.application.services.entity_app_service import EntityAppService
-from smart_library.application.services.document_app_service import DocumentAppService
-from smart_library.application.services.ranking_service import RankingService
+from api.dependencies import get_search_service, get_text_service, get_ranking_service
+from api.session import empty_session, load_session, update_session
+from smart_library.application.services.federated_search_service import FederatedSearchService
 from smart_library.application.models.search_response import SearchSession
+from smart_library.application.services.fusion import FUSION_METHODS
+from smart_library.infrastructure.db.shards import load_catalog
 
 router = APIRouter()
 
 
 @router.post("/", response_model=SearchResponse)
-async def search(
-    request: SearchRequest,
-    search_service: SearchService = Depends(get_search_service),
-    text_service: TextAppService = Depends(get_text_service)
-):
+async def search(request: SearchRequest):
     """
-    Perform similarity search.
+    Perform similarity (mode "vector"), BM25 keyword (mode "keyword") or
+    hybrid (mode "hybrid": both, fused into one ranking) search.
     
     Args:
         request: Search query and parameters
@@ -27,70 +24,114 @@ async def search(
     Returns:
         Search results with scores
     """
+    return await run_blocking("search", _search, request)
+
+
+def _search(request: SearchRequest) -> SearchResponse:
+    search_service = get_search_service()
+    if request.mode not in ("vector", "keyword", "hybrid"):
+        raise HTTPException(status_code=400, detail=f"Unknown search mode: {request.mode}")
+    if request.fusion is not None and request.fusion not in FUSION_METHODS:
+        raise HTTPException(status_code=400, detail=f"Unknown fusion method: {request.fusion}")
+    if request.shards is not None or request.collections is not None:
+        if not isinstance(search_service, FederatedSearchService):
+            search_service = FederatedSearchService(load_catalog())
+        search_service = search_service.scoped(request.shards, request.collections)
+        try:
+            search_service.catalog.select(request.shards, request.collections)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    timings = None
     try:
-        results = search_service.similarity_search(
-            request.query,
-            top_k=request.top_k
-        )
+        if request.mode == "hybrid":
+            weights = {}
+            if request.lexical_weight is not None:
+                weights["lexical"] = request.lexical_weight
+            if request.vector_weight is not None:
+                weights["vector"] = request.vector_weight
+            hybrid = search_service.hybrid_search(
+                request.query,
+                top_k=request.top_k,
+                fusion=request.fusion,
+                weights=weights,
+                doc_ids=request.doc_ids,
+                year_from=request.year_from,
+                year_to=request.year_to
+            )
+            results, timings = hybrid.results, hybrid.timings_ms
+        elif request.mode == "keyword":
+            results = search_service.keyword_search(
+                request.query,
+                top_k=request.top_k,
+                doc_ids=request.doc_ids,
+                year_from=request.year_from,
+                year_to=request.year_to
+            )
+        else:
+            results = search_service.similarity_search(
+                request.query,
+                top_k=request.top_k
+            )
         
         if not results:
             return SearchResponse(
                 query=request.query,
                 results=[],
-                total=0
+                total=0,
+                timings_ms=timings
             )
         
+        # Searches skip tombstoned documents before the top-k; this only catches
+        # deletes that landed meanwhile (one query per shard). Ranks are numbered
+        # after filtering, so they stay contiguous.
+        existing = search_service.existing_ids([r.get("id") for r in results])
+        results = [r for r in results if r.get("id") in existing]
+
         # Convert to response format
         search_results = []
         for i, r in enumerate(results, start=1):
-            # Validate that the text entity still exists (not deleted)
             text_id = r.get("id")
-            try:
-                text = text_service.get_text(text_id)
-                if not text:
-                    # Skip deleted texts
-                    continue
-            except Exception:
-                # Skip if entity doesn't exist
-                continue
-            
             search_results.append(
                 SearchResult(
                     rank=i,
                     id=text_id,
                     score=r.get("cosine_similarity") or r.get("score") or 0.0,
                     is_positive=False,
-                    is_negative=False
+                    is_negative=False,
+                    heading=r.get("heading"),
+                    snippet=r.get("snippet"),
+                    highlights=[list(span) for span in r.get("highlights") or []],
+                    sources=r.get("sources"),
+                    shard=r.get("shard")
                 )
             )
-        
-        # Save session for labeling
-        from smart_library.config import DATA_DIR
-        import json
-        session_file = DATA_DIR / ".search_session.json"
+
+        # Attach section headings for all hits in one batched lookup
         try:
-            # Load existing session to preserve labels
-            if session_file.exists():
-                session_data = json.loads(session_file.read_text(encoding="utf-8"))
+            context = search_service.expand_context([r.id for r in search_results])
+            for r in search_results:
+                r.heading = (context.get(r.id) or {}).get("heading_title") or r.heading
+        except Exception:
+            pass  # Headings are optional decoration
+        
+        # Save session for labeling (same lock as the label routes: no lost labels)
+        def store_results(session):
+            if session.get("query") != request.query:
                 # If query changed, clear labels
-                if session_data.get("query") != request.query:
-                    session_data = {"query": request.query, "positive_ids": [], "negative_ids": [], "results": [], "offset": 0}
-            else:
-                session_data = {"query": request.query, "positive_ids": [], "negative_ids": [], "results": [], "offset": 0}
-            
-            # Update query and results
-            session_data["query"] = request.query
-            session_data["results"] = [{"id": r.get("id"), "score": r.get("cosine_similarity") or r.get("score") or 0.0} for r in results]
-            
-            session_file.parent.mkdir(parents=True, exist_ok=True)
-            session_file.write_text(json.dumps(session_data, default=str), encoding="utf-8")
+                session.clear()
+                session.update(empty_session(request.query))
+            session["results"] = [{"id": r.get("id"), "score": r.get("cosine_similarity") or r.get("score") or 0.0} for r in results]
+
+        try:
+            update_session(store_results)
         except Exception:
             pass  # Don't fail search if session save fails
         
         return SearchResponse(
             query=request.query,
             results=search_results,
-            total=len(search_results)
+            total=len(search_results),
+            timings_ms=timings
         )
     
     except Exception as e:
@@ -98,12 +139,7 @@ async def search(
 
 
 @router.post("/rerank", response_model=SearchResponse)
-async def rerank_search(
-    request: RerankRequest,
-    ranking_service: RankingService = Depends(get_ranking_service),
-    search_service: SearchService = Depends(get_search_service),
-    text_service: TextAppService = Depends(get_text_service)
-):
+async def rerank_search(request: RerankRequest):
     """
     Perform reranked search based on positive/negative feedback.
     
@@ -113,23 +149,23 @@ async def rerank_search(
     Returns:
         Reranked search results
     """
+    return await run_blocking("search", _rerank_search, request)
+
+
+def _rerank_search(request: RerankRequest) -> SearchResponse:
+    ranking_service = get_ranking_service()
+    search_service = get_search_service()
+    text_service = get_text_service()
     try:
         # If no labels provided, try to load from session file
         positive_ids = request.positive_ids
         negative_ids = request.negative_ids
         
         if not positive_ids and not negative_ids:
-            from smart_library.config import DATA_DIR
-            import json
-            session_file = DATA_DIR / ".search_session.json"
-            if session_file.exists():
-                try:
-                    session_data = json.loads(session_file.read_text(encoding="utf-8"))
-                    if session_data.get("query") == request.query:
-                        positive_ids = session_data.get("positive_ids", [])
-                        negative_ids = session_data.get("negative_ids", [])
-                except Exception:
-                    pass
+            session_data = load_session()
+            if session_data.get("query") == request.query:
+                positive_ids = session_data.get("positive_ids", [])
+                negative_ids = session_data.get("negative_ids", [])
         
         # Create session with labels
         session = SearchSession(
@@ -171,9 +207,7 @@ async def rerank_search(
 
 
 @router.post("/cleanup/")
-async def cleanup_orphaned_vectors(
-    search_service: SearchService = Depends(get_search_service)
-):
+async def cleanup_orphaned_vectors():
     """
     Clean up orphaned vectors in the vector database.
     This removes vectors that have no corresponding text entity.
@@ -183,7 +217,12 @@ async def cleanup_orphaned_vectors(
         Number of orphaned vectors removed
     """
     try:
-        deleted_count = search_service.cleanup_orphaned_vectors()
+        # Writes go through the single writer thread, the pooled "serve" connections are query_only
+        from smart_library.infrastructure.db.writer import get_writer
+        from smart_library.infrastructure.repositories.vector_repository import VectorRepository
+        writer = get_writer()
+        deleted_count = await run_blocking(
+            "documents", writer.execute, lambda conn: VectorRepository(conn).cleanup_orphaned_vectors())
         return {
             "success": True,
             "message": f"Cleaned up {deleted_count} orphaned vectors"
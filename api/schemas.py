@@ -1,12 +1,21 @@
 """Pydantic schemas for API requests and responses."""
 from pydantic import BaseModel, Field
-from typing import List, Optional, Set
+from typing import Dict, List, Optional, Set
 
 
 class SearchRequest(BaseModel):
     """Search request schema."""
     query: str = Field(..., description="Search query text")
     top_k: int = Field(10, description="Number of results to return", ge=1, le=100)
+    mode: str = Field("vector", description="'vector' (embedding similarity), 'keyword' (BM25 full-text) or 'hybrid' (both, fused)")
+    doc_ids: Optional[List[str]] = Field(None, description="Keyword/hybrid mode: only search these documents")
+    year_from: Optional[int] = Field(None, description="Keyword/hybrid mode: earliest publication year")
+    year_to: Optional[int] = Field(None, description="Keyword/hybrid mode: latest publication year")
+    fusion: Optional[str] = Field(None, description="Hybrid mode: 'rrf' (reciprocal rank fusion) or 'weighted' (normalised scores)")
+    lexical_weight: Optional[float] = Field(None, description="Hybrid mode: weight of the keyword ranking", ge=0)
+    vector_weight: Optional[float] = Field(None, description="Hybrid mode: weight of the vector ranking", ge=0)
+    shards: Optional[List[str]] = Field(None, description="Sharded library: only search these shards")
+    collections: Optional[List[str]] = Field(None, description="Sharded library: only search shards of these collections")
 
 
 class SearchResult(BaseModel):
@@ -16,6 +25,11 @@ class SearchResult(BaseModel):
     score: float
     is_positive: bool = False
     is_negative: bool = False
+    heading: Optional[str] = None
+    snippet: Optional[str] = None  # keyword mode: matched terms in [brackets]
+    highlights: List[List[int]] = []  # keyword mode: [start, end] offsets into the text content
+    sources: Optional[Dict[str, int]] = None  # hybrid mode: rank of the hit in each source ("lexical", "vector")
+    shard: Optional[str] = None  # sharded library: shard holding the text
 
 
 class SearchResponse(BaseModel):
@@ -23,6 +37,7 @@ class SearchResponse(BaseModel):
     query: str
     results: List[SearchResult]
     total: int
+    timings_ms: Optional[Dict[str, float]] = None  # hybrid mode: latency per source, fusion and total
 
 
 class RerankRequest(BaseModel):
@@ -59,9 +74,11 @@ class DocumentAddResponse(BaseModel):
 
 
 class DocumentListResponse(BaseModel):
-    """Document list response schema."""
+    """Document list response schema (one keyset page)."""
     documents: List[dict]
-    total: int
+    total: int = Field(..., description="Number of documents in the library")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page; null on the last page")
+    order: str = "created"
 
 
 class DocumentDetailResponse(BaseModel):
@@ -76,6 +93,20 @@ class DocumentDetailResponse(BaseModel):
     source_path: Optional[str]
 
 
+class CoCitedDocument(BaseModel):
+    """A document cited together with another one."""
+    id: str
+    count: int
+
+
+class CitationGraphResponse(BaseModel):
+    """Citation edges of a document within the library."""
+    document_id: str
+    cited: List[str]
+    citing: List[str]
+    co_cited: List[CoCitedDocument]
+
+
 class TextContentResponse(BaseModel):
     """Text content response schema."""
     id: str
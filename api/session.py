@@ -0,0 +1,62 @@
+"""The API's search session file (`DATA_DIR/.search_session.json`).
+
+Searches store their results in it and the label routes edit its labels.
+Both are read-modify-write cycles on one file, run from different limiter
+groups ("search" and "labels"), so every writer goes through
+`update_session`: one process-wide lock around load, change and save, and an
+atomic replace so readers never see a half-written file.
+"""
+import json
+import os
+import tempfile
+import threading
+from typing import Any, Callable, Dict
+
+from smart_library.config import DATA_DIR
+
+SESSION_FILE = DATA_DIR / ".search_session.json"
+
+_lock = threading.Lock()
+
+
+def empty_session(query: str = "") -> Dict[str, Any]:
+    return {"query": query, "positive_ids": [], "negative_ids": [], "results": [], "offset": 0}
+
+
+def load_session() -> Dict[str, Any]:
+    """The stored session (an empty one when there is none or it cannot be read)."""
+    try:
+        if not SESSION_FILE.exists():
+            return empty_session()
+        data = json.loads(SESSION_FILE.read_text(encoding="utf-8"))
+        # Ensure sets are loaded as lists (JSON doesn't support sets)
+        for key in ("positive_ids", "negative_ids"):
+            if key in data and not isinstance(data[key], list):
+                data[key] = list(data[key])
+        return data
+    except Exception:
+        return empty_session()
+
+
+def _save_session(session: Dict[str, Any]):
+    SESSION_FILE.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=SESSION_FILE.parent, prefix=".search_session-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(session, f, default=str)
+        os.replace(tmp, SESSION_FILE)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def update_session(change: Callable[[Dict[str, Any]], Any]) -> Any:
+    """
+    Run `change(session)` on the stored session and save it, under the
+    session lock. Returns what `change` returns; if it raises, nothing is saved.
+    """
+    with _lock:
+        session = load_session()
+        result = change(session)
+        _save_session(session)
+        return result
@@ -0,0 +1,131 @@
+-- 0001: base schema (same tables as infrastructure/db/schema.sql, without the
+-- DROP TABLE statements so it is safe on databases created from schema.sql).
+
+-- =========================================================
+-- Base ENTITY table (matches Entity dataclass)
+-- =========================================================
+CREATE TABLE IF NOT EXISTS entity (
+    id TEXT PRIMARY KEY,
+    created_at TIMESTAMP NOT NULL,
+    modified_at TIMESTAMP NOT NULL,
+    created_by TEXT,
+    updated_by TEXT,
+    parent_id TEXT REFERENCES entity(id) ON DELETE CASCADE,
+    entity_kind TEXT NOT NULL,          -- "Document","Page","Text","Term"
+    metadata TEXT                       -- JSON (dict)
+);
+
+-- =========================================================
+-- DOCUMENT table (matches Document dataclass)
+-- =========================================================
+CREATE TABLE IF NOT EXISTS document (
+    id TEXT PRIMARY KEY REFERENCES entity(id) ON DELETE CASCADE,
+    type TEXT,                          -- classification (research_article, etc.)
+    source_path TEXT,
+    source_url TEXT,
+    source_format TEXT,
+    file_hash TEXT,
+    version TEXT,
+    page_count INTEGER,
+    title TEXT,
+    authors TEXT,                       -- JSON list
+    keywords TEXT,                      -- JSON list
+    doi TEXT,
+    publication_date TEXT,
+    publisher TEXT,
+    venue TEXT,
+    year INTEGER,
+    abstract TEXT,
+    citation_key TEXT,
+    human_id TEXT,
+    reference_list TEXT,                -- JSON list
+    citations TEXT                      -- JSON list
+);
+
+-- =========================================================
+-- PAGE table (matches Page dataclass; relationship via parent_id)
+-- parent_id in entity points to Document.id
+-- =========================================================
+CREATE TABLE IF NOT EXISTS page (
+    id TEXT PRIMARY KEY REFERENCES entity(id) ON DELETE CASCADE,
+    page_number INTEGER NOT NULL,
+    full_text TEXT,
+    token_count INTEGER,
+    paragraphs TEXT,                    -- JSON list
+    sections TEXT,                      -- JSON list
+    is_reference_page INTEGER,          -- 0/1
+    is_title_page INTEGER,
+    has_tables INTEGER,
+    has_figures INTEGER,
+    has_equations INTEGER
+);
+
+-- =========================================================
+-- TEXT table (matches Text dataclass; parent_id → Page or Document)
+-- =========================================================
+CREATE TABLE IF NOT EXISTS text_entity (
+    id TEXT PRIMARY KEY REFERENCES entity(id) ON DELETE CASCADE,
+    type TEXT,              -- classification (chunk, summary, etc.)
+    text_type TEXT,
+    chunk_index INTEGER,
+    "index" INTEGER,
+    page_number INTEGER,
+    content TEXT NOT NULL,
+    display_content TEXT,
+    embedding_content TEXT,
+    character_count INTEGER,
+    token_count INTEGER,
+    -- Blob storage mode: offsets into document_text of blob_id (content is '',
+    -- display_content NULL means "same as content")
+    blob_id TEXT,
+    content_start INTEGER,
+    content_end INTEGER,
+    embedding_start INTEGER,
+    embedding_end INTEGER
+);
+
+-- =========================================================
+-- DOCUMENT_TEXT table: one compressed normalized text per document
+-- (TextStorageConfig.MODE = "blob")
+-- =========================================================
+CREATE TABLE IF NOT EXISTS document_text (
+    document_id TEXT PRIMARY KEY REFERENCES entity(id) ON DELETE CASCADE,
+    codec TEXT NOT NULL,              -- "zlib"
+    char_length INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+
+-- =========================================================
+-- TERM table (matches Term dataclass)
+-- =========================================================
+CREATE TABLE IF NOT EXISTS term (
+    id TEXT PRIMARY KEY REFERENCES entity(id) ON DELETE CASCADE,
+    canonical_name TEXT NOT NULL,
+    sense TEXT,
+    definition TEXT,
+    aliases TEXT,           -- JSON list
+    domain TEXT,
+    related_terms TEXT      -- JSON list
+);
+
+-- =========================================================
+-- HEADING table (matches Heading dataclass)
+-- =========================================================
+CREATE TABLE IF NOT EXISTS heading (
+    id TEXT PRIMARY KEY REFERENCES entity(id) ON DELETE CASCADE,
+    title TEXT,
+    "index" INTEGER,
+    page_number INTEGER
+);
+
+-- =========================================================
+-- RELATIONSHIP table
+-- =========================================================
+CREATE TABLE IF NOT EXISTS relationship (
+    id TEXT PRIMARY KEY,
+    source_id TEXT NOT NULL REFERENCES entity(id) ON DELETE CASCADE,
+    target_id TEXT NOT NULL REFERENCES entity(id) ON DELETE CASCADE,
+    type TEXT NOT NULL,
+    metadata TEXT,     -- JSON: {score, confidence, keyword, etc}
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
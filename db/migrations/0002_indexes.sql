@@ -0,0 +1,19 @@
+-- 0002: indexes. CREATE INDEX IF NOT EXISTS is safe on a live database: WAL
+-- readers keep going while the index is built (writers wait for the lock).
+
+-- Relationship traversal
+CREATE INDEX IF NOT EXISTS idx_relationship_source ON relationship(source_id);
+CREATE INDEX IF NOT EXISTS idx_relationship_target ON relationship(target_id);
+CREATE INDEX IF NOT EXISTS idx_relationship_type   ON relationship(type);
+CREATE INDEX IF NOT EXISTS idx_relationship_source_type ON relationship(source_id, type);
+CREATE INDEX IF NOT EXISTS idx_relationship_target_type ON relationship(target_id, type);
+
+-- Tree walks (subtree deletion, page/text listing) and filters
+CREATE INDEX IF NOT EXISTS idx_entity_parent ON entity(parent_id);
+CREATE INDEX IF NOT EXISTS idx_document_year ON document(year);
+
+-- Hot lookups: texts by page, entities by kind, duplicate detection by file hash and DOI
+CREATE INDEX IF NOT EXISTS idx_text_entity_page_number ON text_entity(page_number);
+CREATE INDEX IF NOT EXISTS idx_entity_kind ON entity(entity_kind);
+CREATE INDEX IF NOT EXISTS idx_document_file_hash ON document(file_hash);
+CREATE INDEX IF NOT EXISTS idx_document_doi ON document(doi);
@@ -0,0 +1,20 @@
+-- 0003: columns missing from databases created by older versions of schema.sql.
+-- The runner skips ADD COLUMN statements whose column already exists.
+
+-- document.abstract (DocumentRepository writes it; without it inserts fell back
+-- to a statement that also dropped citation_key and human_id)
+ALTER TABLE document ADD COLUMN abstract TEXT;
+
+-- Blob text storage (TextStorageConfig.MODE = "blob")
+ALTER TABLE text_entity ADD COLUMN blob_id TEXT;
+ALTER TABLE text_entity ADD COLUMN content_start INTEGER;
+ALTER TABLE text_entity ADD COLUMN content_end INTEGER;
+ALTER TABLE text_entity ADD COLUMN embedding_start INTEGER;
+ALTER TABLE text_entity ADD COLUMN embedding_end INTEGER;
+
+CREATE TABLE IF NOT EXISTS document_text (
+    document_id TEXT PRIMARY KEY REFERENCES entity(id) ON DELETE CASCADE,
+    codec TEXT NOT NULL,
+    char_length INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
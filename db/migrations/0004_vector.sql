@@ -0,0 +1,7 @@
+-- requires: vec0
+-- 0004: sqlite-vec table for text embeddings (768 dimensions, id = entity id).
+-- Needs a connection with the sqlite-vec extension loaded.
+CREATE VIRTUAL TABLE IF NOT EXISTS vector USING vec0(
+    id TEXT,
+    embedding FLOAT[768]
+);
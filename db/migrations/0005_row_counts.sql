@@ -0,0 +1,51 @@
+-- 0005: exact row counts maintained by triggers, and keyset-pagination indexes.
+-- Listing totals read row_count (O(1)) instead of COUNT(*) over the table.
+-- Cascaded deletes fire the child-table triggers too, so counts stay exact.
+
+CREATE TABLE IF NOT EXISTS row_count (
+    name TEXT PRIMARY KEY,              -- table name
+    n INTEGER NOT NULL DEFAULT 0
+);
+
+-- Backfill once from the existing rows (idempotent)
+INSERT OR REPLACE INTO row_count (name, n) SELECT 'document', COUNT(*) FROM document;
+INSERT OR REPLACE INTO row_count (name, n) SELECT 'page', COUNT(*) FROM page;
+INSERT OR REPLACE INTO row_count (name, n) SELECT 'text_entity', COUNT(*) FROM text_entity;
+INSERT OR REPLACE INTO row_count (name, n) SELECT 'term', COUNT(*) FROM term;
+INSERT OR REPLACE INTO row_count (name, n) SELECT 'heading', COUNT(*) FROM heading;
+
+CREATE TRIGGER IF NOT EXISTS document_count_ai AFTER INSERT ON document BEGIN
+    UPDATE row_count SET n = n + 1 WHERE name = 'document';
+END;
+CREATE TRIGGER IF NOT EXISTS document_count_ad AFTER DELETE ON document BEGIN
+    UPDATE row_count SET n = n - 1 WHERE name = 'document';
+END;
+CREATE TRIGGER IF NOT EXISTS page_count_ai AFTER INSERT ON page BEGIN
+    UPDATE row_count SET n = n + 1 WHERE name = 'page';
+END;
+CREATE TRIGGER IF NOT EXISTS page_count_ad AFTER DELETE ON page BEGIN
+    UPDATE row_count SET n = n - 1 WHERE name = 'page';
+END;
+CREATE TRIGGER IF NOT EXISTS text_entity_count_ai AFTER INSERT ON text_entity BEGIN
+    UPDATE row_count SET n = n + 1 WHERE name = 'text_entity';
+END;
+CREATE TRIGGER IF NOT EXISTS text_entity_count_ad AFTER DELETE ON text_entity BEGIN
+    UPDATE row_count SET n = n - 1 WHERE name = 'text_entity';
+END;
+CREATE TRIGGER IF NOT EXISTS term_count_ai AFTER INSERT ON term BEGIN
+    UPDATE row_count SET n = n + 1 WHERE name = 'term';
+END;
+CREATE TRIGGER IF NOT EXISTS term_count_ad AFTER DELETE ON term BEGIN
+    UPDATE row_count SET n = n - 1 WHERE name = 'term';
+END;
+CREATE TRIGGER IF NOT EXISTS heading_count_ai AFTER INSERT ON heading BEGIN
+    UPDATE row_count SET n = n + 1 WHERE name = 'heading';
+END;
+CREATE TRIGGER IF NOT EXISTS heading_count_ad AFTER DELETE ON heading BEGIN
+    UPDATE row_count SET n = n - 1 WHERE name = 'heading';
+END;
+
+-- Keyset pagination: (sort key, id) seeks for each listing order
+CREATE INDEX IF NOT EXISTS idx_entity_kind_created ON entity(entity_kind, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_document_title_id ON document(ifnull(title, '') COLLATE NOCASE, id);
+CREATE INDEX IF NOT EXISTS idx_document_year_id ON document(ifnull(year, 0), id);
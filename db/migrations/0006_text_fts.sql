@@ -0,0 +1,44 @@
+-- requires: fts5
+-- 0006: full-text (BM25) indexes over text content and heading titles.
+-- External-content FTS5 tables store only the index; the text stays in
+-- text_entity/heading and is read back for snippets and highlights.
+-- Triggers keep them in sync (cascaded deletes fire them too).
+-- Blob-mode texts (TextStorageConfig.MODE = "blob") keep content = '' in
+-- text_entity, so they are not in the text index; only their headings are.
+-- The indexes map rowids: after a VACUUM run FullTextRepository.rebuild().
+
+CREATE VIRTUAL TABLE IF NOT EXISTS text_fts USING fts5(
+    content,
+    content='text_entity', content_rowid='rowid',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS heading_fts USING fts5(
+    title,
+    content='heading', content_rowid='rowid',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS text_fts_ai AFTER INSERT ON text_entity BEGIN
+    INSERT INTO text_fts (rowid, content) VALUES (new.rowid, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS text_fts_ad AFTER DELETE ON text_entity BEGIN
+    INSERT INTO text_fts (text_fts, rowid, content) VALUES ('delete', old.rowid, old.content);
+END;
+CREATE TRIGGER IF NOT EXISTS text_fts_au AFTER UPDATE OF content ON text_entity BEGIN
+    INSERT INTO text_fts (text_fts, rowid, content) VALUES ('delete', old.rowid, old.content);
+    INSERT INTO text_fts (rowid, content) VALUES (new.rowid, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS heading_fts_ai AFTER INSERT ON heading BEGIN
+    INSERT INTO heading_fts (rowid, title) VALUES (new.rowid, new.title);
+END;
+CREATE TRIGGER IF NOT EXISTS heading_fts_ad AFTER DELETE ON heading BEGIN
+    INSERT INTO heading_fts (heading_fts, rowid, title) VALUES ('delete', old.rowid, old.title);
+END;
+CREATE TRIGGER IF NOT EXISTS heading_fts_au AFTER UPDATE OF title ON heading BEGIN
+    INSERT INTO heading_fts (heading_fts, rowid, title) VALUES ('delete', old.rowid, old.title);
+    INSERT INTO heading_fts (rowid, title) VALUES (new.rowid, new.title);
+END;
+
+-- Index the rows that already exist
+INSERT INTO text_fts (text_fts) VALUES ('rebuild');
+INSERT INTO heading_fts (heading_fts) VALUES ('rebuild');
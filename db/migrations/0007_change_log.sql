@@ -0,0 +1,38 @@
+-- 0007: monotonic change log for derived structures (ANN index, caches, snapshots).
+-- Entity and text rows are logged by triggers, in the same transaction as the
+-- change; vectors live in a vec0 virtual table (no triggers) and are logged by
+-- VectorRepository. AUTOINCREMENT: sequence numbers never go back, not even
+-- after the log is compacted. Consumers keep their position in change_checkpoint.
+
+CREATE TABLE IF NOT EXISTS change_log (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    source TEXT NOT NULL,               -- 'entity', 'text_entity' or 'vector'
+    entity_id TEXT NOT NULL,
+    op TEXT NOT NULL,                   -- 'insert', 'update' or 'delete'
+    changed_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%f', 'now'))
+);
+
+CREATE TABLE IF NOT EXISTS change_checkpoint (
+    consumer TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL,               -- last change_log.seq the consumer has applied
+    updated_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%f', 'now'))
+);
+
+CREATE TRIGGER IF NOT EXISTS entity_log_ai AFTER INSERT ON entity BEGIN
+    INSERT INTO change_log (source, entity_id, op) VALUES ('entity', new.id, 'insert');
+END;
+CREATE TRIGGER IF NOT EXISTS entity_log_au AFTER UPDATE ON entity BEGIN
+    INSERT INTO change_log (source, entity_id, op) VALUES ('entity', new.id, 'update');
+END;
+CREATE TRIGGER IF NOT EXISTS entity_log_ad AFTER DELETE ON entity BEGIN
+    INSERT INTO change_log (source, entity_id, op) VALUES ('entity', old.id, 'delete');
+END;
+CREATE TRIGGER IF NOT EXISTS text_entity_log_ai AFTER INSERT ON text_entity BEGIN
+    INSERT INTO change_log (source, entity_id, op) VALUES ('text_entity', new.id, 'insert');
+END;
+CREATE TRIGGER IF NOT EXISTS text_entity_log_au AFTER UPDATE ON text_entity BEGIN
+    INSERT INTO change_log (source, entity_id, op) VALUES ('text_entity', new.id, 'update');
+END;
+CREATE TRIGGER IF NOT EXISTS text_entity_log_ad AFTER DELETE ON text_entity BEGIN
+    INSERT INTO change_log (source, entity_id, op) VALUES ('text_entity', old.id, 'delete');
+END;
@@ -0,0 +1,10 @@
+-- 0008: tombstones for deleted documents. Deleting a document only sets
+-- entity.deleted_at; search and listings skip tombstoned documents at once and
+-- the purge job (application/services/purge_service.py) removes the rows,
+-- vectors and PDF later, in small batches.
+
+ALTER TABLE entity ADD COLUMN deleted_at TEXT;
+
+-- Partial index: holds only the tombstones, so finding them costs nothing for
+-- the live library and the index stays tiny.
+CREATE INDEX IF NOT EXISTS idx_entity_deleted ON entity(deleted_at) WHERE deleted_at IS NOT NULL;
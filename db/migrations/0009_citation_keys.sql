@@ -0,0 +1,32 @@
+-- 0009: indexed citation keys (joins/paper_citations.py). Linking a new
+-- document used to scan every document row and decode every reference list;
+-- with these tables it probes two small indexes instead.
+--
+-- Existing libraries start with empty tables: run `smartlib db citations
+-- --rebuild` once after migrating (imports rebuild them automatically).
+
+-- Normalized DOI / title keys of every library document
+CREATE TABLE IF NOT EXISTS citation_key (
+    kind TEXT NOT NULL,                 -- 'doi' or 'title'
+    key TEXT NOT NULL,
+    document_id TEXT NOT NULL REFERENCES document(id) ON DELETE CASCADE,
+    PRIMARY KEY (kind, key, document_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_citation_key_document ON citation_key(document_id);
+
+-- Keys of every bibliography entry. target_id is the library document the
+-- entry resolved to; NULL while unresolved, and again when the target is purged.
+CREATE TABLE IF NOT EXISTS citation_ref (
+    source_id TEXT NOT NULL REFERENCES document(id) ON DELETE CASCADE,
+    entry INTEGER NOT NULL,             -- position in the source's reference_list
+    bib_key TEXT,
+    doi_key TEXT,
+    title_key TEXT,
+    target_id TEXT REFERENCES document(id) ON DELETE SET NULL,
+    match TEXT,                         -- 'doi' or 'title' when resolved
+    PRIMARY KEY (source_id, entry)
+);
+-- Partial indexes: a new document only probes the unresolved entries
+CREATE INDEX IF NOT EXISTS idx_citation_ref_doi ON citation_ref(doi_key) WHERE target_id IS NULL;
+CREATE INDEX IF NOT EXISTS idx_citation_ref_title ON citation_ref(title_key) WHERE target_id IS NULL;
+CREATE INDEX IF NOT EXISTS idx_citation_ref_target ON citation_ref(target_id);
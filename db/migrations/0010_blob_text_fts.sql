@@ -0,0 +1,24 @@
+-- requires: fts5
+-- 0010: keyword index for blob-mode texts (TextStorageConfig.MODE = "blob").
+-- Their text_entity.content is '' (the text is sliced from the compressed
+-- document_text blob), so text_fts cannot index them. blob_text_fts holds
+-- their chunk text under the text_entity rowid: TextRepository writes it
+-- when it places texts in a blob, the triggers drop it with the row (or when
+-- the row leaves blob storage). It keeps its own copy of the text, which
+-- snippets and highlights need.
+--
+-- Existing blob-mode texts are indexed by `smartlib db fts --rebuild`
+-- (FullTextRepository.rebuild(); imports run it automatically).
+
+CREATE VIRTUAL TABLE IF NOT EXISTS blob_text_fts USING fts5(
+    content,
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS blob_text_fts_ad AFTER DELETE ON text_entity WHEN old.blob_id IS NOT NULL BEGIN
+    DELETE FROM blob_text_fts WHERE rowid = old.rowid;
+END;
+CREATE TRIGGER IF NOT EXISTS blob_text_fts_au AFTER UPDATE OF blob_id ON text_entity
+WHEN old.blob_id IS NOT NULL AND new.blob_id IS NULL BEGIN
+    DELETE FROM blob_text_fts WHERE rowid = old.rowid;
+END;
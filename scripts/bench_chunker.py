@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Compare the sentence chunker (`process_chunks`) with span mode (`page_spans`).
+
+Uses real Grobid page texts (tests/e2e/data/documents/text/*/p*.txt by
+default). Each page is chunked either as one paragraph or as one paragraph per
+line (--lines, closer to many short Grobid paragraphs). Reports time per
+page for spans only (no strings built) and spans + materialised strings,
+and checks that chunk boundaries agree with the sentence chunker.
+
+Run from repository root:
+  PYTHONPATH=src python3 scripts/bench_chunker.py
+  PYTHONPATH=src python3 scripts/bench_chunker.py --lines --repeat 50
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from smart_library.utils.chunker import TextChunker
+
+DEFAULT_GLOB = "tests/e2e/data/documents/text/*/p*.txt"
+
+
+def _timed(fn, pages, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for paragraphs in pages:
+            fn(paragraphs)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _squash(chunks):
+    # Span mode keeps the source text between sentences ("3.5" stays "3.5",
+    # the sentence chunker writes "3. 5"), so compare without whitespace.
+    return ["".join(c.split()) for c in chunks]
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--glob", default=DEFAULT_GLOB, help="page text files, relative to the repository root")
+    ap.add_argument("--lines", action="store_true", help="treat every line as a paragraph")
+    ap.add_argument("--repeat", type=int, default=20, help="timing runs (best is reported)")
+    args = ap.parse_args()
+
+    root = Path(__file__).resolve().parents[1]
+    files = sorted(root.glob(args.glob))
+    if not files:
+        sys.exit(f"no files match {args.glob}")
+    texts = [f.read_text(encoding="utf-8") for f in files]
+    pages = [[line for line in t.split("\n") if line] if args.lines else [t] for t in texts]
+    chunker = TextChunker()
+
+    def spans_only(paragraphs):
+        _, spans = chunker.page_spans(paragraphs)
+        for _ in spans:
+            pass
+
+    def spans_materialised(paragraphs):
+        source, spans = chunker.page_spans(paragraphs)
+        return [(s.text(source), s.overlap_text(source)) for s in spans]
+
+    t_sentences = _timed(chunker.process_chunks, pages, args.repeat)
+    t_spans = _timed(spans_only, pages, args.repeat)
+    t_materialised = _timed(spans_materialised, pages, args.repeat)
+
+    chunks = boundary_diff = overlap_diff = 0
+    for paragraphs in pages:
+        non_overlap, overlap = chunker.process_chunks(paragraphs)
+        pairs = spans_materialised(paragraphs)
+        chunks += len(non_overlap)
+        boundary_diff += _squash(non_overlap) != _squash([a for a, _ in pairs])
+        overlap_diff += _squash(overlap) != _squash([b for _, b in pairs])
+
+    n = len(pages)
+    chars = sum(len(t) for t in texts)
+    print(f"{n} pages, {chars / 1e3:.0f}k chars, {chunks} chunks ({'line' if args.lines else 'page'} paragraphs)")
+    print(f"  sentences (process_chunks): {t_sentences * 1e3 / n:7.3f} ms/page")
+    print(f"  spans only:                 {t_spans * 1e3 / n:7.3f} ms/page  ({t_sentences / t_spans:.1f}x)")
+    print(f"  spans + strings:            {t_materialised * 1e3 / n:7.3f} ms/page  "
+          f"({t_sentences / t_materialised:.1f}x)")
+    print(f"  pages with different chunk boundaries: {boundary_diff}")
+    print(f"  pages with different overlap text:     {overlap_diff}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Compare vector, keyword and hybrid search quality (nDCG@k) and latency.
+
+Uses labeled search sessions as relevance judgments: every `positive_ids`
+entry of a session is a relevant hit for its query (binary gain), negatives
+and unlabeled texts count as irrelevant. Sessions are the `.search_session.json`
+files written by `smartlib search`/`label` and the API; pass files or
+directories of session JSON files (default: DATA_DIR and the working dir).
+
+Labels were collected from vector (and reranked) result lists, so they favour
+the vector mode; treat keyword/hybrid scores as a lower bound.
+
+Run from repository root against the configured library:
+  PYTHONPATH=src python3 scripts/bench_hybrid.py
+  PYTHONPATH=src python3 scripts/bench_hybrid.py sessions/ -k 20 --repeat 3 --lexical-weight 0.5
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+
+def load_sessions(inputs):
+    sessions = []
+    for item in inputs:
+        path = Path(item)
+        files = sorted(path.glob("*.json")) + sorted(path.glob(".*.json")) if path.is_dir() else [path]
+        for f in files:
+            if not f.exists():
+                continue
+            try:
+                data = json.loads(f.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as e:
+                print(f"skipping {f}: {e}", file=sys.stderr)
+                continue
+            for session in data if isinstance(data, list) else [data]:
+                if session.get("query") and session.get("positive_ids"):
+                    sessions.append({"query": session["query"], "relevant": set(session["positive_ids"]), "file": str(f)})
+    return sessions
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("inputs", nargs="*", help="session JSON files or directories")
+    ap.add_argument("-k", type=int, default=10, help="cutoff for nDCG and the number of results per query")
+    ap.add_argument("--repeat", type=int, default=1, help="run every query this many times (latency)")
+    ap.add_argument("--candidates", type=int, default=None, help="hybrid: candidates per source (SearchConfig.CANDIDATES)")
+    ap.add_argument("--rrf-k", type=int, default=None, help="hybrid rrf: rank constant (SearchConfig.RRF_K)")
+    ap.add_argument("--lexical-weight", type=float, default=None)
+    ap.add_argument("--vector-weight", type=float, default=None)
+    args = ap.parse_args()
+
+    from smart_library.application.services.evaluation import ndcg_at_k
+    from smart_library.application.services.search_service import SearchService
+    from smart_library.config import DATA_DIR
+
+    inputs = args.inputs or [DATA_DIR / ".search_session.json", Path.cwd() / ".search_session.json"]
+    sessions = load_sessions(inputs)
+    if not sessions:
+        sys.exit("no labeled sessions (with positive_ids) found")
+
+    svc = SearchService()
+    weights = {}
+    if args.lexical_weight is not None:
+        weights["lexical"] = args.lexical_weight
+    if args.vector_weight is not None:
+        weights["vector"] = args.vector_weight
+    hybrid = dict(top_k=args.k, weights=weights, rrf_k=args.rrf_k, candidates=args.candidates)
+    modes = {
+        "vector": lambda q: svc.similarity_search(q, top_k=args.k),
+        "keyword": lambda q: svc.keyword_search(q, top_k=args.k),
+        "hybrid-rrf": lambda q: svc.hybrid_search(q, fusion="rrf", **hybrid).results,
+        "hybrid-weighted": lambda q: svc.hybrid_search(q, fusion="weighted", **hybrid).results,
+    }
+
+    svc.similarity_search(sessions[0]["query"], top_k=1)  # warm up the embedding model and caches
+    print(f"{len(sessions)} labeled queries, nDCG@{args.k}\n")
+    print(f"{'mode':<16} {'nDCG':>7} {'p50 ms':>9} {'p95 ms':>9} {'failed':>7}")
+    for name, run in modes.items():
+        scores, latencies, failed = [], [], 0
+        for session in sessions:
+            for _ in range(args.repeat):
+                t0 = time.perf_counter()
+                try:
+                    hits = run(session["query"])
+                except Exception as e:
+                    print(f"{name} failed for {session['query']!r}: {e}", file=sys.stderr)
+                    failed += 1
+                    hits = []
+                latencies.append((time.perf_counter() - t0) * 1000)
+            scores.append(ndcg_at_k([h["id"] for h in hits], session["relevant"], args.k))
+        latencies.sort()
+        p95 = latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))]
+        print(f"{name:<16} {statistics.mean(scores):>7.3f} {statistics.median(latencies):>9.1f} {p95:>9.1f} {failed:>7}")
+
+
+if __name__ == "__main__":
+    main()
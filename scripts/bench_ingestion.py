@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Measure IngestionAppService throughput against the offline Grobid replay server.
+
+Starts the replay server in-process on a free port, ingests the PDFs into a
+fresh database under a temporary SMARTLIB_DATA_DIR and reports docs/minute,
+per-document latency and the Grobid client/server counters. The TEI cache is
+bypassed so every document goes through HTTP.
+
+Record fixtures first (see scripts/record_grobid_fixtures.py), then run from
+repository root:
+  PYTHONPATH=src python3 scripts/bench_ingestion.py tests/e2e/data/documents/pdf \\
+      --fixtures data_dev/grobid_fixtures --latency 1.5 --server-concurrency 4 --concurrency 4
+  PYTHONPATH=src python3 scripts/bench_ingestion.py ... --repeat 5 --no-embed
+"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("inputs", nargs="+", help="PDF files or directories")
+    ap.add_argument("--fixtures", required=True, help="replay fixture directory")
+    ap.add_argument("--latency", type=float, default=1.0, help="replay seconds per request")
+    ap.add_argument("--jitter", type=float, default=0.0)
+    ap.add_argument("--latency-per-mb", type=float, default=0.0)
+    ap.add_argument("--server-concurrency", type=int, default=4, help="replay server slots (503 beyond)")
+    ap.add_argument("--concurrency", type=int, default=4, help="client requests in flight")
+    ap.add_argument("--repeat", type=int, default=1, help="ingest the PDF set this many times")
+    ap.add_argument("--no-embed", action="store_true", help="skip embeddings (measures Grobid + mapping + DB)")
+    args = ap.parse_args()
+
+    data_dir = tempfile.mkdtemp(prefix="smartlib-bench-")
+    os.environ["SMARTLIB_DATA_DIR"] = data_dir  # must be set before smart_library.config is imported
+
+    from smart_library.application.services.ingestion_app_service import IngestionAppService
+    from smart_library.infrastructure.db.db import init_db
+    from smart_library.infrastructure.grobid.grobid_client import GrobidClient
+    from smart_library.infrastructure.grobid.grobid_service import GrobidService
+    from smart_library.infrastructure.grobid.replay_server import GrobidReplayServer, ReplayFixtures
+
+    pdfs = []
+    for item in args.inputs:
+        path = Path(item)
+        pdfs.extend(sorted(path.rglob("*.pdf")) if path.is_dir() else [path])
+    if not pdfs:
+        sys.exit("no PDFs given")
+
+    Path(data_dir, "db").mkdir(parents=True, exist_ok=True)
+    init_db()
+
+    server = GrobidReplayServer(
+        ReplayFixtures(Path(args.fixtures)), port=0, latency=args.latency, jitter=args.jitter,
+        latency_per_mb=args.latency_per_mb, max_concurrency=args.server_concurrency,
+    ).start()
+    client = GrobidClient(
+        fulltext_url=f"{server.url}/api/processFulltextDocument",
+        header_url=f"{server.url}/api/processHeaderDocument",
+        version_url=f"{server.url}/api/version",
+        concurrency=args.concurrency,
+        backoff_base=0.2,
+    )
+    ingestion = IngestionAppService(grobid_svc=GrobidService(client=client, use_cache=False))
+
+    durations, ok, failed = [], 0, 0
+    t0 = time.perf_counter()
+    try:
+        for _ in range(args.repeat):
+            last = time.perf_counter()
+            for path, doc_id, error in ingestion.ingest_many_from_grobid(
+                pdfs, embed=not args.no_embed, concurrency=args.concurrency
+            ):
+                now = time.perf_counter()
+                durations.append(now - last)
+                last = now
+                if error is None:
+                    ok += 1
+                else:
+                    failed += 1
+                    print(f"  FAILED {path}: {error}")
+    finally:
+        elapsed = time.perf_counter() - t0
+        ingestion.close()
+        server.stop()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    print(f"{ok} documents ingested ({failed} failed) in {elapsed:.2f}s "
+          f"-> {ok * 60.0 / elapsed:.1f} docs/min")
+    if durations:
+        print(f"time between completions: median {statistics.median(durations):.2f}s, "
+              f"max {max(durations):.2f}s")
+    print("client:", {k: round(v, 3) if isinstance(v, float) else v for k, v in client.metrics.snapshot().items()})
+    print("server:", server.stats.snapshot())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Compare peak memory and time of the tree and streaming TEI mappers.
+
+Each mapper runs in a fresh subprocess and reports its peak RSS, because most
+of the memory is allocated by libxml2 and is invisible to tracemalloc.
+
+Run from repository root:
+  PYTHONPATH=src python3 scripts/bench_tei_mapper.py                 # synthetic 300-page TEI
+  PYTHONPATH=src python3 scripts/bench_tei_mapper.py path/to/doc.xml  # real Grobid output
+  PYTHONPATH=src python3 scripts/bench_tei_mapper.py --pages 1000
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+TEI_NS = "http://www.tei-c.org/ns/1.0"
+
+
+def synthetic_tei(pages: int, paragraphs_per_page: int = 12) -> str:
+    """TEI shaped like Grobid output with coordinates: one section per page."""
+    sentence = "Streaming parsers keep memory flat while mapping large documents. "
+    parts = [
+        f'<?xml version="1.0" encoding="UTF-8"?>\n<TEI xmlns="{TEI_NS}"><teiHeader><fileDesc>'
+        "<titleStmt><title>Synthetic thesis</title></titleStmt>"
+        "<sourceDesc><biblStruct><analytic><author><persName><forename>A</forename>"
+        "<surname>Writer</surname></persName></author></analytic>"
+        '<idno type="DOI">10.0/synthetic</idno></biblStruct></sourceDesc></fileDesc></teiHeader><facsimile>'
+    ]
+    parts += [f'<surface n="{p}" ulx="0.0" uly="0.0" lrx="595.3" lry="841.9"/>' for p in range(1, pages + 1)]
+    parts.append("</facsimile><text><body>")
+    for p in range(1, pages + 1):
+        parts.append(f'<div n="{p}"><head coords="{p},50,60,200,12">Section {p}</head>')
+        for i in range(paragraphs_per_page):
+            coords = ";".join(f"{p},{50 + k},{100 + 20 * i},{400},{10}" for k in range(6))
+            parts.append(
+                f'<p coords="{coords}">{sentence * 6}'
+                f'<ref type="bibr" target="#b{i}" coords="{p},60,{100 + 20 * i},20,10">[{i}]</ref> {sentence}</p>'
+            )
+        parts.append("</div>")
+    parts.append("</body><back><div><listBibl>")
+    parts += [f'<biblStruct xml:id="b{i}"><monogr><title>Ref {i}</title></monogr></biblStruct>' for i in range(200)]
+    parts.append("</listBibl></div></back></text></TEI>")
+    return "".join(parts)
+
+
+def _run_one(mapper: str, path: Path):
+    """Child process: map `path` once and print peak RSS and timings as JSON."""
+    from smart_library.infrastructure.grobid.grobid_mapper import GrobidMapper
+    from smart_library.infrastructure.grobid.grobid_stream_mapper import StreamingGrobidMapper
+
+    base_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    t0 = time.perf_counter()
+    if mapper == "tree":
+        struct = GrobidMapper().xml_to_struct(path.read_text(encoding="utf-8"))
+    else:
+        with open(path, "rb") as f:
+            struct = StreamingGrobidMapper().stream_to_struct(f)
+    seconds = time.perf_counter() - t0
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({
+        "mapper": mapper,
+        "seconds": seconds,
+        "peak_rss_mb": peak_rss / 1024,
+        "delta_rss_mb": (peak_rss - base_rss) / 1024,
+        "sections": len(struct["body"].sections),
+    }))
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("tei", nargs="?", help="TEI XML file (default: generate a synthetic one)")
+    ap.add_argument("--pages", type=int, default=300, help="pages for the synthetic TEI")
+    ap.add_argument("--child", choices=["tree", "stream"], help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.child:
+        _run_one(args.child, Path(args.tei))
+        return
+
+    tmp = None
+    if args.tei:
+        path = Path(args.tei)
+    else:
+        tmp = tempfile.NamedTemporaryFile("w", suffix=".tei.xml", delete=False, encoding="utf-8")
+        tmp.write(synthetic_tei(args.pages))
+        tmp.close()
+        path = Path(tmp.name)
+
+    try:
+        print(f"TEI: {path} ({path.stat().st_size / 1e6:.1f} MB)")
+        results = []
+        for mapper in ("tree", "stream"):
+            out = subprocess.run(
+                [sys.executable, __file__, str(path), "--child", mapper],
+                check=True, capture_output=True, text=True, env=os.environ.copy(),
+            )
+            results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+        for r in results:
+            print(f"{r['mapper']:>6}: {r['seconds']:.2f}s  peak RSS {r['peak_rss_mb']:.0f} MB "
+                  f"(+{r['delta_rss_mb']:.0f} MB while mapping)  sections={r['sections']}")
+    finally:
+        if tmp is not None:
+            os.unlink(tmp.name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Load test the running API: latency percentiles per concurrency level.
+
+Each level runs `-n` requests with that many concurrent clients. When the
+blocking work runs off the event loop (api/concurrency.py), p99 stays near
+the single-request latency until a thread limit is reached and then grows
+with the queue. When it runs on the loop, requests are served one at a time
+and p99 grows like the serialized sum, concurrency x latency (the
+"serialized" column).
+
+Start the API first (`make api` or `uvicorn api.main:app`), then:
+  python3 scripts/load_test_api.py
+  python3 scripts/load_test_api.py --mode keyword --query '"BRCA1" cohort' -c 1,8,32 -n 200
+  python3 scripts/load_test_api.py --endpoint list -c 1,16,64
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+
+def percentile(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+def make_request(args):
+    if args.endpoint == "search":
+        body = json.dumps({"query": args.query, "top_k": args.top_k, "mode": args.mode}).encode("utf-8")
+        return lambda: urllib.request.Request(f"{args.url}/api/search/", data=body,
+                                              headers={"Content-Type": "application/json"}, method="POST")
+    return lambda: urllib.request.Request(f"{args.url}/api/documents/?limit={args.top_k}")
+
+
+def timed_call(build, timeout):
+    t0 = time.perf_counter()
+    try:
+        with urllib.request.urlopen(build(), timeout=timeout) as resp:
+            resp.read()
+            ok = 200 <= resp.status < 300
+    except (urllib.error.URLError, OSError):
+        ok = False
+    return time.perf_counter() - t0, ok
+
+
+def run_level(build, concurrency, n, timeout):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda _: timed_call(build, timeout), range(n)))
+    wall = time.perf_counter() - start
+    latencies = [lat * 1000 for lat, ok in results if ok]
+    return latencies, n - len(latencies), wall
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--url", default="http://localhost:8000", help="API base URL")
+    ap.add_argument("--endpoint", choices=("search", "list"), default="search")
+    ap.add_argument("--mode", default="keyword", help="search mode: vector, keyword or hybrid")
+    ap.add_argument("--query", default="retrieval evaluation")
+    ap.add_argument("--top-k", type=int, default=10)
+    ap.add_argument("-c", "--concurrency", default="1,4,16,32", help="comma-separated concurrency levels")
+    ap.add_argument("-n", "--requests", type=int, default=100, help="requests per level")
+    ap.add_argument("--warmup", type=int, default=5, help="sequential requests before measuring")
+    ap.add_argument("--timeout", type=float, default=120.0)
+    args = ap.parse_args()
+
+    build = make_request(args)
+    for _ in range(args.warmup):
+        _, ok = timed_call(build, args.timeout)
+        if not ok:
+            print(f"Warm-up request to {args.url} failed; is the API running?", file=sys.stderr)
+            return 1
+
+    levels = [int(c) for c in args.concurrency.split(",") if c.strip()]
+    print(f"{args.endpoint} {'(' + args.mode + ') ' if args.endpoint == 'search' else ''}"
+          f"x {args.requests} requests per level against {args.url}")
+    print(f"{'clients':>7} {'p50 ms':>9} {'p99 ms':>9} {'serialized':>11} {'req/s':>8} {'errors':>7}")
+    base = None
+    for concurrency in levels:
+        latencies, errors, wall = run_level(build, concurrency, args.requests, args.timeout)
+        if not latencies:
+            print(f"{concurrency:>7} {'-':>9} {'-':>9} {'-':>11} {'-':>8} {errors:>7}")
+            continue
+        p50 = statistics.median(latencies)
+        base = base or p50  # single-request latency from the first level
+        print(f"{concurrency:>7} {p50:>9.1f} {percentile(latencies, 99):>9.1f} {base * concurrency:>11.1f} "
+              f"{len(latencies) / wall:>8.1f} {errors:>7}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Record Grobid TEI responses as fixtures for the replay server.
+
+Fixtures are stored as <pdf sha256>.tei.xml.gz in the output directory, which
+`smart_library.infrastructure.grobid.replay_server` serves offline.
+
+Run from repository root:
+  # from a live Grobid (GROBID_URL / GROBID_HOST as usual)
+  PYTHONPATH=src python3 scripts/record_grobid_fixtures.py tests/e2e/data/documents/pdf -o data_dev/grobid_fixtures
+  # from TEI files already saved next to their PDFs (paper.pdf + paper.xml / paper.tei.xml)
+  PYTHONPATH=src python3 scripts/record_grobid_fixtures.py data_dev/db/pdf/pdf -o data_dev/grobid_fixtures --from-xml
+"""
+import argparse
+import sys
+from pathlib import Path
+
+from smart_library.infrastructure.grobid.grobid_client import GrobidClient
+from smart_library.infrastructure.grobid.replay_server import ReplayFixtures
+from smart_library.utils.hashing import sha256_file
+
+
+def _pdfs(inputs):
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            yield from sorted(path.rglob("*.pdf"))
+        elif path.suffix.lower() == ".pdf":
+            yield path
+
+
+def _saved_tei(pdf: Path):
+    for candidate in (pdf.with_suffix(".tei.xml"), pdf.with_suffix(".xml")):
+        if candidate.exists():
+            return candidate.read_text(encoding="utf-8")
+    return None
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("inputs", nargs="+", help="PDF files or directories")
+    ap.add_argument("-o", "--output", required=True, help="fixture directory")
+    ap.add_argument("--from-xml", action="store_true", help="use saved TEI next to each PDF instead of Grobid")
+    ap.add_argument("--concurrency", type=int, default=None, help="parallel Grobid requests")
+    ap.add_argument("--force", action="store_true", help="re-record PDFs that already have a fixture")
+    args = ap.parse_args()
+
+    fixtures = ReplayFixtures(Path(args.output))
+    existing = set(fixtures.hashes())
+    pdfs = list(_pdfs(args.inputs))
+    if not args.force:
+        pdfs = [p for p in pdfs if sha256_file(p) not in existing]
+    print(f"{len(pdfs)} PDFs to record into {fixtures.root}")
+
+    recorded = failed = 0
+    if args.from_xml:
+        for pdf in pdfs:
+            tei = _saved_tei(pdf)
+            if tei is None:
+                print(f"  skip {pdf}: no saved TEI")
+                failed += 1
+                continue
+            print(f"  {fixtures.record(pdf, tei)[:12]}  {pdf}")
+            recorded += 1
+    else:
+        client = GrobidClient()
+        try:
+            for result in client.extract_many(pdfs, concurrency=args.concurrency):
+                if not result.ok:
+                    print(f"  FAILED {result.path}: {result.error}")
+                    failed += 1
+                    continue
+                print(f"  {fixtures.record(result.path, result.tei)[:12]}  {result.path} ({result.seconds:.1f}s)")
+                recorded += 1
+            version = client.version()
+        finally:
+            client.close()
+        if version:
+            print(f"Recorded against Grobid {version}")
+
+    print(f"Recorded {recorded}, failed {failed}; {len(fixtures.hashes())} fixtures in total")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -40,6 +40,14 @@ class SearchSession:
         )
 
 
+@dataclass
+class HybridSearchResult:
+    """Fused hits of a hybrid search with the latency of each retrieval source."""
+    results: List[Dict[str, Any]] = field(default_factory=list)
+    timings_ms: Dict[str, float] = field(default_factory=dict)  # "lexical", "vector", "fusion", "total"
+    errors: Dict[str, str] = field(default_factory=dict)  # source -> error, when a source failed
+
+
 @dataclass
 class SearchResult:
     rank: int
@@ -9,6 +9,7 @@ from smart_library.application.services.document_app_service import DocumentAppS
 from smart_library.application.services.page_app_service import PageAppService
 from smart_library.application.services.text_app_service import TextAppService
 from smart_library.utils.chunker import TextChunker
+from smart_library.utils.tokens import get_tokenizer
 from smart_library.application.pipelines.metadata_extraction import SimpleMetadataExtractor
 from collections import defaultdict
 from typing import Dict, List, Tuple
@@ -55,8 +56,12 @@ class DocumentIngestionService:
         first_page_id = None
         first_page_text = None
         page_ids = []
+        tokenizer = get_tokenizer()
         for i, page_text in enumerate(raw_pages):
-            page = Page(parent_id=doc_id, page_number=i+1, full_text=page_text)
+            chunks = self.chunker.chunk(page_text)
+            # One batch per page: the page itself followed by its chunks
+            page_tokens, *chunk_tokens = tokenizer.count_many([page_text or ""] + chunks)
+            page = Page(parent_id=doc_id, page_number=i+1, full_text=page_text, token_count=page_tokens)
             if getattr(self, 'page_app', None):
                 page_id = self.page_app.add_page(page)
             else:
@@ -66,10 +71,10 @@ class DocumentIngestionService:
                 first_page_id = page_id
                 first_page_text = page_text
 
-            chunks = self.chunker.chunk(page_text)
             chunk_ids = []
-            for idx, chunk in enumerate(chunks):
-                text = Text(parent_id=page_id, content=chunk, text_type="chunk", index=idx)
+            for idx, (chunk, token_count) in enumerate(zip(chunks, chunk_tokens)):
+                text = Text(parent_id=page_id, content=chunk, text_type="chunk", index=idx,
+                            token_count=token_count)
                 if getattr(self, 'text_app', None):
                     text_id = self.text_app.add_text(text)
                 else:
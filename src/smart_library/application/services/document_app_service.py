@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 
 from smart_library.infrastructure.repositories.document_repository import DocumentRepository
 from smart_library.domain.entities.document import Document
@@ -17,6 +17,14 @@ class DocumentAppService:
     def get_document(self, doc_id: str) -> Optional[Document]:
         return self.repo.get(doc_id)
 
+    def get_documents(self, doc_ids) -> List[Document]:
+        """Documents for `doc_ids` in the given order, in one query; missing ids are skipped."""
+        return self.repo.get_many(doc_ids)
+
+    def get_document_views(self, doc_ids, columns=None):
+        """Read-only row views for `doc_ids` (only `columns` when given); cheaper than `get_documents`."""
+        return self.repo.get_views(doc_ids, columns=columns)
+
     def exists(self, doc_id: str) -> bool:
         return self.get_document(doc_id) is not None
 
@@ -1,4 +1,4 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 from smart_library.infrastructure.repositories.entity_repository import EntityRepository
 
@@ -19,6 +19,9 @@ class EntityAppService:
     def get(self, entity_id: str) -> Optional[Dict[str, Any]]:
         return self.repo.get(entity_id)
 
+    def get_many(self, entity_ids) -> List[Dict[str, Any]]:
+        return self.repo.get_many(entity_ids)
+
     def create(self, id: str, entity_kind: str, created_by: str = None, metadata: dict = None, parent_id: str = None):
         return self.repo.create(id, entity_kind, created_by, metadata, parent_id)
 
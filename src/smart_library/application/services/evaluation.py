@@ -0,0 +1,19 @@
+"""Ranking quality metrics for comparing search modes on labelled sessions."""
+import math
+from typing import Iterable, Sequence
+
+
+def dcg(gains: Iterable[float]) -> float:
+    return sum(gain / math.log2(position + 2) for position, gain in enumerate(gains))
+
+
+def ndcg_at_k(ranked_ids: Sequence[str], relevant: Iterable[str], k: int = 10) -> float:
+    """
+    Binary-relevance nDCG@k: ids in `relevant` gain 1, everything else 0.
+    The ideal ranking puts all relevant ids first. 0.0 when nothing is relevant.
+    """
+    relevant = set(relevant)
+    if not relevant:
+        return 0.0
+    ideal = dcg([1.0] * min(len(relevant), k))
+    return dcg(1.0 if doc_id in relevant else 0.0 for doc_id in list(ranked_ids)[:k]) / ideal
@@ -0,0 +1,98 @@
+"""
+Document and text lookups in a sharded library.
+
+Routing (`ShardCatalog.route`) only decides where new documents are written;
+a document stays on the shard it was written to. Lookups therefore probe the
+routed shard first (a primary-key probe) and then the other shards, and
+writes to a document (tombstones) go to the shard that holds it.
+"""
+import string
+from typing import Any, Callable, List, Optional
+
+from smart_library.application.services.document_app_service import DocumentAppService
+from smart_library.application.services.text_app_service import TextAppService
+from smart_library.infrastructure.db.connection_manager import pooled_connection
+from smart_library.infrastructure.db.shards import Shard, ShardCatalog
+from smart_library.infrastructure.repositories.base_repository import KeysetPage, encode_cursor
+from smart_library.infrastructure.repositories.document_repository import DocumentRepository
+from smart_library.infrastructure.repositories.text_repository import TextRepository
+
+_NOCASE = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)  # SQLite NOCASE folds ASCII only
+
+
+def write_on_shard(shard: Shard, fn: Callable) -> Any:
+    """Run the write job `fn(conn)` on `shard`: the writer thread for main, else the thread's own connection."""
+    if shard.is_main:
+        from smart_library.infrastructure.db.writer import get_writer
+        return get_writer().execute(fn)
+    return fn(pooled_connection("ingest", shard.path))  # each shard has its own write lock
+
+
+class FederatedDocumentService:
+    """
+    Documents of all shards of a `ShardCatalog`: locate a document or text,
+    services bound to the shard that holds it, merged listings and deletes.
+    `connect(shard)` opens a read connection, `write(shard, fn)` runs a write
+    job (defaults: the pooled "serve" connection, `write_on_shard`).
+    """
+
+    def __init__(self, catalog: ShardCatalog = None, connect=None, write=None):
+        self.catalog = catalog or ShardCatalog()
+        self._connect = connect or (lambda shard: pooled_connection("serve", shard.path))
+        self._write = write or write_on_shard
+
+    # ---------- Lookup ----------
+    def _probe(self, shards: List[Shard], sql: str, entity_id: str) -> Optional[Shard]:
+        for shard in shards:
+            if self._connect(shard).execute(sql, (entity_id,)).fetchone() is not None:
+                return shard
+        return None
+
+    def locate(self, doc_id: str) -> Optional[Shard]:
+        """Shard holding document `doc_id` (tombstoned or not): its routed shard first, then the others."""
+        routed = self.catalog.route(doc_id)
+        shards = [routed] + [s for s in self.catalog.shards if s != routed]
+        return self._probe(shards, "SELECT 1 FROM entity WHERE id = ? AND entity_kind = 'Document'", doc_id)
+
+    def locate_text(self, text_id: str) -> Optional[Shard]:
+        """Shard holding text `text_id` (text ids do not route: every shard in catalog order)."""
+        return self._probe(self.catalog.shards, "SELECT 1 FROM text_entity WHERE id = ?", text_id)
+
+    def document_service(self, doc_id: str) -> DocumentAppService:
+        """DocumentAppService on the shard holding `doc_id` (main when no shard does: lookups find nothing)."""
+        return DocumentAppService(DocumentRepository(self._connect(self.locate(doc_id) or self.catalog.main)))
+
+    def text_service(self, text_id: str) -> TextAppService:
+        return TextAppService(TextRepository(self._connect(self.locate_text(text_id) or self.catalog.main)))
+
+    # ---------- Listing ----------
+    def page(self, limit: int = 50, after: Optional[str] = None, order: str = "created",
+             descending: bool = False, columns=None) -> KeysetPage:
+        """
+        `DocumentRepository.page` over all shards. Cursors hold a sort
+        position (key, id), not a shard, so every shard continues after the
+        same cursor; the per-shard pages are merged and cut to `limit`.
+        """
+        pages = [DocumentRepository(self._connect(shard)).page(limit=limit, after=after, order=order,
+                                                              descending=descending, columns=columns)
+                 for shard in self.catalog.shards]
+
+        def sort_key(entry):
+            (key, doc_id), _ = entry
+            return (key.translate(_NOCASE) if order == "title" else key), doc_id
+
+        entries = sorted(((k, item) for p in pages for k, item in zip(p.keys, p.items)), key=sort_key,
+                         reverse=descending)
+        more = len(entries) > limit or any(p.next_cursor for p in pages)
+        entries = entries[:limit]
+        next_cursor = encode_cursor([order, *entries[-1][0]]) if more and entries else None
+        return KeysetPage([item for _, item in entries], next_cursor, sum(p.total for p in pages),
+                          [k for k, _ in entries])
+
+    # ---------- Deleting ----------
+    def tombstone(self, doc_id: str) -> Optional[Shard]:
+        """Tombstone `doc_id` on the shard holding it; that shard, or None if there is no such live document."""
+        shard = self.locate(doc_id)
+        if shard is None or not self._write(shard, lambda conn: DocumentRepository(conn).tombstone(doc_id)):
+            return None
+        return shard
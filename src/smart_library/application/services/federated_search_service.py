@@ -0,0 +1,182 @@
+import heapq
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from smart_library.application.services.search_service import SearchService
+from smart_library.application.services.text_app_service import TextAppService
+from smart_library.application.services.vector_service import VectorService
+from smart_library.config import ShardConfig
+from smart_library.infrastructure.db.connection_manager import pooled_connection
+from smart_library.infrastructure.db.shards import ShardCatalog
+from smart_library.infrastructure.repositories.base_repository import _chunked
+from smart_library.infrastructure.repositories.fts_repository import FullTextRepository
+from smart_library.infrastructure.repositories.relationship_repository import RelationshipRepository
+from smart_library.infrastructure.repositories.text_repository import TextRepository
+from smart_library.infrastructure.repositories.vector_repository import VectorRepository
+
+log = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _shard_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=ShardConfig.SEARCH_WORKERS, thread_name_prefix="shard-search")
+        return _executor
+
+
+def _may_match(conn, doc_ids=None, year_from=None, year_to=None) -> bool:
+    """Cheap index probes: can this shard hold a hit for the document/year filters at all?"""
+    if doc_ids is not None:
+        doc_ids = list(doc_ids)
+        if not any(
+            conn.execute(f"SELECT EXISTS (SELECT 1 FROM document WHERE id IN ({','.join('?' * len(batch))}))",
+                         batch).fetchone()[0]
+            for batch in _chunked(doc_ids)
+        ):
+            return False
+    if year_from is not None or year_to is not None:
+        low, high = conn.execute("SELECT MIN(year), MAX(year) FROM document").fetchone()
+        if low is None:
+            return False
+        if (year_from is not None and high < year_from) or (year_to is not None and low > year_to):
+            return False
+    return True
+
+
+class FederatedSearchService(SearchService):
+    """
+    SearchService over all shards of a `ShardCatalog`.
+
+    Queries fan out to the shards on a shared thread pool (each worker uses
+    its pooled per-thread connection to the shard) and the per-shard top-k
+    lists are merged into the global top-k. The query is embedded once.
+    Shards outside `shards`/`collections` are never queried; shards whose
+    documents cannot match the doc/year filters are skipped after two index
+    probes. Hits carry the name of their `shard`. A failing shard is logged
+    and reported in `errors`; the search fails only when every shard fails.
+
+    BM25 statistics are per shard, so keyword scores across shards are
+    comparable only roughly (fine for top-k merging of similar shards).
+    Reranking and other single-database features use the main shard
+    (`vector_service`/`text_service`).
+    """
+
+    def __init__(self, catalog: ShardCatalog = None, shards=None, collections=None, embedding_service=None,
+                 connect=None):
+        self.catalog = catalog or ShardCatalog()
+        self.shards = list(shards) if shards is not None else None
+        self.collections = list(collections) if collections is not None else None
+        self._embedding_service = embedding_service
+        self._connect = connect or (lambda shard: pooled_connection("serve", shard.path))
+        self._relationship_repo = None
+        self._fulltext_repo = None
+        self._shard_of = {}  # text id -> shard name, for hits returned by this instance
+        self.errors = {}
+
+    def scoped(self, shards=None, collections=None) -> "FederatedSearchService":
+        """The same service restricted to `shards` (names) and/or `collections`."""
+        return FederatedSearchService(self.catalog, shards, collections, self._embedding_service, self._connect)
+
+    # Single-database collaborators (rerank, inherited helpers) read the main shard
+    @property
+    def vector_service(self):
+        return VectorService(VectorRepository(self._connect(self.catalog.main)))
+
+    @property
+    def text_service(self):
+        return TextAppService(TextRepository(self._connect(self.catalog.main)))
+
+    def _shard_service(self, conn) -> SearchService:
+        return SearchService(
+            embedding_service=self._embedding_service,
+            vector_service=VectorService(VectorRepository(conn)),
+            text_service=TextAppService(TextRepository(conn)),
+            relationship_repo=RelationshipRepository(conn),
+            fulltext_repo=FullTextRepository(conn),
+        )
+
+    def _fan_out(self, fn, shards=None):
+        """Run `fn(shard, conn)` on every selected shard in parallel; [(shard, result)] of the shards that answered."""
+        shards = self.catalog.select(self.shards, self.collections) if shards is None else shards
+        if not shards:
+            return []
+
+        def run(shard):
+            return fn(shard, self._connect(shard))
+
+        if len(shards) == 1:
+            futures = [(shards[0], None)]
+        else:
+            executor = _shard_executor()
+            futures = [(shard, executor.submit(run, shard)) for shard in shards]
+        results = []
+        for shard, future in futures:
+            try:
+                results.append((shard, run(shard) if future is None else future.result()))
+            except Exception as e:
+                log.warning("Shard %s failed: %s", shard.name, e)
+                self.errors[shard.name] = str(e)
+        if not results:
+            raise RuntimeError(f"Search failed on every shard: {self.errors}")
+        return results
+
+    def _merge(self, per_shard, top_k, score_key):
+        hits = []
+        for shard, shard_hits in per_shard:
+            for hit in shard_hits:
+                hit["shard"] = shard.name
+                self._shard_of[hit["id"]] = shard.name
+                hits.append(hit)
+        return heapq.nlargest(top_k, hits, key=lambda h: h.get(score_key) or 0.0)
+
+    def similarity_search(self, text, top_k=10, doc_ids=None, year_from=None, year_to=None):
+        embedding = self.embedding_service.embed(text)
+
+        def search(shard, conn):
+            if not _may_match(conn, doc_ids, year_from, year_to):
+                return []
+            return self._shard_service(conn).live_similar(embedding, top_k=top_k, doc_ids=doc_ids,
+                                                          year_from=year_from, year_to=year_to)
+        return self._merge(self._fan_out(search), top_k, "cosine_similarity")
+
+    def keyword_search(self, query, top_k=10, doc_ids=None, year_from=None, year_to=None,
+                       heading_weight=0.5, raw=False):
+        def search(shard, conn):
+            if not _may_match(conn, doc_ids, year_from, year_to):
+                return []
+            return self._shard_service(conn).keyword_search(query, top_k=top_k, doc_ids=doc_ids, year_from=year_from,
+                                                           year_to=year_to, heading_weight=heading_weight, raw=raw)
+        return self._merge(self._fan_out(search), top_k, "score")
+
+    def hybrid_search(self, query, top_k=10, **kwargs):
+        result = super().hybrid_search(query, top_k=top_k, **kwargs)
+        for hit in result.results:
+            hit["shard"] = self._shard_of.get(hit["id"])
+        return result
+
+    def _by_shard(self, text_ids):
+        """Group ids by the shard of the hit that returned them (unknown ids: every selected shard)."""
+        selected = self.catalog.select(self.shards, self.collections)
+        groups = {shard.name: [] for shard in selected}
+        for tid in text_ids:
+            name = self._shard_of.get(tid)
+            for target in ([name] if name in groups else groups):
+                groups[target].append(tid)
+        return [(shard, groups[shard.name]) for shard in selected if groups[shard.name]]
+
+    def existing_ids(self, text_ids):
+        found = set()
+        for shard, ids in self._by_shard(text_ids):
+            found |= self._shard_service(self._connect(shard)).existing_ids(ids)
+        return found
+
+    def expand_context(self, text_ids, window=None):
+        context = {}
+        for shard, ids in self._by_shard(text_ids):
+            context.update(self._shard_service(self._connect(shard)).expand_context(ids, window=window))
+        return context
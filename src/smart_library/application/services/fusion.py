@@ -0,0 +1,55 @@
+"""Rank fusion for hybrid retrieval: merge ranked lists from several sources into one."""
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+# One source's hits as (id, score), best first
+Ranking = Sequence[Tuple[str, float]]
+
+FUSION_METHODS = ("rrf", "weighted")
+
+
+def _ordered(scores: Dict[str, float]) -> List[Tuple[str, float]]:
+    # Stable: equal scores keep the order in which ids were first seen
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+def reciprocal_rank_fusion(rankings: Mapping[str, Ranking], weights: Optional[Mapping[str, float]] = None,
+                           k: int = 60) -> List[Tuple[str, float]]:
+    """
+    score(d) = sum over sources of weight / (k + rank(d)), ranks from 1.
+    Only ranks count, so BM25 and cosine scales never need reconciling; `k`
+    damps the advantage of the very top ranks (60 is the usual choice).
+    """
+    scores: Dict[str, float] = {}
+    for source, ranking in rankings.items():
+        weight = 1.0 if weights is None else weights.get(source, 1.0)
+        for rank, (doc_id, _) in enumerate(ranking, start=1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + weight / (k + rank)
+    return _ordered(scores)
+
+
+def weighted_fusion(rankings: Mapping[str, Ranking],
+                    weights: Optional[Mapping[str, float]] = None) -> List[Tuple[str, float]]:
+    """
+    Min-max normalise each source's scores to [0, 1] and sum them weighted;
+    a source that did not return a document contributes 0 for it.
+    """
+    scores: Dict[str, float] = {}
+    for source, ranking in rankings.items():
+        if not ranking:
+            continue
+        weight = 1.0 if weights is None else weights.get(source, 1.0)
+        values = [score for _, score in ranking]
+        low, span = min(values), max(values) - min(values)
+        for doc_id, score in ranking:
+            normalised = (score - low) / span if span else 1.0
+            scores[doc_id] = scores.get(doc_id, 0.0) + weight * normalised
+    return _ordered(scores)
+
+
+def fuse(rankings: Mapping[str, Ranking], method: str = "rrf", weights: Optional[Mapping[str, float]] = None,
+         k: int = 60) -> List[Tuple[str, float]]:
+    if method == "rrf":
+        return reciprocal_rank_fusion(rankings, weights, k)
+    if method == "weighted":
+        return weighted_fusion(rankings, weights)
+    raise ValueError(f"Unknown fusion method {method!r}; expected one of: {', '.join(FUSION_METHODS)}")
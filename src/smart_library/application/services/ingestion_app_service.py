@@ -1,4 +1,4 @@
-from typing import Optional, Any
+from typing import Optional, Any, Iterable, List, Tuple
 from pathlib import Path
 import logging
 
@@ -11,6 +11,16 @@ from .embedding_app_service import EmbeddingAppService
 from .vector_service import VectorService
 from smart_library.infrastructure.grobid.grobid_service import GrobidService
 from smart_library.domain.mappers.grobid_domain.snapshop_mapper import build_snapshot
+from smart_library.infrastructure.db.db import get_connection, transaction
+from smart_library.infrastructure.db.shards import Shard, ShardCatalog
+from smart_library.infrastructure.db.writer import DatabaseWriter
+from smart_library.infrastructure.repositories.document_repository import DocumentRepository
+from smart_library.infrastructure.repositories.heading_repository import HeadingRepository
+from smart_library.infrastructure.repositories.text_repository import TextRepository
+from smart_library.infrastructure.repositories.vector_repository import VectorRepository
+from smart_library.infrastructure.repositories.relationship_repository import RelationshipRepository
+from smart_library.joins.paper_citations import link_document
+from smart_library.utils.hashing import sha256_file
 
 
 class IngestionAppService:
@@ -29,7 +39,11 @@ class IngestionAppService:
                  embed_svc: Optional[EmbeddingAppService] = None,
                  vec_svc: Optional[VectorService] = None,
                  logger: Optional[logging.Logger] = None,
-                 debug: bool = False):
+                 debug: bool = False,
+                 conn=None,
+                 grobid_svc: Optional[GrobidService] = None,
+                 writer: Optional[DatabaseWriter] = None,
+                 catalog: Optional[ShardCatalog] = None):
         self.log = logger or logging.getLogger("IngestionAppService")
         # Ensure logger outputs to console at appropriate level
         if not self.log.handlers:
@@ -46,6 +60,36 @@ class IngestionAppService:
         self.entity = entity_svc or EntityAppService()
         self.embed = embed_svc or EmbeddingAppService()
         self.vec = vec_svc or VectorService()
+        # Connection used by the bulk snapshot path (opened lazily)
+        self._conn = conn
+        self._owns_conn = conn is None
+        # Shared across calls so the client's pooled connections are reused
+        self._grobid = grobid_svc
+        # When set, snapshot writes are queued to the single-writer thread
+        # and `conn` is only used for reads
+        self.writer = writer
+        # Sharded libraries: snapshots are routed to a shard (main: `conn`/`writer`)
+        self._catalog = catalog
+        self._shard_conns = {}
+
+    @property
+    def conn(self):
+        if self._conn is None:
+            self._conn = get_connection(profile="ingest")
+        return self._conn
+
+    @property
+    def catalog(self) -> ShardCatalog:
+        if self._catalog is None:
+            self._catalog = ShardCatalog()
+        return self._catalog
+
+    def _shard_conn(self, shard: Shard):
+        """Write connection of a non-main shard; each shard has its own write lock, so no writer thread."""
+        conn = self._shard_conns.get(shard.name)
+        if conn is None:
+            conn = self._shard_conns[shard.name] = get_connection(shard.path, profile="ingest")
+        return conn
 
     def ensure_entity(self, id: str, kind: str, parent_id: str = None, metadata: dict = None, created_by: str = None) -> bool:
         return self.entity.ensure_exists(id, kind, created_by=created_by, metadata=metadata, parent_id=parent_id)
@@ -115,73 +159,122 @@ class IngestionAppService:
             raise
         return hid
 
-    def persist_snapshot(self, snapshot: Any, embed: bool = True):
+    def persist_snapshot(self, snapshot: Any, embed: bool = True, collection: Optional[str] = None):
         """Persist a snapshot produced by the Grobid mapper.
 
-        Idempotent: will skip existing entities.
+        Embeddings are computed first; the document, headings, texts, vectors
+        and the snapshot's relationships are then bulk-inserted in a single
+        transaction on one connection. Idempotent: entities that already exist
+        are skipped and relationships are inserted with `INSERT OR IGNORE`.
+        Texts whose embedding fails are stored without a vector.
+        In a sharded library the document goes to the shard of `collection`,
+        or the hash-routed shard (see `ShardCatalog.route`); citations are
+        linked within that shard.
         """
         doc = getattr(snapshot, "document", None)
         if not doc:
             raise ValueError("Snapshot has no document")
 
-        # Persist document
-        try:
-            self.log.debug("Persisting snapshot: doc_id=%s title=%s", getattr(doc, "id", None), getattr(doc, "title", None))
-            if not self.doc.exists(getattr(doc, "id", None)):
-                self.doc.add_document(doc)
-                self.log.info("Document persisted: %s", getattr(doc, "id", None))
-            else:
-                self.log.debug("Document already exists: %s", getattr(doc, "id", None))
-        except Exception:
-            self.log.exception("Failed to persist document %s", getattr(doc, "id", None))
-            raise
+        shard = self.catalog.route(doc.id, collection) if collection or self.catalog.is_sharded else None
+        on_main = shard is None or shard.is_main
+        conn = self.conn if on_main else self._shard_conn(shard)
+        docs = DocumentRepository(conn)
 
-        # Headings
         headings = (getattr(snapshot, "headings", None) or [])
-        self.log.debug("Snapshot has %d headings", len(headings))
-        for h in headings:
-            try:
-                self.persist_heading(h)
-            except Exception:
-                self.log.exception("Failed to persist heading %s", getattr(h, 'id', None))
-
-        # Pages/texts
         texts = (getattr(snapshot, "texts", None) or [])
-        self.log.debug("Snapshot has %d text objects", len(texts))
-        failed_texts = []
-        for t in texts:
-            try:
-                self.persist_text_with_vector(t, embed=embed)
-            except Exception:
-                tid = getattr(t, 'id', None)
-                failed_texts.append(tid)
-                self.log.exception("Failed to persist text in snapshot: %s", tid)
+        relationships = (getattr(snapshot, "relationships", None) or [])
+        self.log.debug("Persisting snapshot: doc_id=%s title=%s headings=%d texts=%d relationships=%d",
+                       doc.id, getattr(doc, "title", None), len(headings), len(texts), len(relationships))
+
+        existing = docs._existing_ids([doc.id] + [h.id for h in headings] + [t.id for t in texts])
+        new_headings = [h for h in headings if h.id not in existing]
+        new_texts = [t for t in texts if t.id not in existing]
+
+        vectors = []
+        if embed:
+            for t in new_texts:
+                txt_for_embed = getattr(t, "embedding_content", None) or getattr(t, "display_content", None) or getattr(t, "content", "")
+                try:
+                    vectors.append((t.id, self.embed.embed(txt_for_embed)))
+                except Exception:
+                    self.log.exception("Embedding failed for text %s; storing it without a vector", t.id)
+
+        def write(conn):
+            if doc.id not in existing:
+                DocumentRepository(conn)._insert_row(doc)
+            HeadingRepository(conn).add_many(new_headings)
+            TextRepository(conn).add_many(new_texts)
+            VectorRepository(conn).add_many(vectors)
+            RelationshipRepository(conn).add_many(relationships)
+            return link_document(conn, doc.id)
 
-        if failed_texts:
-            self.log.warning("Some texts failed to persist for document %s: %s", getattr(doc, 'id', None), failed_texts)
+        try:
+            if self.writer is not None and on_main:
+                citation_edges = self.writer.execute(write)
+            else:
+                with transaction(conn):
+                    citation_edges = write(conn)
+        except Exception:
+            self.log.exception("Failed to persist snapshot for document %s", doc.id)
+            raise
 
-        return getattr(doc, "id", None)
+        self.log.info("Document persisted: %s on shard %s (%d headings, %d texts, %d vectors, %d relationships, citations %s)",
+                      doc.id, shard.name if shard else "main", len(new_headings), len(new_texts), len(vectors), len(relationships), citation_edges)
+        return doc.id
 
-    def ingest_from_grobid(self, pdf_path: str | Path, embed: bool = True, source_path: str | None = None):
+    def ingest_from_grobid(self, pdf_path: str | Path, embed: bool = True, source_path: str | None = None,
+                           file_hash: str | None = None, collection: str | None = None):
         """Run Grobid extraction for `pdf_path`, build a domain snapshot, and persist it.
 
+        Pass `file_hash` when the caller already hashed the PDF (e.g. while streaming an upload);
+        otherwise the PDF is hashed here.
+        `collection` selects the shard in a sharded library.
+
         Returns the document id.
         """
         logger = self.log
-        svc = GrobidService()
         try:
-            struct = svc.extract_fulltext(pdf_path)
+            struct = self.grobid.extract_fulltext(pdf_path)
         except Exception:
             logger.exception("Grobid extraction failed for %s", pdf_path)
             raise
 
         try:
-            snapshot = build_snapshot(struct, source_path=source_path or str(pdf_path))
+            snapshot = build_snapshot(struct, source_path=source_path or str(pdf_path),
+                                      file_hash=file_hash or sha256_file(pdf_path))
         except Exception:
             logger.exception("Failed to build snapshot from Grobid output for %s", pdf_path)
             raise
 
-        return self.persist_snapshot(snapshot, embed=embed)
+        return self.persist_snapshot(snapshot, embed=embed, collection=collection)
+
+    def ingest_many_from_grobid(self, pdf_paths: Iterable[str | Path], embed: bool = True,
+                                concurrency: int | None = None, collection: str | None = None) -> List[Tuple[Path, Optional[str], Optional[Exception]]]:
+        """Ingest many PDFs, keeping up to `concurrency` Grobid requests in flight.
+
+        Documents are mapped and persisted one at a time as their TEI arrives.
+        Returns `(pdf_path, document id or None, error or None)` per PDF in completion order.
+        """
+        results = []
+        for result in self.grobid.extract_many_xml([Path(p) for p in pdf_paths], concurrency=concurrency):
+            if not result.ok:
+                self.log.error("Grobid extraction failed for %s: %s", result.path, result.error)
+                results.append((result.path, None, result.error))
+                continue
+            try:
+                struct = self.grobid.mapper.xml_to_struct(result.tei)
+                snapshot = build_snapshot(struct, source_path=str(result.path), file_hash=sha256_file(result.path))
+                results.append((result.path, self.persist_snapshot(snapshot, embed=embed, collection=collection), None))
+            except Exception as e:
+                self.log.exception("Failed to ingest %s", result.path)
+                results.append((result.path, None, e))
+        return results
+
+    @property
+    def grobid(self) -> GrobidService:
+        if self._grobid is None:
+            self._grobid = GrobidService()
+        return self._grobid
 
     def close(self):
         for svc in (self.doc, self.head, self.page, self.text):
@@ -189,3 +282,17 @@ class IngestionAppService:
                 svc.close()
             except Exception:
                 pass
+        for conn in self._shard_conns.values():
+            try:
+                conn.close()
+            except Exception:
+                pass
+        self._shard_conns = {}
+        if self._owns_conn and self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
+        if self._grobid is not None:
+            self._grobid.client.close()
@@ -19,6 +19,13 @@ class ListingService:
     def list_documents(self, limit=None):
         return self.repo_doc.list(limit)
 
+    def page_documents(self, limit=50, cursor=None, order="created", descending=False, columns=None):
+        """Keyset page of documents: `.items`, `.next_cursor` and the exact `.total`."""
+        return self.repo_doc.page(limit=limit, after=cursor, order=order, descending=descending, columns=columns)
+
+    def page_texts(self, limit=100, cursor=None, descending=False, columns=None):
+        return self.repo_text.page(limit=limit, after=cursor, descending=descending, columns=columns)
+
     def list_pages(self, doc_id=None, limit=100):
         return self.repo_page.list(doc_id=doc_id, limit=limit)
 
@@ -0,0 +1,171 @@
+"""
+Background purge of tombstoned documents.
+
+Deleting a document only writes a tombstone (`DocumentRepository.tombstone`),
+which search and listings honour at once. The rows, vectors and the stored
+PDF are removed here afterwards: `PurgeConfig.BATCH_SIZE` entities per write
+job, with `PurgeConfig.PAUSE` between jobs, so the write lock is never held
+for a whole document and concurrent ingestion and searches keep going.
+Tombstones survive restarts; pending ones are purged when the worker starts.
+In a sharded library every shard is purged, each on its own connection.
+"""
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from smart_library.config import PurgeConfig
+from smart_library.infrastructure.db.shards import Shard, ShardCatalog
+from smart_library.infrastructure.repositories.document_repository import DocumentRepository
+
+log = logging.getLogger(__name__)
+
+
+class PurgeWorker:
+    """
+    Purges tombstoned documents on a daemon thread, woken by `wake()` after a
+    delete and otherwise every `poll_interval` seconds. `execute(fn)` runs a
+    write job `fn(conn)` on the main shard (default: the process-wide
+    `DatabaseWriter`), `connect(shard)` gives the write connection of any
+    other shard of `catalog` (default: the configured catalog, re-read per run).
+    """
+
+    def __init__(self, execute: Callable[[Callable], Any] = None, pdf_dir: Path = None, batch_size: int = None,
+                 pause: float = None, poll_interval: float = None, catalog: ShardCatalog = None,
+                 connect: Callable[[Shard], Any] = None):
+        if pdf_dir is None:
+            from smart_library.config import DOC_PDF_DIR
+            pdf_dir = DOC_PDF_DIR
+        self._execute = execute
+        self._catalog = catalog
+        self._connect = connect
+        self.pdf_dir = Path(pdf_dir)
+        self.batch_size = batch_size or PurgeConfig.BATCH_SIZE
+        self.pause = PurgeConfig.PAUSE if pause is None else pause
+        self.poll_interval = poll_interval or PurgeConfig.POLL_INTERVAL
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.purged = 0
+
+    @property
+    def catalog(self) -> ShardCatalog:
+        if self._catalog is not None:
+            return self._catalog
+        from smart_library.infrastructure.db.shards import load_catalog
+        return load_catalog()
+
+    def execute(self, fn: Callable, shard: Shard = None) -> Any:
+        if shard is not None and not shard.is_main:
+            if self._connect is not None:
+                return fn(self._connect(shard))
+            from smart_library.application.services.federated_document_service import write_on_shard
+            return write_on_shard(shard, fn)
+        if self._execute is not None:
+            return self._execute(fn)
+        from smart_library.infrastructure.db.writer import get_writer
+        return get_writer().execute(fn)  # looked up per job: the writer is replaced after close_writer()
+
+    # ---------- Purging ----------
+    def purge_document(self, doc_id: str, shard: Shard = None) -> int:
+        """
+        Delete a tombstoned document of `shard` (default: main) in throttled
+        batches, then its PDF. Returns the entities deleted.
+        """
+        deleted, finished = 0, False
+        while not finished:
+            count, finished = self.execute(lambda conn: DocumentRepository(conn).purge_step(doc_id, self.batch_size),
+                                           shard)
+            deleted += count
+            if not finished and self.pause:
+                time.sleep(self.pause)
+        try:
+            (self.pdf_dir / f"{doc_id}.pdf").unlink(missing_ok=True)
+        except OSError as e:
+            log.warning("Purged document %s but could not delete its PDF: %s", doc_id, e)
+        log.info("Purged document %s (%d entities)", doc_id, deleted)
+        return deleted
+
+    def purge_pending(self) -> int:
+        """Purge every tombstoned document (oldest first, shard by shard). Returns the number of documents purged."""
+        purged, failed = 0, set()
+        for shard in self.catalog.shards:
+            while not self._stop.is_set():
+                pending = [d for d in self.execute(lambda conn: DocumentRepository(conn).tombstoned(len(failed) + 100),
+                                                   shard)
+                           if d not in failed]
+                if not pending:
+                    break
+                for doc_id in pending:
+                    if self._stop.is_set():
+                        break
+                    try:
+                        self.purge_document(doc_id, shard)
+                        purged += 1
+                    except Exception:
+                        log.exception("Purge of document %s on shard %s failed; retried on the next run",
+                                      doc_id, shard.name)
+                        failed.add(doc_id)
+        self.purged += purged
+        return purged
+
+    # ---------- Background thread ----------
+    def start(self) -> "PurgeWorker":
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._wake.set()  # purge what was left over from the last run
+                self._thread = threading.Thread(target=self._run, name="purge", daemon=True)
+                self._thread.start()
+        return self
+
+    def wake(self):
+        """Start purging now instead of at the next poll (call after writing a tombstone)."""
+        self._wake.set()
+
+    def stop(self, timeout: float = None):
+        """Stop after the current batch; the remaining tombstones are purged on the next start."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        self._stop.set()
+        self._wake.set()
+        if thread is not None:
+            thread.join(timeout)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            try:
+                self.purge_pending()
+            except Exception:
+                log.exception("Purge run failed")
+
+
+_worker: Optional[PurgeWorker] = None
+_worker_lock = threading.Lock()
+
+
+def get_purge_worker() -> PurgeWorker:
+    """Process-wide purge worker for the configured database (not started until `start()`)."""
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = PurgeWorker()
+        return _worker
+
+
+def close_purge_worker(timeout: float = None):
+    global _worker
+    with _worker_lock:
+        worker, _worker = _worker, None
+    if worker is not None:
+        worker.stop(timeout)
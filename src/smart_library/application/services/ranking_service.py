@@ -26,7 +26,7 @@ class RankingService:
             session: SearchSession containing query, positive_ids, and negative_ids.
                      positive_ids and negative_ids can be empty for initial searches.
             embedding_service: service providing `embed(text)`.
-            text_service: service providing `get_text(text_id)`.
+            text_service: service providing `get_texts(text_ids)`.
             vector_service: service providing `search_similar_vectors(vec, top_k)`.
             top_k: number of results to return.
             alpha/beta/gamma: Rocchio weights (alpha for query, beta for positives, gamma for negatives).
@@ -49,35 +49,22 @@ class RankingService:
         pos_vecs: List[List[float]] = []
         neg_vecs: List[List[float]] = []
 
-        # Embed positive texts
-        for vid in session.positive_ids:
-            try:
-                txt = text_service.get_text(vid)
-                if not txt:
+        # Fetch all labelled texts in one query, then embed positives and negatives
+        labelled = {t.id: t for t in text_service.get_texts([*session.positive_ids, *session.negative_ids])}
+        for ids, vecs in ((session.positive_ids, pos_vecs), (session.negative_ids, neg_vecs)):
+            for vid in ids:
+                try:
+                    txt = labelled.get(vid)
+                    if not txt:
+                        continue
+                    emb_source = getattr(txt, "embedding_content", None) or getattr(txt, "display_content", None) or getattr(txt, "content", None)
+                    if not emb_source:
+                        continue
+                    vec = embedding_service.embed(emb_source)
+                    if vec:
+                        vecs.append(vec)
+                except Exception:
                     continue
-                emb_source = getattr(txt, "embedding_content", None) or getattr(txt, "display_content", None) or getattr(txt, "content", None)
-                if not emb_source:
-                    continue
-                vec = embedding_service.embed(emb_source)
-                if vec:
-                    pos_vecs.append(vec)
-            except Exception:
-                continue
-
-        # Embed negative texts
-        for vid in session.negative_ids:
-            try:
-                txt = text_service.get_text(vid)
-                if not txt:
-                    continue
-                emb_source = getattr(txt, "embedding_content", None) or getattr(txt, "display_content", None) or getattr(txt, "content", None)
-                if not emb_source:
-                    continue
-                vec = embedding_service.embed(emb_source)
-                if vec:
-                    neg_vecs.append(vec)
-            except Exception:
-                continue
 
         # Compute Rocchio-adjusted query vector
         q = np.array(q_vec, dtype=float)
@@ -0,0 +1,236 @@
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+import logging
+
+from smart_library.config import DOC_PDF_DIR
+from smart_library.domain.entities.text import Text
+from smart_library.domain.mappers.grobid_domain.snapshop_mapper import build_snapshot
+from smart_library.infrastructure.db.db import get_connection, transaction
+from smart_library.infrastructure.repositories.document_repository import DocumentRepository
+from smart_library.infrastructure.repositories.heading_repository import HeadingRepository
+from smart_library.infrastructure.repositories.relationship_repository import RelationshipRepository
+from smart_library.infrastructure.repositories.text_repository import TextRepository
+from smart_library.infrastructure.repositories.vector_repository import VectorRepository
+from smart_library.joins.paper_citations import REFERENCES, link_document
+from smart_library.utils.hashing import sha256_text
+
+# Document fields the Grobid mapper does not produce; keep the stored values.
+_PRESERVED_DOCUMENT_FIELDS = ("human_id", "citation_key", "file_hash", "source_url", "source_format", "version", "type")
+
+
+def embedding_source(text_obj) -> str:
+    """The string that gets embedded for a text (same precedence as ingestion)."""
+    return (getattr(text_obj, "embedding_content", None)
+            or getattr(text_obj, "display_content", None)
+            or getattr(text_obj, "content", "")
+            or "")
+
+
+@dataclass
+class TextDiff:
+    """Delta between the stored texts of a document and a rebuilt snapshot."""
+    keep: List[Tuple[Text, Text]] = field(default_factory=list)  # (stored, rebuilt) with equal embedding input
+    insert: List[Text] = field(default_factory=list)
+    delete: List[str] = field(default_factory=list)
+
+
+def diff_texts(stored: Iterable[Text], rebuilt: Iterable[Text]) -> TextDiff:
+    """Match rebuilt texts to stored ones by the hash of their embedding input.
+
+    Duplicated chunks are matched one-to-one in order, so two identical stored
+    chunks are only both kept if the rebuilt snapshot still has two of them.
+    """
+    by_hash = defaultdict(list)
+    for t in stored:
+        by_hash[sha256_text(embedding_source(t))].append(t)
+
+    diff = TextDiff()
+    for t in rebuilt:
+        candidates = by_hash.get(sha256_text(embedding_source(t)))
+        if candidates:
+            diff.keep.append((candidates.pop(0), t))
+        else:
+            diff.insert.append(t)
+    diff.delete = [t.id for remaining in by_hash.values() for t in remaining]
+    return diff
+
+
+@dataclass
+class ReprocessReport:
+    document_id: str
+    kept: int = 0
+    inserted: int = 0
+    deleted: int = 0
+    embedded: int = 0
+    headings: int = 0
+
+
+class ReprocessAppService:
+    """Rebuild stored documents from their PDF and write only the chunk delta.
+
+    Unchanged chunks keep their id, so their vectors are reused as-is; only new
+    chunks are embedded. All writes for one document happen in one transaction
+    on a single connection, and embeddings are computed before it starts so
+    the write lock is never held during HTTP calls.
+    """
+
+    def __init__(self, conn=None, embed_svc=None, grobid_svc=None,
+                 logger: Optional[logging.Logger] = None, debug: bool = False):
+        self.log = logger or logging.getLogger("ReprocessAppService")
+        if not self.log.handlers:
+            handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s"))
+            self.log.addHandler(handler)
+        self.log.setLevel(logging.DEBUG if debug else logging.WARNING)
+        self.conn = conn or get_connection(profile="ingest")
+        self.docs = DocumentRepository(self.conn)
+        self.headings = HeadingRepository(self.conn)
+        self.texts = TextRepository(self.conn)
+        self.vectors = VectorRepository(self.conn)
+        self.relationships = RelationshipRepository(self.conn)
+        self._embed = embed_svc
+        self._grobid = grobid_svc
+
+    @property
+    def embed(self):
+        if self._embed is None:
+            from smart_library.application.services.embedding_app_service import EmbeddingAppService
+            self._embed = EmbeddingAppService()
+        return self._embed
+
+    @property
+    def grobid(self):
+        if self._grobid is None:
+            from smart_library.infrastructure.grobid.grobid_service import GrobidService
+            self._grobid = GrobidService()
+        return self._grobid
+
+    def resolve_pdf(self, doc) -> Path:
+        """Find the PDF of a stored document: managed copy first, then its source path."""
+        candidates = [DOC_PDF_DIR / f"{doc.id}.pdf"]
+        if doc.source_path:
+            candidates.append(Path(doc.source_path))
+        for p in candidates:
+            if p.exists():
+                return p
+        raise FileNotFoundError(f"No PDF found for document {doc.id} (tried: {', '.join(str(c) for c in candidates)})")
+
+    def list_document_ids(self) -> List[str]:
+        return [row["id"] for row in self.conn.execute("SELECT id FROM document").fetchall()]
+
+    def reprocess_document(self, doc_id: str, pdf_path=None, embed: bool = True) -> ReprocessReport:
+        """Re-run Grobid and chunking for a stored document and apply the delta."""
+        doc = self.docs.get(doc_id)
+        if not doc:
+            raise ValueError(f"Document not found: {doc_id}")
+        pdf = Path(pdf_path) if pdf_path else self.resolve_pdf(doc)
+
+        struct = self.grobid.extract_fulltext(pdf)
+        return self._apply_struct(doc, struct, pdf, embed)
+
+    def _apply_struct(self, doc, struct, pdf: Path, embed: bool) -> ReprocessReport:
+        snapshot = build_snapshot(
+            struct,
+            source_path=doc.source_path or str(pdf),
+            source_url=doc.source_url,
+            file_hash=doc.file_hash,
+            document_id=doc.id,
+        )
+        return self.apply_snapshot(snapshot, stored_document=doc, embed=embed)
+
+    def reprocess_many(self, doc_ids: Iterable[str], embed: bool = True, concurrency: int = None):
+        """Re-process many documents, keeping Grobid busy with concurrent requests.
+
+        Extraction runs on the Grobid client's worker pool; mapping and the
+        database writes happen on this thread as results arrive.
+        Yields `(doc_id, ReprocessReport | None, error | None)`.
+        """
+        # Several documents may share a PDF (same source_path): extract it once, apply it to each
+        by_pdf = defaultdict(list)
+        for doc_id in doc_ids:
+            doc = self.docs.get(doc_id)
+            if not doc:
+                yield doc_id, None, ValueError(f"Document not found: {doc_id}")
+                continue
+            try:
+                by_pdf[self.resolve_pdf(doc)].append(doc)
+            except FileNotFoundError as e:
+                yield doc_id, None, e
+
+        for result in self.grobid.extract_many_xml(list(by_pdf), concurrency=concurrency):
+            for doc in by_pdf[result.path]:
+                if not result.ok:
+                    yield doc.id, None, result.error
+                    continue
+                try:
+                    struct = self.grobid.mapper.xml_to_struct(result.tei)
+                    yield doc.id, self._apply_struct(doc, struct, result.path, embed), None
+                except Exception as e:
+                    self.log.exception("Re-processing failed for %s", doc.id)
+                    yield doc.id, None, e
+
+    def apply_snapshot(self, snapshot, stored_document=None, embed: bool = True) -> ReprocessReport:
+        """Diff `snapshot` against the stored rows of its document and write the delta."""
+        doc = snapshot.document
+        if stored_document is not None:
+            for attr in _PRESERVED_DOCUMENT_FIELDS:
+                if getattr(doc, attr, None) is None:
+                    setattr(doc, attr, getattr(stored_document, attr, None))
+
+        diff = diff_texts(self.texts.list_for_document(doc.id), snapshot.texts or [])
+        remap = {}
+        for stored, rebuilt in diff.keep:
+            remap[rebuilt.id] = stored.id
+            rebuilt.id = stored.id
+            rebuilt.created_at = stored.created_at
+        relationships = snapshot.relationships or []
+        for rel in relationships:
+            rel.source_id = remap.get(rel.source_id, rel.source_id)
+            rel.target_id = remap.get(rel.target_id, rel.target_id)
+
+        vectors = []
+        if embed:
+            for t in diff.insert:
+                try:
+                    vectors.append((t.id, self.embed.embed(embedding_source(t))))
+                except Exception:
+                    self.log.exception("Embedding failed for text %s; it is stored without a vector", t.id)
+
+        headings = snapshot.headings or []
+        kept = [rebuilt for _, rebuilt in diff.keep]
+        with transaction(self.conn):
+            self.docs._update_row(doc)
+            # Old headings and deleted texts take their relationships with them (FK cascade)
+            self.headings.delete_for_parent(doc.id)
+            self.headings.add_many(headings)
+            self.texts.delete_many(diff.delete, compact=False)
+            self.relationships.delete_for_sources([t.id for t in kept])
+            self.texts.update_many(kept)
+            self.texts.add_many(diff.insert)
+            # Placement only appends: rewrite the blob without the replaced chunks, in reading order
+            self.texts.compact_blobs([doc.id])
+            self.vectors.add_many(vectors)
+            self.relationships.add_many(relationships)
+            # Rebuild this document's outgoing citation edges from the new bibliography
+            self.relationships.delete_for_sources([doc.id], REFERENCES)
+            link_document(self.conn, doc.id)
+
+        report = ReprocessReport(
+            document_id=doc.id,
+            kept=len(diff.keep),
+            inserted=len(diff.insert),
+            deleted=len(diff.delete),
+            embedded=len(vectors),
+            headings=len(headings),
+        )
+        self.log.info("Reprocessed %s: kept=%d inserted=%d deleted=%d embedded=%d",
+                      doc.id, report.kept, report.inserted, report.deleted, report.embedded)
+        return report
+
+    def close(self):
+        try:
+            self.conn.close()
+        except Exception:
+            pass
@@ -1,22 +1,222 @@
 
-from smart_library.infrastructure.embeddings.embedding_service import EmbeddingService
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from smart_library.config import SearchConfig
 from smart_library.application.services.vector_service import VectorService
 from smart_library.application.services.text_app_service import TextAppService
+from smart_library.infrastructure.repositories.relationship_repository import RelationshipRepository
+from smart_library.infrastructure.repositories.fts_repository import FullTextRepository, to_match_query
+from smart_library.application.models.search_response import HybridSearchResult
+from smart_library.application.services.fusion import FUSION_METHODS, fuse
+
+log = logging.getLogger(__name__)
+
+# Shared by all SearchService instances: runs the vector side of hybrid searches
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _search_executor():
+	global _executor
+	with _executor_lock:
+		if _executor is None:
+			_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="hybrid-search")
+		return _executor
+
 
 class SearchService:
-	def __init__(self, embedding_service=None, vector_service=None, text_service=None):
-		self.embedding_service = embedding_service or EmbeddingService()
+	def __init__(self, embedding_service=None, vector_service=None, text_service=None, relationship_repo=None,
+				 fulltext_repo=None):
+		self._embedding_service = embedding_service
 		self.vector_service = vector_service or VectorService()
 		self.text_service = text_service or TextAppService()
+		self._relationship_repo = relationship_repo
+		self._fulltext_repo = fulltext_repo
+
+	@property
+	def embedding_service(self):
+		# Created on first use: keyword search never loads the embedding model
+		if self._embedding_service is None:
+			from smart_library.infrastructure.embeddings.embedding_service import EmbeddingService
+			self._embedding_service = EmbeddingService()
+		return self._embedding_service
+
+	@embedding_service.setter
+	def embedding_service(self, value):
+		self._embedding_service = value
 
-	def similarity_search(self, text, top_k=10):
+	@property
+	def fulltext_repo(self):
+		if self._fulltext_repo is None:
+			self._fulltext_repo = FullTextRepository(self.text_service.repo.conn)
+		return self._fulltext_repo
+
+	@property
+	def relationship_repo(self):
+		if self._relationship_repo is None:
+			self._relationship_repo = RelationshipRepository(self.text_service.repo.conn)
+		return self._relationship_repo
+
+	def similarity_search(self, text, top_k=10, doc_ids=None, year_from=None, year_to=None):
 		"""
 		1. Embed the input text to a vector
 		2. Perform vector similarity search
-		Returns: list of similar vectors (with ids and scores)
+		Returns: list of similar vectors (with ids and scores), only live texts
+		inside the document/year filters
 		"""
 		embedding = self.embedding_service.embed(text)
-		return self.vector_service.search_similar_vectors(embedding, top_k=top_k)
+		return self.live_similar(embedding, top_k=top_k, doc_ids=doc_ids, year_from=year_from, year_to=year_to)
+
+	def live_similar(self, embedding, top_k=10, doc_ids=None, year_from=None, year_to=None):
+		"""
+		The `top_k` nearest vectors of live texts inside the document/year
+		filters. The vector index cannot filter, so hits of tombstoned or
+		filtered-out documents (and orphaned vectors) are dropped here and more
+		candidates are fetched until `top_k` remain or the index is exhausted.
+		"""
+		filters = dict(doc_ids=doc_ids, year_from=year_from, year_to=year_to)
+		filtered = any(v is not None for v in filters.values())
+		if doc_ids is not None and not list(doc_ids):
+			return []
+		fetch = top_k
+		while True:
+			hits = self.vector_service.search_similar_vectors(embedding, top_k=fetch)
+			live = self.existing_ids([h["id"] for h in hits]) if hits else set()
+			results = [h for h in hits if h["id"] in live]
+			if filtered and results:
+				results = self._filter_hits(results, **filters)
+			if len(results) >= top_k or len(hits) < fetch:
+				return results[:top_k]
+			fetch *= 2
+
+	def keyword_search(self, query, top_k=10, doc_ids=None, year_from=None, year_to=None,
+					   heading_weight=0.5, raw=False):
+		"""
+		BM25 keyword search over the FTS5 indexes; no embedding call.
+		`query` is free text ("quoted phrases" stay phrases, `word*` is a
+		prefix, every part is required) or FTS5 syntax with `raw=True`.
+		A text scores its own BM25 plus `heading_weight` times the BM25 of its
+		heading title. `doc_ids` and `year_from`/`year_to` restrict the
+		documents searched.
+		Returns: [{"id", "score", "document_id", "year", "snippet", "highlights",
+		"heading", "heading_highlights"}], best first; `highlights` are
+		(start, end) offsets into the text content.
+		Blob-mode texts are searched in blob_text_fts (see 0010_blob_text_fts.sql).
+		"""
+		match = query if raw else to_match_query(query)
+		if not match:
+			return []
+		pool = max(top_k * 4, 50)
+		filters = dict(doc_ids=doc_ids, year_from=year_from, year_to=year_to)
+		hits = {}
+		for hit in self.fulltext_repo.search_texts(match, limit=pool, **filters):
+			hits[hit["id"]] = {**hit, "heading": None, "heading_highlights": []}
+		if heading_weight:
+			for hit in self.fulltext_repo.search_headings(match, limit=pool, **filters):
+				entry = hits.setdefault(hit["id"], {**hit, "score": 0.0, "snippet": None, "highlights": []})
+				entry["score"] += heading_weight * hit["score"]
+				entry["heading"], entry["heading_highlights"] = hit["heading"], hit["heading_highlights"]
+		return sorted(hits.values(), key=lambda h: h["score"], reverse=True)[:top_k]
+
+	def hybrid_search(self, query, top_k=10, fusion=None, weights=None, rrf_k=None, candidates=None,
+					  doc_ids=None, year_from=None, year_to=None):
+		"""
+		Run keyword (BM25) and vector retrieval concurrently, then fuse both
+		candidate lists into one ranking with reciprocal rank fusion ("rrf")
+		or min-max normalised weighted scores ("weighted").
+		`weights` maps "lexical"/"vector" to fusion weights; defaults, `rrf_k`
+		and the per-source `candidates` come from `SearchConfig`. Filters
+		apply to both sources. If one source fails the other still answers
+		(the failure is in `errors`).
+		Returns: HybridSearchResult with results [{"id", "score", "sources"
+		({source: rank}), "cosine_similarity", "bm25", "snippet", "highlights",
+		"heading"}] and `timings_ms` for "lexical", "vector", "fusion", "total".
+		"""
+		fusion = fusion or SearchConfig.FUSION
+		if fusion not in FUSION_METHODS:
+			raise ValueError(f"Unknown fusion method {fusion!r}; expected one of: {', '.join(FUSION_METHODS)}")
+		weights = {"lexical": SearchConfig.LEXICAL_WEIGHT, "vector": SearchConfig.VECTOR_WEIGHT, **(weights or {})}
+		candidates = max(candidates or SearchConfig.CANDIDATES, top_k)
+		filters = dict(doc_ids=doc_ids, year_from=year_from, year_to=year_to)
+		out = HybridSearchResult()
+
+		def timed(source, fn):
+			t0 = time.perf_counter()
+			try:
+				return fn()
+			except Exception as e:
+				log.warning("Hybrid search: %s retrieval failed: %s", source, e)
+				out.errors[source] = str(e)
+				return []
+			finally:
+				out.timings_ms[source] = (time.perf_counter() - t0) * 1000
+
+		start = time.perf_counter()
+		vector_future = _search_executor().submit(
+			timed, "vector", lambda: self.similarity_search(query, top_k=candidates, **filters))
+		lexical = timed("lexical", lambda: self.keyword_search(query, top_k=candidates, **filters))
+		vector = vector_future.result()
+		if len(out.errors) == 2:
+			raise RuntimeError(f"Hybrid search failed: {out.errors}")
+
+		t0 = time.perf_counter()
+		rankings = {
+			"lexical": [(h["id"], h["score"]) for h in lexical],
+			"vector": [(v["id"], v.get("cosine_similarity") or 0.0) for v in vector],
+		}
+		fused = fuse(rankings, fusion, weights, k=rrf_k or SearchConfig.RRF_K)[:top_k]
+		lexical_by_id = {h["id"]: h for h in lexical}
+		vector_by_id = {v["id"]: v for v in vector}
+		ranks = {source: {doc_id: rank for rank, (doc_id, _) in enumerate(ranking, start=1)}
+				 for source, ranking in rankings.items()}
+		for doc_id, score in fused:
+			lex = lexical_by_id.get(doc_id, {})
+			out.results.append({
+				"id": doc_id,
+				"score": score,
+				"sources": {source: r[doc_id] for source, r in ranks.items() if doc_id in r},
+				"cosine_similarity": vector_by_id.get(doc_id, {}).get("cosine_similarity"),
+				"bm25": lex.get("score"),
+				"snippet": lex.get("snippet"),
+				"highlights": lex.get("highlights") or [],
+				"heading": lex.get("heading"),
+			})
+		out.timings_ms["fusion"] = (time.perf_counter() - t0) * 1000
+		out.timings_ms["total"] = (time.perf_counter() - start) * 1000
+		return out
+
+	def _filter_hits(self, hits, doc_ids=None, year_from=None, year_to=None):
+		"""`hits` whose text lies inside the document/year filters (the vector index cannot filter)."""
+		allowed = self.fulltext_repo.filter_texts([h["id"] for h in hits], doc_ids=doc_ids,
+												  year_from=year_from, year_to=year_to)
+		return [h for h in hits if h["id"] in allowed]
+
+	def existing_ids(self, text_ids):
+		"""
+		The subset of `text_ids` that still exist (hits can outlive deleted texts
+		in the vector index) and whose document is not tombstoned.
+		"""
+		found = {t.id for t in self.text_service.get_text_views(text_ids, columns=("id",))}
+		return found - self.fulltext_repo.deleted_texts(found) if found else found
+
+	def expand_context(self, text_ids, window=None):
+		"""
+		Resolve the heading and neighbouring texts for a batch of search hits.
+		Uses the indexed relationship table (one query per batch of ids) instead
+		of looking up each hit's metadata.
+		`window` limits siblings to that many texts before/after each hit.
+		Returns: {text_id: {"heading_id", "heading_title", "heading_index", "siblings"}}
+		"""
+		context = self.relationship_repo.heading_context(text_ids)
+		if window is not None:
+			for tid, entry in context.items():
+				siblings = entry["siblings"]
+				pos = siblings.index(tid) if tid in siblings else 0
+				entry["siblings"] = siblings[max(0, pos - window):pos + window + 1]
+		return context
 
 	def cleanup_orphaned_vectors(self):
 		"""
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 
 from smart_library.infrastructure.repositories.text_repository import TextRepository
 from smart_library.domain.entities.text import Text
@@ -14,6 +14,14 @@ class TextAppService:
     def get_text(self, text_id: str) -> Optional[Text]:
         return self.repo.get(text_id)
 
+    def get_texts(self, text_ids) -> List[Text]:
+        """Texts for `text_ids` in the given order, in one query; missing ids are skipped."""
+        return self.repo.get_many(text_ids)
+
+    def get_text_views(self, text_ids, columns=None):
+        """Read-only row views for `text_ids` (only `columns` when given); cheaper than `get_texts`."""
+        return self.repo.get_views(text_ids, columns=columns)
+
     def update_text(self, txt: Text) -> None:
         return self.repo.update(txt)
 
@@ -6,6 +6,7 @@ from smart_library.cli.main import app
 def add(
     path: str = Argument(..., help="Path to the PDF file to ingest"),
     debug: bool = Option(False, "--debug", help="Enable debug output"),
+    collection: str = Option(None, "--collection", "-c", help="Sharded library: store in this collection's shard"),
 ):
     """Ingest a PDF file using Grobid and persist canonical objects (always embed)."""
     # Use the high-level IngestionAppService which runs Grobid -> snapshot -> persist
@@ -18,7 +19,7 @@ def add(
     svc = IngestionAppService(debug=debug)
     try:
         # Always create embeddings/vectors for every text entity
-        doc_id = svc.ingest_from_grobid(path, embed=True, source_path=path)
+        doc_id = svc.ingest_from_grobid(path, embed=True, source_path=path, collection=collection)
         echo(f"Document ingested successfully. Document ID: {doc_id}")
     except Exception as e:
         echo(f"Ingestion failed: {e}")
@@ -0,0 +1,53 @@
+"""CLI commands to inspect and prune the Grobid TEI cache."""
+from datetime import datetime
+from typing import Optional
+
+from typer import Option, Typer, echo
+from smart_library.cli.main import app
+from smart_library.infrastructure.grobid.tei_cache import TeiCache
+
+cache_app = Typer(help="Inspect and prune the Grobid TEI cache")
+app.add_typer(cache_app, name="cache")
+
+
+def _fmt_bytes(n: int) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024 or unit == "GB":
+            return f"{n:.1f} {unit}" if unit != "B" else f"{n} B"
+        n /= 1024
+
+
+def _fmt_time(ts) -> str:
+    return datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M") if ts else "-"
+
+
+@cache_app.command("info")
+def cache_info(
+    entries: bool = Option(False, "--entries", help="List individual entries (least recently used first)"),
+):
+    """Show location, size and age of the TEI cache."""
+    cache = TeiCache()
+    s = cache.stats()
+    echo(f"Location:  {s['root']}")
+    echo(f"Entries:   {s['entries']}")
+    echo(f"Size:      {_fmt_bytes(s['bytes'])} of {_fmt_bytes(s['max_bytes'])}")
+    echo(f"Last used: {_fmt_time(s['oldest'])} .. {_fmt_time(s['newest'])}")
+    if entries:
+        for e in cache.entries():
+            echo(f"  {e.key[:16]}  {_fmt_bytes(e.size):>10}  {_fmt_time(e.last_used)}")
+
+
+@cache_app.command("prune")
+def cache_prune(
+    max_mb: Optional[float] = Option(None, "--max-mb", help="Evict least recently used entries until below this size"),
+    older_than_days: Optional[float] = Option(None, "--older-than", help="Evict entries unused for this many days"),
+    all_entries: bool = Option(False, "--all", help="Remove every entry"),
+):
+    """Evict cache entries (defaults to enforcing the configured size cap)."""
+    cache = TeiCache()
+    if all_entries:
+        removed = cache.clear()
+    else:
+        max_bytes = int(max_mb * 1024 * 1024) if max_mb is not None else cache.max_bytes
+        removed = cache.prune(max_bytes=max_bytes, older_than_days=older_than_days)
+    echo(f"✓ Removed {removed} cache entr{'y' if removed == 1 else 'ies'}")
@@ -1,9 +1,9 @@
-"""CLI command to clean up orphaned vectors."""
+"""CLI commands to clean up orphaned vectors and purge deleted documents."""
 from typer import Typer
 from smart_library.cli.main import app
 from smart_library.infrastructure.repositories.vector_repository import VectorRepository
 
-cleanup_app = Typer(help="Clean up orphaned vectors")
+cleanup_app = Typer(help="Clean up orphaned vectors and deleted documents")
 app.add_typer(cleanup_app, name="cleanup")
 
 
@@ -30,3 +30,22 @@ def cleanup_vectors():
         import traceback
         traceback.print_exc()
         return 1
+
+
+@cleanup_app.command("purge")
+def cleanup_purge():
+    """
+    Purge documents deleted through the API whose background purge has not
+    finished (e.g. the server stopped first): rows, vectors and PDFs.
+    """
+    from smart_library.application.services.purge_service import PurgeWorker
+    from smart_library.infrastructure.repositories.document_repository import DocumentRepository
+
+    repo = DocumentRepository()
+    pending = repo.count_tombstoned()
+    if not pending:
+        print("✓ No deleted documents awaiting purge")
+        return 0
+    purged = PurgeWorker(execute=lambda fn: fn(repo.conn), pause=0).purge_pending()
+    print(f"✓ Purged {purged} of {pending} deleted document(s)")
+    return 0 if purged == pending else 1
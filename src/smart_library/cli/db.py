@@ -0,0 +1,144 @@
+"""CLI commands to inspect and apply database schema migrations."""
+from typing import Optional
+
+from typer import Exit, Option, Typer, echo
+from smart_library.cli.main import app
+
+db_app = Typer(help="Inspect and apply database schema migrations")
+app.add_typer(db_app, name="db")
+
+
+@db_app.command("status")
+def db_status():
+    """Show the schema version and pending migrations."""
+    from smart_library.config import DB_PATH
+    from smart_library.infrastructure.db.db import get_connection
+    from smart_library.infrastructure.db.migrations import current_version, discover, pending
+
+    conn = get_connection()
+    try:
+        version = current_version(conn)
+        todo = pending(conn)
+    finally:
+        conn.close()
+    available = discover()
+    echo(f"Database: {DB_PATH}")
+    echo(f"Version:  {version} (latest {available[-1].version if available else 0})")
+    if not todo:
+        echo("Up to date.")
+    for m in todo:
+        echo(f"  pending  {m.path.name}{'  [destructive]' if m.destructive_statements() else ''}")
+
+
+@db_app.command("migrate")
+def db_migrate(
+    target: Optional[int] = Option(None, "--target", help="Stop after this version (default: latest)"),
+    allow_destructive: bool = Option(False, "--allow-destructive", help="Apply DROP/DELETE migrations on a non-empty database"),
+):
+    """Apply pending migrations, each in its own transaction."""
+    from smart_library.infrastructure.db.db import get_connection
+    from smart_library.infrastructure.db.migrations import MigrationError, current_version, migrate
+
+    def _report(applied):
+        echo(f"  {applied.version:04d}_{applied.name}: {applied.statements} statements in {applied.seconds * 1e3:.1f} ms")
+        for reason in applied.skipped:
+            echo(f"    skipped: {reason.splitlines()[0]}")
+
+    conn = get_connection()
+    try:
+        start = current_version(conn)
+        applied = migrate(conn, target=target, allow_destructive=allow_destructive, on_applied=_report)
+        if applied:
+            echo(f"Migrated from version {start} to {current_version(conn)} "
+                 f"in {sum(a.seconds for a in applied):.2f}s.")
+        else:
+            echo(f"Already at version {start}; nothing to do.")
+    except MigrationError as e:
+        echo(f"Migration failed: {e}", err=True)
+        raise Exit(1)
+    finally:
+        conn.close()
+
+
+@db_app.command("citations")
+def db_citations(
+    rebuild: bool = Option(False, "--rebuild", help="Rebuild the citation keys and every citation edge"),
+):
+    """Show the citation index; --rebuild fills it for libraries migrated to version 9."""
+    from smart_library.infrastructure.db.db import get_connection, transaction
+    from smart_library.joins.paper_citations import rebuild_citation_index
+
+    conn = get_connection()
+    try:
+        if rebuild:
+            with transaction(conn):
+                edges = rebuild_citation_index(conn)
+            echo(f"Rebuilt citation index: {edges} resolved citations.")
+        keys, refs, unresolved = conn.execute(
+            "SELECT (SELECT COUNT(*) FROM citation_key), (SELECT COUNT(*) FROM citation_ref), "
+            "(SELECT COUNT(*) FROM citation_ref WHERE target_id IS NULL)"
+        ).fetchone()
+        echo(f"Document keys:         {keys}")
+        echo(f"Bibliography entries:  {refs} ({unresolved} unresolved)")
+    finally:
+        conn.close()
+
+
+@db_app.command("fts")
+def db_fts(
+    rebuild: bool = Option(False, "--rebuild", help="Re-index every text and heading"),
+):
+    """Show the keyword-search index sizes; --rebuild indexes blob-mode texts stored before version 10."""
+    from smart_library.infrastructure.db.db import get_connection, transaction
+    from smart_library.infrastructure.repositories.fts_repository import FullTextRepository
+
+    conn = get_connection()
+    try:
+        fts = FullTextRepository(conn)
+        if not fts.available():
+            echo("Keyword search is not available (SQLite built without FTS5).")
+            raise Exit(1)
+        if rebuild:
+            with transaction(conn):
+                fts.rebuild()
+            echo("Rebuilt keyword-search indexes.")
+        texts, blob_texts = conn.execute(
+            "SELECT (SELECT COUNT(*) FROM text_entity WHERE blob_id IS NULL), "
+            "(SELECT COUNT(*) FROM text_entity WHERE blob_id IS NOT NULL)"
+        ).fetchone()
+        indexed = conn.execute("SELECT COUNT(*) FROM blob_text_fts").fetchone()[0] if blob_texts else 0
+        echo(f"Inline texts:      {texts}")
+        echo(f"Blob-mode texts:   {blob_texts} ({indexed} indexed)")
+    finally:
+        conn.close()
+
+
+@db_app.command("changes")
+def db_changes(
+    compact: bool = Option(False, "--compact",
+                           help="Delete changes every consumer has applied (all changes when there are no consumers)"),
+):
+    """
+    Show the change log position and how far each consumer lags behind.
+
+    The log is kept until it is compacted: `--compact` deletes what the
+    slowest consumer has applied, or the whole log when no consumer is
+    registered (a new consumer builds from the tables, not from the log).
+    """
+    from smart_library.infrastructure.db.db import get_connection
+    from smart_library.infrastructure.repositories.change_log_repository import ChangeLogRepository
+
+    conn = get_connection()
+    try:
+        log = ChangeLogRepository(conn)
+        if compact:
+            echo(f"Compacted {log.compact()} changes.")
+        latest = log.latest_seq()
+        echo(f"Latest change: {latest}")
+        checkpoints = log.checkpoints()
+        if not checkpoints:
+            echo("No consumers: --compact deletes the whole log.")
+        for consumer, seq in checkpoints.items():
+            echo(f"  {consumer:<24} at {seq:>10}  ({latest - seq} behind)")
+    finally:
+        conn.close()
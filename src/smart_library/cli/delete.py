@@ -11,19 +11,12 @@ def delete(
     Delete a document, page, text, or term by ID.
     """
     service = ListingService()
-    if service.repo_doc.get(entity_id):
-        service.repo_doc.delete(entity_id)
-        # Also delete the associated PDF file if it exists
-        try:
-            from smart_library.config import DOC_PDF_DIR
-            pdf_path = DOC_PDF_DIR / f"{entity_id}.pdf"
-            if pdf_path.exists():
-                pdf_path.unlink()
-                echo(f"Document {entity_id} deleted (including PDF).")
-            else:
-                echo(f"Document {entity_id} deleted.")
-        except Exception as e:
-            echo(f"Document {entity_id} deleted, but failed to delete PDF: {e}")
+    if service.repo_doc.tombstone(entity_id):
+        # Same path as the API, but purged right away: rows, vectors and PDF in batches
+        from smart_library.application.services.purge_service import PurgeWorker
+        conn = service.repo_doc.conn
+        deleted = PurgeWorker(execute=lambda fn: fn(conn), pause=0).purge_document(entity_id)
+        echo(f"Document {entity_id} deleted ({deleted} entities, PDF removed if stored).")
         return
     if service.repo_page.get(entity_id):
         service.repo_page.delete(entity_id)
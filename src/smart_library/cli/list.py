@@ -1,18 +1,22 @@
 # src/smart_library/cli/list.py
-from typer import Argument, echo
+from typer import Argument, Option, echo
 from smart_library.application.services.list_service import ListingService
 from smart_library.cli.main import app
 
 @app.command(name="list")
 def list(
     what: str = Argument(None, help="What to list: doc, page, text, term, entities"),
-    parent_id: str = Argument(None, help="Parent ID (for page, text, term, entities)")
+    parent_id: str = Argument(None, help="Parent ID (for page, text, term, entities)"),
+    limit: int = Option(50, "--limit", "-n", help="Documents per page (doc)"),
+    cursor: str = Option(None, "--cursor", help="Continue after a previous page (doc)"),
+    order: str = Option("created", "--order", help="Document order: created, title or year (doc)"),
+    desc: bool = Option(False, "--desc", help="Reverse the document order (doc)"),
 ):
     """
     List documents, pages, texts, terms, or all entities.
     Usage:
       smartlib list
-      smartlib list doc
+      smartlib list doc [--limit N] [--order title] [--cursor <next cursor>]
       smartlib list page <document_id>
       smartlib list text <page_id>
       smartlib list term <document_id>
@@ -40,13 +44,22 @@ def list(
         return
 
     if what == "doc":
-        docs = service.list_documents()
-        if not docs:
+        try:
+            page = service.page_documents(limit=limit, cursor=cursor, order=order, descending=desc,
+                                          columns=("human_id", "citation_key", "title", "doi"))
+        except ValueError as e:
+            echo(f"Error: {e}", err=True)
+            raise SystemExit(1)
+        if not page.items:
             echo("No documents found.")
             return
-        for doc in docs:
+        for doc in page.items:
             display_id = getattr(doc, "human_id", None) or getattr(doc, "citation_key", None) or doc.id
             echo(f"{display_id} | {getattr(doc, 'title', '')} | {getattr(doc, 'doi', '')}")
+        echo(f"-- {len(page.items)} of {page.total} documents")
+        if page.next_cursor:
+            echo(f"-- next page: smartlib list doc --order {order}{' --desc' if desc else ''} "
+                 f"--limit {limit} --cursor {page.next_cursor}")
     elif what == "page":
         if not parent_id:
             echo("Please provide a document ID for listing pages.")
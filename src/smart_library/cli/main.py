@@ -14,6 +14,11 @@ importlib.import_module("smart_library.cli.show")
 importlib.import_module("smart_library.cli.initialize")
 importlib.import_module("smart_library.cli.search")
 importlib.import_module("smart_library.cli.cleanup")
+importlib.import_module("smart_library.cli.reprocess")
+importlib.import_module("smart_library.cli.cache")
+importlib.import_module("smart_library.cli.db")
+importlib.import_module("smart_library.cli.transfer")
+importlib.import_module("smart_library.cli.shard")
 
 if __name__ == "__main__":
     try:
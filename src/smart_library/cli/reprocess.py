@@ -0,0 +1,45 @@
+from typing import Optional
+
+from typer import Argument, Option, echo
+from smart_library.cli.main import app
+
+
+@app.command(name="reprocess")
+def reprocess(
+    doc_id: Optional[str] = Argument(None, help="ID of the document to re-process"),
+    all_docs: bool = Option(False, "--all", help="Re-process every document in the library"),
+    pdf: Optional[str] = Option(None, "--pdf", help="PDF to use instead of the stored copy"),
+    no_embed: bool = Option(False, "--no-embed", help="Do not embed new chunks"),
+    debug: bool = Option(False, "--debug", help="Enable debug output"),
+):
+    """Re-run Grobid and chunking for stored documents, re-embedding only changed chunks."""
+    from smart_library.application.services.reprocess_app_service import ReprocessAppService
+
+    if not doc_id and not all_docs:
+        echo("Give a document ID or --all.")
+        raise SystemExit(1)
+
+    svc = ReprocessAppService(debug=debug)
+    try:
+        failed = 0
+        if all_docs:
+            for did, r, err in svc.reprocess_many(svc.list_document_ids(), embed=not no_embed):
+                if err is not None:
+                    failed += 1
+                    echo(f"{did}: re-processing failed: {err}")
+                else:
+                    echo(f"{did}: kept {r.kept}, inserted {r.inserted}, deleted {r.deleted}, embedded {r.embedded}")
+            m = svc.grobid.client.metrics.snapshot()
+            echo(f"Grobid: {m['succeeded']} ok, {m['failed']} failed, {m['retries']} retries "
+                 f"({m['busy_responses']} busy), {m['docs_per_minute']:.1f} docs/min")
+        else:
+            try:
+                r = svc.reprocess_document(doc_id, pdf_path=pdf, embed=not no_embed)
+                echo(f"{doc_id}: kept {r.kept}, inserted {r.inserted}, deleted {r.deleted}, embedded {r.embedded}")
+            except Exception as e:
+                failed += 1
+                echo(f"{doc_id}: re-processing failed: {e}")
+        if failed:
+            raise SystemExit(1)
+    finally:
+        svc.close()
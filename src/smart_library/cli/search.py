@@ -1,4 +1,4 @@
-from typer import Argument, echo
+from typer import Argument, Option, echo
 from smart_library.application.services.search_service import SearchService
 from smart_library.application.models.search_response import SearchResponse, SearchResult, SearchSession
 from smart_library.application.services.text_app_service import TextAppService
@@ -37,6 +37,13 @@ def _load_session() -> SearchSession:
 def search(
     query: str = Argument(..., help="Text to search for"),
     batch_size: int = Argument(10, help="Number of results to show"),
+    mode: str = Option("vector", "--mode", "-m", help="vector (embedding similarity), keyword (BM25 full-text) or hybrid (both, fused)"),
+    doc: List[str] = Option(None, "--doc", help="Keyword/hybrid mode: only search this document id (repeatable)"),
+    year_from: int = Option(None, "--from", help="Keyword/hybrid mode: earliest publication year"),
+    year_to: int = Option(None, "--to", help="Keyword/hybrid mode: latest publication year"),
+    fusion: str = Option(None, "--fusion", help="Hybrid mode: rrf (reciprocal rank fusion) or weighted (normalised scores)"),
+    lexical_weight: float = Option(None, "--lexical-weight", help="Hybrid mode: weight of the keyword ranking"),
+    vector_weight: float = Option(None, "--vector-weight", help="Hybrid mode: weight of the vector ranking"),
 ):
     """
     Run a similarity search for `query` and show matching text ids and scores.
@@ -44,7 +51,13 @@ def search(
     Examples:
         smartlib search "xr is useful"    - Search, show first 10 results
         smartlib search "xr is useful" 20 - Search, show first 20 results
+        smartlib search '"GSE12345" BRCA1' --mode keyword --from 2015 - Exact terms, no embedding
+        smartlib search "xr for surgery" -m hybrid --fusion weighted - Keyword and vector hits fused
     """
+    if mode not in ("vector", "keyword", "hybrid"):
+        echo(f"Unknown search mode: {mode}. Use vector, keyword or hybrid.")
+        return []
+    timings = None
     session = _load_session()
     
     # If the query changed, reset labels, offset, and results but keep the new query
@@ -57,15 +70,43 @@ def search(
     # If same query, preserve labels and results (allows continued refinement)
 
     try:
-        ranker = RankingService()
-        response = ranker.rerank_from_session(
-            session=session,
-            embedding_service=SearchService().embedding_service,
-            text_service=TextAppService(),
-            vector_service=SearchService().vector_service,
-            top_k=batch_size,
-        )
+        if mode == "hybrid":
+            weights = {}
+            if lexical_weight is not None:
+                weights["lexical"] = lexical_weight
+            if vector_weight is not None:
+                weights["vector"] = vector_weight
+            hybrid = SearchService().hybrid_search(query, top_k=batch_size, fusion=fusion, weights=weights,
+                                                   doc_ids=doc or None, year_from=year_from, year_to=year_to)
+            timings = hybrid.timings_ms
+            for source, error in hybrid.errors.items():
+                echo(f"Warning: {source} search failed, showing the other source only: {error}")
+            response = SearchResponse(query=query)
+            for i, h in enumerate(hybrid.results, start=1):
+                response.results.append(SearchResult(rank=i, id=h["id"], score=h["score"],
+                                                     is_positive=h["id"] in session.positive_ids,
+                                                     is_negative=h["id"] in session.negative_ids))
+        elif mode == "keyword":
+            hits = SearchService().keyword_search(query, top_k=batch_size, doc_ids=doc or None,
+                                                  year_from=year_from, year_to=year_to)
+            response = SearchResponse(query=query)
+            for i, h in enumerate(hits, start=1):
+                response.results.append(SearchResult(rank=i, id=h["id"], score=h["score"],
+                                                     is_positive=h["id"] in session.positive_ids,
+                                                     is_negative=h["id"] in session.negative_ids))
+        else:
+            ranker = RankingService()
+            response = ranker.rerank_from_session(
+                session=session,
+                embedding_service=SearchService().embedding_service,
+                text_service=TextAppService(),
+                vector_service=SearchService().vector_service,
+                top_k=batch_size,
+            )
     except Exception as e:
+        if mode != "vector":
+            echo(f"Search failed: {e}")
+            return []
         # fallback to basic similarity search if ranking fails
         try:
             svc = SearchService()
@@ -112,6 +153,9 @@ def search(
         # fallback: print minimal numbered results
         for res in response.results:
             echo(f"{res.rank}: {res.id} | score={res.score:.4f}")
+
+    if timings:
+        echo("Latency: " + ", ".join(f"{name} {ms:.1f} ms" for name, ms in timings.items()))
     
     return [{"id": r.id, "score": r.score} for r in response.results]
 
@@ -0,0 +1,109 @@
+"""CLI commands to manage library shards and search across them."""
+from pathlib import Path
+from typing import List, Optional
+
+from typer import Argument, Exit, Option, Typer, echo
+from smart_library.cli.main import app
+
+shard_app = Typer(help="Manage library shards (separate databases searched together)")
+app.add_typer(shard_app, name="shard")
+
+
+@shard_app.command("list")
+def shard_list():
+    """Show the shards with their collection, document count and database file."""
+    from smart_library.infrastructure.db.db import get_connection
+    from smart_library.infrastructure.db.shards import ShardCatalog
+
+    catalog = ShardCatalog()
+    echo(f"Catalog: {catalog.path}{'' if catalog.path.exists() else ' (not created: single database)'}")
+    for shard in catalog.shards:
+        documents = "-"
+        if shard.path.exists():
+            conn = get_connection(shard.path)
+            try:
+                documents = conn.execute("SELECT COUNT(*) FROM document").fetchone()[0]
+            finally:
+                conn.close()
+        echo(f"  {shard.name:<16} {shard.collection or '(hash pool)':<20} {documents:>8} docs  {shard.path}")
+
+
+@shard_app.command("add")
+def shard_add(
+    name: str = Argument(..., help="Shard name (lowercase letters, digits, '-' and '_')"),
+    collection: Optional[str] = Option(None, "--collection", "-c", help="Hold only this collection (default: join the hash pool)"),
+    path: Optional[Path] = Option(None, "--path", help="Database file (default: next to the catalog, shards/<name>.db)"),
+):
+    """Register a shard and create its database."""
+    from smart_library.infrastructure.db.db import init_db
+    from smart_library.infrastructure.db.shards import ShardCatalog
+
+    catalog = ShardCatalog()
+    try:
+        shard = catalog.add(name, path=path, collection=collection)
+    except ValueError as e:
+        echo(f"Cannot add shard: {e}", err=True)
+        raise Exit(1)
+    shard.path.parent.mkdir(parents=True, exist_ok=True)
+    if not shard.path.exists():
+        init_db(shard.path)
+    echo(f"Shard {shard.name} ready at {shard.path}"
+         + (f" for collection {collection!r}." if collection else " (hash pool)."))
+
+
+@shard_app.command("remove")
+def shard_remove(name: str = Argument(..., help="Shard to unregister (its database file is kept)")):
+    """Unregister a shard; its documents are no longer searched or written."""
+    from smart_library.infrastructure.db.shards import ShardCatalog
+
+    try:
+        shard = ShardCatalog().remove(name)
+    except (KeyError, ValueError) as e:
+        echo(f"Cannot remove shard: {e}", err=True)
+        raise Exit(1)
+    echo(f"Removed shard {shard.name}; database kept at {shard.path}")
+
+
+@shard_app.command("search")
+def shard_search(
+    query: str = Argument(..., help="Text to search for"),
+    top_k: int = Argument(10, help="Number of results to show"),
+    mode: str = Option("vector", "--mode", "-m", help="vector, keyword or hybrid"),
+    shard: List[str] = Option(None, "--shard", "-s", help="Only search this shard (repeatable)"),
+    collection: List[str] = Option(None, "--collection", "-c", help="Only search shards of this collection (repeatable)"),
+    year_from: int = Option(None, "--from", help="Keyword/hybrid mode: earliest publication year"),
+    year_to: int = Option(None, "--to", help="Keyword/hybrid mode: latest publication year"),
+):
+    """
+    Search all shards in parallel and show the merged top results.
+
+    Examples:
+        smartlib shard search "xr for surgery"
+        smartlib shard search '"GSE12345"' -m keyword -c genomics --from 2015
+    """
+    from smart_library.application.services.federated_search_service import FederatedSearchService
+
+    if mode not in ("vector", "keyword", "hybrid"):
+        echo(f"Unknown search mode: {mode}. Use vector, keyword or hybrid.")
+        raise Exit(1)
+    svc = FederatedSearchService(shards=shard or None, collections=collection or None)
+    filters = dict(year_from=year_from, year_to=year_to)
+    try:
+        if mode == "keyword":
+            hits = svc.keyword_search(query, top_k=top_k, **filters)
+        elif mode == "hybrid":
+            hits = svc.hybrid_search(query, top_k=top_k, **filters).results
+        else:
+            hits = svc.similarity_search(query, top_k=top_k)
+    except (ValueError, RuntimeError) as e:
+        echo(f"Search failed: {e}", err=True)
+        raise Exit(1)
+
+    for name, error in svc.errors.items():
+        echo(f"Warning: shard {name} failed: {error}")
+    if not hits:
+        echo("No results found.")
+        return
+    for rank, hit in enumerate(hits, start=1):
+        score = hit.get("cosine_similarity") if mode == "vector" else hit.get("score")
+        echo(f"{rank}: {hit['id']} | score={score or 0.0:.4f} | shard={hit.get('shard', '?')}")
@@ -0,0 +1,82 @@
+"""CLI commands to export a library to a directory and import it into another one."""
+from pathlib import Path
+
+from typer import Argument, Exit, Option, echo
+from smart_library.cli.main import app
+
+
+def _progress():
+    last = {}
+
+    def report(name: str, count: int):
+        # One line per 100k rows is enough to see a multi-million row transfer moving
+        if count // 100_000 > last.get(name, 0):
+            last[name] = count // 100_000
+            echo(f"  {name}: {count:,} rows...")
+    return report
+
+
+def _summary(stats, verb: str):
+    for table, rows in stats.rows.items():
+        echo(f"  {table:<14} {rows:>10,}")
+    echo(f"  {'vectors':<14} {stats.vectors:>10,}")
+    echo(f"{verb} {sum(stats.rows.values()) + stats.vectors:,} rows in {stats.seconds:.1f}s.")
+
+
+@app.command(name="export")
+def export(
+    out_dir: Path = Argument(..., help="Directory to write the export to (created; must be empty)"),
+    compress: str = Option("none", "--compress", "-c", help="none or zstd (needs the zstandard package)"),
+    level: int = Option(3, "--level", help="zstd compression level"),
+):
+    """
+    Export documents, pages, texts, headings, terms, relationships and vectors.
+
+    Rows are written as JSONL (one file per table), vectors as a float32 .npy
+    matrix plus their ids. Streams in constant memory.
+
+    Examples:
+        smartlib export backups/2024-05-01
+        smartlib export /mnt/clone -c zstd
+    """
+    from smart_library.infrastructure.db.db import get_connection
+    from smart_library.infrastructure.db.dump import export_library
+
+    conn = get_connection()
+    try:
+        stats = export_library(conn, out_dir, compression=None if compress == "none" else compress, level=level,
+                               progress=_progress())
+    except (ValueError, RuntimeError) as e:
+        echo(f"Export failed: {e}", err=True)
+        raise Exit(1)
+    finally:
+        conn.close()
+    _summary(stats, f"Exported to {out_dir}:")
+
+
+@app.command(name="import")
+def import_(
+    in_dir: Path = Argument(..., help="Directory written by `smartlib export`"),
+):
+    """
+    Load an export into the configured (empty) library.
+
+    Indexes and triggers are rebuilt once after the load; run `smartlib init`
+    first to get an empty database at the current schema. The import is one
+    transaction: a failed import leaves the library empty, ready to rerun.
+
+    Examples:
+        smartlib init && smartlib import backups/2024-05-01
+    """
+    from smart_library.infrastructure.db.db import get_connection
+    from smart_library.infrastructure.db.dump import import_library
+
+    conn = get_connection(profile="ingest")
+    try:
+        stats = import_library(conn, in_dir, progress=_progress())
+    except (ValueError, RuntimeError) as e:
+        echo(f"Import failed: {e}", err=True)
+        raise Exit(1)
+    finally:
+        conn.close()
+    _summary(stats, "Imported")
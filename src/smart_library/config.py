@@ -15,10 +15,52 @@ JSONL_ROOT    = DATA_DIR / "jsonl"
 ENTITIES_JSONL  = JSONL_ROOT / "entities.jsonl"
 RELATIONS_JSONL = JSONL_ROOT / "relations.jsonl"
 
+# Numbered schema migrations (infrastructure/db/migrations.py), tracked by PRAGMA user_version
+MIGRATIONS_DIR = Path(os.getenv("SMARTLIB_MIGRATIONS_DIR", Path(__file__).resolve().parents[2] / "db" / "migrations"))
+
 class ChunkerConfig:
     MAX_CHAR = 600
     MIN_CHAR = 400
     OVERLAP = 100
+    # Token mode budgets, in tokens of TOKENIZER (keep MAX_TOKENS under the embedding model's context)
+    MIN_TOKENS = 96
+    MAX_TOKENS = 160
+    OVERLAP_TOKENS = 24
+    # tiktoken encoding; "regex-estimate" (or an unavailable encoding) uses the offline approximation
+    TOKENIZER = os.getenv("SMARTLIB_TOKENIZER", "cl100k_base")
+    # "sentences" (string based), "spans" (single pass over offsets, see TextChunker.page_spans)
+    # or "tokens" (spans sized by token count, see TextChunker.page_token_spans)
+    MODE = os.getenv("SMARTLIB_CHUNKER_MODE", "sentences")
+
+class TextStorageConfig:
+    # "inline": every chunk row stores its own strings; "blob": one compressed
+    # text per document (document_text) and chunk offsets into it
+    MODE = os.getenv("SMARTLIB_TEXT_STORAGE", "inline")
+    COMPRESSION_LEVEL = 6
+
+class SearchConfig:
+    # Hybrid retrieval (SearchService.hybrid_search): "rrf" (reciprocal rank fusion)
+    # or "weighted" (min-max normalised scores, weighted sum)
+    FUSION = os.getenv("SMARTLIB_SEARCH_FUSION", "rrf")
+    RRF_K = 60
+    LEXICAL_WEIGHT = float(os.getenv("SMARTLIB_SEARCH_LEXICAL_WEIGHT", "1.0"))
+    VECTOR_WEIGHT = float(os.getenv("SMARTLIB_SEARCH_VECTOR_WEIGHT", "1.0"))
+    # Candidates taken from each source before fusion
+    CANDIDATES = 50
+
+class ShardConfig:
+    # Shard catalog (JSON); DB_PATH is always the shard "main". See infrastructure/db/shards.py
+    CATALOG = Path(os.getenv("SMARTLIB_SHARD_CATALOG", DATA_DIR / "db/shards.json"))
+    # Threads used by FederatedSearchService to query shards in parallel
+    SEARCH_WORKERS = int(os.getenv("SMARTLIB_SHARD_WORKERS", "8"))
+
+class PurgeConfig:
+    # Background purge of tombstoned documents (application/services/purge_service.py):
+    # entities deleted per write transaction, pause between transactions (seconds)
+    # so searches and ingestion get the write lock in between, and idle polling interval
+    BATCH_SIZE = int(os.getenv("SMARTLIB_PURGE_BATCH", "500"))
+    PAUSE = float(os.getenv("SMARTLIB_PURGE_PAUSE", "0.05"))
+    POLL_INTERVAL = float(os.getenv("SMARTLIB_PURGE_POLL", "60"))
 
 class OllamaConfig:
     # both services use the same container now
@@ -34,9 +76,38 @@ class OllamaConfig:
 
 class Grobid:
     HOST = os.getenv("GROBID_HOST", "grobid")
-    PORT = 8070
-    BASE_URL = f"http://{HOST}:{PORT}"
+    PORT = int(os.getenv("GROBID_PORT", "8070"))
+    # GROBID_URL overrides host/port, e.g. to point at the replay server
+    # (infrastructure/grobid/replay_server.py)
+    BASE_URL = os.getenv("GROBID_URL", f"http://{HOST}:{PORT}").rstrip("/")
     PROCESSING_TEXT_URL = f"{BASE_URL}/api/processFulltextDocument"
     PROCESSING_HEADER_URL = f"{BASE_URL}/api/processHeaderDocument"
+    VERSION_URL = f"{BASE_URL}/api/version"
+    # Client pool: keep CONCURRENCY in line with the server's GROBID_NB_THREADS
+    CONCURRENCY = int(os.getenv("GROBID_CONCURRENCY", "4"))
+    TIMEOUT = float(os.getenv("GROBID_TIMEOUT", "300"))
+    MAX_RETRIES = int(os.getenv("GROBID_MAX_RETRIES", "6"))
+    BACKOFF_BASE = 1.0      # seconds; doubled per retry, with full jitter
+    BACKOFF_MAX = 30.0
+    # Upper bound on a server's Retry-After, in case it sends something absurd
+    RETRY_AFTER_MAX = float(os.getenv("GROBID_RETRY_AFTER_MAX", "600"))
+    # TEI mapper: "tree" (lxml tree) or "stream" (iterparse, lower peak memory)
+    MAPPER = os.getenv("GROBID_MAPPER", "tree")
+    # Pin the version used in TEI cache keys (skips the /api/version lookup)
+    VERSION = os.getenv("GROBID_VERSION")
+    # Seconds a failed version lookup is remembered before the server is asked again
+    VERSION_RETRY = float(os.getenv("GROBID_VERSION_RETRY", "30"))
 
+    # Compressed TEI cache (see infrastructure/grobid/tei_cache.py)
+    CACHE_ENABLED = os.getenv("SMARTLIB_TEI_CACHE", "1") != "0"
+    CACHE_DIR = DATA_DIR / "cache" / "tei"
+    CACHE_MAX_BYTES = int(os.getenv("SMARTLIB_TEI_CACHE_MB", "1024")) * 1024 * 1024
 
+class ApiConfig:
+    # Worker threads per endpoint group for the API's blocking work (api/concurrency.py);
+    # requests beyond a limit wait their turn without blocking the event loop.
+    # Searches are SQLite reads plus one embedding call; ingestion holds a Grobid
+    # slot for seconds to minutes, so it gets no more threads than Grobid has.
+    SEARCH_THREADS = int(os.getenv("SMARTLIB_API_SEARCH_THREADS", "16"))
+    DOCUMENT_THREADS = int(os.getenv("SMARTLIB_API_DOCUMENT_THREADS", "16"))
+    INGEST_THREADS = int(os.getenv("SMARTLIB_API_INGEST_THREADS", str(Grobid.CONCURRENCY)))
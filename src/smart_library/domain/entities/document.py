@@ -38,3 +38,9 @@ class Document(Entity):
     venue: Optional[str] = field(default=None)
     year: Optional[int] = field(default=None)
     abstract: Optional[str] = field(default=None)
+
+    # -----------------------------
+    # Bibliography
+    # -----------------------------
+    reference_list: Optional[List[dict]] = field(default=None)  # parsed bibliography entries
+    citations: Optional[List[str]] = field(default=None)        # ids of library documents this one cites
@@ -1,5 +1,6 @@
 from smart_library.domain.services.document_service import DocumentService
 from smart_library.domain.mappers.grobid_domain.page_mapper import parse_pages
+from collections import Counter
 from types import SimpleNamespace
 import re
 
@@ -17,8 +18,34 @@ def _format_author_name(author):
         return last
 
 
+def _reference_list(struct):
+    """Bibliography entries as plain dicts, with how often the body cites each one."""
+    bibliography = struct.get("bibliography") or []
+    if not bibliography:
+        return None
+    cited = Counter()
+    body = struct.get("body")
+    for section in getattr(body, "sections", None) or []:
+        for para in getattr(section, "paragraphs", None) or []:
+            for ref in getattr(para, "references", None) or []:
+                if getattr(ref, "bib_key", None):
+                    cited[ref.bib_key] += 1
+    return [
+        {
+            "key": b.key,
+            "title": b.title,
+            "authors": list(b.authors or []),
+            "year": b.year,
+            "doi": b.doi,
+            "venue": b.venue,
+            "cited_count": cited.get(b.key, 0),
+        }
+        for b in bibliography
+    ]
+
+
 def parse_document(struct, source_path=None, source_url=None, file_hash=None,
-                   document_service=None):
+                   document_service=None, document_id=None):
     header = struct.get("header") or SimpleNamespace()
 
     # Use default DocumentService if not provided
@@ -41,6 +68,7 @@ def parse_document(struct, source_path=None, source_url=None, file_hash=None,
 
     # Create Document using service (only pass recognized Document fields)
     doc = document_service.create_document(
+        id=document_id,
         title=getattr(header, "title", None),
         authors=[_format_author_name(a) for a in getattr(header, "authors", [])],
         doi=getattr(header, "doi", None),
@@ -52,6 +80,7 @@ def parse_document(struct, source_path=None, source_url=None, file_hash=None,
         source_path=source_path,
         source_url=source_url,
         page_count=num_pages,
+        reference_list=_reference_list(struct),
     )
 
     return doc
\ No newline at end of file
@@ -13,10 +13,12 @@ from smart_library.domain.services.term_service import TermService
 
 def build_snapshot(struct, source_path=None, source_url=None, file_hash=None,
 				   document_service=None, heading_service=None,
-				   text_service=None, relationship_service=None, term_service=None):
+				   text_service=None, relationship_service=None, term_service=None,
+				   document_id=None):
 	"""Build a DocumentSnapshot from a grobid `struct` using domain services.
 
-	- Creates the `Document` via `parse_document`/DocumentService.
+	- Creates the `Document` via `parse_document`/DocumentService. Pass
+	  `document_id` to rebuild the snapshot of an already stored document.
 	- Creates Heading and Text entities using services and links them with Relationships.
 	- Attaches `document_id` in each object's `metadata`.
 	"""
@@ -29,7 +31,7 @@ def build_snapshot(struct, source_path=None, source_url=None, file_hash=None,
 
 	# Create document
 	document = parse_document(struct, source_path=source_path, source_url=source_url, file_hash=file_hash,
-							  document_service=document_service)
+							  document_service=document_service, document_id=document_id)
 
 	headings = []
 	texts = []
@@ -1,7 +1,9 @@
 from smart_library.domain.constants.text_types import TextType
 from smart_library.domain.mappers.grobid_domain.utils import extract_page_number_from_coords
 
+from smart_library.config import ChunkerConfig
 from smart_library.utils.chunker import TextChunker
+from smart_library.utils.tokens import get_tokenizer
 import logging
 from smart_library.domain.services.text_service import TextService
 from smart_library.domain.services.relationship_service import RelationshipService
@@ -39,6 +41,7 @@ def parse_texts(section, section_text_obj, document_id, text_service=None, relat
 
     logger = logging.getLogger(__name__)
     chunker = TextChunker()
+    tokenizer = get_tokenizer()
     for page_number, paragraphs in paras_by_page.items():
         # Concatenate all paragraph texts for this page number
         page_text = "\n".join(p for p in paragraphs if p)
@@ -54,7 +57,18 @@ def parse_texts(section, section_text_obj, document_id, text_service=None, relat
                     logger.debug(" para[%d] length=%d", i, len(p))
         # Chunk the text using paragraph-aware normalization from the chunker config
         page_paragraphs = [p for p in paragraphs if p]
-        non_overlap_chunks, overlap_chunks = chunker.process_chunks(page_paragraphs)
+        if ChunkerConfig.MODE in ("spans", "tokens"):
+            if ChunkerConfig.MODE == "tokens":
+                source, spans = chunker.page_token_spans(page_paragraphs, tokenizer)
+            else:
+                source, spans = chunker.page_spans(page_paragraphs)
+            spans = list(spans)
+            non_overlap_chunks = [s.text(source) for s in spans]
+            overlap_chunks = [s.overlap_text(source) for s in spans]
+        else:
+            non_overlap_chunks, overlap_chunks = chunker.process_chunks(page_paragraphs)
+        # One batch call per page; stored so context packing never re-tokenizes
+        token_counts = tokenizer.count_many(non_overlap_chunks)
         # Debug: log chunk counts and lengths after chunking
         if logger.isEnabledFor(logging.DEBUG):
             logger.debug(" chunks_non_overlap=%d chunks_with_overlap=%d", len(non_overlap_chunks), len(overlap_chunks))
@@ -63,7 +77,7 @@ def parse_texts(section, section_text_obj, document_id, text_service=None, relat
         # Relationship service for creating relationships between texts/headings/document
         relationship_service = relationship_service or RelationshipService.default_instance()
 
-        for idx, (non_overlap, overlap) in enumerate(zip(non_overlap_chunks, overlap_chunks)):
+        for idx, (non_overlap, overlap, token_count) in enumerate(zip(non_overlap_chunks, overlap_chunks, token_counts)):
             global_idx = start_index + idx
             # Attach document and page number to text metadata so downstream
             # presentation code can show page information.
@@ -79,6 +93,7 @@ def parse_texts(section, section_text_obj, document_id, text_service=None, relat
                 parent_id=document_id,
                 index=global_idx,
                 character_count=len(non_overlap) if non_overlap is not None else 0,
+                token_count=token_count,
                 page_number=page_number,
                 metadata=meta,
             )
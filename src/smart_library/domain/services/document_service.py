@@ -39,6 +39,8 @@ class DocumentService:
             "venue": (str, type(None)),
             "year": (int, type(None)),
             "abstract": (str, type(None)),
+            "reference_list": (list, type(None)),
+            "citations": (list, type(None)),
         }
         for field, types in doc_fields.items():
             value = kwargs.get(field)
@@ -0,0 +1,90 @@
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from smart_library.infrastructure.db.db import get_connection_with_sqlitevec
+
+
+class PooledConnection(sqlite3.Connection):
+    """Connection owned by a ConnectionManager: `close()` is a no-op so that
+    services which close "their" connection do not break the pool."""
+
+    def close(self):
+        pass
+
+    def _close(self):
+        super().close()
+
+
+class ConnectionManager:
+    """
+    Hands out one connection per (thread, database, profile) and reuses it.
+
+    Opening a connection runs the WAL/busy_timeout/foreign_keys PRAGMAs, loads
+    sqlite-vec and applies the profile's PRAGMAs (see `db.PRAGMA_PROFILES`),
+    so request handlers that build several repositories should share the
+    pooled connection instead of calling `get_connection()` each time.
+    Connections are never shared between threads; `close_all()` closes them
+    at shutdown.
+    """
+
+    def __init__(self, db_path: Path = None, load_sqlitevec: bool = True):
+        self.db_path = db_path
+        self.load_sqlitevec = load_sqlitevec
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._all: List[PooledConnection] = []
+        self.opened = 0
+
+    def _resolve_path(self) -> Path:
+        if self.db_path is not None:
+            return Path(self.db_path)
+        from smart_library.config import DB_PATH
+        return DB_PATH
+
+    def connection(self, profile: str = "serve", db_path: Path = None) -> sqlite3.Connection:
+        """The calling thread's connection for `profile` to `db_path` (default: the manager's database)."""
+        pool: Dict[Tuple[str, str], PooledConnection] = getattr(self._local, "pool", None)
+        if pool is None:
+            pool = self._local.pool = {}
+        key = (str(db_path if db_path is not None else self._resolve_path()), profile)
+        conn = pool.get(key)
+        if conn is None:
+            conn = get_connection_with_sqlitevec(
+                key[0], load_sqlitevec=self.load_sqlitevec, profile=profile, factory=PooledConnection
+            )
+            pool[key] = conn
+            with self._lock:
+                self._all.append(conn)
+                self.opened += 1
+        return conn
+
+    def close_all(self) -> int:
+        """Close every pooled connection (all threads). Returns how many were closed."""
+        with self._lock:
+            conns, self._all = self._all, []
+        for conn in conns:
+            try:
+                conn._close()
+            except sqlite3.Error:
+                pass
+        # Threads that call connection() again get fresh connections
+        self._local = threading.local()
+        return len(conns)
+
+
+_manager = ConnectionManager()
+
+
+def get_manager() -> ConnectionManager:
+    return _manager
+
+
+def pooled_connection(profile: str = "serve", db_path: Path = None) -> sqlite3.Connection:
+    """The calling thread's pooled connection for `profile` (do not close it); `db_path` selects a shard."""
+    return _manager.connection(profile, db_path)
+
+
+def close_pooled_connections() -> int:
+    return _manager.close_all()
@@ -1,29 +1,95 @@
 import sqlite3
 import os
+from contextlib import contextmanager
 from pathlib import Path
 
 
 
 from smart_library.infrastructure.db.sqlite_vec import load_sqlitevec_extension
 
-def get_connection(db_path: Path = None) -> sqlite3.Connection:
+
+@contextmanager
+def transaction(conn: sqlite3.Connection, immediate: bool = True):
+    """Run a block of statements as one transaction on `conn`.
+
+    Connections are opened with `isolation_level=None` (autocommit), so the
+    transaction is started explicitly. `BEGIN IMMEDIATE` takes the write lock
+    up front, which avoids lock upgrades failing halfway through a batch.
+    Code inside the block must not call `conn.commit()` itself. Inside an
+    open transaction (e.g. a `DatabaseWriter` batch) the block runs in a
+    savepoint instead, so it stays atomic and commits with the outer one.
+    """
+    if conn.in_transaction:
+        conn.execute("SAVEPOINT nested_transaction")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK TO nested_transaction")
+            conn.execute("RELEASE nested_transaction")
+            raise
+        else:
+            conn.execute("RELEASE nested_transaction")
+        return
+    conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    else:
+        conn.execute("COMMIT")
+
+# Workload-specific PRAGMAs applied on top of the defaults (WAL, busy_timeout, foreign_keys)
+PRAGMA_PROFILES = {
+    "default": (),
+    # Bulk writes: 256 MiB page cache, temp b-trees in memory, fsync only at checkpoints
+    # (safe with WAL: a crash may lose the last transactions but never corrupts the file)
+    "ingest": (
+        "PRAGMA synchronous = NORMAL;",
+        "PRAGMA cache_size = -262144;",
+        "PRAGMA temp_store = MEMORY;",
+    ),
+    # Request serving: memory-mapped reads, 64 MiB cache, writes rejected
+    "serve": (
+        "PRAGMA mmap_size = 268435456;",
+        "PRAGMA cache_size = -65536;",
+        "PRAGMA temp_store = MEMORY;",
+        "PRAGMA query_only = ON;",
+    ),
+}
+
+
+def apply_profile(conn: sqlite3.Connection, profile: str = "default"):
+    try:
+        pragmas = PRAGMA_PROFILES[profile]
+    except KeyError:
+        raise ValueError(f"Unknown connection profile: {profile!r}") from None
+    for pragma in pragmas:
+        conn.execute(pragma)
+
+
+def get_connection(db_path: Path = None, profile: str = "default") -> sqlite3.Connection:
     """Get a SQLite connection with foreign keys enabled. Always load sqlite-vec extension.
 
     If `db_path` is not provided, resolve it at call-time from the current
     `smart_library.config.DB_PATH`. This allows callers to override the global
     config (for tests/scenarios) and have the change take effect.
+
+    The caller owns (and closes) the connection. For short-lived reads use the
+    pooled per-thread connections of `connection_manager.pooled_connection`.
     """
     if db_path is None:
         from smart_library.config import DB_PATH
         db_path = DB_PATH
-    return get_connection_with_sqlitevec(db_path, load_sqlitevec=True)
+    return get_connection_with_sqlitevec(db_path, load_sqlitevec=True, profile=profile)
 
-def get_connection_with_sqlitevec(db_path: Path = None, load_sqlitevec: bool = False, sqlitevec_path: str = None) -> sqlite3.Connection:
+def get_connection_with_sqlitevec(db_path: Path = None, load_sqlitevec: bool = False, sqlitevec_path: str = None,
+                                  profile: str = "default", factory=sqlite3.Connection) -> sqlite3.Connection:
     if db_path is None:
         from smart_library.config import DB_PATH
         db_path = DB_PATH
     # Allow SQLite connections to be used across threads (needed for FastAPI async workers)
-    conn = sqlite3.connect(str(db_path), check_same_thread=False, isolation_level=None)
+    conn = sqlite3.connect(str(db_path), check_same_thread=False, isolation_level=None, factory=factory)
     conn.row_factory = sqlite3.Row
     
     # Enable WAL mode for better concurrent access (allows multiple readers + one writer)
@@ -46,14 +112,15 @@ def get_connection_with_sqlitevec(db_path: Path = None, load_sqlitevec: bool = F
             tb = traceback.format_exc()
             # Include the full traceback in the exception message so it is always visible
             raise RuntimeError(f"Failed to load sqlite-vec extension. Traceback:\n{tb}") from e
+    apply_profile(conn, profile)
     return conn
 
-def migrate_schema(schema_path: Path = None):
-    """Apply schema.sql to the database."""
+def migrate_schema(schema_path: Path = None, db_path: Path = None):
+    """Apply schema.sql to the database (default: `DB_PATH`)."""
     if schema_path is None:
         schema_path = Path(__file__).parent / "schema.sql"
     sql = schema_path.read_text(encoding="utf-8")
-    conn = get_connection()
+    conn = get_connection(db_path)
     try:
         conn.executescript(sql)
         conn.commit()
@@ -128,6 +195,12 @@ def check_sqlitevec_index(db_path: Path = None, table_name: str = "document_vec"
     finally:
         conn.close()
 
-def init_db():
-    """Initialize the database using the schema file."""
-    migrate_schema()
\ No newline at end of file
+def init_db(db_path: Path = None):
+    """Initialize the database (default: `DB_PATH`) from the schema file, then bring it to the latest migration."""
+    migrate_schema(db_path=db_path)
+    from smart_library.infrastructure.db.migrations import migrate
+    conn = get_connection(db_path)
+    try:
+        migrate(conn)
+    finally:
+        conn.close()
\ No newline at end of file
@@ -0,0 +1,308 @@
+"""
+Streaming export/import of a whole library.
+
+An export is a directory:
+
+    manifest.json              format, schema version, row counts (written last)
+    <table>.jsonl[.zst]        one JSON object per row, tables in foreign-key order
+    vectors.jsonl[.zst]        vector ids, one per line, in the order of ...
+    vectors.npy                ... the float32 (n, dim) embedding matrix
+
+Rows are streamed with `fetchmany` and vectors are written to/read from a
+memory-mapped `.npy`, so memory stays constant however large the library is.
+The export runs in one read transaction (a consistent snapshot under WAL).
+
+Import loads into an empty library: secondary indexes and triggers are
+dropped first and recreated at the end, rows go in with `executemany` in
+large transactions, then the trigger-maintained `row_count`, the FTS
+indexes and the citation keys are rebuilt in one pass each.
+"""
+import base64
+import io
+import json
+import logging
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from smart_library.infrastructure.db.db import transaction
+
+log = logging.getLogger(__name__)
+
+FORMAT = "smartlib-export"
+FORMAT_VERSION = 1
+MANIFEST = "manifest.json"
+
+# Parents before children (entity.parent_id and every child table reference entity)
+TABLES = ("entity", "document", "page", "text_entity", "document_text", "term", "heading", "relationship")
+COMPRESSIONS = (None, "zstd")
+
+_BYTES_KEY = "$base64"
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError:
+        raise RuntimeError("zstd compression needs the 'zstandard' package (pip install zstandard)") from None
+    return zstandard
+
+
+@contextmanager
+def _open_text(path: Path, mode: str, compression: Optional[str] = None, level: int = 3):
+    """Text stream over a plain or zstd-compressed file ("r" or "w")."""
+    raw = open(path, mode + "b")
+    try:
+        if compression == "zstd":
+            zstd = _zstd()
+            if mode == "w":
+                stream = zstd.ZstdCompressor(level=level).stream_writer(raw, closefd=False)
+            else:
+                stream = zstd.ZstdDecompressor().stream_reader(raw, closefd=False)
+        else:
+            stream = raw
+        text = io.TextIOWrapper(stream, encoding="utf-8")
+        try:
+            yield text
+        finally:
+            text.close()  # a zstd writer finishes its frame here; `raw` stays open
+    finally:
+        raw.close()
+
+
+def _encode(value):
+    if isinstance(value, (bytes, memoryview)):
+        return {_BYTES_KEY: base64.b64encode(bytes(value)).decode("ascii")}
+    return value
+
+
+def _decode(value):
+    if isinstance(value, dict) and _BYTES_KEY in value:
+        return base64.b64decode(value[_BYTES_KEY])
+    return value
+
+
+def _filename(stem: str, compression: Optional[str]) -> str:
+    return f"{stem}.jsonl" + (".zst" if compression == "zstd" else "")
+
+
+def _existing_tables(conn) -> set:
+    return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+
+def _columns(conn, table: str) -> List[str]:
+    return [row[1] for row in conn.execute(f'PRAGMA table_info("{table}")')]
+
+
+@dataclass
+class TransferStats:
+    rows: Dict[str, int] = field(default_factory=dict)  # table -> rows written/loaded
+    vectors: int = 0
+    seconds: float = 0.0
+
+
+def export_library(conn, out_dir: Path, compression: Optional[str] = None, level: int = 3,
+                   batch_size: int = 5000, progress: Callable[[str, int], None] = None) -> TransferStats:
+    """Write every library table and all vectors of `conn` to `out_dir` (created; must be empty)."""
+    from smart_library.infrastructure.db.migrations import current_version
+    from smart_library.infrastructure.repositories.vector_repository import VectorRepository
+
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression {compression!r}; expected one of: none, zstd")
+    if compression:
+        _zstd()  # fail before writing anything
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    if any(out_dir.iterdir()):
+        raise ValueError(f"Export directory is not empty: {out_dir}")
+
+    t0 = time.perf_counter()
+    stats = TransferStats()
+    manifest = {
+        "format": FORMAT,
+        "format_version": FORMAT_VERSION,
+        "schema_version": current_version(conn),
+        "created_at": datetime.utcnow().isoformat(),
+        "compression": compression,
+        "tables": {},
+        "vectors": None,
+    }
+    existing = _existing_tables(conn)
+    conn.execute("BEGIN")  # one snapshot for all tables and the vectors
+    try:
+        for table in TABLES:
+            if table not in existing:
+                continue
+            name = _filename(table, compression)
+            count = 0
+            cur = conn.execute(f'SELECT * FROM "{table}" ORDER BY rowid')
+            columns = [d[0] for d in cur.description]
+            with _open_text(out_dir / name, "w", compression, level) as f:
+                while True:
+                    rows = cur.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    f.writelines(
+                        json.dumps({c: _encode(v) for c, v in zip(columns, row)}, ensure_ascii=False) + "\n"
+                        for row in rows
+                    )
+                    count += len(rows)
+                    if progress:
+                        progress(table, count)
+            manifest["tables"][table] = {"file": name, "rows": count, "columns": columns}
+            stats.rows[table] = count
+
+        vectors = VectorRepository(conn)
+        total = vectors.count_vectors()
+        if total:
+            embeddings = vectors.iter_embeddings(batch_size)
+            first_id, first = next(embeddings)
+            matrix = np.lib.format.open_memmap(out_dir / "vectors.npy", mode="w+", dtype=np.float32,
+                                               shape=(total, first.shape[0]))
+            ids_name = _filename("vectors", compression)
+            with _open_text(out_dir / ids_name, "w", compression, level) as f:
+                matrix[0] = first
+                f.write(json.dumps({"id": first_id}) + "\n")
+                n = 1
+                for vid, vec in embeddings:
+                    matrix[n] = vec
+                    f.write(json.dumps({"id": vid}) + "\n")
+                    n += 1
+                    if progress and n % batch_size == 0:
+                        progress("vectors", n)
+            matrix.flush()
+            del matrix
+            manifest["vectors"] = {"file": "vectors.npy", "ids": ids_name, "rows": n, "dim": int(first.shape[0]),
+                                   "dtype": "float32"}
+            stats.vectors = n
+    finally:
+        conn.execute("COMMIT")
+
+    (out_dir / MANIFEST).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    stats.seconds = time.perf_counter() - t0
+    log.info("Exported %s rows and %d vectors to %s in %.1fs", stats.rows, stats.vectors, out_dir, stats.seconds)
+    return stats
+
+
+def read_manifest(in_dir: Path) -> dict:
+    path = Path(in_dir) / MANIFEST
+    if not path.exists():
+        raise ValueError(f"No {MANIFEST} in {in_dir} (not an export, or the export did not finish)")
+    manifest = json.loads(path.read_text(encoding="utf-8"))
+    if manifest.get("format") != FORMAT or manifest.get("format_version", 0) > FORMAT_VERSION:
+        raise ValueError(f"Unsupported export format in {path}: {manifest.get('format')} "
+                         f"v{manifest.get('format_version')}")
+    return manifest
+
+
+def _iter_rows(path: Path, compression: Optional[str]) -> Iterator[dict]:
+    with _open_text(path, "r", compression) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _batches(items, size: int) -> Iterator[list]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _deferred_objects(conn, tables) -> List[tuple]:
+    """Secondary indexes and triggers on `tables` (auto-indexes of PRIMARY KEY/UNIQUE stay)."""
+    names = ",".join("?" * len(tables))
+    return conn.execute(
+        f"SELECT type, name, sql FROM sqlite_master WHERE type IN ('index', 'trigger') AND sql IS NOT NULL "
+        f"AND tbl_name IN ({names}) ORDER BY type, name",
+        list(tables),
+    ).fetchall()
+
+
+def import_library(conn, in_dir: Path, batch_size: int = 10000,
+                   progress: Callable[[str, int], None] = None) -> TransferStats:
+    """
+    Load an export written by `export_library` into the empty library on `conn`.
+    Columns missing from the target schema are dropped, so older exports load
+    into newer schemas. The load is one transaction: if it fails the library
+    is left empty (indexes and triggers intact) and the import can be rerun.
+    """
+    from smart_library.infrastructure.repositories.fts_repository import FullTextRepository
+    from smart_library.infrastructure.repositories.vector_repository import VectorRepository
+    from smart_library.joins.paper_citations import rebuild_citation_index
+
+    in_dir = Path(in_dir)
+    manifest = read_manifest(in_dir)
+    compression = manifest.get("compression")
+    if compression:
+        _zstd()
+    existing = _existing_tables(conn)
+    if any(conn.execute(f'SELECT EXISTS (SELECT 1 FROM "{t}")').fetchone()[0] for t in TABLES if t in existing):
+        raise ValueError("The target library is not empty; import into a freshly initialised database")
+
+    t0 = time.perf_counter()
+    stats = TransferStats()
+    tables = [t for t in TABLES if t in manifest["tables"] and t in existing]
+    deferred = _deferred_objects(conn, tables)
+
+    # Set outside the transaction (the pragma is a no-op inside one)
+    conn.execute("PRAGMA foreign_keys = OFF")  # rows arrive parents-first per table, not across self-references
+    try:
+        with transaction(conn):
+            # DDL is transactional too: a failed load also brings the dropped indexes and triggers back
+            for kind, name, _ in deferred:
+                conn.execute(f'DROP {kind.upper()} IF EXISTS "{name}"')
+            for table in tables:
+                info = manifest["tables"][table]
+                target = set(_columns(conn, table))
+                columns = [c for c in info["columns"] if c in target]
+                quoted = ", ".join(f'"{c}"' for c in columns)
+                sql = f'INSERT INTO "{table}" ({quoted}) VALUES ({",".join("?" * len(columns))})'
+                rows = (tuple(_decode(row.get(c)) for c in columns)
+                        for row in _iter_rows(in_dir / info["file"], compression))
+                count = 0
+                for batch in _batches(rows, batch_size):
+                    conn.executemany(sql, batch)
+                    count += len(batch)
+                    if progress:
+                        progress(table, count)
+                stats.rows[table] = count
+
+            vec_info = manifest.get("vectors")
+            if vec_info:
+                matrix = np.load(in_dir / vec_info["file"], mmap_mode="r")
+                repo = VectorRepository(conn)
+                ids = (row["id"] for row in _iter_rows(in_dir / vec_info["ids"], compression))
+                for batch in _batches(ids, batch_size):
+                    repo.insert_embeddings(zip(batch, matrix[stats.vectors:stats.vectors + len(batch)]))
+                    stats.vectors += len(batch)
+                    if progress:
+                        progress("vectors", stats.vectors)
+                del matrix
+
+            # Indexes are built once over the loaded rows
+            for _, _, sql in deferred:
+                conn.execute(sql)
+            if "row_count" in existing:
+                for (name,) in conn.execute("SELECT name FROM row_count").fetchall():
+                    conn.execute(f'UPDATE row_count SET n = (SELECT COUNT(*) FROM "{name}") WHERE name = ?', (name,))
+            fts = FullTextRepository(conn)
+            if fts.available():
+                fts.rebuild()
+            if "citation_key" in existing:
+                rebuild_citation_index(conn, relink=False)
+    finally:
+        conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute("PRAGMA optimize")
+    stats.seconds = time.perf_counter() - t0
+    log.info("Imported %s rows and %d vectors from %s in %.1fs", stats.rows, stats.vectors, in_dir, stats.seconds)
+    return stats
@@ -0,0 +1,174 @@
+import logging
+import re
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from smart_library.infrastructure.db.db import transaction
+
+log = logging.getLogger(__name__)
+
+MIGRATION_FILE = re.compile(r"^(\d+)_([\w-]+)\.sql$")
+# "-- requires: vec0" header line: SQLite modules the migration needs
+_REQUIRES = re.compile(r"^--\s*requires:\s*(.+)$", re.MULTILINE | re.IGNORECASE)
+# Statements that lose data; refused on a non-empty database unless allowed explicitly
+_DESTRUCTIVE = re.compile(r"^\s*(DROP\s+TABLE|DELETE\s+FROM|ALTER\s+TABLE\s+\S+\s+DROP)\b", re.IGNORECASE)
+_ADD_COLUMN = re.compile(r"^\s*ALTER\s+TABLE\s+\S+\s+ADD\s+(COLUMN\s+)?", re.IGNORECASE)
+
+
+class MigrationError(RuntimeError):
+    pass
+
+
+def _strip_comments(sql: str) -> str:
+    return "\n".join(line for line in sql.splitlines() if not line.lstrip().startswith("--")).strip()
+
+
+def split_statements(sql: str) -> List[str]:
+    """Split a script into complete statements (trigger bodies stay whole); comments are dropped."""
+    statements, buf = [], ""
+    for line in sql.splitlines(keepends=True):
+        buf += line
+        if sqlite3.complete_statement(buf):
+            stmt = _strip_comments(buf)
+            if stmt:
+                statements.append(stmt)
+            buf = ""
+    if _strip_comments(buf):
+        raise MigrationError(f"Incomplete SQL statement: {buf.strip()[:80]!r}")
+    return statements
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    path: Path
+
+    @property
+    def sql(self) -> str:
+        return self.path.read_text(encoding="utf-8")
+
+    @property
+    def requires(self) -> List[str]:
+        return [m.strip() for line in _REQUIRES.findall(self.sql) for m in line.split(",") if m.strip()]
+
+    def statements(self) -> List[str]:
+        return split_statements(self.sql)
+
+    def destructive_statements(self) -> List[str]:
+        return [s for s in self.statements() if _DESTRUCTIVE.match(s)]
+
+
+@dataclass
+class AppliedMigration:
+    version: int
+    name: str
+    seconds: float
+    statements: int
+    skipped: List[str] = field(default_factory=list)  # why statements (or the whole file) were skipped
+
+
+def discover(directory: Path = None) -> List[Migration]:
+    """Migrations in `directory` (default `config.MIGRATIONS_DIR`), ordered by version."""
+    if directory is None:
+        from smart_library.config import MIGRATIONS_DIR
+        directory = MIGRATIONS_DIR
+    migrations = {}
+    for path in sorted(Path(directory).glob("*.sql")):
+        m = MIGRATION_FILE.match(path.name)
+        if not m:
+            continue
+        version = int(m.group(1))
+        if version in migrations:
+            raise MigrationError(f"Duplicate migration version {version}: {migrations[version].path.name}, {path.name}")
+        migrations[version] = Migration(version, m.group(2), path)
+    return [migrations[v] for v in sorted(migrations)]
+
+
+def current_version(conn) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def pending(conn, directory: Path = None) -> List[Migration]:
+    version = current_version(conn)
+    return [m for m in discover(directory) if m.version > version]
+
+
+def is_empty(conn) -> bool:
+    """True when no regular table holds a row (virtual tables and their shadow tables are ignored)."""
+    rows = conn.execute("SELECT name, sql FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'").fetchall()
+    virtual = [name for name, sql in rows if (sql or "").upper().startswith("CREATE VIRTUAL")]
+    tables = [name for name, _ in rows if not any(name == v or name.startswith(v + "_") for v in virtual)]
+    return not any(conn.execute(f'SELECT EXISTS (SELECT 1 FROM "{t}")').fetchone()[0] for t in tables)
+
+
+def _modules(conn) -> set:
+    try:
+        return {row[0] for row in conn.execute("PRAGMA module_list")}
+    except sqlite3.DatabaseError:
+        return set()
+
+
+def migrate(
+    conn,
+    directory: Path = None,
+    target: Optional[int] = None,
+    allow_destructive: bool = False,
+    skip_missing_modules: bool = False,
+    on_applied: Callable[[AppliedMigration], None] = None,
+) -> List[AppliedMigration]:
+    """
+    Apply pending migrations up to `target` (default: the latest), each in its
+    own transaction together with the `PRAGMA user_version` bump, so a failed
+    migration leaves the database at the previous version. Already applied
+    versions are never re-run.
+
+    Refuses migrations with destructive statements (DROP TABLE, DELETE, ...)
+    when the database holds data, unless `allow_destructive`. A migration
+    whose `-- requires:` module is not loaded raises, or is recorded as
+    skipped with `skip_missing_modules` (vector-less test databases).
+    ADD COLUMN statements for columns that already exist are skipped, so the
+    migrations also upgrade databases created from schema.sql.
+    """
+    todo = [m for m in pending(conn, directory) if target is None or m.version <= target]
+    applied: List[AppliedMigration] = []
+    for migration in todo:
+        statements = migration.statements()
+        destructive = migration.destructive_statements()
+        if destructive and not allow_destructive and not is_empty(conn):
+            raise MigrationError(
+                f"Migration {migration.path.name} is destructive and the database is not empty "
+                f"(first: {destructive[0][:60]!r}); back it up and pass allow_destructive=True"
+            )
+        result = AppliedMigration(migration.version, migration.name, 0.0, 0)
+        missing = [m for m in migration.requires if m not in _modules(conn)]
+        if missing:
+            if not skip_missing_modules:
+                raise MigrationError(f"Migration {migration.path.name} requires SQLite module(s): {', '.join(missing)}")
+            result.skipped.append(f"module(s) not loaded: {', '.join(missing)}")
+            statements = []
+
+        t0 = time.perf_counter()
+        with transaction(conn):
+            for stmt in statements:
+                try:
+                    conn.execute(stmt)
+                except sqlite3.OperationalError as e:
+                    if _ADD_COLUMN.match(stmt) and "duplicate column name" in str(e):
+                        result.skipped.append(f"column exists: {stmt}")
+                        continue
+                    raise MigrationError(f"Migration {migration.path.name} failed: {e}\n  in: {stmt[:200]}") from e
+                result.statements += 1
+            conn.execute(f"PRAGMA user_version = {int(migration.version)}")
+        result.seconds = time.perf_counter() - t0
+        log.info("Applied migration %04d_%s in %.3fs", migration.version, migration.name, result.seconds)
+        applied.append(result)
+        if on_applied:
+            on_applied(result)
+
+    if applied:
+        conn.execute("PRAGMA optimize")  # refresh planner statistics for new indexes
+    return applied
@@ -12,7 +12,8 @@ CREATE TABLE entity (
     updated_by TEXT,
     parent_id TEXT REFERENCES entity(id) ON DELETE CASCADE,
     entity_kind TEXT NOT NULL,          -- "Document","Page","Text","Term"
-    metadata TEXT                       -- JSON (dict)
+    metadata TEXT,                      -- JSON (dict)
+    deleted_at TEXT                     -- tombstone: set on delete, row purged later
 );
 
 -- =========================================================
@@ -36,6 +37,7 @@ CREATE TABLE document (
     publisher TEXT,
     venue TEXT,
     year INTEGER,
+    abstract TEXT,
     citation_key TEXT,
     human_id TEXT,
     reference_list TEXT,                -- JSON list
@@ -76,7 +78,26 @@ CREATE TABLE text_entity (
     display_content TEXT,
     embedding_content TEXT,
     character_count INTEGER,
-    token_count INTEGER
+    token_count INTEGER,
+    -- Blob storage mode: offsets into document_text of blob_id (content is '',
+    -- display_content NULL means "same as content", '' means None)
+    blob_id TEXT,
+    content_start INTEGER,
+    content_end INTEGER,
+    embedding_start INTEGER,
+    embedding_end INTEGER
+);
+
+-- =========================================================
+-- DOCUMENT_TEXT table: one compressed normalized text per document
+-- (TextStorageConfig.MODE = "blob")
+-- =========================================================
+DROP TABLE IF EXISTS document_text;
+CREATE TABLE document_text (
+    document_id TEXT PRIMARY KEY REFERENCES entity(id) ON DELETE CASCADE,
+    codec TEXT NOT NULL,              -- "zlib"
+    char_length INTEGER NOT NULL,
+    data BLOB NOT NULL
 );
 
 -- =========================================================
@@ -137,3 +158,183 @@ CREATE INDEX IF NOT EXISTS idx_relationship_source_type ON relationship(source_i
 CREATE INDEX IF NOT EXISTS idx_relationship_target_type ON relationship(target_id, type);
 CREATE INDEX IF NOT EXISTS idx_entity_parent ON entity(parent_id);
 CREATE INDEX IF NOT EXISTS idx_document_year ON document(year);
+
+-- Hot lookups (see db/migrations/0002_indexes.sql)
+CREATE INDEX IF NOT EXISTS idx_text_entity_page_number ON text_entity(page_number);
+CREATE INDEX IF NOT EXISTS idx_entity_kind ON entity(entity_kind);
+CREATE INDEX IF NOT EXISTS idx_document_file_hash ON document(file_hash);
+CREATE INDEX IF NOT EXISTS idx_document_doi ON document(doi);
+
+-- Keyset pagination (see db/migrations/0005_row_counts.sql)
+CREATE INDEX IF NOT EXISTS idx_entity_kind_created ON entity(entity_kind, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_document_title_id ON document(ifnull(title, '') COLLATE NOCASE, id);
+CREATE INDEX IF NOT EXISTS idx_document_year_id ON document(ifnull(year, 0), id);
+
+-- Tombstones awaiting purge (see db/migrations/0008_soft_delete.sql)
+CREATE INDEX IF NOT EXISTS idx_entity_deleted ON entity(deleted_at) WHERE deleted_at IS NOT NULL;
+
+-- =========================================================
+-- CITATION keys: normalized DOI/title keys of documents and of
+-- their bibliography entries (see db/migrations/0009_citation_keys.sql)
+-- =========================================================
+DROP TABLE IF EXISTS citation_key;
+CREATE TABLE citation_key (
+    kind TEXT NOT NULL,                 -- 'doi' or 'title'
+    key TEXT NOT NULL,
+    document_id TEXT NOT NULL REFERENCES document(id) ON DELETE CASCADE,
+    PRIMARY KEY (kind, key, document_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_citation_key_document ON citation_key(document_id);
+
+DROP TABLE IF EXISTS citation_ref;
+CREATE TABLE citation_ref (
+    source_id TEXT NOT NULL REFERENCES document(id) ON DELETE CASCADE,
+    entry INTEGER NOT NULL,             -- position in the source's reference_list
+    bib_key TEXT,
+    doi_key TEXT,
+    title_key TEXT,
+    target_id TEXT REFERENCES document(id) ON DELETE SET NULL,  -- NULL: unresolved
+    match TEXT,                         -- 'doi' or 'title' when resolved
+    PRIMARY KEY (source_id, entry)
+);
+CREATE INDEX IF NOT EXISTS idx_citation_ref_doi ON citation_ref(doi_key) WHERE target_id IS NULL;
+CREATE INDEX IF NOT EXISTS idx_citation_ref_title ON citation_ref(title_key) WHERE target_id IS NULL;
+CREATE INDEX IF NOT EXISTS idx_citation_ref_target ON citation_ref(target_id);
+
+-- =========================================================
+-- ROW_COUNT table: exact per-table row counts kept by triggers
+-- (cascaded deletes fire them too); listing totals read this
+-- instead of COUNT(*)
+-- =========================================================
+DROP TABLE IF EXISTS row_count;
+CREATE TABLE row_count (
+    name TEXT PRIMARY KEY,              -- table name
+    n INTEGER NOT NULL DEFAULT 0
+);
+INSERT INTO row_count (name, n) VALUES ('document', 0), ('page', 0), ('text_entity', 0), ('term', 0), ('heading', 0);
+
+CREATE TRIGGER document_count_ai AFTER INSERT ON document BEGIN
+    UPDATE row_count SET n = n + 1 WHERE name = 'document';
+END;
+CREATE TRIGGER document_count_ad AFTER DELETE ON document BEGIN
+    UPDATE row_count SET n = n - 1 WHERE name = 'document';
+END;
+
+CREATE TRIGGER page_count_ai AFTER INSERT ON page BEGIN
+    UPDATE row_count SET n = n + 1 WHERE name = 'page';
+END;
+CREATE TRIGGER page_count_ad AFTER DELETE ON page BEGIN
+    UPDATE row_count SET n = n - 1 WHERE name = 'page';
+END;
+
+CREATE TRIGGER text_entity_count_ai AFTER INSERT ON text_entity BEGIN
+    UPDATE row_count SET n = n + 1 WHERE name = 'text_entity';
+END;
+CREATE TRIGGER text_entity_count_ad AFTER DELETE ON text_entity BEGIN
+    UPDATE row_count SET n = n - 1 WHERE name = 'text_entity';
+END;
+
+CREATE TRIGGER term_count_ai AFTER INSERT ON term BEGIN
+    UPDATE row_count SET n = n + 1 WHERE name = 'term';
+END;
+CREATE TRIGGER term_count_ad AFTER DELETE ON term BEGIN
+    UPDATE row_count SET n = n - 1 WHERE name = 'term';
+END;
+
+CREATE TRIGGER heading_count_ai AFTER INSERT ON heading BEGIN
+    UPDATE row_count SET n = n + 1 WHERE name = 'heading';
+END;
+CREATE TRIGGER heading_count_ad AFTER DELETE ON heading BEGIN
+    UPDATE row_count SET n = n - 1 WHERE name = 'heading';
+END;
+
+-- =========================================================
+-- FULL-TEXT indexes (FTS5, external content; see
+-- db/migrations/0006_text_fts.sql). Blob-mode texts have
+-- content = '' and are indexed in blob_text_fts instead
+-- (written by TextRepository, see 0010_blob_text_fts.sql).
+-- =========================================================
+DROP TABLE IF EXISTS text_fts;
+CREATE VIRTUAL TABLE text_fts USING fts5(
+    content,
+    content='text_entity', content_rowid='rowid',
+    tokenize='unicode61 remove_diacritics 2'
+);
+DROP TABLE IF EXISTS heading_fts;
+CREATE VIRTUAL TABLE heading_fts USING fts5(
+    title,
+    content='heading', content_rowid='rowid',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER text_fts_ai AFTER INSERT ON text_entity BEGIN
+    INSERT INTO text_fts (rowid, content) VALUES (new.rowid, new.content);
+END;
+CREATE TRIGGER text_fts_ad AFTER DELETE ON text_entity BEGIN
+    INSERT INTO text_fts (text_fts, rowid, content) VALUES ('delete', old.rowid, old.content);
+END;
+CREATE TRIGGER text_fts_au AFTER UPDATE OF content ON text_entity BEGIN
+    INSERT INTO text_fts (text_fts, rowid, content) VALUES ('delete', old.rowid, old.content);
+    INSERT INTO text_fts (rowid, content) VALUES (new.rowid, new.content);
+END;
+CREATE TRIGGER heading_fts_ai AFTER INSERT ON heading BEGIN
+    INSERT INTO heading_fts (rowid, title) VALUES (new.rowid, new.title);
+END;
+CREATE TRIGGER heading_fts_ad AFTER DELETE ON heading BEGIN
+    INSERT INTO heading_fts (heading_fts, rowid, title) VALUES ('delete', old.rowid, old.title);
+END;
+CREATE TRIGGER heading_fts_au AFTER UPDATE OF title ON heading BEGIN
+    INSERT INTO heading_fts (heading_fts, rowid, title) VALUES ('delete', old.rowid, old.title);
+    INSERT INTO heading_fts (rowid, title) VALUES (new.rowid, new.title);
+END;
+DROP TABLE IF EXISTS blob_text_fts;
+CREATE VIRTUAL TABLE blob_text_fts USING fts5(
+    content,
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER blob_text_fts_ad AFTER DELETE ON text_entity WHEN old.blob_id IS NOT NULL BEGIN
+    DELETE FROM blob_text_fts WHERE rowid = old.rowid;
+END;
+CREATE TRIGGER blob_text_fts_au AFTER UPDATE OF blob_id ON text_entity
+WHEN old.blob_id IS NOT NULL AND new.blob_id IS NULL BEGIN
+    DELETE FROM blob_text_fts WHERE rowid = old.rowid;
+END;
+
+-- =========================================================
+-- CHANGE_LOG: monotonic log of entity/text/vector changes for
+-- derived structures (see db/migrations/0007_change_log.sql);
+-- vectors are logged by VectorRepository (vec0 has no triggers)
+-- =========================================================
+DROP TABLE IF EXISTS change_log;
+CREATE TABLE change_log (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    source TEXT NOT NULL,               -- 'entity', 'text_entity' or 'vector'
+    entity_id TEXT NOT NULL,
+    op TEXT NOT NULL,                   -- 'insert', 'update' or 'delete'
+    changed_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%f', 'now'))
+);
+DROP TABLE IF EXISTS change_checkpoint;
+CREATE TABLE change_checkpoint (
+    consumer TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL,               -- last change_log.seq the consumer has applied
+    updated_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%f', 'now'))
+);
+
+CREATE TRIGGER entity_log_ai AFTER INSERT ON entity BEGIN
+    INSERT INTO change_log (source, entity_id, op) VALUES ('entity', new.id, 'insert');
+END;
+CREATE TRIGGER entity_log_au AFTER UPDATE ON entity BEGIN
+    INSERT INTO change_log (source, entity_id, op) VALUES ('entity', new.id, 'update');
+END;
+CREATE TRIGGER entity_log_ad AFTER DELETE ON entity BEGIN
+    INSERT INTO change_log (source, entity_id, op) VALUES ('entity', old.id, 'delete');
+END;
+
+CREATE TRIGGER text_entity_log_ai AFTER INSERT ON text_entity BEGIN
+    INSERT INTO change_log (source, entity_id, op) VALUES ('text_entity', new.id, 'insert');
+END;
+CREATE TRIGGER text_entity_log_au AFTER UPDATE ON text_entity BEGIN
+    INSERT INTO change_log (source, entity_id, op) VALUES ('text_entity', new.id, 'update');
+END;
+CREATE TRIGGER text_entity_log_ad AFTER DELETE ON text_entity BEGIN
+    INSERT INTO change_log (source, entity_id, op) VALUES ('text_entity', old.id, 'delete');
+END;
@@ -0,0 +1,169 @@
+"""
+Shard catalog: a library split over several SQLite databases.
+
+Each shard is a complete library database (same schema, own WAL and write
+lock). The catalog is a JSON file (`ShardConfig.CATALOG`) listing the
+shards; the configured `DB_PATH` is always the shard "main", so a library
+without a catalog is a single-shard library and nothing changes for it.
+
+A shard either holds one collection (documents ingested with that
+collection name go there) or belongs to the hash pool: documents without
+a collection are spread over the pool by rendezvous hashing of their id,
+which moves only ~1/n of the routing when a shard is added. Routing decides
+where new documents go; existing documents stay where they were written,
+so lookups must not assume a document is on its routed shard.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+MAIN = "main"
+_NAME_CHARS = set("abcdefghijklmnopqrstuvwxyz0123456789_-")
+
+
+@dataclass(frozen=True)
+class Shard:
+    name: str
+    path: Path
+    collection: Optional[str] = None  # None: member of the hash pool
+
+    @property
+    def is_main(self) -> bool:
+        return self.name == MAIN
+
+
+def _score(shard: Shard, document_id: str) -> bytes:
+    return hashlib.blake2b(f"{shard.name}\0{document_id}".encode("utf-8"), digest_size=8).digest()
+
+
+class ShardCatalog:
+    """The shards of a library, loaded from (and saved to) the catalog file."""
+
+    def __init__(self, path: Path = None, main_path: Path = None):
+        if path is None or main_path is None:
+            from smart_library.config import DB_PATH, ShardConfig
+            path = path or ShardConfig.CATALOG
+            main_path = main_path or DB_PATH
+        self.path = Path(path)
+        self.main = Shard(MAIN, Path(main_path))
+        self._lock = threading.Lock()
+        self._shards: List[Shard] = self._load()
+
+    # ---------- Persistence ----------
+    def _load(self) -> List[Shard]:
+        if not self.path.exists():
+            return []
+        data = json.loads(self.path.read_text(encoding="utf-8"))
+        shards = []
+        for entry in data.get("shards", []):
+            path = Path(entry["path"])
+            shards.append(Shard(entry["name"], path if path.is_absolute() else self.path.parent / path,
+                                entry.get("collection")))
+        return shards
+
+    def _save(self):
+        def stored(path: Path) -> str:
+            try:
+                return str(path.relative_to(self.path.parent))
+            except ValueError:
+                return str(path)
+
+        data = {"shards": [{"name": s.name, "path": stored(s.path), "collection": s.collection} for s in self._shards]}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=".shards-", suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp, self.path)  # readers never see a half-written catalog
+
+    # ---------- Registry ----------
+    @property
+    def shards(self) -> List[Shard]:
+        return [self.main, *self._shards]
+
+    @property
+    def is_sharded(self) -> bool:
+        return bool(self._shards)
+
+    def get(self, name: str) -> Shard:
+        for shard in self.shards:
+            if shard.name == name:
+                return shard
+        raise KeyError(f"Unknown shard: {name!r}")
+
+    def add(self, name: str, path: Path = None, collection: Optional[str] = None) -> Shard:
+        """Register a shard (default file: `<catalog dir>/shards/<name>.db`); the database is not created here."""
+        if not name or set(name) - _NAME_CHARS:
+            raise ValueError(f"Invalid shard name {name!r}: use lowercase letters, digits, '-' and '_'")
+        with self._lock:
+            if any(s.name == name for s in self.shards):
+                raise ValueError(f"Shard {name!r} already exists")
+            if collection is not None and any(s.collection == collection for s in self._shards):
+                raise ValueError(f"Collection {collection!r} already has a shard")
+            shard = Shard(name, Path(path) if path else self.path.parent / "shards" / f"{name}.db", collection)
+            self._shards.append(shard)
+            self._save()
+        return shard
+
+    def remove(self, name: str) -> Shard:
+        """Unregister a shard; its database file is left in place."""
+        if name == MAIN:
+            raise ValueError("The main shard cannot be removed")
+        with self._lock:
+            shard = self.get(name)
+            self._shards.remove(shard)
+            self._save()
+        return shard
+
+    # ---------- Routing ----------
+    @property
+    def hash_pool(self) -> List[Shard]:
+        return [s for s in self.shards if s.collection is None]
+
+    def route(self, document_id: str, collection: Optional[str] = None) -> Shard:
+        """Shard a new document is written to: its collection's shard, else by hash of its id."""
+        if collection is not None:
+            for shard in self._shards:
+                if shard.collection == collection:
+                    return shard
+            raise ValueError(f"No shard for collection {collection!r}")
+        return max(self.hash_pool, key=lambda s: _score(s, document_id))
+
+    def select(self, names: Iterable[str] = None, collections: Iterable[str] = None) -> List[Shard]:
+        """Shards a query visits: all, or only those named in `names` / holding one of `collections`."""
+        shards = self.shards
+        if names is not None:
+            names = set(names)
+            unknown = names - {s.name for s in shards}
+            if unknown:
+                raise ValueError(f"Unknown shard(s): {', '.join(sorted(unknown))}")
+            shards = [s for s in shards if s.name in names]
+        if collections is not None:
+            collections = set(collections)
+            shards = [s for s in shards if s.collection in collections]
+        return shards
+
+
+_cached: Optional[ShardCatalog] = None
+_cached_key = None
+_cache_lock = threading.Lock()
+
+
+def load_catalog() -> ShardCatalog:
+    """The configured catalog, re-read when the catalog file changes (for long-running servers)."""
+    global _cached, _cached_key
+    from smart_library.config import DB_PATH, ShardConfig
+    path = Path(ShardConfig.CATALOG)
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        mtime = None
+    key = (str(path), str(DB_PATH), mtime)
+    with _cache_lock:
+        if _cached is None or _cached_key != key:
+            _cached, _cached_key = ShardCatalog(path, DB_PATH), key
+        return _cached
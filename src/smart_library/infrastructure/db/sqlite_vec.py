@@ -4,6 +4,7 @@ import os
 from pathlib import Path
 import glob
 import site
+from functools import lru_cache
 
 
 def _search_for_vec0():
@@ -69,13 +70,20 @@ def _search_for_vec0():
     return os.getenv("SQLITE_VEC_PATH", "/home/vscode/.local/lib/python3.11/site-packages/sqlite_vec/vec0")
 
 
+@lru_cache(maxsize=1)
+def resolve_vec0_path() -> str:
+    """Discover the vec0 library once per process (the search globs every sys.path entry)."""
+    return _search_for_vec0()
+
+
 def load_sqlitevec_extension(conn: sqlite3.Connection):
     """Load the sqlite-vec extension into a SQLite connection.
 
     This function attempts multiple discovery strategies and falls back to
     the `SQLITE_VEC_PATH` environment variable if nothing else is found.
+    The discovered path is cached (see `resolve_vec0_path`).
     """
-    path = _search_for_vec0()
+    path = resolve_vec0_path()
     conn.enable_load_extension(True)
     conn.load_extension(path)
     conn.enable_load_extension(False)
\ No newline at end of file
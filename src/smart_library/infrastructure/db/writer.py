@@ -0,0 +1,190 @@
+import logging
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Tuple
+
+from smart_library.infrastructure.db.db import get_connection_with_sqlitevec
+
+log = logging.getLogger(__name__)
+
+WriteFn = Callable[[sqlite3.Connection], Any]
+_STOP = object()
+
+
+class WriterConnection(sqlite3.Connection):
+    """Write connection owned by a DatabaseWriter: the writer decides when to
+    commit, so `commit()` from repository code inside a job is a no-op."""
+
+    def commit(self):
+        pass
+
+
+class DatabaseWriter:
+    """
+    Single-writer actor: one thread owns the only write connection and runs
+    every submitted job `fn(conn)` on it.
+
+    Jobs waiting in the queue are grouped into one transaction (up to
+    `max_batch` jobs), so concurrent writers cost one fsync and one lock
+    acquisition per batch instead of contending for the database lock until
+    `busy_timeout`. Each job runs in a savepoint: a failing job is rolled back
+    and gets its exception, the rest of the batch still commits. Futures
+    resolve after COMMIT. Readers use `query_only` connections (the "serve"
+    profile of `connection_manager`) and never wait on the writer under WAL.
+    """
+
+    def __init__(self, db_path: Path = None, max_batch: int = 64, profile: str = "ingest",
+                 load_sqlitevec: bool = True, connect: Callable[[], sqlite3.Connection] = None):
+        self.db_path = db_path
+        self.max_batch = max_batch
+        self.profile = profile
+        self.load_sqlitevec = load_sqlitevec
+        self._connect = connect
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.jobs = 0
+
+    # ---------- Lifecycle ----------
+    def start(self) -> "DatabaseWriter":
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                ready = Future()
+                self._thread = threading.Thread(target=self._run, args=(ready,), name="sqlite-writer", daemon=True)
+                self._thread.start()
+                ready.result()  # surface connection errors to the caller
+        return self
+
+    def stop(self, timeout: float = None):
+        """Finish the queued jobs, then close the write connection."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None and thread.is_alive():
+            self._queue.put(_STOP)
+            thread.join(timeout)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ---------- Submitting ----------
+    def submit(self, fn: WriteFn) -> Future:
+        """Queue `fn(conn)`; the future resolves to its return value once committed."""
+        if not self.running:
+            self.start()
+        future = Future()
+        self._queue.put((fn, future))
+        return future
+
+    def execute(self, fn: WriteFn, timeout: float = None) -> Any:
+        """Run `fn(conn)` on the writer thread and wait for it to be committed."""
+        if threading.current_thread() is self._thread:
+            return fn(self._conn)  # nested call from a job: already inside the batch
+        return self.submit(fn).result(timeout)
+
+    # ---------- Writer thread ----------
+    def _open(self) -> sqlite3.Connection:
+        if self._connect is not None:
+            return self._connect()
+        db_path = self.db_path
+        if db_path is None:
+            from smart_library.config import DB_PATH
+            db_path = DB_PATH
+        return get_connection_with_sqlitevec(db_path, load_sqlitevec=self.load_sqlitevec, profile=self.profile,
+                                             factory=WriterConnection)
+
+    def _run(self, ready: Future):
+        try:
+            self._conn = self._open()
+        except BaseException as e:
+            ready.set_exception(e)
+            return
+        ready.set_result(None)
+        try:
+            stopping = False
+            while not stopping:
+                batch: List[Tuple[WriteFn, Future]] = []
+                item = self._queue.get()
+                while True:
+                    if item is _STOP:
+                        stopping = True
+                        break
+                    batch.append(item)
+                    if len(batch) >= self.max_batch:
+                        break
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                if batch:
+                    self._run_batch(batch)
+        finally:
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass
+
+    def _run_batch(self, batch: List[Tuple[WriteFn, Future]]):
+        conn = self._conn
+        done: List[Tuple[Future, Any]] = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for fn, future in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                conn.execute("SAVEPOINT job")
+                try:
+                    value = fn(conn)
+                except Exception as e:
+                    if not conn.in_transaction:
+                        raise  # SQLite rolled back the whole transaction (e.g. disk full)
+                    conn.execute("ROLLBACK TO job")
+                    conn.execute("RELEASE job")
+                    future.set_exception(e)
+                    continue
+                conn.execute("RELEASE job")
+                done.append((future, value))
+            conn.execute("COMMIT")
+        except Exception as e:
+            log.exception("Write batch of %d jobs failed", len(batch))
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        self.batches += 1
+        self.jobs += len(done)
+        for future, value in done:
+            future.set_result(value)
+
+
+_writer: Optional[DatabaseWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_writer() -> DatabaseWriter:
+    """Process-wide writer for the configured database (started on first use)."""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = DatabaseWriter()
+        return _writer
+
+
+def close_writer(timeout: float = None):
+    global _writer
+    with _writer_lock:
+        writer, _writer = _writer, None
+    if writer is not None:
+        writer.stop(timeout)
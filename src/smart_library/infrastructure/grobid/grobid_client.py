@@ -1,15 +1,223 @@
-import requests
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
 from smart_library.config import Grobid
 
+# Responses that mean "server busy, try again later"
+RETRY_STATUSES = {429, 503}
+
+
+class GrobidBusyError(requests.HTTPError):
+    """Grobid kept answering 503 after all retries."""
+
+
+def retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delay-seconds or HTTP-date), None if absent or invalid."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+@dataclass
+class GrobidMetrics:
+    """Thread-safe request counters for a client."""
+    started_at: float = field(default_factory=time.monotonic)
+    requests: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    retries: int = 0
+    busy_responses: int = 0
+    bytes_received: int = 0
+    request_seconds: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, **deltas):
+        with self._lock:
+            for name, value in deltas.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            elapsed = max(time.monotonic() - self.started_at, 1e-9)
+            return {
+                "requests": self.requests,
+                "succeeded": self.succeeded,
+                "failed": self.failed,
+                "retries": self.retries,
+                "busy_responses": self.busy_responses,
+                "bytes_received": self.bytes_received,
+                "elapsed_seconds": elapsed,
+                "docs_per_minute": self.succeeded * 60.0 / elapsed,
+                "mean_request_seconds": self.request_seconds / self.requests if self.requests else 0.0,
+            }
+
+
+class _MeteredReader:
+    """Binary reader over a streamed response body that counts the bytes read into the metrics."""
+
+    def __init__(self, raw, metrics: GrobidMetrics):
+        self.raw = raw
+        self.metrics = metrics
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.raw.read(None if size is None or size < 0 else size)
+        if data:
+            self.metrics.record(bytes_received=len(data))
+        return data
+
+
+@dataclass
+class GrobidResult:
+    path: Path
+    tei: Optional[str] = None
+    error: Optional[Exception] = None
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
 class GrobidClient:
+    # Form fields sent with every full-text request (also part of the TEI cache key)
+    FULLTEXT_PARAMS = [
+        ("generateCoordinates", "1"),
+        ("teiCoordinates", "p"),
+        ("teiCoordinates", "head"),
+        ("teiCoordinates", "div"),
+    ]
+
     def __init__(
         self,
         fulltext_url: str = Grobid.PROCESSING_TEXT_URL,
         header_url: str = Grobid.PROCESSING_HEADER_URL,
+        version_url: str = Grobid.VERSION_URL,
+        concurrency: int = Grobid.CONCURRENCY,
+        timeout: float = Grobid.TIMEOUT,
+        max_retries: int = Grobid.MAX_RETRIES,
+        backoff_base: float = Grobid.BACKOFF_BASE,
+        backoff_max: float = Grobid.BACKOFF_MAX,
+        retry_after_max: float = Grobid.RETRY_AFTER_MAX,
+        version_retry: float = Grobid.VERSION_RETRY,
+        session: requests.Session = None,
     ):
         self.fulltext_url = fulltext_url
         self.header_url = header_url
+        self.version_url = version_url
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_after_max = retry_after_max
+        self.version_retry = version_retry
+        self.session = session or self._make_session(self.concurrency)
+        self.metrics = GrobidMetrics()
+        self._version = None
+        self._version_failed_at = None
+
+    @staticmethod
+    def _make_session(pool_size: int) -> requests.Session:
+        """Session whose connection pool holds one keep-alive connection per worker."""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, pool_block=True)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        Full-jitter exponential backoff, capped at `backoff_max`. A Retry-After
+        header is honoured as the floor, even above `backoff_max`; only
+        `retry_after_max` bounds it.
+        """
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+        wait = retry_after_seconds(retry_after)
+        if wait is not None:
+            delay = max(delay, min(wait, self.retry_after_max))
+        return delay
+
+    def _send(self, url: str, pdf_path: Path, data=None, stream: bool = False) -> requests.Response:
+        """POST a PDF, retrying on 503/429 and connection errors. With `stream`, the body is left unread."""
+        attempt = 0
+        while True:
+            t0 = time.monotonic()
+            try:
+                with open(pdf_path, "rb") as pdf_file:
+                    response = self.session.post(url, files={"input": pdf_file}, data=data, timeout=self.timeout,
+                                                 stream=stream)
+            except (requests.ConnectionError, requests.Timeout):
+                self.metrics.record(requests=1, request_seconds=time.monotonic() - t0)
+                if attempt >= self.max_retries:
+                    self.metrics.record(failed=1)
+                    raise
+                self.metrics.record(retries=1)
+                time.sleep(self._backoff(attempt))
+                attempt += 1
+                continue
+
+            self.metrics.record(requests=1, request_seconds=time.monotonic() - t0)
+            if response.status_code in RETRY_STATUSES:
+                self.metrics.record(busy_responses=1)
+                response.close()  # hand a streamed connection back to the pool
+                if attempt >= self.max_retries:
+                    self.metrics.record(failed=1)
+                    raise GrobidBusyError(
+                        f"Grobid still busy ({response.status_code}) after {attempt + 1} attempts", response=response
+                    )
+                self.metrics.record(retries=1)
+                time.sleep(self._backoff(attempt, response.headers.get("Retry-After")))
+                attempt += 1
+                continue
+
+            try:
+                response.raise_for_status()
+            except requests.HTTPError:
+                response.close()
+                self.metrics.record(failed=1)
+                raise
+            self.metrics.record(succeeded=1)
+            return response
+
+    def _post_pdf(self, url: str, pdf_path: Path, data=None) -> str:
+        response = self._send(url, pdf_path, data=data)
+        self.metrics.record(bytes_received=len(response.content))
+        return response.text
+
+    def version(self):
+        """
+        Returns the Grobid server version (cached per client), or None if unreachable.
+        A failed lookup is remembered for `version_retry` seconds, so callers do not
+        each wait out the timeout while the server is down.
+        """
+        if self._version is None:
+            failed_at = self._version_failed_at
+            if failed_at is not None and time.monotonic() - failed_at < self.version_retry:
+                return None
+            try:
+                response = self.session.get(self.version_url, timeout=5)
+                response.raise_for_status()
+                self._version = response.text.strip() or None
+            except requests.RequestException:
+                pass
+            self._version_failed_at = None if self._version else time.monotonic()
+        return self._version
 
     def extract_fulltext(self, pdf_path: Path) -> str:
         """
@@ -21,16 +229,47 @@ class GrobidClient:
         Returns:
             str: Extracted full text in XML format (TEI).
         """
-        with open(pdf_path, "rb") as pdf_file:
-            files = {"input": pdf_file}
-            response = requests.post(self.fulltext_url, files=files, data=[
-        ("generateCoordinates", "1"),
-        ("teiCoordinates", "p"),
-        ("teiCoordinates", "head"),
-        ("teiCoordinates", "div"),
-    ])
-            response.raise_for_status()
-            return response.text
+        return self._post_pdf(self.fulltext_url, pdf_path, data=self.FULLTEXT_PARAMS)
+
+    @contextmanager
+    def stream_fulltext(self, pdf_path: Path):
+        """
+        Like `extract_fulltext`, but yields the TEI as a binary file-like object
+        that reads the response body as it arrives (transfer encoding removed),
+        so it can be parsed without holding the whole document in memory.
+        """
+        response = self._send(self.fulltext_url, pdf_path, data=self.FULLTEXT_PARAMS, stream=True)
+        try:
+            response.raw.decode_content = True
+            yield _MeteredReader(response.raw, self.metrics)
+        finally:
+            response.close()
+
+    def extract_many(self, pdf_paths: Iterable[Path], concurrency: int = None) -> Iterator[GrobidResult]:
+        """
+        Extracts many PDFs with up to `concurrency` requests in flight.
+
+        Args:
+            pdf_paths: PDFs to process.
+            concurrency: Parallel requests (defaults to the client's pool size).
+
+        Yields:
+            GrobidResult: one per PDF, in completion order. Failures are returned
+            in `error` instead of aborting the batch.
+        """
+        workers = max(1, concurrency or self.concurrency)
+
+        def _one(path):
+            t0 = time.monotonic()
+            try:
+                return GrobidResult(Path(path), tei=self.extract_fulltext(path), seconds=time.monotonic() - t0)
+            except Exception as e:
+                return GrobidResult(Path(path), error=e, seconds=time.monotonic() - t0)
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="grobid") as pool:
+            futures = [pool.submit(_one, p) for p in pdf_paths]
+            for fut in as_completed(futures):
+                yield fut.result()
 
     def extract_header(self, pdf_path: Path) -> str:
         """
@@ -42,8 +281,7 @@ class GrobidClient:
         Returns:
             str: Extracted header in XML format (TEI).
         """
-        with open(pdf_path, "rb") as pdf_file:
-            files = {"input": pdf_file}
-            response = requests.post(self.header_url, files=files)
-            response.raise_for_status()
-            return response.text
\ No newline at end of file
+        return self._post_pdf(self.header_url, pdf_path)
+
+    def close(self):
+        self.session.close()
@@ -4,7 +4,8 @@ from smart_library.infrastructure.grobid.grobid_models import (
     DocumentBody, Section, Paragraph, InlineRef, Coordinates, CoordinateBox
 )
 from smart_library.infrastructure.grobid.utils import (
-    parse_coords, parse_affiliation, parse_surface, parse_section, parse_author, XMLParser
+    parse_coords, parse_affiliation, parse_surface, parse_section, parse_author, XMLParser,
+    parse_bibl_struct, resolve_inline_refs
 )
 
 class GrobidMapper:
@@ -16,9 +17,10 @@ class GrobidMapper:
     def xml_to_struct(self, xml_str: str) -> dict:
         """
         Main entry point.
-        Accepts a TEI XML string, extracts the <teiHeader>, <facsimile>, and <body> elements,
-        and maps them to dataclasses.
-        Returns: {"header": Header, "facsimile": Facsimile, "body": DocumentBody}
+        Accepts a TEI XML string, extracts the <teiHeader>, <facsimile>, <body> and
+        bibliography (<back>//<listBibl>) elements, and maps them to dataclasses.
+        Returns: {"header": Header, "facsimile": Facsimile, "body": DocumentBody,
+                  "bibliography": List[BibEntry]}
         """
         root = etree.fromstring(xml_str.encode("utf-8"))
         parser = XMLParser(root, self.NS)
@@ -27,12 +29,15 @@ class GrobidMapper:
             raise ValueError("No <teiHeader> found in XML.")
         facsimile_el = parser.find(".//tei:facsimile")
         body_el = parser.find(".//tei:text/tei:body")
+        back_el = parser.find(".//tei:text/tei:back")
 
         header = self.parse_tei_header(XMLParser(header_el, self.NS))
         facsimile = self.parse_facsimile(XMLParser(facsimile_el, self.NS)) if facsimile_el is not None else Facsimile()
         body = self.parse_body(XMLParser(body_el, self.NS)) if body_el is not None else DocumentBody()
+        bibliography = self.parse_bibliography(XMLParser(back_el, self.NS)) if back_el is not None else []
+        resolve_inline_refs(body.sections, bibliography)
 
-        return {"header": header, "facsimile": facsimile, "body": body}
+        return {"header": header, "facsimile": facsimile, "body": body, "bibliography": bibliography}
 
     # ------------------------------------------------------------
     # MAPPER: convert <teiHeader> → Header dataclass
@@ -105,3 +110,9 @@ class GrobidMapper:
     def parse_body(self, body_parser: XMLParser) -> DocumentBody:
         sections = [parse_section(div, body_parser.ns) for div in body_parser.findall(".//tei:div")]
         return DocumentBody(sections=sections)
+
+    # ------------------------------------------------------------
+    # MAPPER: convert <back>//<listBibl>/<biblStruct> → BibEntry list
+    # ------------------------------------------------------------
+    def parse_bibliography(self, back_parser: XMLParser) -> list:
+        return [parse_bibl_struct(b, back_parser.ns) for b in back_parser.findall(".//tei:listBibl/tei:biblStruct")]
@@ -66,6 +66,16 @@ class InlineRef:
     target: Optional[str]
     text: Optional[str]
     coords: Optional["Coordinates"] = None  # <-- updated
+    bib_key: Optional[str] = None  # resolved <biblStruct xml:id> for "#bN" bibliography refs
+
+@dataclass
+class BibEntry:
+    key: str  # xml:id of the <biblStruct>, e.g. "b12"
+    title: Optional[str] = None
+    authors: List[str] = field(default_factory=list)
+    year: Optional[int] = None
+    doi: Optional[str] = None
+    venue: Optional[str] = None
 
 @dataclass
 class CoordinateBox:
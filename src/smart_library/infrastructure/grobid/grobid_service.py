@@ -1,16 +1,134 @@
 from pathlib import Path
-from smart_library.infrastructure.grobid.grobid_client import GrobidClient
+from typing import Iterable, Iterator, Optional
+from smart_library.config import Grobid
+from smart_library.infrastructure.grobid.grobid_client import GrobidClient, GrobidResult
 from smart_library.infrastructure.grobid.grobid_mapper import GrobidMapper
+from smart_library.infrastructure.grobid.grobid_stream_mapper import StreamingGrobidMapper
+from smart_library.infrastructure.grobid.tei_cache import TeiCache, TeiCacheWriter
+from smart_library.utils.hashing import sha256_file
+
+
+class _TeeReader:
+    """Binary reader that copies everything read into a cache entry; a failing cache write only drops the copy."""
+
+    def __init__(self, source, sink: Optional[TeiCacheWriter]):
+        self.source = source
+        self.sink = sink
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.source.read(size)
+        if data and self.sink is not None:
+            try:
+                self.sink.write(data)
+            except OSError:
+                self.sink.abort()
+                self.sink = None
+        return data
+
+    def drain(self, chunk_size: int = 64 * 1024):
+        """Copy whatever the parser left unread (trailing whitespace) so the cached TEI is complete."""
+        while self.sink is not None and self.read(chunk_size):
+            pass
+
 
 class GrobidService:
-    def __init__(self, client: GrobidClient = None, mapper: GrobidMapper = None):
+    def __init__(self, client: GrobidClient = None, mapper: GrobidMapper = None, cache: TeiCache = None,
+                 use_cache: bool = Grobid.CACHE_ENABLED):
         self.client = client or GrobidClient()
-        self.mapper = mapper or GrobidMapper()
+        self.mapper = mapper or (StreamingGrobidMapper() if Grobid.MAPPER == "stream" else GrobidMapper())
+        self.cache = (cache or TeiCache()) if use_cache else None
+
+    def cache_key(self, pdf_path: Path) -> Optional[str]:
+        """
+        TEI cache key of a PDF, or None when the Grobid version is unknown: TEI
+        from different versions must not share entries, so the cache is bypassed.
+        """
+        version = Grobid.VERSION or self.client.version()
+        if not version:
+            return None
+        params = getattr(self.client, "FULLTEXT_PARAMS", [])
+        return TeiCache.make_key(sha256_file(pdf_path), version, params)
+
+    def extract_fulltext_xml(self, pdf_path: Path) -> str:
+        """
+        Returns the TEI XML for a PDF, from the on-disk cache when possible.
+        """
+        key = self.cache_key(pdf_path) if self.cache is not None else None
+        if key is None:
+            return self.client.extract_fulltext(pdf_path)
+        xml = self.cache.get(key)
+        if xml is None:
+            xml = self.client.extract_fulltext(pdf_path)
+            self._cache_put(key, xml)
+        return xml
+
+    def _cache_put(self, key: str, xml: str):
+        try:
+            self.cache.put(key, xml)
+        except OSError:
+            pass  # a failed cache write must not fail the extraction
+
+    def extract_many_xml(self, pdf_paths: Iterable[Path], concurrency: int = None) -> Iterator[GrobidResult]:
+        """
+        Yields a GrobidResult per PDF: cache hits first, then server results as they complete.
+        """
+        if self.cache is None:
+            yield from self.client.extract_many(pdf_paths, concurrency=concurrency)
+            return
+        keys = {}
+        for p in pdf_paths:
+            key = self.cache_key(p)
+            xml = self.cache.get(key) if key is not None else None
+            if xml is not None:
+                yield GrobidResult(Path(p), tei=xml)
+            else:
+                keys[Path(p)] = key
+        for result in self.client.extract_many(list(keys), concurrency=concurrency):
+            if result.ok and keys[result.path] is not None:
+                self._cache_put(keys[result.path], result.tei)
+            yield result
 
     def extract_fulltext(self, pdf_path: Path) -> dict:
         """
         Extracts fulltext TEI XML from PDF and parses to structured dataclasses.
         Returns: {"header": Header, "facsimile": Facsimile, "body": DocumentBody}
         """
-        xml = self.client.extract_fulltext(pdf_path)
+        if hasattr(self.mapper, "stream_to_struct") and hasattr(self.client, "stream_fulltext"):
+            # Streaming mapper: parse from the gzip file on a cache hit, or from
+            # the HTTP response as it arrives (teed into the cache) on a miss
+            key = self.cache_key(pdf_path) if self.cache is not None else None
+            stream = self.cache.open(key) if key is not None else None
+            if stream is not None:
+                try:
+                    with stream:
+                        return self.mapper.stream_to_struct(stream)
+                except (OSError, EOFError):
+                    # Truncated or corrupt entry (BadGzipFile is an OSError): a miss, like in `get`
+                    self.cache.discard(key)
+            return self._stream_from_server(pdf_path, key)
+        xml = self.extract_fulltext_xml(pdf_path)
         return self.mapper.xml_to_struct(xml)
+
+    def _stream_from_server(self, pdf_path: Path, key: Optional[str]) -> dict:
+        sink = None
+        if key is not None:
+            try:
+                sink = self.cache.writer(key)
+            except OSError:
+                pass  # a failed cache write must not fail the extraction
+        tee = None
+        try:
+            with self.client.stream_fulltext(pdf_path) as body:
+                tee = _TeeReader(body, sink)
+                struct = self.mapper.stream_to_struct(tee)
+                tee.drain()
+        except BaseException:
+            if sink is not None:
+                sink.abort()
+            raise
+        if tee.sink is not None:
+            try:
+                tee.sink.commit()
+            except OSError:
+                pass
+        return struct
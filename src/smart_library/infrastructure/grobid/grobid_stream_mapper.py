@@ -0,0 +1,113 @@
+import io
+from lxml import etree
+from smart_library.infrastructure.grobid.grobid_mapper import GrobidMapper
+from smart_library.infrastructure.grobid.grobid_models import Facsimile, DocumentBody
+from smart_library.infrastructure.grobid.utils import (
+    parse_surface, parse_section, parse_bibl_struct, resolve_inline_refs, XMLParser
+)
+
+TEI = "{http://www.tei-c.org/ns/1.0}"
+
+
+class StreamingGrobidMapper(GrobidMapper):
+    """
+    Single-pass `iterparse` variant of GrobidMapper for very large TEI documents.
+
+    Produces the same {"header", "facsimile", "body", "bibliography"} structure,
+    but maps each <teiHeader>, <surface>, body <div> and bibliography
+    <biblStruct> as soon as its end tag is read and then frees it, so peak
+    memory follows the largest section instead of the whole document. The rest
+    of <front> and <back> is discarded while streaming, as the tree mapper
+    ignores it too.
+    """
+
+    # ------------------------------------------------------------
+    # MAIN ENTRY: same contract as GrobidMapper.xml_to_struct
+    # ------------------------------------------------------------
+    def xml_to_struct(self, xml_str: str) -> dict:
+        return self.stream_to_struct(io.BytesIO(xml_str.encode("utf-8")))
+
+    def stream_to_struct(self, source) -> dict:
+        """
+        Maps TEI read from `source` (a path or a binary file-like object such as
+        an HTTP response stream or a gzip file).
+        Returns: {"header": Header, "facsimile": Facsimile, "body": DocumentBody,
+                  "bibliography": List[BibEntry]}
+        """
+        header = None
+        bibliography = []
+        in_back = False
+        surfaces = []
+        sections = []       # (start order, Section): nested divs end before their parent
+        div_seq = 0
+        open_divs = []      # start order of the body divs currently open (they nest)
+        in_body = False
+        in_facsimile = False
+        facsimile_seen = False
+
+        for event, el in etree.iterparse(source, events=("start", "end")):
+            tag = el.tag
+            if event == "start":
+                if tag == TEI + "body" and el.getparent() is not None and el.getparent().tag == TEI + "text":
+                    in_body = True
+                elif tag == TEI + "div" and in_body:
+                    open_divs.append(div_seq)
+                    div_seq += 1
+                elif tag == TEI + "facsimile" and not facsimile_seen:
+                    in_facsimile = facsimile_seen = True
+                elif tag == TEI + "back" and el.getparent() is not None and el.getparent().tag == TEI + "text":
+                    in_back = True
+                continue
+
+            # ---- end events ----
+            if tag == TEI + "teiHeader":
+                if header is None:
+                    header = self.parse_tei_header(XMLParser(el, self.NS))
+                self._release(el)
+            elif tag == TEI + "surface" and in_facsimile and el.getparent().tag == TEI + "facsimile":
+                surfaces.append(parse_surface(el))
+                self._release(el)
+            elif tag == TEI + "facsimile":
+                in_facsimile = False
+                self._release(el)
+            elif tag == TEI + "div" and in_body:
+                sections.append((open_divs.pop(), parse_section(el, self.NS)))
+                # Nested divs stay attached (emptied) so the parent's head/p
+                # children are still there when the parent ends.
+                if el.getparent() is not None and el.getparent().tag == TEI + "body":
+                    self._release(el)
+                else:
+                    el.clear(keep_tail=True)
+            elif tag == TEI + "body" and in_body:
+                in_body = False
+                self._release(el)
+            elif tag == TEI + "biblStruct" and in_back and el.getparent().tag == TEI + "listBibl":
+                bibliography.append(parse_bibl_struct(el, self.NS))
+                self._release(el)
+            elif tag == TEI + "back" and in_back:
+                in_back = False
+                self._release(el)
+            elif tag in (TEI + "front", TEI + "back"):
+                self._release(el)
+
+        if header is None:
+            raise ValueError("No <teiHeader> found in XML.")
+
+        sections.sort(key=lambda item: item[0])
+        body = DocumentBody(sections=[s for _, s in sections])
+        resolve_inline_refs(body.sections, bibliography)
+        return {
+            "header": header,
+            "facsimile": Facsimile(surfaces=surfaces),
+            "body": body,
+            "bibliography": bibliography,
+        }
+
+    @staticmethod
+    def _release(el):
+        """Clear a mapped element and drop already processed siblings before it."""
+        el.clear(keep_tail=True)
+        parent = el.getparent()
+        if parent is not None:
+            while el.getprevious() is not None:
+                del parent[0]
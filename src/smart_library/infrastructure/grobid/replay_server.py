@@ -0,0 +1,267 @@
+"""Offline stand-in for a Grobid server that replays recorded TEI.
+
+Speaks the subset of the Grobid REST API the library uses
+(`POST /api/processFulltextDocument`, `POST /api/processHeaderDocument`,
+`GET /api/version`, `GET /api/isalive`) and answers with TEI recorded from a
+real run, looked up by the sha256 of the uploaded PDF. Artificial latency and a
+concurrency limit (excess requests get `503` + `Retry-After`, like a saturated
+Grobid pool) make ingestion benchmarks reproducible without a container.
+
+Record fixtures with `scripts/record_grobid_fixtures.py`, then run:
+  PYTHONPATH=src python3 -m smart_library.infrastructure.grobid.replay_server \\
+      --fixtures tests/e2e/data/grobid --port 8070 --latency 1.5 --concurrency 4
+and point the client at it with GROBID_URL=http://127.0.0.1:8070.
+"""
+import argparse
+import email.policy
+import gzip
+import hashlib
+import os
+import random
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from smart_library.utils.hashing import sha256_file
+
+FIXTURE_SUFFIX = ".tei.xml.gz"
+PROCESS_PATHS = ("/api/processFulltextDocument", "/api/processHeaderDocument")
+
+
+class ReplayFixtures:
+    """Recorded TEI responses on disk, one gzip file per PDF sha256."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def path_for(self, pdf_sha256: str) -> Path:
+        return self.root / f"{pdf_sha256}{FIXTURE_SUFFIX}"
+
+    def get(self, pdf_sha256: str) -> Optional[bytes]:
+        try:
+            with gzip.open(self.path_for(pdf_sha256), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, pdf_sha256: str, tei: str) -> Path:
+        path = self.path_for(pdf_sha256)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb") as gz:
+                gz.write(tei.encode("utf-8"))
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        return path
+
+    def record(self, pdf_path: Path, tei: str) -> str:
+        """Store `tei` as the response for `pdf_path`; returns the PDF hash."""
+        digest = sha256_file(pdf_path)
+        self.put(digest, tei)
+        return digest
+
+    def hashes(self) -> List[str]:
+        if not self.root.exists():
+            return []
+        return sorted(p.name[: -len(FIXTURE_SUFFIX)] for p in self.root.glob(f"*{FIXTURE_SUFFIX}"))
+
+
+@dataclass
+class ReplayStats:
+    requests: int = 0
+    served: int = 0
+    missing: int = 0
+    busy: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, **deltas):
+        with self._lock:
+            for name, value in deltas.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {"requests": self.requests, "served": self.served, "missing": self.missing, "busy": self.busy}
+
+
+def _form_files(content_type: str, body: bytes) -> Dict[str, bytes]:
+    """Parse a multipart/form-data body into {field name: raw bytes}."""
+    message = BytesParser(policy=email.policy.HTTP).parsebytes(
+        b"Content-Type: " + content_type.encode("latin-1") + b"\r\n\r\n" + body
+    )
+    fields = {}
+    if not message.is_multipart():
+        return fields
+    for part in message.iter_parts():
+        name = part.get_param("name", header="content-disposition")
+        if name:
+            fields[name] = part.get_payload(decode=True) or b""
+    return fields
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    server_version = "GrobidReplay/1.0"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        if self.server.replay.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status: int, body: bytes = b"", content_type: str = "text/plain", headers: dict = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        replay = self.server.replay
+        if self.path == "/api/version":
+            self._send(200, replay.version.encode("utf-8"))
+        elif self.path == "/api/isalive":
+            self._send(200, b"true")
+        else:
+            self._send(404, b"not found")
+
+    def do_POST(self):
+        replay = self.server.replay
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length)  # always drain the request, even when answering 503
+        if self.path not in PROCESS_PATHS:
+            self._send(404, b"not found")
+            return
+        replay.stats.record(requests=1)
+
+        if not replay.slots.acquire(blocking=False):
+            replay.stats.record(busy=1)
+            self._send(503, b"server busy", headers={"Retry-After": str(replay.retry_after)})
+            return
+        try:
+            pdf = _form_files(self.headers.get("Content-Type", ""), body).get("input")
+            if pdf is None:
+                self._send(400, b"missing 'input' file field")
+                return
+            digest = hashlib.sha256(pdf).hexdigest()
+            time.sleep(replay.delay_for(len(pdf)))
+            tei = replay.fixtures.get(digest)
+            if tei is None:
+                replay.stats.record(missing=1)
+                self._send(404, f"no recorded TEI for {digest}".encode("utf-8"))
+                return
+            replay.stats.record(served=1)
+            self._send(200, tei, content_type="application/xml")
+        finally:
+            replay.slots.release()
+
+
+class GrobidReplayServer:
+    """Threaded HTTP server replaying `ReplayFixtures`.
+
+    Each request holds one of `max_concurrency` slots for
+    `latency + uniform(0, jitter) + latency_per_mb * size_mb` seconds.
+    """
+
+    def __init__(
+        self,
+        fixtures: ReplayFixtures,
+        host: str = "127.0.0.1",
+        port: int = 8070,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        latency_per_mb: float = 0.0,
+        max_concurrency: int = 4,
+        retry_after: int = 1,
+        version: str = "replay",
+        verbose: bool = False,
+    ):
+        self.fixtures = fixtures
+        self.latency = latency
+        self.jitter = jitter
+        self.latency_per_mb = latency_per_mb
+        self.max_concurrency = max(1, max_concurrency)
+        self.retry_after = retry_after
+        self.version = version
+        self.verbose = verbose
+        self.slots = threading.BoundedSemaphore(self.max_concurrency)
+        self.stats = ReplayStats()
+        self.httpd = ThreadingHTTPServer((host, port), _ReplayHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.replay = self
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def delay_for(self, size_bytes: int) -> float:
+        delay = self.latency + self.latency_per_mb * size_bytes / 1e6
+        if self.jitter:
+            delay += random.uniform(0, self.jitter)
+        return delay
+
+    def start(self) -> "GrobidReplayServer":
+        """Serve from a background thread (for tests and benchmarks)."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="grobid-replay", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self.httpd.serve_forever()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Replay recorded Grobid TEI responses.")
+    ap.add_argument("--fixtures", required=True, help="directory of <pdf sha256>.tei.xml.gz files")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8070)
+    ap.add_argument("--latency", type=float, default=0.0, help="base seconds per request")
+    ap.add_argument("--jitter", type=float, default=0.0, help="extra uniform random seconds per request")
+    ap.add_argument("--latency-per-mb", type=float, default=0.0, help="extra seconds per MB of PDF")
+    ap.add_argument("--concurrency", type=int, default=4, help="requests processed at once; others get 503")
+    ap.add_argument("--version", default="replay", help="reported by /api/version")
+    ap.add_argument("-v", "--verbose", action="store_true")
+    args = ap.parse_args(argv)
+
+    fixtures = ReplayFixtures(Path(args.fixtures))
+    server = GrobidReplayServer(
+        fixtures, host=args.host, port=args.port, latency=args.latency, jitter=args.jitter,
+        latency_per_mb=args.latency_per_mb, max_concurrency=args.concurrency, version=args.version,
+        verbose=args.verbose,
+    )
+    print(f"Replaying {len(fixtures.hashes())} recorded documents on {server.url} "
+          f"(concurrency {server.max_concurrency}, latency {args.latency}s + {args.jitter}s jitter)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(server.stats.snapshot())
+
+
+if __name__ == "__main__":
+    main()
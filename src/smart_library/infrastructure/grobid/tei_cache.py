@@ -0,0 +1,188 @@
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from smart_library.config import Grobid
+
+SUFFIX = ".tei.xml.gz"
+
+
+class TeiCacheWriter:
+    """A new cache entry being written: gzip into a temp file, published by `commit()`."""
+
+    def __init__(self, cache: "TeiCache", key: str):
+        self.cache = cache
+        self.key = key
+        self.path = cache.path_for(key)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".part")
+        self.tmp = Path(tmp)
+        self._raw = os.fdopen(fd, "wb")
+        self._gz = gzip.GzipFile(fileobj=self._raw, mode="wb")
+
+    def write(self, data: bytes) -> int:
+        return self._gz.write(data)
+
+    def commit(self) -> Path:
+        """Publish the entry atomically (rename), then enforce the cache's size cap."""
+        try:
+            self._gz.close()
+            self._raw.close()
+            os.replace(self.tmp, self.path)
+        except BaseException:
+            self.abort()
+            raise
+        self.cache.prune(self.cache.max_bytes, keep=self.key)
+        return self.path
+
+    def abort(self):
+        """Discard the partial entry."""
+        for f in (self._gz, self._raw):
+            try:
+                f.close()
+            except OSError:
+                pass
+        self.tmp.unlink(missing_ok=True)
+
+
+@dataclass
+class CacheEntry:
+    key: str
+    path: Path
+    size: int
+    last_used: float
+
+
+class TeiCache:
+    """Gzip-compressed TEI XML on disk, keyed by (pdf sha256, grobid version, request params).
+
+    Each entry is one file under `root/<key[:2]>/`. Reads touch the file's
+    mtime so it doubles as the last-used time; once the total size exceeds
+    `max_bytes` the least recently used entries are removed.
+    """
+
+    def __init__(self, root: Path = None, max_bytes: int = None):
+        self.root = Path(root or Grobid.CACHE_DIR)
+        self.max_bytes = Grobid.CACHE_MAX_BYTES if max_bytes is None else max_bytes
+
+    @staticmethod
+    def make_key(pdf_sha256: str, grobid_version: str, params: Iterable[Tuple[str, str]] = ()) -> str:
+        payload = json.dumps([pdf_sha256, grobid_version or "unknown", sorted(params or [])])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def path_for(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}{SUFFIX}"
+
+    def get(self, key: str) -> Optional[str]:
+        path = self.path_for(key)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                xml = f.read()
+        except (FileNotFoundError, OSError, EOFError):
+            return None
+        try:
+            os.utime(path)  # mark as recently used
+        except OSError:
+            pass
+        return xml
+
+    def open(self, key: str):
+        """
+        Open an entry as a binary stream of decompressed TEI, or None on a miss.
+        Corruption only shows while reading: callers treat OSError/EOFError
+        from the stream as a miss and `discard` the entry.
+        """
+        path = self.path_for(key)
+        try:
+            f = gzip.open(path, "rb")
+        except OSError:
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return f
+
+    def discard(self, key: str) -> bool:
+        """Remove an entry (e.g. one found corrupt while reading). True if there was one."""
+        try:
+            self.path_for(key).unlink()
+        except FileNotFoundError:
+            return False
+        return True
+
+    def writer(self, key: str) -> TeiCacheWriter:
+        """Start writing an entry incrementally (e.g. teed from a streamed response)."""
+        return TeiCacheWriter(self, key)
+
+    def put(self, key: str, xml: str) -> Path:
+        """Store `xml` atomically (temp file + rename), then enforce the size cap."""
+        writer = self.writer(key)
+        try:
+            writer.write(xml.encode("utf-8"))
+        except BaseException:
+            writer.abort()
+            raise
+        return writer.commit()
+
+    def entries(self) -> List[CacheEntry]:
+        """All entries, least recently used first."""
+        out = []
+        if not self.root.exists():
+            return out
+        for path in self.root.glob(f"*/*{SUFFIX}"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            out.append(CacheEntry(path.name[: -len(SUFFIX)], path, st.st_size, st.st_mtime))
+        out.sort(key=lambda e: e.last_used)
+        return out
+
+    def stats(self) -> dict:
+        entries = self.entries()
+        return {
+            "root": str(self.root),
+            "entries": len(entries),
+            "bytes": sum(e.size for e in entries),
+            "max_bytes": self.max_bytes,
+            "oldest": entries[0].last_used if entries else None,
+            "newest": entries[-1].last_used if entries else None,
+        }
+
+    def prune(self, max_bytes: int = None, older_than_days: float = None, keep: str = None) -> int:
+        """Evict entries unused for `older_than_days`, then LRU entries until under `max_bytes`.
+
+        Returns the number of removed entries.
+        """
+        entries = self.entries()
+        total = sum(e.size for e in entries)
+        cutoff = time.time() - older_than_days * 86400 if older_than_days is not None else None
+        removed = 0
+        for e in entries:
+            if e.key == keep:
+                continue
+            expired = cutoff is not None and e.last_used < cutoff
+            over = max_bytes is not None and max_bytes > 0 and total > max_bytes
+            if not (expired or over):
+                continue
+            try:
+                e.path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= e.size
+            removed += 1
+        return removed
+
+    def clear(self) -> int:
+        removed = 0
+        for e in self.entries():
+            e.path.unlink(missing_ok=True)
+            removed += 1
+        return removed
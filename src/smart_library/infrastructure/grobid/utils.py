@@ -1,8 +1,11 @@
 
+import re
 from smart_library.infrastructure.grobid.grobid_models import (
-    Affiliation, Author, Surface, InlineRef, Paragraph, Section, Coordinates, CoordinateBox
+    Affiliation, Author, Surface, InlineRef, Paragraph, Section, Coordinates, CoordinateBox, BibEntry
 )
 
+XML_ID = "{http://www.w3.org/XML/1998/namespace}id"
+
 # Namespace-aware XML parser utility
 class XMLParser:
     def __init__(self, element, ns=None):
@@ -136,4 +139,61 @@ def parse_author(author_el, ns, affiliations):
         affiliation_keys=aff_keys,
         org_names=org_names,
         affiliations=author_affiliations
-    )
\ No newline at end of file
+    )
+
+def parse_bibl_struct(bibl_el, ns):
+    """Map one <biblStruct> of the bibliography to a BibEntry."""
+    def text_or_none(el):
+        if el is None:
+            return None
+        text = "".join(el.itertext()).strip()
+        return text or None
+
+    analytic = bibl_el.find("tei:analytic", ns)
+    monogr = bibl_el.find("tei:monogr", ns)
+
+    # Article title lives in <analytic>; books/theses only have <monogr>
+    title = None
+    venue = None
+    monogr_title = text_or_none(monogr.find("tei:title", ns)) if monogr is not None else None
+    if analytic is not None:
+        title = text_or_none(analytic.find("tei:title", ns))
+        venue = monogr_title
+    if not title:
+        title, venue = monogr_title, None
+
+    authors = []
+    for source in (analytic, monogr):
+        if source is None or authors:
+            continue
+        for pers in source.findall("tei:author/tei:persName", ns):
+            last = text_or_none(pers.find("tei:surname", ns))
+            first = text_or_none(pers.find("tei:forename", ns))
+            if last and first:
+                authors.append(f"{last}, {first}")
+            elif last or first:
+                authors.append(last or first)
+
+    year = None
+    date_el = bibl_el.find(".//tei:imprint/tei:date", ns)
+    if date_el is not None:
+        m = re.search(r"\b(1[5-9]|20)\d{2}\b", date_el.get("when") or text_or_none(date_el) or "")
+        year = int(m.group(0)) if m else None
+
+    doi = None
+    for idno in bibl_el.findall(".//tei:idno", ns):
+        if (idno.get("type") or "").upper() == "DOI":
+            doi = text_or_none(idno)
+            break
+
+    return BibEntry(key=bibl_el.get(XML_ID), title=title, authors=authors, year=year, doi=doi, venue=venue)
+
+def resolve_inline_refs(sections, bibliography):
+    """Point "#bN" bibliography refs in paragraphs at their BibEntry key."""
+    keys = {b.key for b in bibliography if b.key}
+    for section in sections:
+        for para in section.paragraphs:
+            for ref in para.references:
+                if ref.ref_type == "bibr" and ref.target and ref.target.startswith("#"):
+                    key = ref.target[1:]
+                    ref.bib_key = key if key in keys else None
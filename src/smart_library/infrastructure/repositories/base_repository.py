@@ -1,7 +1,11 @@
-from typing import Any, Dict, Optional, TypeVar, Generic
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple, TypeVar, Generic
+import base64
 import json
-from smart_library.infrastructure.db.db import get_connection
+import sqlite3
+from smart_library.infrastructure.db.db import get_connection, transaction
+from smart_library.infrastructure.repositories.change_log_repository import ChangeLogRepository
 from smart_library.domain.entities.entity import Entity
+from smart_library.infrastructure.repositories.row_views import ENTITY_COLUMNS, RowView
 
 E = TypeVar("E", bound=Entity)
 
@@ -21,11 +25,46 @@ def _from_json(value, default):
         return default
 
 
+# Stay well below SQLite's bound-parameter limit when building IN (...) lists.
+MAX_IN_PARAMS = 500
+
+
+def _chunked(items, size: int = MAX_IN_PARAMS):
+    items = list(items)
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Opaque, URL-safe pagination cursor for a sort position."""
+    raw = json.dumps(list(values), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """Inverse of `encode_cursor`; raises ValueError for a malformed cursor."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError as e:  # binascii, unicode and JSON errors are all ValueErrors
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+    if not isinstance(values, list):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return values
+
+
+class KeysetPage(NamedTuple):
+    items: List[Any]
+    next_cursor: Optional[str]  # None on the last page
+    total: int                  # exact size of the whole listing
+    keys: Optional[List[Tuple[Any, str]]] = None  # (sort key, id) of each item, for merging pages
+
+
 class BaseRepository(Generic[E]):
     table: str  # child table
     columns: Dict[str, str]  # db_column -> entity_attribute
     json_columns: set[str] = set()  # db columns to JSON-encode
     join_entity: bool = True
+    view: type = RowView  # read model returned by get_views()/page(columns=...)
 
     def __init__(self, conn=None):
         if conn is None:
@@ -53,6 +92,52 @@ class BaseRepository(Generic[E]):
             ],
         )
 
+    # ---------- Bulk helpers (no commit: the caller owns the transaction) ----------
+    def _insert_entities(self, entities, entity_kind: Optional[str] = None):
+        sql = """
+        INSERT INTO entity
+        (id, created_at, modified_at, created_by, updated_by, parent_id, entity_kind, metadata)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """
+        self.conn.executemany(
+            sql,
+            [
+                (
+                    e.id,
+                    e.created_at,
+                    e.modified_at,
+                    e.created_by,
+                    e.updated_by,
+                    e.parent_id or None,
+                    entity_kind or e.__class__.__name__,
+                    _to_json(e.metadata),
+                )
+                for e in entities
+            ],
+        )
+
+    def _existing_ids(self, entity_ids) -> set:
+        """Return the subset of `entity_ids` that already has an entity row."""
+        found = set()
+        for batch in _chunked(entity_ids):
+            placeholders = ",".join("?" * len(batch))
+            rows = self.conn.execute(f"SELECT id FROM entity WHERE id IN ({placeholders})", batch).fetchall()
+            found.update(row["id"] for row in rows)
+        return found
+
+    def _delete_entities(self, entity_ids):
+        """Delete leaf entities and their vectors in batches."""
+        for batch in _chunked(entity_ids):
+            placeholders = ",".join("?" * len(batch))
+            for table in ("vector", "vector_fallback"):
+                try:
+                    ChangeLogRepository(self.conn).record_select(
+                        "vector", "delete", f"SELECT id FROM {table} WHERE id IN ({placeholders})", batch)
+                    self.conn.execute(f"DELETE FROM {table} WHERE id IN ({placeholders})", batch)
+                except Exception:
+                    pass  # vector table might not exist on this schema
+            self.conn.execute(f"DELETE FROM entity WHERE id IN ({placeholders})", batch)
+
     def _update_entity_meta(self, e: Entity):
         sql = """
         UPDATE entity SET modified_at=?, updated_by=?, metadata=? WHERE id=?
@@ -63,41 +148,180 @@ class BaseRepository(Generic[E]):
         )
 
     def _delete_entity(self, entity_id: str):
-        # First delete vectors for this entity and all its descendants
-        # (vector table is virtual and doesn't have foreign key cascades)
-        # Find all descendant entity IDs (transitive closure of parent_id relationships)
-        descendant_ids = self._get_descendant_ids(entity_id)
-        all_ids = [entity_id] + descendant_ids
-        
-        if all_ids:
-            placeholders = ",".join("?" * len(all_ids))
-            try:
-                self.conn.execute(f"DELETE FROM vector WHERE id IN ({placeholders})", all_ids)
-            except Exception:
-                pass  # vector table might not exist or might be different type
-            
-            try:
-                self.conn.execute(f"DELETE FROM vector_fallback WHERE id IN ({placeholders})", all_ids)
-            except Exception:
-                pass  # fallback table might not exist
-        
-        # Now delete the entity (which cascades to child tables like text_entity, document, etc)
-        self.conn.execute("DELETE FROM entity WHERE id=?", (entity_id,))
+        """Delete an entity, its descendants and their vectors (no commit)."""
+        self._delete_subtree([entity_id])
 
     def _get_descendant_ids(self, entity_id: str):
-        """Get all descendant entity IDs (recursive children)."""
-        descendants = []
-        children = self.conn.execute(
-            "SELECT id FROM entity WHERE parent_id=?", (entity_id,)
+        """Get all descendant entity IDs (recursive children), in one query."""
+        rows = self.conn.execute(
+            """
+            WITH RECURSIVE subtree(id) AS (
+                SELECT id FROM entity WHERE parent_id = ?
+                UNION
+                SELECT e.id FROM entity e JOIN subtree s ON e.parent_id = s.id
+            )
+            SELECT id FROM subtree
+            """,
+            (entity_id,),
         ).fetchall()
-        
-        for child in children:
-            child_id = child["id"]
-            descendants.append(child_id)
-            # Recursively get descendants of this child
-            descendants.extend(self._get_descendant_ids(child_id))
-        
-        return descendants
+        return [row["id"] for row in rows]
+
+    # ---------- Subtree deletion ----------
+    def delete_subtree(self, entity_ids) -> int:
+        """
+        Delete entities with all their descendants and vectors in one
+        transaction (joins the caller's transaction if one is open).
+        Returns the number of entities deleted.
+        """
+        if self.conn.in_transaction:
+            return self._delete_subtree(entity_ids)
+        with transaction(self.conn):
+            return self._delete_subtree(entity_ids)
+
+    def _delete_subtree(self, entity_ids) -> int:
+        """
+        Collect the subtrees of `entity_ids` with one recursive query (over
+        idx_entity_parent) into a temp table, delete (and log) their vectors
+        with a join on it (vec0 tables have no foreign keys), then delete the
+        entities; child tables and relationships follow through ON DELETE
+        CASCADE, and the change-log triggers record every deleted row.
+        """
+        conn = self.conn
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS _subtree_root (id TEXT PRIMARY KEY)")
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS _subtree (id TEXT PRIMARY KEY)")
+        conn.execute("DELETE FROM temp._subtree_root")
+        conn.execute("DELETE FROM temp._subtree")
+        try:
+            conn.executemany("INSERT OR IGNORE INTO temp._subtree_root (id) VALUES (?)", [(i,) for i in entity_ids])
+            conn.execute(
+                """
+                INSERT INTO temp._subtree (id)
+                WITH RECURSIVE subtree(id) AS (
+                    SELECT r.id FROM temp._subtree_root r JOIN entity e ON e.id = r.id
+                    UNION
+                    SELECT e.id FROM entity e JOIN subtree s ON e.parent_id = s.id
+                )
+                SELECT id FROM subtree
+                """
+            )
+            count = conn.execute("SELECT COUNT(*) FROM temp._subtree").fetchone()[0]
+            for table in ("vector", "vector_fallback"):
+                try:
+                    subtree = f"SELECT id FROM {table} WHERE id IN (SELECT id FROM temp._subtree)"
+                    ChangeLogRepository(conn).record_select("vector", "delete", subtree)
+                    conn.execute(f"DELETE FROM {table} WHERE id IN (SELECT id FROM temp._subtree)")
+                except sqlite3.OperationalError:
+                    pass  # vector table might not exist on this schema
+            conn.execute("DELETE FROM entity WHERE id IN (SELECT id FROM temp._subtree)")
+            return count
+        finally:
+            conn.execute("DELETE FROM temp._subtree_root")
+            conn.execute("DELETE FROM temp._subtree")
+
+    def _fetch_joined_rows(self, entity_ids) -> Dict[str, Dict[str, Any]]:
+        """
+        Entity + child rows for `entity_ids` as `{id: row}`: one JOIN query
+        per MAX_IN_PARAMS ids. Entity columns win over same-named child columns.
+        """
+        found: Dict[str, Dict[str, Any]] = {}
+        for batch in _chunked(dict.fromkeys(entity_ids)):
+            placeholders = ",".join("?" * len(batch))
+            rows = self.conn.execute(
+                f"SELECT c.*, e.* FROM entity e JOIN {self.table} c ON c.id = e.id WHERE e.id IN ({placeholders})",
+                batch,
+            ).fetchall()
+            found.update((row["id"], dict(row)) for row in rows)
+        return found
+
+    def _get_many(self, entity_ids, build) -> List[E]:
+        """Build entities for `entity_ids` in the requested order; unknown ids are skipped."""
+        entity_ids = list(entity_ids)
+        built = {eid: build(row) for eid, row in self._fetch_joined_rows(entity_ids).items()}
+        return [built[eid] for eid in entity_ids if eid in built]
+
+    # ---------- Counting and keyset pagination ----------
+    def count(self) -> int:
+        """
+        Exact number of rows in the child table, read from the trigger-kept
+        `row_count` table (COUNT(*) on databases that predate it).
+        """
+        try:
+            row = self.conn.execute("SELECT n FROM row_count WHERE name = ?", (self.table,)).fetchone()
+        except sqlite3.OperationalError:
+            row = None  # no row_count table (migration 0005 not applied)
+        if row is not None:
+            return row[0]
+        return self.conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def _keyset_page(self, build, order: str, key_sql: str, id_sql: str, limit: int = 50,
+                     after: Optional[str] = None, descending: bool = False,
+                     where: str = "", params: Sequence[Any] = (), columns: Sequence[str] = None) -> KeysetPage:
+        """
+        One page of entity + child rows ordered by (`key_sql`, `id_sql`),
+        continuing after the position in the `after` cursor. Instead of OFFSET
+        the query seeks past the last (key, id) seen on an index over that
+        pair, so page 5000 costs the same as page 1. The leading `key >= ?`
+        term lets SQLite seek on expression indexes as well. Cursors are tagged
+        with `order` and rejected (ValueError) for a different order.
+        With `columns`, items are row views over just those columns.
+        """
+        op, direction = ("<", "DESC") if descending else (">", "ASC")
+        clauses, args = ([where], list(params)) if where else ([], [])
+        if after:
+            tag, key, last_id = (decode_cursor(after) + [None, None, None])[:3]
+            if tag != order or last_id is None:
+                raise ValueError(f"Cursor does not belong to a listing ordered by {order!r}")
+            clauses.append(f"{key_sql} {op}= ? AND ({key_sql}, {id_sql}) {op} (?, ?)")
+            args += [key, key, last_id]
+        select = "c.*, e.*" if columns is None else self._view_select(columns)
+        sql = f"SELECT {select}, {key_sql} AS _key FROM entity e JOIN {self.table} c ON c.id = e.id"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY {key_sql} {direction}, {id_sql} {direction} LIMIT ?"
+        rows = self._row_cursor().execute(sql, args + [limit + 1]).fetchall()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor([order, rows[-1]["_key"], rows[-1]["id"]])
+        items = [build(dict(row)) for row in rows] if columns is None else [self._make_view(row) for row in rows]
+        return KeysetPage(items, next_cursor, self.count(), [(row["_key"], row["id"]) for row in rows])
+
+    # ---------- Row views (read model) ----------
+    def _row_cursor(self) -> sqlite3.Cursor:
+        cur = self.conn.cursor()
+        cur.row_factory = sqlite3.Row
+        return cur
+
+    def _view_select(self, columns: Optional[Sequence[str]]) -> str:
+        """Select list for `columns` (attribute names; None: all) of the entity + child join."""
+        if columns is None:
+            return "e.*, c.*"
+        needed = dict.fromkeys(["id"])
+        for name in columns:
+            needed.update(dict.fromkeys(self.view.columns_for(name)))
+        return ", ".join(f'{"e" if col in ENTITY_COLUMNS else "c"}."{col}"' for col in needed)
+
+    def _make_view(self, row) -> RowView:
+        return self.view(row)
+
+    def get_views(self, entity_ids, columns: Optional[Sequence[str]] = None) -> List[RowView]:
+        """
+        Lightweight read model for `entity_ids` (request order, unknown ids
+        skipped): slotted views over the rows, selecting only `columns` when
+        given. No entity objects, dict copies or JSON decoding up front.
+        """
+        entity_ids = list(entity_ids)
+        select = self._view_select(columns)
+        cur = self._row_cursor()
+        found = {}
+        for batch in _chunked(dict.fromkeys(entity_ids)):
+            placeholders = ",".join("?" * len(batch))
+            for row in cur.execute(
+                f"SELECT {select} FROM entity e JOIN {self.table} c ON c.id = e.id WHERE e.id IN ({placeholders})",
+                batch,
+            ):
+                found[row["id"]] = self._make_view(row)
+        return [found[eid] for eid in entity_ids if eid in found]
 
     def _fetch_entity_row(self, entity_id: str) -> Optional[Dict[str, Any]]:
         row = self.conn.execute("SELECT * FROM entity WHERE id=?", (entity_id,)).fetchone()
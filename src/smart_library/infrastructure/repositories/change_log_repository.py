@@ -0,0 +1,140 @@
+import sqlite3
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+SOURCES = ("entity", "text_entity", "vector")
+
+
+class Change(NamedTuple):
+    seq: int
+    source: str     # 'entity', 'text_entity' or 'vector'
+    entity_id: str
+    op: str         # 'insert', 'update' or 'delete'
+    changed_at: str
+
+
+def coalesce(changes: Iterable[Change]) -> Dict[Tuple[str, str], Change]:
+    """Latest change per `(source, entity_id)`: a consumer only needs the final state of each row."""
+    latest: Dict[Tuple[str, str], Change] = {}
+    for change in changes:
+        latest[(change.source, change.entity_id)] = change
+    return latest
+
+
+class ChangeLogRepository:
+    """
+    Monotonic log of entity, text and vector changes (`change_log` table).
+
+    Entity and text rows are logged by triggers; vectors by VectorRepository
+    and subtree deletion, in the same transaction as the write. SQLite has a
+    single writer, so sequence numbers become visible in order: a consumer
+    that has applied everything up to `seq` catches up with
+    `changes_since(seq)` in O(changes), without rescanning the library.
+
+    Consumers (an ANN index, caches, snapshots) keep their position in
+    `change_checkpoint`. A new consumer reads `latest_seq()`, builds from
+    the tables, then stores that seq as its checkpoint. Rows written by the
+    bulk import are not logged (it drops triggers), so consumers of an
+    imported library start from scratch the same way.
+    """
+
+    table = "change_log"
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    # ---------- Writing ----------
+    def record(self, source: str, op: str, entity_ids: Iterable[str]) -> int:
+        """Log `op` for `entity_ids` (no commit: the caller's transaction covers the write and its log)."""
+        rows = [(source, eid, op) for eid in entity_ids]
+        if not rows:
+            return 0
+        return self._write("INSERT INTO change_log (source, entity_id, op) VALUES (?, ?, ?)", rows, many=True)
+
+    def record_select(self, source: str, op: str, select_sql: str, params: Sequence = ()) -> int:
+        """Log `op` for the ids returned by `select_sql` (one column), before the caller deletes them."""
+        return self._write(
+            f"INSERT INTO change_log (source, entity_id, op) SELECT ?, id, ? FROM ({select_sql})",
+            [source, op, *params],
+        )
+
+    def _write(self, sql, params, many=False) -> int:
+        try:
+            cur = self.conn.executemany(sql, params) if many else self.conn.execute(sql, params)
+        except sqlite3.OperationalError as e:
+            if "change_log" in str(e):
+                return 0  # database predates migration 0007: nothing to log into
+            raise
+        return cur.rowcount
+
+    # ---------- Reading ----------
+    def latest_seq(self) -> int:
+        """Highest seq ever assigned (AUTOINCREMENT keeps it in sqlite_sequence, also after compaction)."""
+        row = self.conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'change_log'").fetchone()
+        return row[0] if row else 0
+
+    def changes_since(self, seq: int, limit: int = 1000, sources: Optional[Sequence[str]] = None) -> List[Change]:
+        """Up to `limit` changes after `seq`, oldest first (a range scan on the primary key)."""
+        sql = "SELECT seq, source, entity_id, op, changed_at FROM change_log WHERE seq > ?"
+        args: list = [seq]
+        if sources is not None:
+            sql += f" AND source IN ({','.join('?' * len(sources))})"
+            args += list(sources)
+        sql += " ORDER BY seq LIMIT ?"
+        return [Change(*row) for row in self.conn.execute(sql, args + [limit])]
+
+    # ---------- Consumers ----------
+    def checkpoint(self, consumer: str) -> int:
+        """Last seq `consumer` has applied (0: nothing yet)."""
+        row = self.conn.execute("SELECT seq FROM change_checkpoint WHERE consumer = ?", (consumer,)).fetchone()
+        return row[0] if row else 0
+
+    def set_checkpoint(self, consumer: str, seq: int) -> None:
+        self.conn.execute(
+            """
+            INSERT INTO change_checkpoint (consumer, seq) VALUES (?, ?)
+            ON CONFLICT(consumer) DO UPDATE SET
+                seq = excluded.seq,
+                updated_at = strftime('%Y-%m-%dT%H:%M:%f', 'now')
+            """,
+            (consumer, seq),
+        )
+        self.conn.commit()
+
+    def checkpoints(self) -> Dict[str, int]:
+        return {row[0]: row[1] for row in self.conn.execute("SELECT consumer, seq FROM change_checkpoint ORDER BY consumer")}
+
+    def drop_consumer(self, consumer: str) -> None:
+        self.conn.execute("DELETE FROM change_checkpoint WHERE consumer = ?", (consumer,))
+        self.conn.commit()
+
+    def catch_up(self, consumer: str, apply: Callable[[List[Change]], None], batch_size: int = 1000,
+                 sources: Optional[Sequence[str]] = None) -> int:
+        """
+        Feed the changes after `consumer`'s checkpoint to `apply` in batches,
+        storing the checkpoint after each batch. Delivery is at-least-once:
+        if `apply` fails (or the process dies) the batch is replayed next
+        time, so `apply` must be idempotent. Returns the number of changes.
+        """
+        seq = self.checkpoint(consumer)
+        total = 0
+        while True:
+            batch = self.changes_since(seq, limit=batch_size, sources=sources)
+            if not batch:
+                return total
+            apply(batch)
+            seq = batch[-1].seq
+            self.set_checkpoint(consumer, seq)
+            total += len(batch)
+
+    # ---------- Maintenance ----------
+    def compact(self) -> int:
+        """
+        Delete the changes every registered consumer has applied. Without
+        consumers nobody needs the log (a new consumer builds from the tables
+        and starts at `latest_seq()`), so everything up to `latest_seq()` goes.
+        """
+        row = self.conn.execute("SELECT MIN(seq) FROM change_checkpoint").fetchone()
+        upto = self.latest_seq() if row[0] is None else row[0]
+        cur = self.conn.execute("DELETE FROM change_log WHERE seq <= ?", (upto,))
+        self.conn.commit()
+        return cur.rowcount
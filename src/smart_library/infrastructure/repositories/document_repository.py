@@ -1,13 +1,15 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 import json
 import sqlite3
 
 from smart_library.domain.entities.document import Document
-from smart_library.infrastructure.repositories.base_repository import BaseRepository, _to_json, _from_json
+from smart_library.infrastructure.repositories.base_repository import BaseRepository, KeysetPage, _to_json, _from_json
+from smart_library.infrastructure.repositories.row_views import DocumentView
 
 
 class DocumentRepository(BaseRepository[Document]):
     table = "document"
+    view = DocumentView
     # Map DB columns to Document attributes
     columns = {
         "id": "id",
@@ -28,6 +30,13 @@ class DocumentRepository(BaseRepository[Document]):
         "page_count": "page_count",
     }
     json_columns = {"authors", "keywords"}
+    # Listing orders: sort key and id column, each pair backed by an index
+    # (idx_entity_kind_created, idx_document_title_id, idx_document_year_id)
+    ORDERS = {
+        "created": ("e.created_at", "e.id"),
+        "title": ("ifnull(c.title, '') COLLATE NOCASE", "c.id"),
+        "year": ("ifnull(c.year, 0)", "c.id"),
+    }
 
     def row_to_entity(self, row: Dict[str, Any]) -> Document:
         # Split e.* and c.* fields after join; prefer child alias keys
@@ -69,6 +78,8 @@ class DocumentRepository(BaseRepository[Document]):
             page_count=data.get("page_count"),
             citation_key=data.get("citation_key"),
             human_id=data.get("human_id"),
+            reference_list=_from_json(data.get("reference_list"), None),
+            citations=_from_json(data.get("citations"), None),
         )
 
     def get_entity(self, entity_id: str) -> Optional[Document]:
@@ -78,12 +89,19 @@ class DocumentRepository(BaseRepository[Document]):
         return self.row_to_entity(row)
 
     def add(self, doc: Document):
+        self._insert_row(doc)
+        self.conn.commit()
+        return doc.id
+
+    def _insert_row(self, doc: Document):
+        """Insert the entity and document rows without committing."""
         self._insert_entity(doc)
         sql = """
         INSERT INTO document (id, type, source_path, source_url, source_format, file_hash,
                       version, page_count, title, authors, keywords, doi,
-                      publication_date, publisher, venue, year, abstract, citation_key, human_id)
-        VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
+                      publication_date, publisher, venue, year, reference_list, citations,
+                      abstract, citation_key, human_id)
+        VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
         """
         try:
             self.conn.execute(
@@ -105,6 +123,8 @@ class DocumentRepository(BaseRepository[Document]):
                     doc.publisher,
                     doc.venue,
                     doc.year,
+                    _to_json(getattr(doc, "reference_list", None)),
+                    _to_json(getattr(doc, "citations", None)),
                     getattr(doc, "abstract", None),
                     getattr(doc, "citation_key", None),
                     getattr(doc, "human_id", None),
@@ -115,8 +135,8 @@ class DocumentRepository(BaseRepository[Document]):
             sql_fallback = """
             INSERT INTO document (id, type, source_path, source_url, source_format, file_hash,
                                   version, page_count, title, authors, keywords, doi,
-                                  publication_date, publisher, venue, year)
-            VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
+                                  publication_date, publisher, venue, year, reference_list, citations)
+            VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
             """
             self.conn.execute(
                 sql_fallback,
@@ -137,27 +157,22 @@ class DocumentRepository(BaseRepository[Document]):
                     doc.publisher,
                     doc.venue,
                     doc.year,
+                    _to_json(getattr(doc, "reference_list", None)),
+                    _to_json(getattr(doc, "citations", None)),
                 ],
             )
-        self.conn.commit()
-        return doc.id
 
-    def get(self, doc_id: str) -> Optional[Document]:
-        es = self._fetch_entity_row(doc_id)
-        if not es:
-            return None
-        row = self.conn.execute("SELECT * FROM document WHERE id=?", (doc_id,)).fetchone()
-        if not row:
-            return None
-        r = dict(row)
+    @staticmethod
+    def _document_from_row(r) -> Document:
+        """Build a `Document` from a joined `entity` + `document` row."""
         return Document(
-            id=es["id"],
-            created_at=es["created_at"],
-            modified_at=es["modified_at"],
-            created_by=es.get("created_by"),
-            updated_by=es.get("updated_by"),
-            parent_id=es.get("parent_id"),
-            metadata=_from_json(es.get("metadata"), {}),
+            id=r["id"],
+            created_at=r["created_at"],
+            modified_at=r["modified_at"],
+            created_by=r.get("created_by"),
+            updated_by=r.get("updated_by"),
+            parent_id=r.get("parent_id"),
+            metadata=_from_json(r.get("metadata"), {}),
             type=r.get("type"),
             source_path=r.get("source_path"),
             source_url=r.get("source_url"),
@@ -175,85 +190,177 @@ class DocumentRepository(BaseRepository[Document]):
             abstract=r.get("abstract"),
             citation_key=r.get("citation_key"),
             human_id=r.get("human_id"),
+            reference_list=_from_json(r.get("reference_list"), None),
+            citations=_from_json(r.get("citations"), None),
         )
 
+    def get(self, doc_id: str) -> Optional[Document]:
+        es = self._fetch_entity_row(doc_id)
+        if not es or es.get("deleted_at"):
+            return None
+        row = self.conn.execute("SELECT * FROM document WHERE id=?", (doc_id,)).fetchone()
+        if not row:
+            return None
+        return self._document_from_row({**dict(row), **es})
+
+    def get_many(self, doc_ids) -> List[Document]:
+        """Documents for `doc_ids` in the given order (one query; unknown and tombstoned ids are skipped)."""
+        doc_ids = list(doc_ids)
+        rows = self._fetch_joined_rows(doc_ids)
+        return [self._document_from_row(rows[d]) for d in doc_ids if d in rows and not rows[d].get("deleted_at")]
+
     def update(self, doc: Document):
+        self._update_row(doc)
+        self.conn.commit()
+
+    def _update_row(self, doc: Document):
+        """Update the entity and document rows without committing."""
         self._update_entity_meta(doc)
         sql = """
         UPDATE document SET
             type=?, source_path=?, source_url=?, source_format=?, file_hash=?,
             version=?, page_count=?, title=?, authors=?, keywords=?, doi=?,
-            publication_date=?, publisher=?, venue=?, year=?, abstract=?, citation_key=?, human_id=?
+            publication_date=?, publisher=?, venue=?, year=?, reference_list=?, citations=?,
+            abstract=?, citation_key=?, human_id=?
         WHERE id=?
         """
-        self.conn.execute(
-            sql,
-            [
-                doc.type,
-                doc.source_path,
-                doc.source_url,
-                doc.source_format,
-                doc.file_hash,
-                doc.version,
-                doc.page_count,
-                doc.title,
-                _to_json(doc.authors),
-                _to_json(doc.keywords),
-                doc.doi,
-                doc.publication_date,
-                doc.publisher,
-                doc.venue,
-                doc.year,
-                getattr(doc, "abstract", None),
-                getattr(doc, "citation_key", None),
-                getattr(doc, "human_id", None),
-                doc.id,
-            ],
+        values = [
+            doc.type,
+            doc.source_path,
+            doc.source_url,
+            doc.source_format,
+            doc.file_hash,
+            doc.version,
+            doc.page_count,
+            doc.title,
+            _to_json(doc.authors),
+            _to_json(getattr(doc, "keywords", None)),
+            doc.doi,
+            doc.publication_date,
+            doc.publisher,
+            doc.venue,
+            doc.year,
+            _to_json(getattr(doc, "reference_list", None)),
+            _to_json(getattr(doc, "citations", None)),
+        ]
+        try:
+            self.conn.execute(
+                sql,
+                values + [
+                    getattr(doc, "abstract", None),
+                    getattr(doc, "citation_key", None),
+                    getattr(doc, "human_id", None),
+                    doc.id,
+                ],
+            )
+        except sqlite3.OperationalError:
+            # Fallback for older schemas that don't have abstract/citation_key
+            sql_fallback = """
+            UPDATE document SET
+                type=?, source_path=?, source_url=?, source_format=?, file_hash=?,
+                version=?, page_count=?, title=?, authors=?, keywords=?, doi=?,
+                publication_date=?, publisher=?, venue=?, year=?, reference_list=?, citations=?
+            WHERE id=?
+            """
+            self.conn.execute(sql_fallback, values + [doc.id])
+
+    def delete(self, doc_id: str) -> int:
+        """
+        Delete a document with its pages, texts, headings, relationships and
+        vectors in one transaction. Returns the number of entities deleted.
+        """
+        return self.delete_subtree([doc_id])
+
+    # ---------- Tombstones (soft delete) ----------
+    def tombstone(self, doc_id: str) -> bool:
+        """
+        Mark a document deleted: one indexed UPDATE, so it returns at once.
+        Search and listings skip it from now on; `purge_step` removes its rows
+        later. False if there is no such (live) document.
+        """
+        cur = self.conn.execute(
+            """
+            UPDATE entity SET deleted_at = strftime('%Y-%m-%dT%H:%M:%f', 'now')
+            WHERE id = ? AND entity_kind = 'Document' AND deleted_at IS NULL
+            """,
+            (doc_id,),
         )
         self.conn.commit()
+        return cur.rowcount > 0
 
-    def delete(self, doc_id: str):
-        """Delete a document and all its associated texts and vectors."""
-        # First, find all text entities associated with this document
-        # Navigate: document -> pages -> texts
-        page_sql = "SELECT page.id FROM page JOIN entity ON page.id = entity.id WHERE entity.parent_id = ?"
-        page_rows = self.conn.execute(page_sql, (doc_id,)).fetchall()
-        
-        # Delete all vectors for texts in this document
-        if page_rows:
-            from smart_library.application.services.vector_service import VectorService
-            vector_service = VectorService()
-            
-            page_ids = [row["id"] for row in page_rows]
-            
-            # Get all text entities for these pages
-            placeholders = ",".join("?" for _ in page_ids)
-            text_sql = f"""
-                SELECT text_entity.id FROM text_entity
-                JOIN entity ON text_entity.id = entity.id
-                WHERE entity.parent_id IN ({placeholders})
+    def tombstoned(self, limit: int = 100) -> List[str]:
+        """Ids of documents awaiting purge, oldest tombstone first (idx_entity_deleted)."""
+        rows = self.conn.execute(
             """
-            text_rows = self.conn.execute(text_sql, tuple(page_ids)).fetchall()
-            
-            # Delete vectors for each text
-            for text_row in text_rows:
-                try:
-                    vector_service.delete_vector(text_row["id"])
-                except Exception as e:
-                    print(f"Warning: Failed to delete vector {text_row['id']}: {e}")
-        
-        # Then delete the document and cascade to related tables
-        self._delete_entity(doc_id)
-        self.conn.commit()
+            SELECT id FROM entity
+            WHERE deleted_at IS NOT NULL AND entity_kind = 'Document'
+            ORDER BY deleted_at LIMIT ?
+            """,
+            (limit,),
+        ).fetchall()
+        return [row["id"] for row in rows]
+
+    def count(self) -> int:
+        """Live documents: the `row_count` total minus the tombstones awaiting purge."""
+        return super().count() - self.count_tombstoned()
+
+    def count_tombstoned(self) -> int:
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM entity WHERE deleted_at IS NOT NULL AND entity_kind = 'Document'"
+        ).fetchone()[0]
+
+    def purge_step(self, doc_id: str, batch_size: int = 500) -> Tuple[int, bool]:
+        """
+        Physically delete up to `batch_size` entities (and their vectors) of a
+        tombstoned document, deepest first, in one short transaction; the
+        document row itself goes last. Returns `(deleted, finished)`.
+        Raises ValueError for a document that is not tombstoned.
+        """
+        row = self.conn.execute("SELECT deleted_at FROM entity WHERE id = ?", (doc_id,)).fetchone()
+        if row is None:
+            return 0, True
+        if row["deleted_at"] is None:
+            raise ValueError(f"Document {doc_id} is not deleted; tombstone it before purging")
+        rows = self.conn.execute(
+            """
+            WITH RECURSIVE subtree(id, depth) AS (
+                SELECT id, 1 FROM entity WHERE parent_id = ?
+                UNION ALL
+                SELECT e.id, s.depth + 1 FROM entity e JOIN subtree s ON e.parent_id = s.id
+            )
+            SELECT id FROM subtree ORDER BY depth DESC LIMIT ?
+            """,
+            (doc_id, batch_size),
+        ).fetchall()
+        ids = [r["id"] for r in rows] or [doc_id]
+        return self.delete_subtree(ids), ids == [doc_id]
 
     def list(self, limit: int = 50):
         """
-        List documents, limited to `limit` results.
+        List documents, limited to `limit` results (tombstoned documents are skipped).
         """
+        live = "id NOT IN (SELECT id FROM entity WHERE deleted_at IS NOT NULL)"
         if limit is None:
-            sql = "SELECT * FROM document"
+            sql = f"SELECT * FROM document WHERE {live}"
             rows = self.conn.execute(sql).fetchall()
         else:
-            sql = "SELECT * FROM document LIMIT ?"
+            sql = f"SELECT * FROM document WHERE {live} LIMIT ?"
             rows = self.conn.execute(sql, (limit,)).fetchall()
         return [self.row_to_entity(row) for row in rows]
+
+    def page(self, limit: int = 50, after: Optional[str] = None, order: str = "created",
+             descending: bool = False, columns=None) -> KeysetPage:
+        """
+        One page of documents in `order` ("created", "title" or "year"), after
+        the `after` cursor of the previous page, with the exact total from
+        `row_count`. Constant time at any depth. With `columns`, the items
+        are `DocumentView`s over just those columns. Tombstoned documents are
+        skipped and not counted.
+        """
+        if order not in self.ORDERS:
+            raise ValueError(f"Unknown order {order!r}; expected one of: {', '.join(self.ORDERS)}")
+        key_sql, id_sql = self.ORDERS[order]
+        where, params = ("e.entity_kind = ? AND e.deleted_at IS NULL", ("Document",)) if order == "created" \
+            else ("e.deleted_at IS NULL", ())
+        return self._keyset_page(self._document_from_row, order, key_sql, id_sql, limit=limit, after=after,
+                                 descending=descending, where=where, params=params, columns=columns)
@@ -1,5 +1,5 @@
-from typing import Optional, Dict, Any
-from smart_library.infrastructure.repositories.base_repository import BaseRepository
+from typing import Optional, Dict, Any, List
+from smart_library.infrastructure.repositories.base_repository import BaseRepository, _chunked
 from smart_library.domain.entities.entity import Entity
 
 class EntityRepository(BaseRepository[Entity]):
@@ -47,6 +47,16 @@ class EntityRepository(BaseRepository[Entity]):
         row = self.conn.execute(sql, (entity_id,)).fetchone()
         return dict(row) if row else None
 
+    def get_many(self, entity_ids) -> List[Dict[str, Any]]:
+        """Entity rows for `entity_ids` in the given order; unknown ids are skipped."""
+        entity_ids = list(entity_ids)
+        found = {}
+        for batch in _chunked(dict.fromkeys(entity_ids)):
+            placeholders = ",".join("?" * len(batch))
+            rows = self.conn.execute(f"SELECT * FROM entity WHERE id IN ({placeholders})", batch).fetchall()
+            found.update((row["id"], dict(row)) for row in rows)
+        return [found[eid] for eid in entity_ids if eid in found]
+
     def exists(self, entity_id: str) -> bool:
         return self.get(entity_id) is not None
 
@@ -0,0 +1,189 @@
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from smart_library.domain.constants.relationship_types import RelationshipType
+from smart_library.infrastructure.repositories.base_repository import BaseRepository, _chunked
+from smart_library.infrastructure.repositories.relationship_repository import _type_value
+from smart_library.infrastructure.repositories.text_blob_repository import TextBlobRepository
+
+# Markers passed to highlight(); control characters that do not occur in extracted text
+_HL_START, _HL_END = "\x02", "\x03"
+_QUERY_PART = re.compile(r'"([^"]*)"|(\S+)')
+
+# Text -> document: a text's parent is a page (whose parent is the document) or the document itself;
+# de is the document's entity row (its deleted_at marks a tombstone)
+_DOCUMENT_JOIN = """
+    JOIN entity te ON te.id = t.id
+    JOIN entity pe ON pe.id = te.parent_id
+    JOIN document d ON d.id = CASE WHEN pe.entity_kind = 'Document' THEN pe.id ELSE pe.parent_id END
+    JOIN entity de ON de.id = d.id
+"""
+
+
+def to_match_query(text: str) -> str:
+    """
+    Free text -> FTS5 MATCH expression. "Quoted phrases" stay phrases, every
+    other word becomes a quoted term (so `IL-6`, `GSE1234:` or `x^2` are not
+    parsed as FTS5 operators); `word*` keeps its prefix star. All parts are
+    required (implicit AND).
+    """
+    parts = []
+    for phrase, word in _QUERY_PART.findall(text or ""):
+        prefix = bool(word) and len(word) > 1 and word.endswith("*")
+        term = (phrase or (word[:-1] if prefix else word)).strip()
+        if term:
+            parts.append('"' + term.replace('"', '""') + '"' + ("*" if prefix else ""))
+    return " ".join(parts)
+
+
+def highlight_offsets(marked: str) -> List[Tuple[int, int]]:
+    """`(start, end)` character offsets of the highlighted spans in the unmarked text."""
+    offsets, pos, start = [], 0, 0
+    for ch in marked or "":
+        if ch == _HL_START:
+            start = pos
+        elif ch == _HL_END:
+            offsets.append((start, pos))
+        else:
+            pos += 1
+    return offsets
+
+
+class FullTextRepository(BaseRepository):
+    """
+    BM25 keyword search over the FTS5 indexes `text_fts` (text content) and
+    `heading_fts` (heading titles), see db/migrations/0006_text_fts.sql.
+    Both are external-content indexes kept in sync by triggers. Blob-mode
+    texts have no content in text_entity; TextRepository writes theirs to
+    `blob_text_fts` (0010_blob_text_fts.sql), which is searched alongside.
+    """
+
+    table = "text_fts"
+
+    def available(self) -> bool:
+        row = self.conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'text_fts'").fetchone()
+        return row is not None
+
+    def _text_indexes(self) -> List[str]:
+        rows = self.conn.execute(
+            "SELECT name FROM sqlite_master WHERE name IN ('text_fts', 'blob_text_fts') ORDER BY name DESC").fetchall()
+        return [row["name"] for row in rows]
+
+    def rebuild(self):
+        """Re-index everything from text_entity/heading and the blobs (after a VACUUM or a bulk load without triggers)."""
+        self.conn.execute("INSERT INTO text_fts (text_fts) VALUES ('rebuild')")
+        self.conn.execute("INSERT INTO heading_fts (heading_fts) VALUES ('rebuild')")
+        if "blob_text_fts" in self._text_indexes():
+            self._rebuild_blob_texts()
+
+    def _rebuild_blob_texts(self):
+        self.conn.execute("DELETE FROM blob_text_fts")
+        blobs = TextBlobRepository(self.conn)
+        rows = self.conn.execute(
+            "SELECT rowid AS rid, blob_id, content_start, content_end FROM text_entity "
+            "WHERE blob_id IS NOT NULL ORDER BY blob_id").fetchall()
+        blob_id, text = None, None
+        for row in rows:
+            if row["blob_id"] != blob_id:  # one decompression per document
+                blob_id, text = row["blob_id"], blobs.get(row["blob_id"]) or ""
+            self.conn.execute("INSERT INTO blob_text_fts (rowid, content) VALUES (?, ?)",
+                              (row["rid"], text[row["content_start"]:row["content_end"]]))
+
+    @staticmethod
+    def _filters(doc_ids: Optional[Iterable[str]], year_from: Optional[int], year_to: Optional[int]):
+        clauses, params = ["de.deleted_at IS NULL"], []  # never return texts of tombstoned documents
+        if doc_ids is not None:
+            doc_ids = list(dict.fromkeys(doc_ids))
+            clauses.append(f"d.id IN ({','.join('?' * len(doc_ids)) or 'NULL'})")
+            params += doc_ids
+        if year_from is not None:
+            clauses.append("d.year >= ?")
+            params.append(year_from)
+        if year_to is not None:
+            clauses.append("d.year <= ?")
+            params.append(year_to)
+        return "".join(f" AND {c}" for c in clauses), params
+
+    def filter_texts(self, text_ids, doc_ids=None, year_from=None, year_to=None) -> set:
+        """The subset of `text_ids` in live documents inside the document/year filters (for hits from other sources)."""
+        where, params = self._filters(doc_ids, year_from, year_to)
+        found = set()
+        for batch in _chunked(dict.fromkeys(text_ids)):
+            placeholders = ",".join("?" * len(batch))
+            sql = f"SELECT t.id AS id FROM text_entity t {_DOCUMENT_JOIN} WHERE t.id IN ({placeholders}){where}"
+            found.update(row["id"] for row in self.conn.execute(sql, [*batch, *params]).fetchall())
+        return found
+
+    def deleted_texts(self, text_ids) -> set:
+        """The subset of `text_ids` whose document is tombstoned (deleted, purge pending)."""
+        found = set()
+        for batch in _chunked(dict.fromkeys(text_ids)):
+            placeholders = ",".join("?" * len(batch))
+            sql = (f"SELECT t.id AS id FROM text_entity t {_DOCUMENT_JOIN} "
+                   f"WHERE t.id IN ({placeholders}) AND de.deleted_at IS NOT NULL")
+            found.update(row["id"] for row in self.conn.execute(sql, batch).fetchall())
+        return found
+
+    def search_texts(self, match: str, limit: int = 10, doc_ids=None, year_from=None, year_to=None,
+                     snippet_tokens: int = 16) -> List[Dict[str, Any]]:
+        """
+        Texts whose content matches `match` (FTS5 syntax), best BM25 first.
+        Inline and blob-mode texts are searched in their own index and merged.
+        """
+        where, params = self._filters(doc_ids, year_from, year_to)
+        rows = []
+        for index in self._text_indexes():
+            sql = f"""
+                SELECT t.id AS id, -bm25({index}) AS score, d.id AS document_id, d.year AS year,
+                       snippet({index}, 0, '[', ']', '…', ?) AS snippet,
+                       highlight({index}, 0, char(2), char(3)) AS marked
+                FROM {index}
+                JOIN text_entity t ON t.rowid = {index}.rowid
+                {_DOCUMENT_JOIN}
+                WHERE {index} MATCH ?{where}
+                ORDER BY bm25({index})
+                LIMIT ?
+            """
+            rows += self.conn.execute(sql, [snippet_tokens, match, *params, limit]).fetchall()
+        rows = sorted(rows, key=lambda r: -r["score"])[:limit]
+        return [
+            {
+                "id": r["id"],
+                "score": r["score"],
+                "document_id": r["document_id"],
+                "year": r["year"],
+                "snippet": r["snippet"],
+                "highlights": highlight_offsets(r["marked"]),
+            }
+            for r in rows
+        ]
+
+    def search_headings(self, match: str, limit: int = 10, doc_ids=None, year_from=None,
+                        year_to=None) -> List[Dict[str, Any]]:
+        """Texts under headings whose title matches `match`, best heading BM25 first."""
+        where, params = self._filters(doc_ids, year_from, year_to)
+        sql = f"""
+            SELECT t.id AS id, -bm25(heading_fts) AS score, d.id AS document_id, d.year AS year,
+                   h.title AS heading, highlight(heading_fts, 0, char(2), char(3)) AS marked
+            FROM heading_fts
+            JOIN heading h ON h.rowid = heading_fts.rowid
+            JOIN relationship r ON r.target_id = h.id AND r.type = ?
+            JOIN text_entity t ON t.id = r.source_id
+            {_DOCUMENT_JOIN}
+            WHERE heading_fts MATCH ?{where}
+            ORDER BY bm25(heading_fts)
+            LIMIT ?
+        """
+        under_heading = _type_value(RelationshipType.UNDER_HEADING)
+        rows = self.conn.execute(sql, [under_heading, match, *params, limit]).fetchall()
+        return [
+            {
+                "id": r["id"],
+                "score": r["score"],
+                "document_id": r["document_id"],
+                "year": r["year"],
+                "heading": r["heading"],
+                "heading_highlights": highlight_offsets(r["marked"]),
+            }
+            for r in rows
+        ]
@@ -56,8 +56,23 @@ class HeadingRepository(BaseRepository[Heading]):
         )
 
     def delete(self, heading_id: str):
-        self._delete_entity(heading_id)
-        self.conn.commit()
+        self.delete_subtree([heading_id])
+
+    # ---------- Bulk operations (no commit: the caller owns the transaction) ----------
+    def add_many(self, headings):
+        headings = list(headings)
+        self._insert_entities(headings, entity_kind="Heading")
+        self.conn.executemany(
+            "INSERT INTO heading (id, title, \"index\", page_number) VALUES (?,?,?,?)",
+            [(h.id, h.title, h.index, h.page_number) for h in headings],
+        )
+
+    def delete_for_parent(self, parent_id: str) -> int:
+        """Delete all headings under `parent_id` (cascades to the heading table)."""
+        cur = self.conn.execute(
+            "DELETE FROM entity WHERE parent_id = ? AND entity_kind = 'Heading'", (parent_id,)
+        )
+        return cur.rowcount
 
     def list_for_parent(self, parent_id: str):
         sql = "SELECT id FROM heading JOIN entity ON heading.id = entity.id WHERE entity.parent_id = ? ORDER BY \"index\""
@@ -1,10 +1,12 @@
-from typing import Optional
+from typing import List, Optional
 from smart_library.domain.entities.page import Page
 from smart_library.infrastructure.repositories.base_repository import BaseRepository, _to_json, _from_json
+from smart_library.infrastructure.repositories.row_views import PageView
 
 
 class PageRepository(BaseRepository[Page]):
     table = "page"
+    view = PageView
 
     def add(self, page: Page):
         if not page.parent_id:
@@ -36,22 +38,17 @@ class PageRepository(BaseRepository[Page]):
         self.conn.commit()
         return page.id
 
-    def get(self, page_id: str) -> Optional[Page]:
-        es = self._fetch_entity_row(page_id)
-        if not es:
-            return None
-        row = self.conn.execute("SELECT * FROM page WHERE id=?", (page_id,)).fetchone()
-        if not row:
-            return None
-        r = dict(row)
+    @staticmethod
+    def _page_from_row(r) -> Page:
+        """Build a `Page` from a joined `entity` + `page` row."""
         return Page(
-            id=es["id"],
-            created_at=es["created_at"],
-            modified_at=es["modified_at"],
-            created_by=es.get("created_by"),
-            updated_by=es.get("updated_by"),
-            parent_id=es.get("parent_id"),
-            metadata=_from_json(es.get("metadata"), {}),
+            id=r["id"],
+            created_at=r["created_at"],
+            modified_at=r["modified_at"],
+            created_by=r.get("created_by"),
+            updated_by=r.get("updated_by"),
+            parent_id=r.get("parent_id"),
+            metadata=_from_json(r.get("metadata"), {}),
             page_number=r["page_number"],
             full_text=r.get("full_text"),
             token_count=r.get("token_count"),
@@ -64,6 +61,19 @@ class PageRepository(BaseRepository[Page]):
             has_equations=True if r.get("has_equations") == 1 else False if r.get("has_equations") == 0 else None,
         )
 
+    def get(self, page_id: str) -> Optional[Page]:
+        es = self._fetch_entity_row(page_id)
+        if not es:
+            return None
+        row = self.conn.execute("SELECT * FROM page WHERE id=?", (page_id,)).fetchone()
+        if not row:
+            return None
+        return self._page_from_row({**dict(row), **es})
+
+    def get_many(self, page_ids) -> List[Page]:
+        """Pages for `page_ids` in the given order (one query; unknown ids are skipped)."""
+        return self._get_many(page_ids, self._page_from_row)
+
     def update(self, page: Page):
         self._update_entity_meta(page)
         sql = """
@@ -93,8 +103,7 @@ class PageRepository(BaseRepository[Page]):
         self.conn.commit()
 
     def delete(self, page_id: str):
-        self._delete_entity(page_id)
-        self.conn.commit()
+        self.delete_subtree([page_id])
 
     def list(self, doc_id: str = None, limit: int = 100):
         """
@@ -111,4 +120,4 @@ class PageRepository(BaseRepository[Page]):
         else:
             sql = "SELECT id FROM page LIMIT ?"
             rows = self.conn.execute(sql, (limit,)).fetchall()
-        return [self.get(row["id"]) for row in rows]
\ No newline at end of file
+        return self.get_many(row["id"] for row in rows)
\ No newline at end of file
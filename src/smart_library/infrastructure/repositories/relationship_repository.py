@@ -1,5 +1,13 @@
-from typing import Optional, Dict, Any
-from smart_library.infrastructure.repositories.base_repository import BaseRepository, _to_json, _from_json
+from collections import defaultdict
+from typing import Optional, Dict, Any, Iterable, List
+from smart_library.infrastructure.repositories.base_repository import BaseRepository, _to_json, _from_json, _chunked
+from smart_library.domain.constants.relationship_types import RelationshipType
+
+
+def _type_value(type) -> str:
+    """Relationship types are `str` enums; store their value, not their repr."""
+    return getattr(type, "value", type)
+
 
 class RelationshipRepository(BaseRepository):
     """
@@ -17,7 +25,7 @@ class RelationshipRepository(BaseRepository):
             relationship_id,
             source_id,
             target_id,
-            type,
+            _type_value(type),
             _to_json(metadata or {})
         ])
         self.conn.commit()
@@ -47,4 +55,91 @@ class RelationshipRepository(BaseRepository):
         else:
             sql = f"SELECT * FROM {self.table} LIMIT ?"
             rows = self.conn.execute(sql, (limit,)).fetchall()
-        return [dict(row) for row in rows]
\ No newline at end of file
+        return [dict(row) for row in rows]
+
+    # ---------- Bulk operations (no commit: the caller owns the transaction) ----------
+    def add_many(self, relationships) -> int:
+        """Insert `Relationship` entities; already stored ids are ignored."""
+        rows = [
+            (r.id, r.source_id, r.target_id, _type_value(r.type), _to_json(r.metadata or {}), r.created_at)
+            for r in relationships
+        ]
+        self.conn.executemany(
+            f"INSERT OR IGNORE INTO {self.table} (id, source_id, target_id, type, metadata, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        return len(rows)
+
+    def delete_for_sources(self, source_ids: Iterable[str], type: str = None) -> int:
+        """Delete outgoing relationships of `source_ids`, optionally of one type."""
+        deleted = 0
+        for batch in _chunked(source_ids):
+            placeholders = ",".join("?" * len(batch))
+            sql = f"DELETE FROM {self.table} WHERE source_id IN ({placeholders})"
+            params = list(batch)
+            if type is not None:
+                sql += " AND type = ?"
+                params.append(_type_value(type))
+            deleted += self.conn.execute(sql, params).rowcount
+        return deleted
+
+    def neighbors(self, ids: Iterable[str], type: str, direction: str = "out") -> Dict[str, List[str]]:
+        """Batch lookup of related ids for many entities in one query per batch.
+
+        `direction="out"` follows `source_id -> target_id` (served by
+        `idx_relationship_source_type`); `"in"` follows edges backwards via
+        `idx_relationship_target_type`. Returns `{id: [neighbor ids]}` with an
+        entry for every requested id.
+        """
+        if direction == "out":
+            key, other = "source_id", "target_id"
+        elif direction == "in":
+            key, other = "target_id", "source_id"
+        else:
+            raise ValueError(f"direction must be 'out' or 'in', got {direction!r}")
+
+        ids = list(dict.fromkeys(ids))
+        result: Dict[str, List[str]] = defaultdict(list)
+        for batch in _chunked(ids):
+            placeholders = ",".join("?" * len(batch))
+            sql = (
+                f"SELECT {key} AS id, {other} AS neighbor FROM {self.table} "
+                f"WHERE {key} IN ({placeholders}) AND type = ? ORDER BY created_at, rowid"
+            )
+            for row in self.conn.execute(sql, [*batch, _type_value(type)]).fetchall():
+                result[row["id"]].append(row["neighbor"])
+        return {i: result.get(i, []) for i in ids}
+
+    def heading_context(self, text_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Resolve the heading and the sibling texts of many texts in one query per batch.
+
+        Follows `UNDER_HEADING` edges from each text to its heading and back to
+        every text under that heading. Returns
+        `{text_id: {"heading_id", "heading_title", "heading_index", "siblings"}}`
+        where `siblings` lists the ids under the same heading (including the
+        text itself) in reading order. Texts without a heading are omitted.
+        """
+        under_heading = _type_value(RelationshipType.UNDER_HEADING)
+        context: Dict[str, Dict[str, Any]] = {}
+        for batch in _chunked(dict.fromkeys(text_ids)):
+            placeholders = ",".join("?" * len(batch))
+            sql = f"""
+                SELECT r.source_id AS text_id, h.id AS heading_id, h.title AS heading_title,
+                       h."index" AS heading_index, sib.source_id AS sibling_id
+                FROM {self.table} r
+                JOIN heading h ON h.id = r.target_id
+                JOIN {self.table} sib ON sib.target_id = r.target_id AND sib.type = r.type
+                LEFT JOIN text_entity st ON st.id = sib.source_id
+                WHERE r.source_id IN ({placeholders}) AND r.type = ?
+                ORDER BY r.source_id, st."index", sib.rowid
+            """
+            for row in self.conn.execute(sql, [*batch, under_heading]).fetchall():
+                entry = context.setdefault(row["text_id"], {
+                    "heading_id": row["heading_id"],
+                    "heading_title": row["heading_title"],
+                    "heading_index": row["heading_index"],
+                    "siblings": [],
+                })
+                entry["siblings"].append(row["sibling_id"])
+        return context
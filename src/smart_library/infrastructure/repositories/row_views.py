@@ -0,0 +1,147 @@
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+import json
+
+# Columns of the base `entity` table; everything else comes from the child table
+ENTITY_COLUMNS = frozenset(
+    ("id", "created_at", "modified_at", "created_by", "updated_by", "parent_id", "entity_kind", "metadata",
+     "deleted_at")
+)
+
+_TEXT_FIELDS = ("content", "display_content", "embedding_content")
+_BLOB_COLUMNS = ("blob_id", "content_start", "content_end", "embedding_start", "embedding_end")
+
+
+def resolve_blob_text(blobs, row, name: str) -> Optional[str]:
+    """
+    Slice text field `name` of a blob-mode `text_entity` row out of its document blob.
+    A NULL display_content means "same as content"; '' stands for None.
+    """
+    if name == "display_content" and row["display_content"] is not None:
+        return row["display_content"] or None
+    if name == "embedding_content" and row["embedding_start"] is None:
+        return row["embedding_content"]
+    blob = blobs.get(row["blob_id"]) or ""
+    if name == "embedding_content":
+        return blob[row["embedding_start"]:row["embedding_end"]]
+    return blob[row["content_start"]:row["content_end"]]
+
+
+class RowView:
+    """
+    Read-only, attribute-style view of one `sqlite3.Row`.
+
+    Nothing is copied or decoded up front: plain columns are read from the
+    row on access and JSON columns are decoded on first access, then cached.
+    Only columns the query projected are available; anything else raises
+    AttributeError, so `getattr(view, name, default)` works as for entities.
+    """
+
+    __slots__ = ("_row", "_decoded")
+
+    # attribute -> columns tried in order (first non-NULL wins)
+    _aliases: Dict[str, Tuple[str, ...]] = {}
+    # attribute -> every column needed to compute it (projection only)
+    _requires: Dict[str, Tuple[str, ...]] = {}
+    # JSON column -> factory for the value used when NULL or invalid (None: None)
+    _json: Dict[str, Optional[Callable[[], Any]]] = {"metadata": dict}
+
+    def __init__(self, row):
+        self._row = row
+        self._decoded = None
+
+    @classmethod
+    def columns_for(cls, name: str) -> Tuple[str, ...]:
+        """Columns a query has to select for attribute `name` to be readable."""
+        return cls._requires.get(name) or cls._aliases.get(name, (name,))
+
+    def _column(self, column: str):
+        try:
+            value = self._row[column]
+        except (IndexError, KeyError):
+            raise AttributeError(f"{type(self).__name__} has no column {column!r} (not projected?)") from None
+        if column not in self._json:
+            return value
+        if self._decoded is None:
+            self._decoded = {}
+        if column not in self._decoded:
+            default = self._json[column]
+            try:
+                decoded = json.loads(value) if value else None
+            except ValueError:
+                decoded = None
+            self._decoded[column] = (default() if default else None) if decoded is None else decoded
+        return self._decoded[column]
+
+    def __getattr__(self, name: str):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        columns = self._aliases.get(name, (name,))
+        value = None
+        for column in columns:
+            value = self._column(column)
+            if value is not None:
+                break
+        return value
+
+    def keys(self) -> Iterable[str]:
+        return self._row.keys()
+
+    def get(self, name: str, default=None):
+        try:
+            return getattr(self, name)
+        except AttributeError:
+            return default
+
+    def to_dict(self) -> Dict[str, Any]:
+        """All projected columns, JSON decoded."""
+        return {k: getattr(self, k) for k in dict.fromkeys(self._row.keys()) if not k.startswith("_")}
+
+    def __repr__(self):
+        return f"{type(self).__name__}(id={self.get('id')!r})"
+
+
+class DocumentView(RowView):
+    __slots__ = ()
+    _json = {"metadata": dict, "authors": None, "keywords": None, "reference_list": None, "citations": None}
+
+
+class PageView(RowView):
+    __slots__ = ()
+    _json = {"metadata": dict, "paragraphs": list, "sections": list}
+
+
+class TextView(RowView):
+    """Text row; in blob storage mode the text fields are sliced from the document blob on access."""
+
+    __slots__ = ("_blobs",)
+    _aliases = {
+        "text_type": ("text_type", "type"),
+        "index": ("index", "chunk_index"),
+    }
+    # Blob-mode rows need their offsets (and the fields stored inline) to resolve any text field
+    _requires = {name: (*_TEXT_FIELDS, *_BLOB_COLUMNS) for name in _TEXT_FIELDS}
+
+    def __init__(self, row, blobs=None):
+        super().__init__(row)
+        self._blobs = blobs
+
+    def _text(self, name: str) -> Optional[str]:
+        if self._column("blob_id") is None or self._blobs is None:
+            return self._column(name)
+        if self._decoded is None:
+            self._decoded = {}
+        if name not in self._decoded:
+            self._decoded[name] = resolve_blob_text(self._blobs, self._row, name)
+        return self._decoded[name]
+
+    @property
+    def content(self) -> Optional[str]:
+        return self._text("content")
+
+    @property
+    def display_content(self) -> Optional[str]:
+        return self._text("display_content")
+
+    @property
+    def embedding_content(self) -> Optional[str]:
+        return self._text("embedding_content")
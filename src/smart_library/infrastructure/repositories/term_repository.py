@@ -1,4 +1,4 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 import json
 
 from smart_library.domain.entities.term import Term
@@ -63,22 +63,17 @@ class TermRepository(BaseRepository[Term]):
         self.conn.commit()
         return term.id
 
-    def get(self, term_id: str) -> Optional[Term]:
-        es = self._fetch_entity_row(term_id)
-        if not es:
-            return None
-        row = self.conn.execute("SELECT * FROM term WHERE id=?", (term_id,)).fetchone()
-        if not row:
-            return None
-        r = dict(row)
+    @staticmethod
+    def _term_from_row(r) -> Term:
+        """Build a `Term` from a joined `entity` + `term` row."""
         return Term(
-            id=es["id"],
-            created_at=es["created_at"],
-            modified_at=es["modified_at"],
-            created_by=es.get("created_by"),
-            updated_by=es.get("updated_by"),
-            parent_id=es.get("parent_id"),
-            metadata=_from_json(es.get("metadata"), {}),
+            id=r["id"],
+            created_at=r["created_at"],
+            modified_at=r["modified_at"],
+            created_by=r.get("created_by"),
+            updated_by=r.get("updated_by"),
+            parent_id=r.get("parent_id"),
+            metadata=_from_json(r.get("metadata"), {}),
             canonical_name=r["canonical_name"],
             sense=r.get("sense"),
             definition=r.get("definition"),
@@ -87,6 +82,19 @@ class TermRepository(BaseRepository[Term]):
             related_terms=_from_json(r.get("related_terms"), []),
         )
 
+    def get(self, term_id: str) -> Optional[Term]:
+        es = self._fetch_entity_row(term_id)
+        if not es:
+            return None
+        row = self.conn.execute("SELECT * FROM term WHERE id=?", (term_id,)).fetchone()
+        if not row:
+            return None
+        return self._term_from_row({**dict(row), **es})
+
+    def get_many(self, term_ids) -> List[Term]:
+        """Terms for `term_ids` in the given order (one query; unknown ids are skipped)."""
+        return self._get_many(term_ids, self._term_from_row)
+
     def update(self, term: Term):
         self._update_entity_meta(term)
         sql = """
@@ -107,10 +115,9 @@ class TermRepository(BaseRepository[Term]):
         self.conn.commit()
 
     def delete(self, term_id: str):
-        self._delete_entity(term_id)
-        self.conn.commit()
+        self.delete_subtree([term_id])
 
     def list(self, limit: int = 50):
-        sql = "SELECT * FROM term LIMIT ?"
+        sql = "SELECT id FROM term LIMIT ?"
         rows = self.conn.execute(sql, (limit,)).fetchall()
-        return [self.get(row["id"]) for row in rows]
\ No newline at end of file
+        return self.get_many(row["id"] for row in rows)
\ No newline at end of file
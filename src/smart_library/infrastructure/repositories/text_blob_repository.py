@@ -0,0 +1,124 @@
+import zlib
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from smart_library.config import TextStorageConfig
+
+CODEC = "zlib"
+
+# (content_start, content_end, embedding_start, embedding_end); embedding part is None when stored inline
+Placement = Tuple[int, int, Optional[int], Optional[int]]
+
+
+class TextBlobRepository:
+    """
+    One compressed, normalized text per document (`document_text` table).
+
+    Chunks in blob storage mode keep only offsets into this text, so the
+    content of overlapping chunks is stored once. Decompressed texts are
+    cached per repository (LRU) so reconstructing all chunks of a document
+    costs one decompression.
+    """
+
+    table = "document_text"
+
+    def __init__(self, conn, cache_size: int = 8):
+        self.conn = conn
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+
+    # ---------- Schema ----------
+    def ensure_schema(self):
+        """Create the blob table and the text_entity offset columns on databases that predate them."""
+        self.conn.execute(
+            f"""CREATE TABLE IF NOT EXISTS {self.table} (
+                document_id TEXT PRIMARY KEY REFERENCES entity(id) ON DELETE CASCADE,
+                codec TEXT NOT NULL,
+                char_length INTEGER NOT NULL,
+                data BLOB NOT NULL
+            )"""
+        )
+        existing = {row["name"] for row in self.conn.execute("PRAGMA table_info(text_entity)").fetchall()}
+        for column in ("blob_id", "content_start", "content_end", "embedding_start", "embedding_end"):
+            if column not in existing:
+                kind = "TEXT" if column == "blob_id" else "INTEGER"
+                self.conn.execute(f"ALTER TABLE text_entity ADD COLUMN {column} {kind}")
+
+    # ---------- Read / write ----------
+    def get(self, document_id: str) -> Optional[str]:
+        text = self._cache.get(document_id)
+        if text is not None:
+            self._cache.move_to_end(document_id)
+            return text
+        row = self.conn.execute(f"SELECT codec, data FROM {self.table} WHERE document_id = ?", (document_id,)).fetchone()
+        if row is None:
+            return None
+        if row["codec"] != CODEC:
+            raise ValueError(f"Unsupported document_text codec: {row['codec']}")
+        text = zlib.decompress(row["data"]).decode("utf-8")
+        self._remember(document_id, text)
+        return text
+
+    def delete(self, document_id: str):
+        """Drop the text of a document (no commit)."""
+        self.conn.execute(f"DELETE FROM {self.table} WHERE document_id = ?", (document_id,))
+        self._cache.pop(document_id, None)
+
+    def put(self, document_id: str, text: str):
+        """Store the text of a document (no commit: the caller owns the transaction)."""
+        data = zlib.compress(text.encode("utf-8"), TextStorageConfig.COMPRESSION_LEVEL)
+        self.conn.execute(
+            f"INSERT OR REPLACE INTO {self.table} (document_id, codec, char_length, data) VALUES (?, ?, ?, ?)",
+            (document_id, CODEC, len(text), data),
+        )
+        self._remember(document_id, text)
+
+    def _remember(self, document_id: str, text: str):
+        self._cache[document_id] = text
+        self._cache.move_to_end(document_id)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    # ---------- Placement ----------
+    def place(self, document_id: str, texts: Iterable, fresh: bool = False) -> Dict[str, Optional[Placement]]:
+        """
+        Locate or append the content of `texts` (in reading order) in the
+        document's blob and store it. Returns `{text_id: placement}`; texts
+        whose content cannot be expressed as a span map to None and stay inline.
+        With `fresh`, the blob is rebuilt from `texts` alone (compaction).
+
+        Contents are appended with a space between chunks of one page and a
+        newline between pages, so an overlapping `embedding_content`
+        ("<tail of previous chunk> <content>") is a span of the blob too.
+        """
+        existing = "" if fresh else (self.get(document_id) or "")
+        blob = existing
+        placements: Dict[str, Optional[Placement]] = {}
+        last_page = object()
+        for txt in texts:
+            content = txt.content or ""
+            if not content:
+                placements[txt.id] = None
+                continue
+            start = existing.find(content) if existing else -1
+            if start < 0:
+                if blob:
+                    blob += " " if txt.page_number == last_page else "\n"
+                start = len(blob)
+                blob += content
+            end = start + len(content)
+            last_page = txt.page_number
+
+            embedding = txt.embedding_content or ""
+            emb_start = emb_end = None
+            if embedding == content:
+                emb_start, emb_end = start, end
+            elif embedding.endswith(content):
+                prefix_len = len(embedding) - len(content)
+                if prefix_len <= start and blob[start - prefix_len:end] == embedding:
+                    emb_start, emb_end = start - prefix_len, end
+            placements[txt.id] = (start, end, emb_start, emb_end)
+
+        if fresh or blob != existing:
+            self.put(document_id, blob)
+        return placements
@@ -1,47 +1,122 @@
-from typing import Optional, Dict, Any
-import json
-
+from typing import Optional, Dict, Any, List
 
+from smart_library.config import TextStorageConfig
 from smart_library.domain.entities.text import Text
-from smart_library.infrastructure.repositories.base_repository import BaseRepository, _from_json
-from smart_library.infrastructure.repositories.entity_repository import EntityRepository
+from smart_library.infrastructure.repositories.base_repository import BaseRepository, KeysetPage, _chunked, _from_json, _to_json
+from smart_library.infrastructure.repositories.row_views import TextView, resolve_blob_text
+from smart_library.infrastructure.repositories.text_blob_repository import TextBlobRepository
 from datetime import datetime
 
+_LAZY_FIELDS = ("content", "display_content", "embedding_content")
+
+
+class _BlobField:
+    """Text field resolved from the document blob on first access, then cached on the instance."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        values = obj.__dict__
+        if self.name not in values:
+            values[self.name] = obj._resolve(self.name)
+        return values[self.name]
+
+    def __set__(self, obj, value):
+        obj.__dict__[self.name] = value
+
+
+class LazyText(Text):
+    """
+    `Text` stored in blob mode: content, display_content and embedding_content
+    are sliced from the decompressed document text when first read.
+    """
+
+    content = _BlobField("content")
+    display_content = _BlobField("display_content")
+    embedding_content = _BlobField("embedding_content")
+
+    def __init__(self, blobs: TextBlobRepository, row: Dict[str, Any], **fields):
+        super().__init__(**fields)
+        for name in _LAZY_FIELDS:
+            self.__dict__.pop(name, None)
+        self._blobs = blobs
+        self._row = row
+
+    def _resolve(self, name: str):
+        return resolve_blob_text(self._blobs, self._row, name)
+
 class TextRepository(BaseRepository[Text]):
     table = "text_entity"
+    view = TextView
 
-    def add(self, txt: Text):
-        # Parent is page if available; else document
-        if not txt.parent_id:
-            txt.parent_id = txt.page_id or txt.document_id
-        if not txt.parent_id:
-            raise ValueError("Text.parent_id should reference Page or Document id")
-        # Ensure entity exists
-        entity_repo = EntityRepository()
-        if not entity_repo.exists(txt.id):
-            now = datetime.utcnow().isoformat()
-            entity_kind = "Text"
-            meta = txt.metadata if hasattr(txt, 'metadata') and txt.metadata is not None else {}
-            sql_entity = """
-            INSERT INTO entity (id, created_at, modified_at, created_by, updated_by, parent_id, entity_kind, metadata)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """
-            self.conn.execute(sql_entity, [
-                txt.id,
-                now,
-                now,
-                getattr(txt, 'created_by', None),
-                getattr(txt, 'updated_by', None),
-                txt.parent_id,
-                entity_kind,
-                json.dumps(meta) if meta else None
-            ])
-        sql = (
-            "INSERT INTO text_entity (id, type, text_type, chunk_index, \"index\", page_number, content, display_content, embedding_content, character_count, token_count)"
-            " VALUES (?,?,?,?,?,?,?,?,?,?,?)"
+    _INSERT_SQL = (
+        "INSERT INTO text_entity (id, type, text_type, chunk_index, \"index\", page_number, content, display_content, embedding_content, character_count, token_count)"
+        " VALUES (?,?,?,?,?,?,?,?,?,?,?)"
+    )
+    _UPDATE_SQL = (
+        "UPDATE text_entity SET type=?, text_type=?, chunk_index=?, \"index\"=?, page_number=?, content=?,"
+        " display_content=?, embedding_content=?, character_count=?, token_count=? WHERE id=?"
+    )
+    _BLOB_COLUMNS = ("blob_id", "content_start", "content_end", "embedding_start", "embedding_end")
+    _INSERT_BLOB_SQL = (
+        "INSERT INTO text_entity (id, type, text_type, chunk_index, \"index\", page_number, content, display_content,"
+        " embedding_content, character_count, token_count, blob_id, content_start, content_end, embedding_start,"
+        " embedding_end) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)"
+    )
+    # The text row, unless its document (the parent, or the page's parent) is tombstoned
+    _LIVE_TEXT_SQL = """
+        SELECT * FROM text_entity WHERE id = ? AND NOT EXISTS (
+            SELECT 1 FROM entity pe
+            JOIN entity de ON de.id = CASE WHEN pe.entity_kind = 'Document' THEN pe.id ELSE pe.parent_id END
+            WHERE pe.id = ? AND de.deleted_at IS NOT NULL
         )
-        self.conn.execute(sql, [
-            txt.id,
+    """
+    _UPDATE_BLOB_SQL = (
+        "UPDATE text_entity SET type=?, text_type=?, chunk_index=?, \"index\"=?, page_number=?, content=?,"
+        " display_content=?, embedding_content=?, character_count=?, token_count=?, blob_id=?, content_start=?,"
+        " content_end=?, embedding_start=?, embedding_end=? WHERE id=?"
+    )
+
+    def __init__(self, conn=None, storage: str = None):
+        super().__init__(conn)
+        self.storage = storage or TextStorageConfig.MODE
+        self.blobs = TextBlobRepository(self.conn)
+        if self.storage == "blob":
+            self.blobs.ensure_schema()
+        self._blob_fts_available = None
+
+    def _blob_fts(self) -> bool:
+        if self._blob_fts_available is None:
+            self._blob_fts_available = self.conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'blob_text_fts'").fetchone() is not None
+        return self._blob_fts_available
+
+    def _index_blob_texts(self, texts):
+        """
+        Write the content of the blob-mode `texts` to `blob_text_fts` (their
+        text_entity.content is empty, so text_fts cannot see it); deletes are
+        handled by the table's triggers.
+        """
+        if not self._blob_fts():
+            return
+        content = {txt.id: txt.content or "" for txt in texts}
+        for batch in _chunked(list(content)):
+            placeholders = ",".join("?" * len(batch))
+            self.conn.execute(
+                f"DELETE FROM blob_text_fts WHERE rowid IN "
+                f"(SELECT rowid FROM text_entity WHERE id IN ({placeholders}))", batch)
+            rows = self.conn.execute(
+                f"SELECT id, rowid AS rid FROM text_entity WHERE blob_id IS NOT NULL AND id IN ({placeholders})",
+                batch).fetchall()
+            self.conn.executemany("INSERT INTO blob_text_fts (rowid, content) VALUES (?, ?)",
+                                  [(row["rid"], content[row["id"]]) for row in rows])
+
+    @staticmethod
+    def _row_values(txt: Text):
+        return [
             txt.type,
             getattr(txt, "text_type", None),
             getattr(txt, "chunk_index", None) or getattr(txt, "index", None),
@@ -52,57 +127,197 @@ class TextRepository(BaseRepository[Text]):
             getattr(txt, "embedding_content", None),
             getattr(txt, "character_count", None),
             getattr(txt, "token_count", None),
-        ])
-        self.conn.commit()
-        return txt.id
+        ]
 
-    def get(self, text_id: str) -> Optional[Text]:
-        es = self._fetch_entity_row(text_id)
-        if not es:
-            return None
-        row = self.conn.execute("SELECT * FROM text_entity WHERE id=?", (text_id,)).fetchone()
-        if not row:
-            return None
+    @staticmethod
+    def _document_id(txt: Text) -> str:
+        meta = txt.metadata or {}
+        return meta.get("document_id") or txt.parent_id
+
+    def _blob_rows(self, texts, fresh: bool = False, doc_id: str = None):
+        """Row values for blob mode: place texts in their document blobs, keep only offsets."""
+        by_doc: Dict[str, list] = {}
+        for txt in texts:
+            by_doc.setdefault(doc_id or self._document_id(txt), []).append(txt)
+        rows = {}
+        for doc_id, doc_texts in by_doc.items():
+            doc_texts.sort(key=lambda t: (t.index is None, t.index or 0))
+            placements = self.blobs.place(doc_id, doc_texts, fresh=fresh)
+            for txt in doc_texts:
+                values = self._row_values(txt)
+                placement = placements.get(txt.id)
+                if placement is None:
+                    rows[txt.id] = [*values, None, None, None, None, None]
+                    continue
+                c_start, c_end, e_start, e_end = placement
+                values[5] = ""  # content (NOT NULL)
+                if values[6] is None:
+                    values[6] = ""  # display_content None (NULL means "same as content")
+                elif values[6] == txt.content:
+                    values[6] = None  # display_content: same as content
+                if e_start is not None:
+                    values[7] = None
+                rows[txt.id] = [*values, doc_id, c_start, c_end, e_start, e_end]
+        return [rows[txt.id] for txt in texts]
+
+    def _text_from_row(self, row) -> Text:
+        """Build a `Text` from a joined `entity` + `text_entity` row."""
         r = dict(row)
-        return Text(
-            id=es["id"],
-            created_at=es["created_at"],
-            modified_at=es["modified_at"],
-            created_by=es.get("created_by"),
-            updated_by=es.get("updated_by"),
-            parent_id=es.get("parent_id"),
-            metadata=_from_json(es.get("metadata"), {}),
-            content=r.get("content"),
-            display_content=r.get("display_content"),
-            embedding_content=r.get("embedding_content"),
+        fields = dict(
+            id=r["id"],
+            created_at=r.get("created_at"),
+            modified_at=r.get("modified_at"),
+            created_by=r.get("created_by"),
+            updated_by=r.get("updated_by"),
+            parent_id=r.get("parent_id"),
+            metadata=_from_json(r.get("metadata"), {}),
             text_type=r.get("text_type") or r.get("type"),
             index=r.get("index") or r.get("chunk_index"),
             page_number=r.get("page_number"),
             character_count=r.get("character_count"),
             token_count=r.get("token_count"),
         )
+        if r.get("blob_id"):
+            return LazyText(self.blobs, {k: r.get(k) for k in (*_LAZY_FIELDS, *self._BLOB_COLUMNS)}, **fields)
+        return Text(
+            content=r.get("content"),
+            display_content=r.get("display_content"),
+            embedding_content=r.get("embedding_content"),
+            **fields,
+        )
+
+    def add(self, txt: Text):
+        # Parent is page if available; else document
+        if not txt.parent_id:
+            txt.parent_id = txt.page_id or txt.document_id
+        if not txt.parent_id:
+            raise ValueError("Text.parent_id should reference Page or Document id")
+        # Ensure entity exists (ingestion may have created it already)
+        if self.conn.execute("SELECT 1 FROM entity WHERE id = ?", (txt.id,)).fetchone() is None:
+            self._insert_entities([txt], entity_kind="Text")
+        self._insert_text_rows([txt])
+        self.conn.commit()
+        return txt.id
+
+    def get(self, text_id: str) -> Optional[Text]:
+        es = self._fetch_entity_row(text_id)
+        if not es:
+            return None
+        row = self.conn.execute(self._LIVE_TEXT_SQL, (text_id, es.get("parent_id"))).fetchone()
+        if not row:
+            return None  # no such text, or its document is tombstoned
+        return self._text_from_row({**dict(row), **es})
+
+    def get_many(self, text_ids) -> List[Text]:
+        """Texts for `text_ids` in the given order (one query; unknown ids are skipped)."""
+        return self._get_many(text_ids, self._text_from_row)
 
     def update(self, txt: Text):
         self._update_entity_meta(txt)
-        sql = "UPDATE text_entity SET type=?, text_type=?, chunk_index=?, \"index\"=?, page_number=?, content=?, display_content=?, embedding_content=?, character_count=?, token_count=? WHERE id=?"
-        self.conn.execute(sql, [
-            txt.type,
-            getattr(txt, "text_type", None),
-            getattr(txt, "chunk_index", None) or getattr(txt, "index", None),
-            getattr(txt, "index", None),
-            getattr(txt, "page_number", None),
-            getattr(txt, "content", None),
-            getattr(txt, "display_content", None),
-            getattr(txt, "embedding_content", None),
-            getattr(txt, "character_count", None),
-            getattr(txt, "token_count", None),
-            txt.id,
-        ])
+        if self.storage == "blob":
+            self.conn.execute(self._UPDATE_BLOB_SQL, [*self._blob_rows([txt])[0], txt.id])
+            self._index_blob_texts([txt])
+        else:
+            self.conn.execute(self._UPDATE_SQL, [*self._row_values(txt), txt.id])
         self.conn.commit()
 
     def delete(self, text_id: str):
-        self._delete_entity(text_id)
-        self.conn.commit()
+        self.delete_subtree([text_id])
+
+    # ---------- Bulk operations (no commit: the caller owns the transaction) ----------
+    def add_many(self, texts):
+        texts = list(texts)
+        for txt in texts:
+            if not txt.parent_id:
+                raise ValueError("Text.parent_id should reference Page or Document id")
+        self._insert_entities(texts, entity_kind="Text")
+        self._insert_text_rows(texts)
+
+    def _insert_text_rows(self, texts):
+        """`text_entity` rows for `texts`; in blob mode one placement (and blob write) per document."""
+        if self.storage == "blob":
+            rows = self._blob_rows(texts)
+            self.conn.executemany(self._INSERT_BLOB_SQL, [[txt.id, *row] for txt, row in zip(texts, rows)])
+            self._index_blob_texts(texts)
+        else:
+            self.conn.executemany(self._INSERT_SQL, [[txt.id, *self._row_values(txt)] for txt in texts])
+
+    def update_many(self, texts):
+        texts = list(texts)
+        self.conn.executemany(
+            "UPDATE entity SET modified_at=?, updated_by=?, parent_id=?, metadata=? WHERE id=?",
+            [(datetime.utcnow().isoformat(), txt.updated_by, txt.parent_id, _to_json(txt.metadata), txt.id) for txt in texts],
+        )
+        if self.storage == "blob":
+            rows = self._blob_rows(texts)
+            self.conn.executemany(self._UPDATE_BLOB_SQL, [[*row, txt.id] for txt, row in zip(texts, rows)])
+            self._index_blob_texts(texts)
+        else:
+            self.conn.executemany(
+                self._UPDATE_SQL,
+                [[*self._row_values(txt), txt.id] for txt in texts],
+            )
+
+    def delete_many(self, text_ids, compact: bool = True):
+        """Delete texts; with `compact`, the blobs they were placed in are rewritten without them."""
+        text_ids = list(text_ids)
+        blob_ids = set()
+        if compact:
+            for batch in _chunked(text_ids):
+                rows = self.conn.execute(
+                    f"SELECT DISTINCT blob_id FROM text_entity WHERE blob_id IS NOT NULL "
+                    f"AND id IN ({','.join('?' * len(batch))})", batch).fetchall()
+                blob_ids.update(row["blob_id"] for row in rows)
+        self._delete_entities(text_ids)
+        self.compact_blobs(blob_ids)
+
+    def compact_blobs(self, blob_ids) -> int:
+        """
+        Rewrite the blobs `blob_ids` from the texts that still point into them,
+        in reading order: text of deleted or re-processed chunks is dropped
+        (placement only ever appends). No commit. Returns characters dropped.
+        """
+        dropped = 0
+        for blob_id in blob_ids:
+            row = self.conn.execute("SELECT char_length FROM document_text WHERE document_id = ?", (blob_id,)).fetchone()
+            if row is None:
+                continue
+            texts = [t for t in self.list_for_document(blob_id)
+                     if isinstance(t, LazyText) and t._row["blob_id"] == blob_id]
+            if not texts:
+                self.blobs.delete(blob_id)
+                dropped += row["char_length"]
+                continue
+            for txt in texts:  # slice every field out of the old blob before it is replaced
+                for name in _LAZY_FIELDS:
+                    getattr(txt, name)
+            rows = self._blob_rows(texts, fresh=True, doc_id=blob_id)
+            # Content and rowids are unchanged, so blob_text_fts needs no update
+            self.conn.executemany(self._UPDATE_BLOB_SQL, [[*r, txt.id] for txt, r in zip(texts, rows)])
+            dropped += row["char_length"] - len(self.blobs.get(blob_id) or "")
+        return dropped
+
+    def list_for_document(self, doc_id: str):
+        """Return all texts of a document, whether parented to the document or to one of its pages."""
+        sql = """
+            SELECT t.*, e.id, e.created_at, e.modified_at, e.created_by, e.updated_by, e.parent_id, e.metadata
+            FROM entity e
+            JOIN text_entity t ON t.id = e.id
+            WHERE e.parent_id = ?
+               OR e.parent_id IN (SELECT id FROM entity WHERE parent_id = ? AND entity_kind = 'Page')
+            ORDER BY t."index"
+        """
+        rows = self.conn.execute(sql, (doc_id, doc_id)).fetchall()
+        return [self._text_from_row(row) for row in rows]
+
+    def _make_view(self, row) -> TextView:
+        return TextView(row, self.blobs)
+
+    def page(self, limit: int = 100, after: Optional[str] = None, descending: bool = False,
+             columns=None) -> KeysetPage:
+        """One page of texts in creation order after the `after` cursor (constant time at any depth)."""
+        return self._keyset_page(self._text_from_row, "created", "e.created_at", "e.id", limit=limit, after=after,
+                                 descending=descending, where="e.entity_kind = ?", params=("Text",), columns=columns)
 
     def list(self, doc_id: str = None, page_id: str = None, limit: int = 100):
         """
@@ -117,21 +332,17 @@ class TextRepository(BaseRepository[Text]):
             """
             rows = self.conn.execute(sql, (page_id, limit)).fetchall()
         elif doc_id:
-            # Find all pages for the document, then all texts for those pages
-            page_sql = "SELECT page.id FROM page JOIN entity ON page.id = entity.id WHERE entity.parent_id = ?"
-            page_rows = self.conn.execute(page_sql, (doc_id,)).fetchall()
-            page_ids = [row["id"] for row in page_rows]
-            if not page_ids:
-                return []
-            placeholders = ",".join("?" for _ in page_ids)
-            sql = f"""
+            # Texts of all pages of the document
+            sql = """
                 SELECT text_entity.id FROM text_entity
                 JOIN entity ON text_entity.id = entity.id
-                WHERE entity.parent_id IN ({placeholders})
+                WHERE entity.parent_id IN (
+                    SELECT page.id FROM page JOIN entity ON page.id = entity.id WHERE entity.parent_id = ?
+                )
                 LIMIT ?
             """
-            rows = self.conn.execute(sql, (*page_ids, limit)).fetchall()
+            rows = self.conn.execute(sql, (doc_id, limit)).fetchall()
         else:
             sql = "SELECT id FROM text_entity LIMIT ?"
             rows = self.conn.execute(sql, (limit,)).fetchall()
-        return [self.get(row["id"]) for row in rows]
\ No newline at end of file
+        return self.get_many(row["id"] for row in rows)
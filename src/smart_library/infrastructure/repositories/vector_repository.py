@@ -1,9 +1,12 @@
 from typing import Optional, Dict, Any, List
 from smart_library.infrastructure.repositories.base_repository import BaseRepository, _from_json
 
+import json
 import sqlite3
 import pickle
 from datetime import datetime
+from smart_library.infrastructure.db.db import transaction
+from smart_library.infrastructure.repositories.change_log_repository import ChangeLogRepository
 from smart_library.infrastructure.repositories.entity_repository import EntityRepository
 
 
@@ -40,20 +43,17 @@ class VectorRepository(BaseRepository):
 
         vec_norm = self.normalize(vector)
 
-        # Avoid inserting duplicate rows for the same id: remove existing entry first.
-        try:
-            self.conn.execute("DELETE FROM vector WHERE id=?", (id,))
-            sql = """
-            INSERT INTO vector(id, embedding)
-            VALUES (?, ?)
-            """
-            self.conn.execute(sql, (id, str(vec_norm)))
-            self.conn.commit()
-            return id
-        except Exception:
-            # If the vec virtual table doesn't exist, fall back to a regular table.
-            # Create fallback table if missing and insert there.
+        # Replace any existing entry and log the change in one transaction.
+        with transaction(self.conn):
             try:
+                replaced = self.conn.execute("DELETE FROM vector WHERE id=?", (id,)).rowcount > 0
+                sql = """
+                INSERT INTO vector(id, embedding)
+                VALUES (?, ?)
+                """
+                self.conn.execute(sql, (id, str(vec_norm)))
+            except sqlite3.OperationalError:
+                # If the vec virtual table doesn't exist, fall back to a regular table.
                 self.conn.execute(
                     """
                     CREATE TABLE IF NOT EXISTS vector_fallback (
@@ -65,21 +65,116 @@ class VectorRepository(BaseRepository):
                     )
                     """
                 )
-                # remove existing fallback row
-                try:
-                    self.conn.execute("DELETE FROM vector_fallback WHERE id=?", (id,))
-                except Exception:
-                    pass
+                replaced = self.conn.execute("DELETE FROM vector_fallback WHERE id=?", (id,)).rowcount > 0
                 now = datetime.utcnow().isoformat()
                 self.conn.execute(
                     "INSERT INTO vector_fallback(id, embedding, norm, created_by, created_at) VALUES (?, ?, ?, ?, ?)",
                     (id, str(vec_norm), float(np.linalg.norm(vec_norm)), created_by, now)
                 )
-                self.conn.commit()
-                return id
-            except Exception:
-                # Give up and bubble up the original failure
-                raise
+            ChangeLogRepository(self.conn).record("vector", "update" if replaced else "insert", [id])
+        return id
+
+    def add_many(self, items):
+        """Insert `(id, vector)` pairs without committing.
+
+        Unlike `add_vector` this does not create base entity rows: it is meant
+        for bulk paths that already inserted the owning text entities inside the
+        same transaction. Existing vectors are replaced (logged as updates).
+        """
+        rows = [(vid, str(self.normalize(vec))) for vid, vec in items]
+        if not rows:
+            return 0
+        try:
+            replaced = {vid for vid, _ in rows
+                        if self.conn.execute("DELETE FROM vector WHERE id=?", (vid,)).rowcount > 0}
+            self.conn.executemany("INSERT INTO vector(id, embedding) VALUES (?, ?)", rows)
+        except sqlite3.OperationalError:
+            # No vec0 table on this connection: mirror `add_vector` and use the fallback table.
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS vector_fallback (
+                    id TEXT PRIMARY KEY,
+                    embedding TEXT,
+                    norm REAL,
+                    created_by TEXT,
+                    created_at TEXT
+                )
+                """
+            )
+            replaced = {vid for vid, _ in rows
+                        if self.conn.execute("DELETE FROM vector_fallback WHERE id=?", (vid,)).rowcount > 0}
+            now = datetime.utcnow().isoformat()
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO vector_fallback(id, embedding, norm, created_by, created_at) VALUES (?, ?, ?, ?, ?)",
+                [(vid, emb, 1.0, None, now) for vid, emb in rows],
+            )
+        log = ChangeLogRepository(self.conn)
+        log.record("vector", "update", [vid for vid, _ in rows if vid in replaced])
+        log.record("vector", "insert", [vid for vid, _ in rows if vid not in replaced])
+        return len(rows)
+
+    def storage_table(self) -> Optional[str]:
+        """Table holding the vectors: "vector" (sqlite-vec), "vector_fallback" or None."""
+        names = {row[0] for row in self.conn.execute(
+            "SELECT name FROM sqlite_master WHERE name IN ('vector', 'vector_fallback')"
+        )}
+        for table in ("vector", "vector_fallback"):
+            if table in names:
+                return table
+        return None
+
+    def count_vectors(self) -> int:
+        table = self.storage_table()
+        return self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] if table else 0
+
+    def iter_embeddings(self, batch_size: int = 1000):
+        """Yield `(id, float32 array)` for every stored vector, streaming in batches."""
+        table = self.storage_table()
+        if table is None:
+            return
+        cur = self.conn.execute(f"SELECT id, embedding FROM {table}")
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                emb = row[1]
+                if isinstance(emb, (bytes, memoryview)):  # sqlite-vec returns float32 blobs
+                    vec = np.frombuffer(emb, dtype=np.float32)
+                else:
+                    vec = np.asarray(json.loads(emb), dtype=np.float32)
+                yield row[0], vec
+
+    def insert_embeddings(self, items) -> int:
+        """
+        Insert `(id, float32 array)` pairs as stored (already normalised), without
+        committing. A bulk-restore path: like the import, it writes no change log.
+        """
+        table = self.storage_table()
+        if table == "vector":
+            rows = [(vid, np.asarray(vec, dtype=np.float32).tobytes()) for vid, vec in items]
+            self.conn.executemany("INSERT INTO vector(id, embedding) VALUES (?, ?)", rows)
+            return len(rows)
+        # Same fallback as `add_many` when sqlite-vec is not available
+        if table is None:
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS vector_fallback (
+                    id TEXT PRIMARY KEY,
+                    embedding TEXT,
+                    norm REAL,
+                    created_by TEXT,
+                    created_at TEXT
+                )
+                """
+            )
+        now = datetime.utcnow().isoformat()
+        rows = [(vid, str(np.asarray(vec, dtype=float).tolist()), 1.0, None, now) for vid, vec in items]
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO vector_fallback(id, embedding, norm, created_by, created_at) VALUES (?, ?, ?, ?, ?)",
+            rows,
+        )
+        return len(rows)
 
     def get_vector(self, id: str):
         # try primary vec table
@@ -160,20 +255,16 @@ class VectorRepository(BaseRepository):
 
     def delete_vector(self, id: str):
         """Delete a vector from both the sqlite-vec table and fallback table."""
-        try:
-            # Try deleting from sqlite-vec table
-            self.conn.execute("DELETE FROM vector WHERE id=?", (id,))
-            self.conn.commit()
-        except Exception as e:
-            pass
-        
-        try:
-            # Also try deleting from fallback table
-            self.conn.execute("DELETE FROM vector_fallback WHERE id=?", (id,))
-            self.conn.commit()
-        except Exception as e:
-            pass
-    
+        deleted = 0
+        with transaction(self.conn):
+            for table in ("vector", "vector_fallback"):
+                try:
+                    deleted += self.conn.execute(f"DELETE FROM {table} WHERE id=?", (id,)).rowcount
+                except sqlite3.OperationalError:
+                    pass  # table might not exist on this schema
+            if deleted:
+                ChangeLogRepository(self.conn).record("vector", "delete", [id])
+
     def list_vectors(self):
         """List all vectors in the vector database."""
         try:
@@ -189,29 +280,16 @@ class VectorRepository(BaseRepository):
     def cleanup_orphaned_vectors(self):
         """Delete all vectors that don't have corresponding text entities."""
         deleted_count = 0
-        
-        try:
-            # Delete orphaned vectors from vec0 table
-            result = self.conn.execute("""
-                DELETE FROM vector WHERE id NOT IN (
-                    SELECT id FROM text_entity
-                )
-            """)
-            deleted_count += result.rowcount
-            self.conn.commit()
-        except Exception as e:
-            print(f"Warning: Failed to clean vec0 table: {e}")
-        
-        try:
-            # Delete orphaned vectors from fallback table
-            result = self.conn.execute("""
-                DELETE FROM vector_fallback WHERE id NOT IN (
-                    SELECT id FROM text_entity
-                )
-            """)
-            deleted_count += result.rowcount
-            self.conn.commit()
-        except Exception as e:
-            print(f"Warning: Failed to clean fallback table: {e}")
-        
-        return deleted_count
\ No newline at end of file
+        orphans = "SELECT id FROM {table} WHERE id NOT IN (SELECT id FROM text_entity)"
+
+        for table, label in (("vector", "vec0 table"), ("vector_fallback", "fallback table")):
+            try:
+                with transaction(self.conn):
+                    # Log the orphans first: once deleted their ids are gone
+                    ChangeLogRepository(self.conn).record_select("vector", "delete", orphans.format(table=table))
+                    result = self.conn.execute(f"DELETE FROM {table} WHERE id NOT IN (SELECT id FROM text_entity)")
+                    deleted_count += result.rowcount
+            except Exception as e:
+                print(f"Warning: Failed to clean {label}: {e}")
+
+        return deleted_count
@@ -0,0 +1,264 @@
+"""Citation graph between documents of the library.
+
+Bibliography entries parsed from Grobid (`document.reference_list`) are matched
+to library documents by DOI, then by normalized title. The normalized keys are
+persisted (migration 0009): `citation_key` holds each document's keys and
+`citation_ref` each bibliography entry's keys and resolved target, so linking a
+new document costs a few index probes instead of a scan of the library.
+Every match is stored as a `REFERENCES` edge (citing -> cited) in the
+`relationship` table, so "papers citing X" and co-citation become indexed
+lookups on `idx_relationship_target_type` / `idx_relationship_source_type`.
+
+Functions here never commit: callers run them inside their own transaction.
+"""
+import json
+import re
+import uuid
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from smart_library.domain.constants.relationship_types import RelationshipType
+from smart_library.domain.entities.relationship import Relationship
+from smart_library.infrastructure.repositories.relationship_repository import RelationshipRepository
+from smart_library.utils.textnorm import normalize_text
+
+REFERENCES = RelationshipType.REFERENCES.value
+
+_DOI_PREFIX = re.compile(r"^(https?://(dx\.)?doi\.org/|doi:\s*)", re.IGNORECASE)
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+# Short titles ("Introduction", "Editorial") match too many unrelated entries.
+MIN_TITLE_KEY_LENGTH = 20
+
+
+def normalize_doi(doi: Optional[str]) -> Optional[str]:
+    if not doi:
+        return None
+    key = _DOI_PREFIX.sub("", doi.strip()).lower()
+    return key or None
+
+
+def normalize_title(title: Optional[str]) -> Optional[str]:
+    if not title:
+        return None
+    key = _NON_ALNUM.sub(" ", normalize_text(title)).strip()
+    return key if len(key) >= MIN_TITLE_KEY_LENGTH else None
+
+
+def reference_edge_id(source_id: str, target_id: str) -> str:
+    """Deterministic edge id, so re-linking the same pair is a no-op."""
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"smartlib:references:{source_id}:{target_id}"))
+
+
+class LibraryIndex:
+    """In-memory DOI and normalized-title hash indexes over library documents (bulk linking)."""
+
+    def __init__(self):
+        self.by_doi: Dict[str, str] = {}
+        self.by_title: Dict[str, str] = {}
+
+    @classmethod
+    def from_connection(cls, conn) -> "LibraryIndex":
+        index = cls()
+        for row in conn.execute("SELECT id, doi, title FROM document ORDER BY id").fetchall():
+            index.add(row["id"], row["doi"], row["title"])
+        return index
+
+    def add(self, doc_id: str, doi: Optional[str], title: Optional[str]):
+        doi_key = normalize_doi(doi)
+        if doi_key:
+            self.by_doi.setdefault(doi_key, doc_id)
+        title_key = normalize_title(title)
+        if title_key:
+            self.by_title.setdefault(title_key, doc_id)
+
+    def match_keys(self, doi_key: Optional[str], title_key: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+        if doi_key and doi_key in self.by_doi:
+            return self.by_doi[doi_key], "doi"
+        if title_key and title_key in self.by_title:
+            return self.by_title[title_key], "title"
+        return None, None
+
+    def match(self, entry: dict) -> Tuple[Optional[str], Optional[str]]:
+        """Return `(document_id, "doi" | "title")` for a bibliography entry, or `(None, None)`."""
+        return self.match_keys(normalize_doi(entry.get("doi")), normalize_title(entry.get("title")))
+
+
+def _probe_keys(conn, doi_key: Optional[str], title_key: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """`LibraryIndex.match_keys` against the persisted `citation_key` table (ties go to the lowest id)."""
+    for kind, key in (("doi", doi_key), ("title", title_key)):
+        if key:
+            row = conn.execute(
+                "SELECT document_id FROM citation_key WHERE kind = ? AND key = ? ORDER BY document_id LIMIT 1",
+                (kind, key),
+            ).fetchone()
+            if row:
+                return row[0], kind
+    return None, None
+
+
+def _store_document_keys(conn, doc_id: str, doi: Optional[str], title: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    doi_key, title_key = normalize_doi(doi), normalize_title(title)
+    conn.execute("DELETE FROM citation_key WHERE document_id = ?", (doc_id,))
+    conn.executemany(
+        "INSERT OR IGNORE INTO citation_key (kind, key, document_id) VALUES (?, ?, ?)",
+        [(kind, key, doc_id) for kind, key in (("doi", doi_key), ("title", title_key)) if key],
+    )
+    return doi_key, title_key
+
+
+def _reference_edge(source_id: str, target_id: str, bib_key: Optional[str], how: str) -> Relationship:
+    return Relationship(
+        id=reference_edge_id(source_id, target_id),
+        source_id=source_id,
+        target_id=target_id,
+        type=RelationshipType.REFERENCES,
+        metadata={"bib_key": bib_key, "match": how},
+    )
+
+
+def _link_references(conn, source_id: str, reference_list: Iterable[dict], resolve) -> List[Relationship]:
+    """Store the keys of `source_id`'s bibliography in `citation_ref`; return its outgoing edges.
+
+    `resolve(doi_key, title_key)` returns `(document_id, "doi" | "title")` or `(None, None)`.
+    """
+    rows, edges = [], {}
+    for i, entry in enumerate(reference_list or []):
+        doi_key, title_key = normalize_doi(entry.get("doi")), normalize_title(entry.get("title"))
+        if not (doi_key or title_key):
+            continue
+        target_id, how = resolve(doi_key, title_key)
+        if target_id == source_id:
+            target_id = how = None
+        rows.append((source_id, i, entry.get("key"), doi_key, title_key, target_id, how))
+        if target_id and target_id not in edges:
+            edges[target_id] = _reference_edge(source_id, target_id, entry.get("key"), how)
+    conn.executemany(
+        "INSERT INTO citation_ref (source_id, entry, bib_key, doi_key, title_key, target_id, match) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+    return list(edges.values())
+
+
+def _load_reference_list(value) -> List[dict]:
+    if not value:
+        return []
+    try:
+        return json.loads(value)
+    except (TypeError, ValueError):
+        return []
+
+
+def _refresh_citations(conn, doc_ids: Iterable[str]):
+    """Keep the denormalized `document.citations` column in sync with the edges."""
+    for doc_id in doc_ids:
+        conn.execute("UPDATE document SET citations = ? WHERE id = ?",
+                     (json.dumps(cited_documents(conn, doc_id)), doc_id))
+
+
+def link_document(conn, doc_id: str) -> Dict[str, int]:
+    """Create REFERENCES edges for a newly stored (or re-processed) document.
+
+    Outgoing: entries of its reference list that match library documents
+    (probes of `citation_key`). Incoming: entries of other documents that
+    match it: unresolved entries carrying its DOI or title key, found
+    through the partial indexes on `citation_ref`, plus entries already
+    resolved to it. Returns edge counts.
+    """
+    row = conn.execute("SELECT id, doi, title, reference_list FROM document WHERE id = ?", (doc_id,)).fetchone()
+    if row is None:
+        return {"outgoing": 0, "incoming": 0}
+    doi_key, title_key = _store_document_keys(conn, doc_id, row["doi"], row["title"])
+
+    conn.execute("DELETE FROM citation_ref WHERE source_id = ?", (doc_id,))
+    outgoing = _link_references(conn, doc_id, _load_reference_list(row["reference_list"]),
+                                lambda d, t: _probe_keys(conn, d, t))
+
+    matches = conn.execute(
+        """
+        SELECT source_id, entry, bib_key, 'doi' AS how FROM citation_ref
+        WHERE target_id IS NULL AND doi_key = ? AND source_id != ?
+        UNION ALL
+        SELECT source_id, entry, bib_key, 'title' FROM citation_ref
+        WHERE target_id IS NULL AND title_key = ? AND source_id != ?
+        UNION ALL
+        SELECT source_id, entry, bib_key, match FROM citation_ref WHERE target_id = ? AND source_id != ?
+        """,
+        (doi_key, doc_id, title_key, doc_id, doc_id, doc_id),
+    ).fetchall()
+    resolved, incoming = {}, {}
+    for m in matches:  # DOI matches come first and win over a title match of the same entry
+        resolved.setdefault((m["source_id"], m["entry"]), m["how"])
+        if m["source_id"] not in incoming:
+            incoming[m["source_id"]] = _reference_edge(m["source_id"], doc_id, m["bib_key"], m["how"])
+    conn.executemany(
+        "UPDATE citation_ref SET target_id = ?, match = ? WHERE source_id = ? AND entry = ? AND target_id IS NULL",
+        [(doc_id, how, source_id, entry) for (source_id, entry), how in resolved.items()],
+    )
+
+    RelationshipRepository(conn).add_many(outgoing + list(incoming.values()))
+    _refresh_citations(conn, [doc_id] + sorted(incoming))
+    return {"outgoing": len(outgoing), "incoming": len(incoming)}
+
+
+def rebuild_citation_index(conn, relink: bool = True) -> int:
+    """Rebuild the citation key tables from the stored documents in one pass (in-memory indexes).
+
+    For libraries migrated to 0009, whose key tables start empty. With
+    `relink`, every REFERENCES edge and `document.citations` is rebuilt
+    too; without it (after a bulk import, which restores the edges) only
+    the key tables are filled. Returns the number of resolved citations.
+    """
+    index = LibraryIndex()
+    conn.execute("DELETE FROM citation_key")
+    conn.execute("DELETE FROM citation_ref")
+    for row in conn.execute("SELECT id, doi, title FROM document ORDER BY id").fetchall():
+        index.add(row["id"], row["doi"], row["title"])
+        _store_document_keys(conn, row["id"], row["doi"], row["title"])
+
+    if relink:
+        conn.execute("DELETE FROM relationship WHERE type = ?", (REFERENCES,))
+    repo = RelationshipRepository(conn)
+    total = 0
+    for row in conn.execute("SELECT id, reference_list FROM document WHERE reference_list IS NOT NULL").fetchall():
+        edges = _link_references(conn, row["id"], _load_reference_list(row["reference_list"]), index.match_keys)
+        if relink:
+            repo.add_many(edges)
+        total += len(edges)
+    if relink:
+        _refresh_citations(conn, [row["id"] for row in conn.execute("SELECT id FROM document").fetchall()])
+    return total
+
+
+def citing_documents(conn, doc_id: str) -> List[str]:
+    """Documents whose bibliography cites `doc_id`."""
+    rows = conn.execute(
+        "SELECT source_id FROM relationship WHERE target_id = ? AND type = ? ORDER BY source_id",
+        (doc_id, REFERENCES),
+    ).fetchall()
+    return [r["source_id"] for r in rows]
+
+
+def cited_documents(conn, doc_id: str) -> List[str]:
+    """Library documents cited by `doc_id`."""
+    rows = conn.execute(
+        "SELECT target_id FROM relationship WHERE source_id = ? AND type = ? ORDER BY target_id",
+        (doc_id, REFERENCES),
+    ).fetchall()
+    return [r["target_id"] for r in rows]
+
+
+def co_cited_documents(conn, doc_id: str, limit: int = 20) -> List[Tuple[str, int]]:
+    """Documents most often cited together with `doc_id`, as `(document_id, shared citing papers)`."""
+    rows = conn.execute(
+        """
+        SELECT r2.target_id AS id, COUNT(*) AS n
+        FROM relationship r1
+        JOIN relationship r2 ON r2.source_id = r1.source_id AND r2.type = r1.type
+        WHERE r1.target_id = ? AND r1.type = ? AND r2.target_id != r1.target_id
+        GROUP BY r2.target_id
+        ORDER BY n DESC, r2.target_id
+        LIMIT ?
+        """,
+        (doc_id, REFERENCES, limit),
+    ).fetchall()
+    return [(r["id"], r["n"]) for r in rows]
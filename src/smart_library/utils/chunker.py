@@ -1,17 +1,77 @@
 import re
-from typing import List
+from bisect import bisect_left
+from itertools import accumulate
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
 from smart_library.config import ChunkerConfig
 
+_SENTENCE_END = re.compile(r"[.!?]")
+_NON_SPACE = re.compile(r"\S")
+_WHITESPACE_RUN = re.compile(r"\s{2,}")
+_WORD = re.compile(r"\S+")
+
+
+class ChunkSpan(NamedTuple):
+    """
+    A chunk as character offsets into the source text.
+    `text[start:end]` is the non-overlap chunk, `text[overlap_start:end]` the
+    chunk with overlap from the previous one (`overlap_start == start` without).
+    """
+    start: int
+    end: int
+    overlap_start: int
+
+    def text(self, source: str) -> str:
+        return collapse_whitespace(source[self.start:self.end])
+
+    def overlap_text(self, source: str) -> str:
+        return collapse_whitespace(source[self.overlap_start:self.end])
+
+
+def collapse_whitespace(text: str) -> str:
+    """Same normalization the sentence chunker applies: whitespace runs become one space."""
+    return " ".join(text.split())
+
+
+def _join_paragraphs(paragraphs: Sequence[str]) -> Tuple[str, List[Tuple[int, int]]]:
+    """Newline-joined page text and the `(start, end)` range of each paragraph in it."""
+    bounds = []
+    pos = 0
+    for p in paragraphs:
+        bounds.append((pos, pos + len(p)))
+        pos += len(p) + 1
+    return "\n".join(paragraphs), bounds
+
+
+class _CollapsedLength:
+    """
+    Length of `text[a:b]` after collapsing whitespace runs, in O(log n).
+    Only runs of two or more whitespace characters change the length, and
+    Grobid paragraph text has few of them.
+    """
+
+    def __init__(self, text: str):
+        runs = [(m.start(), m.end()) for m in _WHITESPACE_RUN.finditer(text)]
+        self.starts = [a for a, _ in runs]
+        self.excess = [0] + list(accumulate(b - a - 1 for a, b in runs))
+
+    def __call__(self, a: int, b: int) -> int:
+        # a and b lie on non-space characters, so no run straddles them
+        return (b - a) - (self.excess[bisect_left(self.starts, b)] - self.excess[bisect_left(self.starts, a)])
+
 class TextChunker:
     """
     Simple, reliable, deterministic text chunker.
     Splits text into chunks of approx `max_char` with optional overlap.
     """
 
-    def __init__(self):
-        self.min_char = ChunkerConfig.MIN_CHAR
-        self.max_char = ChunkerConfig.MAX_CHAR
-        self.overlap = ChunkerConfig.OVERLAP
+    def __init__(self, min_char: int = None, max_char: int = None, overlap: int = None):
+        self.min_char = ChunkerConfig.MIN_CHAR if min_char is None else min_char
+        self.max_char = ChunkerConfig.MAX_CHAR if max_char is None else max_char
+        self.overlap = ChunkerConfig.OVERLAP if overlap is None else overlap
+        # Token mode (page_token_spans) budgets
+        self.min_tokens = ChunkerConfig.MIN_TOKENS
+        self.max_tokens = ChunkerConfig.MAX_TOKENS
+        self.overlap_tokens = ChunkerConfig.OVERLAP_TOKENS
         assert self.max_char > self.overlap, "max_char must be > overlap"
 
     # --- PUBLIC API ---------------------------------------------------------
@@ -76,6 +136,210 @@ class TextChunker:
 
         return non_overlap_chunks, overlap_chunks
 
+    # --- SPAN MODE ---------------------------------------------------------
+
+    def page_spans(self, paragraphs: Sequence[str]) -> Tuple[str, Iterator[ChunkSpan]]:
+        """
+        Span-mode counterpart of `process_chunks`: joins the paragraphs with
+        newlines and returns `(page_text, spans)`, where `spans` lazily yields
+        one ChunkSpan per chunk. Strings are only built by `ChunkSpan.text()`.
+        """
+        page_text, bounds = _join_paragraphs(paragraphs)
+        return page_text, self.chunk_spans(page_text, bounds)
+
+    def chunk_spans(self, text: str, paragraphs: Optional[Sequence[Tuple[int, int]]] = None) -> Iterator[ChunkSpan]:
+        """
+        Single pass over `text` yielding ChunkSpans with the same grouping rules
+        as `process_chunks`. `paragraphs` are `(start, end)` ranges that
+        sentences never cross (default: the whole text).
+
+        Overlap is taken from the sentence units of the previous chunk instead
+        of re-splitting its joined string, so it only differs from
+        `process_chunks` when a unit has no closing punctuation.
+        """
+        if not text:
+            return
+        units = self._unit_spans(text, paragraphs or [(0, len(text))], _CollapsedLength(text), self.max_char)
+        yield from self._group_spans(units, self.min_char, self.max_char, self.overlap, join=1)
+
+    # --- TOKEN MODE --------------------------------------------------------
+
+    def page_token_spans(self, paragraphs: Sequence[str], tokenizer=None) -> Tuple[str, List[ChunkSpan]]:
+        """`page_spans` with chunk sizes in tokens (ChunkerConfig.MIN/MAX/OVERLAP_TOKENS)."""
+        page_text, bounds = _join_paragraphs(paragraphs)
+        return page_text, self.token_spans(page_text, bounds, tokenizer)
+
+    def token_spans(self, text: str, paragraphs: Optional[Sequence[Tuple[int, int]]] = None,
+                    tokenizer=None) -> List[ChunkSpan]:
+        """
+        Chunks `text` so every chunk, overlap included (the embedding input),
+        stays within `max_tokens`: chunks get `max_tokens - overlap_tokens`
+        and the overlap at most `overlap_tokens`.
+        All sentence units of the page are encoded in one batch call; sentences
+        over budget are split at whitespace (and inside over-long words).
+        """
+        if not text:
+            return []
+        from smart_library.utils.tokens import get_tokenizer
+        tokenizer = tokenizer or get_tokenizer()
+        overlap = min(self.overlap_tokens, self.max_tokens // 2)
+        budget = self.max_tokens - overlap
+        clen = _CollapsedLength(text)
+        # Character pass first (no character cap), then one tokenizer call per page
+        units = list(self._unit_spans(text, paragraphs or [(0, len(text))], clen, None))
+        counts = tokenizer.count_many([text[a:b] for a, b, _ in units])
+        sized = []
+        for (a, b, _), n in zip(units, counts):
+            if n <= budget:
+                sized.append((a, b, n))
+            else:
+                sized.extend(self._token_split(text, a, b, tokenizer, budget))
+        return list(self._group_spans(sized, min(self.min_tokens, budget), budget, overlap, join=0, cap_overlap=True))
+
+    def _token_split(self, text: str, start: int, stop: int, tokenizer, budget: int) -> List[Tuple[int, int, int]]:
+        """Split an over-budget sentence into whitespace-separated pieces within `budget` tokens."""
+        words = [(m.start(), m.end()) for m in _WORD.finditer(text, start, stop)]
+        counts = tokenizer.count_many([" " + text[a:b] for a, b in words])
+        pieces: List[Tuple[int, int, int]] = []
+        cur_start = cur_end = None
+        cur_n = 0
+        for (a, b), n in zip(words, counts):
+            if n > budget:
+                # A single word over budget (formula, URL, unspaced script): cut it by characters
+                if cur_start is not None:
+                    pieces.append((cur_start, cur_end, cur_n))
+                    cur_start = None
+                step = max(1, (b - a) * budget // n)
+                for i in range(a, b, step):
+                    j = min(i + step, b)
+                    pieces.append((i, j, tokenizer.count(text[i:j])))
+                continue
+            if cur_start is not None and cur_n + n > budget:
+                pieces.append((cur_start, cur_end, cur_n))
+                cur_start = None
+            if cur_start is None:
+                cur_start, cur_n = a, 0
+            cur_end = b
+            cur_n += n
+        if cur_start is not None:
+            pieces.append((cur_start, cur_end, cur_n))
+        return pieces
+
+    # --- SPAN GROUPING -----------------------------------------------------
+
+    def _group_spans(self, units: Iterable[Tuple[int, int, int]], min_len: int, max_len: int,
+                     overlap: int, join: int, cap_overlap: bool = False) -> Iterator[ChunkSpan]:
+        """
+        Greedy grouping of `(start, end, length)` units into chunks between
+        `min_len` and `max_len`, aiming at the midpoint; `join` is the length
+        added between two units (1 for a space in character mode). With
+        `cap_overlap` the overlap never exceeds `overlap` (see `_overlap_start`).
+        """
+        target = (min_len + max_len) // 2
+        # One chunk is held back so the last one can still be merged into its predecessor.
+        held = None            # units of the last finished chunk
+        held_len = 0
+        prev_units = None      # units of the chunk before `held` (overlap source)
+        current: List[Tuple[int, int, int]] = []
+        current_len = 0
+
+        def emit(chunk_units, before):
+            start, end = chunk_units[0][0], chunk_units[-1][1]
+            return ChunkSpan(start, end, self._overlap_start(before, start, overlap, join, cap_overlap))
+
+        for unit in units:
+            u_len = unit[2]
+            if not current:
+                current, current_len = [unit], u_len
+                continue
+            new_len = current_len + join + u_len
+            if new_len <= max_len and (
+                current_len < min_len or abs(new_len - target) <= abs(current_len - target)
+            ):
+                current.append(unit)
+                current_len = new_len
+                continue
+            if held is not None:
+                yield emit(held, prev_units)
+                prev_units = held
+            held, held_len = current, current_len
+            current, current_len = [unit], u_len
+
+        if not current:
+            return
+        if held is not None and current_len < min_len and held_len + join + current_len <= max_len:
+            yield emit(held + current, prev_units)
+            return
+        if held is not None:
+            yield emit(held, prev_units)
+            prev_units = held
+        yield emit(current, prev_units)
+
+    @staticmethod
+    def _overlap_start(prev_units, start: int, overlap: int, join: int, cap: bool = False) -> int:
+        """
+        Start of the trailing units of the previous chunk that make up ~`overlap`
+        (the unit reaching it is included). With `cap`, units that would push
+        the overlap past `overlap` are left out instead.
+        """
+        if not prev_units or overlap <= 0:
+            return start
+        total = 0
+        first = start
+        for u_start, _, u_len in reversed(prev_units):
+            total += u_len + join
+            if cap and total > overlap:
+                return first
+            first = u_start
+            if total >= overlap:
+                return u_start
+        return prev_units[0][0]
+
+    def _unit_spans(self, text: str, paragraphs, clen, max_char: Optional[int]) -> Iterator[Tuple[int, int, int]]:
+        """
+        Yields `(start, end, collapsed length)` of sentences (ending at . ! ?
+        or at the paragraph end), hard-split at whitespace when longer than `max_char`.
+        """
+        for p_start, p_end in paragraphs:
+            pos = p_start
+            while pos < p_end:
+                m = _NON_SPACE.search(text, pos, p_end)
+                if m is None:
+                    break
+                start = m.start()
+                end_m = _SENTENCE_END.search(text, start, p_end)
+                end = end_m.end() if end_m else p_end
+                pos = end
+                if end_m is None:
+                    while text[end - 1].isspace():
+                        end -= 1
+                length = clen(start, end)
+                if max_char is None or length <= max_char:
+                    yield start, end, length
+                else:
+                    yield from self._hard_split_spans(text, start, end, clen)
+
+    def _hard_split_spans(self, text: str, start: int, stop: int, clen) -> Iterator[Tuple[int, int, int]]:
+        """Span version of `_hard_split`: pieces of at most max_char, split at whitespace."""
+        while start < stop:
+            end = min(start + self.max_char, stop)
+            while end < stop and clen(start, end) < self.max_char:
+                end = min(end + self.max_char - clen(start, end), stop)
+            if end < stop:
+                space = end - 1
+                while space > start and not text[space].isspace():
+                    space -= 1
+                if space > start:
+                    end = space
+            piece_end = end
+            while piece_end > start and text[piece_end - 1].isspace():
+                piece_end -= 1
+            if piece_end > start:
+                yield start, piece_end, clen(start, piece_end)
+            start = end
+            while start < stop and text[start].isspace():
+                start += 1
+
     # --- HELPERS -----------------------------------------------------------
 
     def _split_into_sentences(self, text: str) -> list[str]:
@@ -0,0 +1,26 @@
+from __future__ import annotations
+import hashlib
+from pathlib import Path
+from typing import Union
+
+PathLike = Union[str, Path]
+
+# Read files in 1 MiB blocks so hashing large PDFs uses constant memory.
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def sha256_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def sha256_text(text: str) -> str:
+    """Hash a text string (UTF-8). `None` hashes like the empty string."""
+    return sha256_bytes((text or "").encode("utf-8"))
+
+
+def sha256_file(path: PathLike, chunk_size: int = HASH_CHUNK_SIZE) -> str:
+    h = hashlib.sha256()
+    with Path(path).open("rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            h.update(block)
+    return h.hexdigest()
@@ -35,6 +35,58 @@ def print_document(doc, indent=0):
             print(f"{prefix}    [Paragraph] {repr(para.content)}... (index={getattr(para, 'index', None)}, id={getattr(para, 'id', None)})")
 
 
+# Fields the search printers read: hits load row views of just these columns
+_HIT_TEXT_COLUMNS = ("parent_id", "metadata", "page_number", "content", "display_content")
+_HIT_DOC_COLUMNS = ("title", "authors", "year", "human_id", "citation_key")
+
+
+def _batch_get(service, many: str, one: str, ids, **kwargs):
+    """`{id: obj}` via the service's batch method, falling back to one call per id."""
+    ids = [i for i in dict.fromkeys(ids) if i]
+    if service is None or not ids:
+        return {}
+    if hasattr(service, many):
+        items = getattr(service, many)(ids, **kwargs)
+        return {(item.get("id") if isinstance(item, dict) else getattr(item, "id", None)): item for item in items}
+    found = {}
+    for i in ids:
+        try:
+            item = getattr(service, one)(i)
+        except Exception:
+            item = None
+        if item is not None:
+            found[i] = item
+    return found
+
+
+def _resolve_hits(ids, text_service, doc_service=None, entity_service=None):
+    """
+    `{text_id: (text, document)}` for search hits, with one query each for
+    texts, parent entities and documents instead of several per hit.
+    """
+    def _get(obj, name):
+        return obj.get(name) if isinstance(obj, dict) else getattr(obj, name, None)
+
+    texts = _batch_get(text_service, "get_text_views", "get_text", ids, columns=_HIT_TEXT_COLUMNS)
+    parent_of = {}
+    for tid, txt in texts.items():
+        parent_of[tid] = _get(txt, "parent_id") or (_get(txt, "metadata") or {}).get("parent_id")
+
+    # A text's parent is a page (whose parent is the document) or the document itself
+    doc_of = dict(parent_of)
+    if entity_service:
+        try:
+            parents = _batch_get(entity_service, "get_many", "get", parent_of.values())
+        except Exception:
+            parents = {}
+        doc_of = {tid: (_get(parents[pid], "parent_id") or pid) if pid in parents else None for tid, pid in parent_of.items()}
+    try:
+        docs = _batch_get(doc_service, "get_document_views", "get_document", doc_of.values(), columns=_HIT_DOC_COLUMNS)
+    except Exception:
+        docs = {}
+    return {tid: (texts.get(tid), docs.get(doc_of.get(tid))) for tid in ids}
+
+
 def print_search_results_boxed(results, text_service, doc_service=None, entity_service=None, max_chars=None):
     """Print each search result in its own boxed table.
 
@@ -64,34 +116,22 @@ def print_search_results_boxed(results, text_service, doc_service=None, entity_s
 
     import textwrap
 
+    results = list(results or [])
+    hits = _resolve_hits(
+        [r.get("id") if isinstance(r, dict) else getattr(r, "id", None) for r in results],
+        text_service, doc_service=doc_service, entity_service=entity_service,
+    )
+
     # Compact mode: single-line metadata header + wrapped snippet
-    for r in results or []:
+    for r in results:
         tid = r.get("id") if isinstance(r, dict) else getattr(r, "id", None)
         score = (r.get("cosine_similarity") or r.get("cosine")) if isinstance(r, dict) else getattr(r, "cosine_similarity", None) or getattr(r, "cosine", 0.0)
         score = float(score or 0.0)
 
-        txt = text_service.get_text(tid) if text_service else None
+        txt, doc = hits.get(tid, (None, None))
         content = _get_attr(txt, "content", None) or _get_attr(txt, "display_content", "")
         metadata = _get_attr(txt, "metadata", {}) or {}
         page = _get_attr(txt, "page_number", None) or metadata.get("page_number") or metadata.get("page") or metadata.get("page_num") or ""
-        parent_id = _get_attr(txt, "parent_id", None) or metadata.get("parent_id")
-
-        # Resolve document title/author/year
-        doc = None
-        if entity_service and parent_id:
-            try:
-                parent = entity_service.get(parent_id)
-                if parent:
-                    p_parent = parent.get("parent_id") if isinstance(parent, dict) else getattr(parent, "parent_id", None)
-                    doc_id = p_parent or (parent.get("id") if isinstance(parent, dict) else getattr(parent, "id", None))
-                    doc = doc_service.get_document(doc_id) if doc_service and doc_id else None
-            except Exception:
-                doc = None
-        elif doc_service and parent_id:
-            try:
-                doc = doc_service.get_document(parent_id)
-            except Exception:
-                doc = None
 
         title = _get_attr(doc, "title", "")
         authors = _get_attr(doc, "authors", []) or []
@@ -140,32 +180,19 @@ def print_search_response(response, text_service, doc_service=None, entity_servi
     summary_rows = []
     # Build a compact table: rank, id, title, author(year), page, score, snippet
     table_rows = []
-    for r in getattr(response, "results", []) or []:
+    results = list(getattr(response, "results", []) or [])
+    hits = _resolve_hits(
+        [r.id if not isinstance(r, dict) else r.get("id") for r in results],
+        text_service, doc_service=doc_service, entity_service=entity_service,
+    )
+    for r in results:
         tid = r.id if not isinstance(r, dict) else r.get("id")
         score = (getattr(r, "score", None) if not isinstance(r, dict) else r.get("score")) or 0.0
 
-        txt = text_service.get_text(tid) if text_service else None
+        txt, doc = hits.get(tid, (None, None))
         content = _get_attr(txt, "content", None) or _get_attr(txt, "display_content", "")
         metadata = _get_attr(txt, "metadata", {}) or {}
         page = _get_attr(txt, "page_number", None) or metadata.get("page_number") or metadata.get("page") or metadata.get("page_num") or ""
-        parent_id = _get_attr(txt, "parent_id", None) or metadata.get("parent_id")
-
-        # Resolve document title/author/year
-        doc = None
-        if entity_service and parent_id:
-            try:
-                parent = entity_service.get(parent_id)
-                if parent:
-                    p_parent = parent.get("parent_id") if isinstance(parent, dict) else getattr(parent, "parent_id", None)
-                    doc_id = p_parent or (parent.get("id") if isinstance(parent, dict) else getattr(parent, "id", None))
-                    doc = doc_service.get_document(doc_id) if doc_service and doc_id else None
-            except Exception:
-                doc = None
-        elif doc_service and parent_id:
-            try:
-                doc = doc_service.get_document(parent_id)
-            except Exception:
-                doc = None
 
         title = _get_attr(doc, "title", "")
         authors = _get_attr(doc, "authors", []) or []
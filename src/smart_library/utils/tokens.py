@@ -0,0 +1,94 @@
+from __future__ import annotations
+import logging
+import math
+import re
+import threading
+from typing import List, Optional, Sequence
+
+log = logging.getLogger(__name__)
+
+# Fallback estimate: letter runs cost ~1 token per 4 chars, digits are grouped
+# by 3 (as in cl100k), every other visible character (CJK, math symbols,
+# punctuation) costs one token. It errs on the high side, which is the safe
+# direction for a budget.
+_FALLBACK_TOKEN = re.compile(r"[^\W\d_]+|\d+|\S", re.UNICODE)
+
+
+class Tokenizer:
+    """Counts tokens; `count_many` encodes a whole page in one call."""
+
+    name = "base"
+
+    def count(self, text: str) -> int:
+        return self.count_many([text])[0]
+
+    def count_many(self, texts: Sequence[str]) -> List[int]:
+        raise NotImplementedError
+
+
+class TiktokenTokenizer(Tokenizer):
+    def __init__(self, encoding):
+        self.encoding = encoding
+        self.name = f"tiktoken:{encoding.name}"
+
+    def count_many(self, texts: Sequence[str]) -> List[int]:
+        if not texts:
+            return []
+        # encode_ordinary_batch releases the GIL and encodes in parallel threads
+        return [len(ids) for ids in self.encoding.encode_ordinary_batch([t or "" for t in texts])]
+
+
+class RegexTokenizer(Tokenizer):
+    """Dependency-free approximation used when tiktoken is unavailable."""
+
+    name = "regex-estimate"
+
+    def count_many(self, texts: Sequence[str]) -> List[int]:
+        counts = []
+        for text in texts:
+            n = 0
+            for m in _FALLBACK_TOKEN.finditer(text or ""):
+                piece = m.group()
+                if piece[0].isdigit():
+                    n += math.ceil(len(piece) / 3)
+                elif piece[0].isalpha() and piece.isascii():
+                    n += math.ceil(len(piece) / 4)
+                elif piece[0].isalpha():
+                    n += len(piece)  # non-Latin scripts: about one token per character
+                else:
+                    n += 1
+            counts.append(n)
+        return counts
+
+
+_tokenizers = {}
+_lock = threading.Lock()
+
+
+def get_tokenizer(encoding_name: Optional[str] = None) -> Tokenizer:
+    """
+    Process-wide tokenizer for `encoding_name` (default: `ChunkerConfig.TOKENIZER`).
+    Loaded once; falls back to RegexTokenizer when tiktoken or its encoding
+    file cannot be loaded (e.g. offline).
+    """
+    if encoding_name is None:
+        from smart_library.config import ChunkerConfig
+        encoding_name = ChunkerConfig.TOKENIZER
+    tokenizer = _tokenizers.get(encoding_name)
+    if tokenizer is not None:
+        return tokenizer
+    with _lock:
+        if encoding_name not in _tokenizers:
+            _tokenizers[encoding_name] = _load(encoding_name)
+        return _tokenizers[encoding_name]
+
+
+def _load(encoding_name: str) -> Tokenizer:
+    if encoding_name == RegexTokenizer.name:
+        return RegexTokenizer()
+    try:
+        import tiktoken
+        return TiktokenTokenizer(tiktoken.get_encoding(encoding_name))
+    except Exception as e:  # ImportError, unknown encoding, or no network for the BPE file
+        log.warning("tiktoken encoding %r unavailable (%s); using approximate token counts", encoding_name, e)
+        return RegexTokenizer()
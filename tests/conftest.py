@@ -0,0 +1,82 @@
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+SCHEMA_PATH = Path(__file__).resolve().parents[1] / "src" / "smart_library" / "infrastructure" / "db" / "schema.sql"
+
+
+def _schema_without_vec0() -> str:
+    """schema.sql minus the sqlite-vec block (same trick as scripts/reset_db.py)."""
+    sql = SCHEMA_PATH.read_text(encoding="utf-8")
+    start = sql.find("DROP TABLE IF EXISTS vector;")
+    if start != -1:
+        end = sql.find("\n-- =========================================================", start)
+        if end != -1:
+            sql = sql[:start] + sql[end:]
+    return sql
+
+
+def _library_conn(path=":memory:"):
+    conn = sqlite3.connect(str(path), isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(_schema_without_vec0())
+    conn.execute("PRAGMA foreign_keys = ON;")
+    return conn
+
+
+@pytest.fixture
+def sqlite_conn():
+    """In-memory database with the library schema; vectors go to `vector_fallback`."""
+    conn = _library_conn()
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def make_sqlite_conn():
+    """Factory for further empty library databases (in memory, or at a path)."""
+    conns = []
+
+    def make(path=":memory:"):
+        conns.append(_library_conn(path))
+        return conns[-1]
+    yield make
+    for conn in conns:
+        conn.close()
+
+
+@pytest.fixture
+def make_document():
+    """
+    Factory seeding a document into a library connection: `n_pages` pages
+    (0: the texts hang off the document) with `n_texts` texts each, their
+    content from the `content` template (or the `contents` list), and with
+    `vectors` one 2-d vector per text. Returns (document, pages, texts).
+    """
+    from smart_library.domain.entities.document import Document
+    from smart_library.domain.entities.page import Page
+    from smart_library.domain.entities.text import Text
+    from smart_library.infrastructure.db.db import transaction
+    from smart_library.infrastructure.repositories.document_repository import DocumentRepository
+    from smart_library.infrastructure.repositories.page_repository import PageRepository
+    from smart_library.infrastructure.repositories.text_repository import TextRepository
+    from smart_library.infrastructure.repositories.vector_repository import VectorRepository
+
+    def make(conn, title="Document", year=None, n_texts=3, storage="inline", vectors=False, n_pages=1,
+             content="chunk {i}", contents=None, **fields):
+        doc = Document(title=title, year=year, **fields)
+        DocumentRepository(conn)._insert_row(doc)
+        pages = [Page(parent_id=doc.id, page_number=n, paragraphs=[f"p{n}"]) for n in range(1, n_pages + 1)]
+        for page in pages:
+            PageRepository(conn).add(page)
+        contents = contents or [content.format(title=title, i=i) for i in range(n_texts)]
+        texts = [Text(parent_id=page.id if page else doc.id, content=c, index=i,
+                      page_number=page.page_number if page else None, metadata={"document_id": doc.id})
+                 for page in (pages or [None]) for i, c in enumerate(contents)]
+        with transaction(conn):
+            TextRepository(conn, storage=storage).add_many(texts)
+            if vectors:
+                VectorRepository(conn).add_many([(t.id, [1.0, float(i)]) for i, t in enumerate(texts)])
+        return doc, pages, texts
+    return make
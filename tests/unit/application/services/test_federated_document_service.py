@@ -0,0 +1,63 @@
+import pytest
+
+from smart_library.application.services.federated_document_service import FederatedDocumentService
+from smart_library.application.services.purge_service import PurgeWorker
+from smart_library.domain.entities.document import Document
+from smart_library.domain.entities.text import Text
+from smart_library.infrastructure.db.shards import ShardCatalog
+from smart_library.infrastructure.repositories.document_repository import DocumentRepository
+from smart_library.infrastructure.repositories.text_repository import TextRepository
+
+
+@pytest.fixture
+def sharded(tmp_path, make_sqlite_conn):
+    catalog = ShardCatalog(tmp_path / "shards.json", main_path=tmp_path / "main.db")
+    catalog.add("pool-1")
+    conns = {shard.name: make_sqlite_conn() for shard in catalog.shards}
+    service = FederatedDocumentService(catalog, connect=lambda shard: conns[shard.name],
+                                       write=lambda shard, fn: fn(conns[shard.name]))
+    return catalog, conns, service
+
+
+def _document_routed_to(catalog, name, title):
+    while True:
+        doc = Document(title=title)
+        if catalog.route(doc.id).name == name:
+            return doc
+
+
+def test_documents_are_found_listed_and_deleted_on_their_shard(sharded, tmp_path):
+    catalog, conns, service = sharded
+    hashed = _document_routed_to(catalog, "pool-1", "On its hashed shard")
+    on_main = _document_routed_to(catalog, "main", "On main")
+    moved = _document_routed_to(catalog, "pool-1", "Written before pool-1 existed")
+    DocumentRepository(conns["pool-1"])._insert_row(hashed)
+    for doc in (on_main, moved):
+        DocumentRepository(conns["main"])._insert_row(doc)
+    text = Text(parent_id=hashed.id, content="BRCA1 cohort", index=0)
+    TextRepository(conns["pool-1"], storage="inline").add_many([text])
+
+    assert service.locate(hashed.id).name == "pool-1"
+    assert service.locate(moved.id).name == "main"  # not on its routed shard: found on the others
+    assert service.locate("missing") is None
+    assert service.document_service(hashed.id).get_document(hashed.id).title == "On its hashed shard"
+    assert service.text_service(text.id).get_text(text.id).content == "BRCA1 cohort"
+
+    expected = sorted((str(d.created_at), d.id) for d in (hashed, on_main, moved))
+    first = service.page(limit=2)
+    assert first.total == 3 and first.next_cursor
+    second = service.page(limit=2, after=first.next_cursor)
+    assert second.next_cursor is None
+    assert [d.id for d in first.items + second.items] == [i for _, i in expected]
+    titles = service.page(limit=10, order="title", columns=("title",)).items
+    assert [d.title for d in titles] == sorted((d.title for d in (hashed, on_main, moved)), key=str.lower)
+
+    assert service.tombstone(hashed.id).name == "pool-1"
+    assert service.tombstone(hashed.id) is None  # already deleted
+    assert service.document_service(hashed.id).get_document(hashed.id) is None
+    assert service.page(limit=10).total == 2
+
+    worker = PurgeWorker(execute=lambda fn: fn(conns["main"]), pdf_dir=tmp_path, pause=0, catalog=catalog,
+                         connect=lambda shard: conns[shard.name])
+    assert worker.purge_pending() == 1
+    assert conns["pool-1"].execute("SELECT COUNT(*) FROM entity").fetchone()[0] == 0
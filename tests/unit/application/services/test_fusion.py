@@ -0,0 +1,45 @@
+import pytest
+
+from smart_library.application.services.evaluation import ndcg_at_k
+from smart_library.application.services.fusion import fuse, reciprocal_rank_fusion, weighted_fusion
+
+
+LEXICAL = [("a", 12.0), ("b", 7.5), ("c", 1.0)]
+VECTOR = [("c", 0.91), ("a", 0.90), ("d", 0.40)]
+
+
+def test_rrf_rewards_agreement_between_sources():
+    fused = reciprocal_rank_fusion({"lexical": LEXICAL, "vector": VECTOR}, k=60)
+
+    assert [doc_id for doc_id, _ in fused] == ["a", "c", "b", "d"]
+    assert fused[0][1] == pytest.approx(1 / 61 + 1 / 62)
+
+
+def test_rrf_weights_scale_each_source():
+    fused = reciprocal_rank_fusion({"lexical": LEXICAL, "vector": VECTOR}, weights={"lexical": 0.0}, k=60)
+
+    assert [doc_id for doc_id, _ in fused][:3] == ["c", "a", "d"]
+
+
+def test_weighted_fusion_normalises_score_scales():
+    fused = dict(weighted_fusion({"lexical": LEXICAL, "vector": VECTOR}, weights={"lexical": 1.0, "vector": 2.0}))
+
+    assert fused["a"] == pytest.approx(1.0 + 2.0 * (0.50 / 0.51))
+    assert fused["b"] == pytest.approx(6.5 / 11.0)
+    assert fused["c"] == pytest.approx(2.0)
+    assert fused["d"] == pytest.approx(0.0)
+    # A single hit (zero spread) counts as a full match, an empty source is ignored
+    assert weighted_fusion({"lexical": [("x", 3.0)], "vector": []}) == [("x", 1.0)]
+
+
+def test_fuse_rejects_unknown_method():
+    assert fuse({"lexical": LEXICAL}, "rrf") == reciprocal_rank_fusion({"lexical": LEXICAL})
+    with pytest.raises(ValueError, match="Unknown fusion method"):
+        fuse({"lexical": LEXICAL}, "max")
+
+
+def test_ndcg_at_k():
+    assert ndcg_at_k(["a", "b", "c"], {"a", "b"}, k=3) == pytest.approx(1.0)
+    assert ndcg_at_k(["x", "a"], {"a"}, k=2) == pytest.approx(1 / 1.5849625007211563)
+    assert ndcg_at_k(["x", "y", "a"], {"a"}, k=2) == 0.0
+    assert ndcg_at_k(["a"], set()) == 0.0
@@ -0,0 +1,103 @@
+from smart_library.application.services.reprocess_app_service import ReprocessAppService, diff_texts
+from smart_library.domain.aggregates.document_snapshot import DocumentSnapshot
+from smart_library.domain.entities.document import Document
+from smart_library.domain.entities.text import Text
+from smart_library.infrastructure.repositories.document_repository import DocumentRepository
+from smart_library.infrastructure.repositories.text_repository import TextRepository
+
+
+class FakeEmbed:
+    def __init__(self):
+        self.calls = []
+
+    def embed(self, text):
+        self.calls.append(text)
+        return [1.0, 0.0, 0.0]
+
+
+def _texts(doc_id, *contents):
+    return [Text(parent_id=doc_id, content=c, embedding_content=c, index=i) for i, c in enumerate(contents)]
+
+
+def test_diff_texts_matches_by_embedding_content():
+    stored = _texts("d", "a", "b", "c")
+    rebuilt = _texts("d", "a", "c", "new")
+    diff = diff_texts(stored, rebuilt)
+    assert [(s.content, r.content) for s, r in diff.keep] == [("a", "a"), ("c", "c")]
+    assert [t.content for t in diff.insert] == ["new"]
+    assert diff.delete == [stored[1].id]
+
+
+def test_diff_texts_duplicates_matched_once():
+    stored = _texts("d", "x", "x")
+    rebuilt = _texts("d", "x")
+    diff = diff_texts(stored, rebuilt)
+    assert len(diff.keep) == 1
+    assert diff.delete == [stored[1].id]
+
+
+def test_apply_snapshot_writes_only_delta(sqlite_conn):
+    doc = Document(title="Paper", human_id="paper2020", file_hash="abc")
+    DocumentRepository(sqlite_conn).add(doc)
+    texts = TextRepository(sqlite_conn)
+    old = _texts(doc.id, "a", "b")
+    texts.add_many(old)
+
+    embed = FakeEmbed()
+    svc = ReprocessAppService(conn=sqlite_conn, embed_svc=embed)
+    rebuilt = Document(id=doc.id, title="Paper v2")
+    snapshot = DocumentSnapshot(document=rebuilt, texts=_texts(doc.id, "a", "c"),
+                                headings=[], relationships=[], terms=[])
+    report = svc.apply_snapshot(snapshot, stored_document=doc)
+
+    assert (report.kept, report.inserted, report.deleted, report.embedded) == (1, 1, 1, 1)
+    assert embed.calls == ["c"]
+    stored = texts.list_for_document(doc.id)
+    assert [t.content for t in stored] == ["a", "c"]
+    assert stored[0].id == old[0].id
+    assert texts.get(old[1].id) is None
+    updated = DocumentRepository(sqlite_conn).get(doc.id)
+    assert updated.title == "Paper v2"
+    assert updated.file_hash == "abc"
+
+
+def test_apply_snapshot_remaps_relationships_of_kept_texts(sqlite_conn):
+    from smart_library.domain.entities.relationship import Relationship
+    from smart_library.domain.constants.relationship_types import RelationshipType
+    from smart_library.infrastructure.repositories.relationship_repository import RelationshipRepository
+
+    doc = Document(title="Paper")
+    DocumentRepository(sqlite_conn).add(doc)
+    old = _texts(doc.id, "a")
+    TextRepository(sqlite_conn).add_many(old)
+
+    rebuilt = _texts(doc.id, "a")
+    rels = [Relationship(source_id=rebuilt[0].id, target_id=doc.id, type=RelationshipType.BELONGS_TO)]
+    snapshot = DocumentSnapshot(document=Document(id=doc.id, title="Paper"), texts=rebuilt,
+                                headings=[], relationships=rels, terms=[])
+    ReprocessAppService(conn=sqlite_conn, embed_svc=FakeEmbed()).apply_snapshot(snapshot, stored_document=doc)
+
+    out = RelationshipRepository(sqlite_conn).neighbors([old[0].id], RelationshipType.BELONGS_TO)
+    assert out[old[0].id] == [doc.id]
+
+
+def test_reprocess_many_keeps_documents_sharing_a_pdf_apart(sqlite_conn, tmp_path):
+    from unittest.mock import Mock
+    from smart_library.infrastructure.grobid.grobid_client import GrobidResult
+
+    pdf = tmp_path / "shared.pdf"
+    pdf.write_bytes(b"%PDF")
+    docs = DocumentRepository(sqlite_conn)
+    first, second = Document(title="A", source_path=str(pdf)), Document(title="B", source_path=str(pdf))
+    docs.add(first)
+    docs.add(second)
+
+    grobid = Mock()
+    grobid.extract_many_xml.side_effect = lambda paths, concurrency=None: iter(
+        [GrobidResult(p, tei="<TEI/>") for p in paths])
+    svc = ReprocessAppService(conn=sqlite_conn, embed_svc=FakeEmbed(), grobid_svc=grobid)
+    svc._apply_struct = lambda doc, struct, path, embed: doc.id
+
+    results = {doc_id: (report, err) for doc_id, report, err in svc.reprocess_many([first.id, second.id])}
+    assert results == {first.id: (first.id, None), second.id: (second.id, None)}
+    assert grobid.extract_many_xml.call_args[0][0] == [pdf]
@@ -0,0 +1,44 @@
+from unittest.mock import Mock
+
+import pytest
+
+from smart_library.application.services.search_service import SearchService
+from smart_library.application.services.text_app_service import TextAppService
+from smart_library.application.services.vector_service import VectorService
+from smart_library.infrastructure.repositories.text_repository import TextRepository
+from smart_library.infrastructure.repositories.vector_repository import VectorRepository
+
+
+@pytest.fixture
+def service(sqlite_conn, make_document):
+    def document(year, vectors):
+        doc, _, texts = make_document(sqlite_conn, f"doc {year}", year=year, n_texts=len(vectors))
+        VectorRepository(sqlite_conn).add_many([(t.id, v) for t, v in zip(texts, vectors)])
+        return doc, texts
+
+    # The 2010 document holds the global nearest neighbours of the query [1, 0]
+    near = document(2010, [[1.0, 0.01 * i] for i in range(6)])
+    far = document(2021, [[0.5, 1.0], [0.1, 1.0]])
+    embedding = Mock()
+    embedding.embed.return_value = [1.0, 0.0]
+    svc = SearchService(embedding_service=embedding, vector_service=VectorService(VectorRepository(sqlite_conn)),
+                        text_service=TextAppService(TextRepository(sqlite_conn, storage="inline")))
+    return svc, near, far
+
+
+def test_vector_search_fills_top_k_inside_filters(service):
+    svc, (near, near_texts), (far, far_texts) = service
+
+    assert [h["id"] for h in svc.live_similar([1.0, 0.0], top_k=2)] == [t.id for t in near_texts[:2]]
+    assert [h["id"] for h in svc.live_similar([1.0, 0.0], top_k=2, year_from=2015)] == [t.id for t in far_texts]
+    assert [h["id"] for h in svc.live_similar([1.0, 0.0], top_k=3, doc_ids=[far.id])] == [t.id for t in far_texts]
+    assert svc.live_similar([1.0, 0.0], top_k=2, doc_ids=[]) == []
+
+
+def test_similarity_search_passes_filters_to_the_vector_side(service):
+    svc, _, (far, far_texts) = service
+
+    hits = svc.similarity_search("query", top_k=2, year_from=2015)
+
+    assert [h["id"] for h in hits] == [t.id for t in far_texts]
+    svc.embedding_service.embed.assert_called_once_with("query")
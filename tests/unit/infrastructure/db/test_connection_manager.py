@@ -0,0 +1,69 @@
+import sqlite3
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from smart_library.infrastructure.db import sqlite_vec
+from smart_library.infrastructure.db.connection_manager import ConnectionManager
+from smart_library.infrastructure.db.db import get_connection_with_sqlitevec
+
+
+@pytest.fixture
+def manager(tmp_path):
+    db = tmp_path / "lib.db"
+    conn = sqlite3.connect(db)
+    conn.execute("CREATE TABLE t (x INTEGER)")
+    conn.close()
+    m = ConnectionManager(db, load_sqlitevec=False)
+    yield m
+    m.close_all()
+
+
+def test_one_connection_per_thread_and_profile(manager):
+    first = manager.connection("serve")
+    assert manager.connection("serve") is first
+    assert manager.connection("ingest") is not first
+
+    other = []
+    t = threading.Thread(target=lambda: other.append(manager.connection("serve")))
+    t.start()
+    t.join()
+    assert other[0] is not first
+    assert manager.opened == 3
+
+
+def test_profiles_apply_pragmas(manager):
+    serve = manager.connection("serve")
+    assert serve.execute("PRAGMA query_only").fetchone()[0] == 1
+    assert serve.execute("PRAGMA mmap_size").fetchone()[0] > 0
+    with pytest.raises(sqlite3.OperationalError):
+        serve.execute("INSERT INTO t VALUES (1)")
+
+    ingest = manager.connection("ingest")
+    assert ingest.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    ingest.execute("INSERT INTO t VALUES (1)")
+
+
+def test_close_is_deferred_to_close_all(manager):
+    conn = manager.connection("serve")
+    conn.close()  # services closing "their" connection must not break the pool
+    assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+    assert manager.close_all() == 1
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute("SELECT 1")
+    assert manager.connection("serve") is not conn
+
+
+def test_unknown_profile_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        get_connection_with_sqlitevec(tmp_path / "x.db", profile="turbo")
+
+
+def test_vec0_path_resolved_once():
+    sqlite_vec.resolve_vec0_path.cache_clear()
+    with patch.object(sqlite_vec, "_search_for_vec0", return_value="/nowhere/vec0") as search:
+        assert sqlite_vec.resolve_vec0_path() == "/nowhere/vec0"
+        assert sqlite_vec.resolve_vec0_path() == "/nowhere/vec0"
+    assert search.call_count == 1
+    sqlite_vec.resolve_vec0_path.cache_clear()
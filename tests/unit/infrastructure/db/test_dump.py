@@ -0,0 +1,116 @@
+import json
+
+import numpy as np
+import pytest
+
+from smart_library.domain.constants.relationship_types import RelationshipType
+from smart_library.domain.entities.document import Document
+from smart_library.domain.entities.heading import Heading
+from smart_library.domain.entities.page import Page
+from smart_library.domain.entities.text import Text
+from smart_library.infrastructure.db.dump import export_library, import_library, read_manifest
+from smart_library.infrastructure.repositories.document_repository import DocumentRepository
+from smart_library.infrastructure.repositories.fts_repository import FullTextRepository
+from smart_library.infrastructure.repositories.heading_repository import HeadingRepository
+from smart_library.infrastructure.repositories.page_repository import PageRepository
+from smart_library.infrastructure.repositories.relationship_repository import RelationshipRepository
+from smart_library.infrastructure.repositories.text_blob_repository import TextBlobRepository
+from smart_library.infrastructure.repositories.text_repository import TextRepository
+from smart_library.infrastructure.repositories.vector_repository import VectorRepository
+
+
+@pytest.fixture
+def library(sqlite_conn):
+    doc = Document(title="Export me as a whole library", year=2020, authors=["A. Author"])
+    DocumentRepository(sqlite_conn)._insert_row(doc)
+    page = Page(parent_id=doc.id, page_number=1, paragraphs=["p1"])
+    PageRepository(sqlite_conn).add(page)
+    texts = [Text(parent_id=page.id, content=c, index=i) for i, c in enumerate(["BRCA1 cohort", "p53 signalling"])]
+    TextRepository(sqlite_conn, storage="inline").add_many(texts)
+    heading = Heading(parent_id=doc.id, title="Results", index=0)
+    HeadingRepository(sqlite_conn).add_many([heading])
+    RelationshipRepository(sqlite_conn).add("rel-1", texts[0].id, heading.id, RelationshipType.UNDER_HEADING)
+    TextBlobRepository(sqlite_conn).put(doc.id, "normalised document text")
+    VectorRepository(sqlite_conn).add_many([(t.id, [float(i + 1), 0.0, 1.0]) for i, t in enumerate(texts)])
+    return sqlite_conn, doc, texts
+
+
+def _dump(conn, table):
+    return [tuple(r) for r in conn.execute(f"SELECT * FROM {table} ORDER BY rowid")]
+
+
+def _indexes_and_triggers(conn):
+    sql = "SELECT type, name FROM sqlite_master WHERE type IN ('index', 'trigger') AND sql IS NOT NULL"
+    return {(r["type"], r["name"]) for r in conn.execute(sql)}
+
+
+def test_export_import_round_trip(library, make_sqlite_conn, tmp_path):
+    conn, doc, texts = library
+    stats = export_library(conn, tmp_path / "export", batch_size=1)
+
+    manifest = read_manifest(tmp_path / "export")
+    assert manifest["tables"]["text_entity"]["rows"] == 2 and stats.vectors == 2
+    assert manifest["vectors"]["dim"] == 3
+    assert np.load(tmp_path / "export" / "vectors.npy").dtype == np.float32
+
+    target = make_sqlite_conn()
+    before = _indexes_and_triggers(target)
+    result = import_library(target, tmp_path / "export", batch_size=1)
+
+    assert result.rows == stats.rows
+    for table in ("entity", "document", "page", "text_entity", "document_text", "heading", "relationship"):
+        assert _dump(target, table) == _dump(conn, table), table
+    assert _indexes_and_triggers(target) == before  # dropped indexes and triggers are back
+    counts = dict(target.execute("SELECT name, n FROM row_count").fetchall())
+    assert counts["text_entity"] == 2 and counts["document"] == 1
+    assert [h["id"] for h in FullTextRepository(target).search_texts('"brca1"')] == [texts[0].id]
+    vectors = VectorRepository(target)
+    np.testing.assert_allclose(vectors.get_vector(texts[1].id)["vector"], VectorRepository.normalize([2.0, 0.0, 1.0]),
+                               rtol=1e-6)
+    assert TextBlobRepository(target).get(doc.id) == "normalised document text"
+    keys = target.execute("SELECT kind, document_id FROM citation_key").fetchall()
+    assert [tuple(k) for k in keys] == [("title", doc.id)]  # citation keys are rebuilt after the load
+
+
+def test_import_refuses_non_empty_library_and_export_non_empty_dir(library, tmp_path):
+    conn, _, _ = library
+    export_library(conn, tmp_path / "export")
+
+    with pytest.raises(ValueError, match="not empty"):
+        import_library(conn, tmp_path / "export")
+    with pytest.raises(ValueError, match="not empty"):
+        export_library(conn, tmp_path / "export")
+    with pytest.raises(ValueError, match="manifest"):
+        import_library(conn, tmp_path)
+
+
+def test_zstd_export_round_trip(library, make_sqlite_conn, tmp_path):
+    pytest.importorskip("zstandard")
+    conn, _, _ = library
+    export_library(conn, tmp_path / "export", compression="zstd")
+    assert (tmp_path / "export" / "entity.jsonl.zst").exists()
+    assert json.loads((tmp_path / "export" / "manifest.json").read_text())["compression"] == "zstd"
+
+    target = make_sqlite_conn()
+    import_library(target, tmp_path / "export")
+    assert _dump(target, "text_entity") == _dump(conn, "text_entity")
+
+
+def test_failed_import_leaves_the_library_empty(library, make_sqlite_conn, tmp_path):
+    conn, _, _ = library
+    export_library(conn, tmp_path / "export")
+    vectors = tmp_path / "export" / "vectors.npy"
+    data = vectors.read_bytes()
+    vectors.write_bytes(b"corrupt")  # fails after every table has been loaded
+
+    target = make_sqlite_conn()
+    before = _indexes_and_triggers(target)
+    with pytest.raises(ValueError):
+        import_library(target, tmp_path / "export", batch_size=1)
+
+    assert target.execute("SELECT COUNT(*) FROM entity").fetchone()[0] == 0
+    assert target.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+    assert _indexes_and_triggers(target) == before
+    vectors.write_bytes(data)
+    result = import_library(target, tmp_path / "export")  # the retry starts from an empty library
+    assert result.rows["text_entity"] == 2 and result.vectors == 2
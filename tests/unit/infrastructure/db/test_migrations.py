@@ -0,0 +1,99 @@
+import sqlite3
+
+import pytest
+
+from smart_library.infrastructure.db.migrations import (
+    MigrationError,
+    current_version,
+    discover,
+    migrate,
+    pending,
+    split_statements,
+)
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:", isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    yield conn
+    conn.close()
+
+
+def _indexes(conn):
+    return {row["name"] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+
+
+def _columns(conn, table):
+    return {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def test_repository_migrations_build_the_schema_idempotently(conn):
+    latest = discover()[-1].version
+
+    applied = migrate(conn, skip_missing_modules=True)
+
+    assert [a.version for a in applied] == [m.version for m in discover()]
+    assert current_version(conn) == latest
+    assert {"idx_text_entity_page_number", "idx_entity_kind", "idx_document_file_hash", "idx_document_doi"} <= _indexes(conn)
+    assert {"abstract", "citation_key", "human_id"} <= _columns(conn, "document")
+    assert any("vec0" in reason for a in applied for reason in a.skipped)
+    assert migrate(conn, skip_missing_modules=True) == []  # nothing re-runs
+    assert pending(conn) == []
+
+
+def test_migrations_upgrade_a_database_created_from_schema_sql(sqlite_conn):
+    sqlite_conn.execute("INSERT INTO entity (id, created_at, modified_at, entity_kind) VALUES ('d', 'now', 'now', 'Document')")
+    assert current_version(sqlite_conn) == 0
+
+    migrate(sqlite_conn, skip_missing_modules=True)
+
+    assert current_version(sqlite_conn) == discover()[-1].version
+    assert sqlite_conn.execute("SELECT COUNT(*) FROM entity").fetchone()[0] == 1
+
+
+def test_requires_loaded_module_unless_skipped(conn):
+    with pytest.raises(MigrationError, match="vec0"):
+        migrate(conn)
+    assert current_version(conn) == 3  # everything before the vector migration is applied
+
+
+def test_destructive_migration_refused_on_non_empty_database(conn, tmp_path):
+    (tmp_path / "0001_items.sql").write_text("CREATE TABLE item (id INTEGER PRIMARY KEY, name TEXT);\n")
+    (tmp_path / "0002_drop_items.sql").write_text("-- start over\nDROP TABLE item;\nCREATE TABLE item (id INTEGER);\n")
+    migrate(conn, tmp_path, target=1)
+    conn.execute("INSERT INTO item (name) VALUES ('kept')")
+
+    with pytest.raises(MigrationError, match="destructive"):
+        migrate(conn, tmp_path)
+    assert current_version(conn) == 1
+    assert conn.execute("SELECT name FROM item").fetchone()["name"] == "kept"
+
+    applied = migrate(conn, tmp_path, allow_destructive=True)
+    assert [(a.version, a.statements) for a in applied] == [(2, 2)]
+    assert applied[0].seconds >= 0
+
+
+def test_failed_migration_rolls_back(conn, tmp_path):
+    (tmp_path / "0001_ok.sql").write_text("CREATE TABLE a (x);\n")
+    (tmp_path / "0002_broken.sql").write_text("CREATE TABLE b (x);\nINSERT INTO missing VALUES (1);\n")
+
+    with pytest.raises(MigrationError, match="0002_broken"):
+        migrate(conn, tmp_path)
+
+    assert current_version(conn) == 1
+    assert conn.execute("SELECT name FROM sqlite_master WHERE name = 'b'").fetchone() is None
+
+
+def test_split_statements_keeps_trigger_bodies_whole():
+    sql = """
+    -- counter
+    CREATE TABLE t (n INTEGER);
+    CREATE TRIGGER t_ai AFTER INSERT ON t BEGIN
+        UPDATE t SET n = n + 1; -- inline
+        SELECT 1;
+    END;
+    """
+    statements = split_statements(sql)
+    assert len(statements) == 2
+    assert statements[1].startswith("CREATE TRIGGER") and statements[1].rstrip().endswith("END;")
@@ -0,0 +1,68 @@
+from collections import Counter
+
+import pytest
+
+from smart_library.infrastructure.db.shards import MAIN, ShardCatalog
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    return ShardCatalog(tmp_path / "db" / "shards.json", main_path=tmp_path / "db" / "main.db")
+
+
+def test_without_catalog_file_the_main_database_is_the_only_shard(catalog, tmp_path):
+    assert [s.name for s in catalog.shards] == [MAIN]
+    assert not catalog.is_sharded
+    assert catalog.route("doc-1").path == tmp_path / "db" / "main.db"
+    with pytest.raises(ValueError, match="collection"):
+        catalog.route("doc-1", collection="genomics")
+
+
+def test_catalog_round_trips_through_its_file(catalog, tmp_path):
+    genomics = catalog.add("genomics", collection="genomics")
+    catalog.add("pool-1", path=tmp_path / "elsewhere" / "pool-1.db")
+
+    reloaded = ShardCatalog(catalog.path, main_path=catalog.main.path)
+    assert reloaded.shards == catalog.shards
+    assert reloaded.get("genomics").path == tmp_path / "db" / "shards" / "genomics.db"
+    assert '"shards/genomics.db"' in catalog.path.read_text()  # stored relative to the catalog
+
+    with pytest.raises(ValueError, match="already exists"):
+        catalog.add("genomics")
+    with pytest.raises(ValueError, match="already has a shard"):
+        catalog.add("genomics-2", collection="genomics")
+    with pytest.raises(ValueError, match="Invalid shard name"):
+        catalog.add("Bad Name")
+    with pytest.raises(ValueError, match="cannot be removed"):
+        catalog.remove(MAIN)
+
+    assert catalog.remove("genomics") == genomics
+    assert [s.name for s in ShardCatalog(catalog.path, main_path=catalog.main.path).shards] == [MAIN, "pool-1"]
+
+
+def test_routing_by_collection_and_stable_hash(catalog):
+    catalog.add("genomics", collection="genomics")
+    catalog.add("pool-1")
+    ids = [f"doc-{i}" for i in range(600)]
+
+    assert catalog.route("doc-1", collection="genomics").name == "genomics"
+    before = {d: catalog.route(d).name for d in ids}
+    assert set(Counter(before.values())) == {MAIN, "pool-1"}  # collection shards are not in the pool
+    assert all(catalog.route(d).name == name for d, name in before.items())  # deterministic
+
+    catalog.add("pool-2")
+    after = {d: catalog.route(d).name for d in ids}
+    moved = [d for d in ids if after[d] != before[d]]
+    assert moved and all(after[d] == "pool-2" for d in moved)  # rendezvous hashing: only moves to the new shard
+    assert len(moved) < len(ids) / 2
+
+
+def test_select_restricts_by_name_and_collection(catalog):
+    catalog.add("genomics", collection="genomics")
+    catalog.add("pool-1")
+
+    assert [s.name for s in catalog.select()] == [MAIN, "genomics", "pool-1"]
+    assert [s.name for s in catalog.select(names=["pool-1", MAIN])] == [MAIN, "pool-1"]
+    assert [s.name for s in catalog.select(collections=["genomics"])] == ["genomics"]
+    with pytest.raises(ValueError, match="Unknown shard"):
+        catalog.select(names=["nope"])
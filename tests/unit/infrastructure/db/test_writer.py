@@ -0,0 +1,112 @@
+import sqlite3
+import threading
+
+import pytest
+
+from smart_library.infrastructure.db.db import apply_profile, transaction
+from smart_library.infrastructure.db.writer import DatabaseWriter, WriterConnection
+
+
+def _connect(path, factory=sqlite3.Connection):
+    conn = sqlite3.connect(str(path), isolation_level=None, check_same_thread=False, factory=factory)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL;")
+    return conn
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = tmp_path / "writer.db"
+    conn = _connect(path)
+    conn.execute("CREATE TABLE item (id INTEGER PRIMARY KEY, name TEXT UNIQUE)")
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def writer(db):
+    w = DatabaseWriter(connect=lambda: _connect(db, WriterConnection)).start()
+    yield w
+    w.stop()
+
+
+def _insert(name):
+    def job(conn):
+        conn.execute("INSERT INTO item (name) VALUES (?)", (name,))
+        conn.commit()  # repository habit: ignored on the writer connection
+        return name
+    return job
+
+
+def test_concurrent_jobs_are_grouped_into_transactions(db, writer):
+    gate = threading.Event()
+    blocker = writer.submit(lambda conn: gate.wait(5))  # hold the writer so the queue fills up
+    futures = [writer.submit(_insert(f"n{i}")) for i in range(50)]
+    gate.set()
+
+    assert blocker.result(5) is True
+    assert [f.result(5) for f in futures] == [f"n{i}" for i in range(50)]
+    assert writer.jobs == 51
+    assert writer.batches <= 3  # the blocker's batch plus one or two for the queued jobs
+
+    reader = _connect(db)
+    assert reader.execute("SELECT COUNT(*) FROM item").fetchone()[0] == 50
+
+
+def test_failing_job_is_rolled_back_alone(db, writer):
+    gate = threading.Event()
+    writer.submit(lambda conn: gate.wait(5))
+
+    def failing(conn):
+        conn.execute("INSERT INTO item (name) VALUES ('partial')")
+        conn.execute("INSERT INTO item (name) VALUES ('a')")  # UNIQUE violation
+
+    first = writer.submit(_insert("a"))
+    bad = writer.submit(failing)
+    last = writer.submit(_insert("b"))
+    gate.set()
+
+    assert first.result(5) == "a" and last.result(5) == "b"
+    with pytest.raises(sqlite3.IntegrityError):
+        bad.result(5)
+    names = {r["name"] for r in _connect(db).execute("SELECT name FROM item")}
+    assert names == {"a", "b"}
+
+
+def test_nested_transaction_blocks_become_savepoints(db, writer):
+    def job(conn):
+        with transaction(conn):
+            conn.execute("INSERT INTO item (name) VALUES ('outer')")
+        try:
+            with transaction(conn):
+                conn.execute("INSERT INTO item (name) VALUES ('inner')")
+                raise ValueError("abort inner block")
+        except ValueError:
+            pass
+        return writer.execute(lambda c: c.execute("SELECT COUNT(*) FROM item").fetchone()[0])
+
+    assert writer.execute(job) == 1
+    assert [r["name"] for r in _connect(db).execute("SELECT name FROM item")] == ["outer"]
+
+
+def test_query_only_readers_do_not_block_on_the_writer(db, writer):
+    reader = _connect(db)
+    apply_profile(reader, "serve")
+    with pytest.raises(sqlite3.OperationalError):
+        reader.execute("INSERT INTO item (name) VALUES ('x')")
+
+    holding = threading.Event()
+    release = threading.Event()
+
+    def long_write(conn):
+        conn.execute("INSERT INTO item (name) VALUES ('pending')")
+        holding.set()
+        release.wait(5)
+
+    future = writer.submit(long_write)
+    assert holding.wait(5)
+    # The write transaction is open: the reader sees the last committed state immediately
+    assert reader.execute("SELECT COUNT(*) FROM item").fetchone()[0] == 0
+    release.set()
+    future.result(5)
+    assert reader.execute("SELECT COUNT(*) FROM item").fetchone()[0] == 1
@@ -0,0 +1,108 @@
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from smart_library.infrastructure.grobid.grobid_client import GrobidBusyError, GrobidClient
+
+
+def _response(status, text=""):
+    r = Mock(status_code=status, text=text, content=text.encode(), headers={})
+    if status >= 400:
+        r.raise_for_status.side_effect = requests.HTTPError(f"{status}")
+    return r
+
+
+@pytest.fixture
+def pdf(tmp_path):
+    p = tmp_path / "a.pdf"
+    p.write_bytes(b"%PDF")
+    return p
+
+
+@patch("smart_library.infrastructure.grobid.grobid_client.time.sleep")
+def test_retries_on_503_then_succeeds(sleep, pdf):
+    session = Mock()
+    session.post.side_effect = [_response(503), _response(503), _response(200, "<TEI/>")]
+    client = GrobidClient(session=session, max_retries=3)
+    assert client.extract_fulltext(pdf) == "<TEI/>"
+    assert session.post.call_count == 3
+    assert sleep.call_count == 2
+    m = client.metrics.snapshot()
+    assert (m["requests"], m["succeeded"], m["busy_responses"], m["retries"]) == (3, 1, 2, 2)
+
+
+@patch("smart_library.infrastructure.grobid.grobid_client.time.sleep")
+def test_gives_up_after_max_retries(sleep, pdf):
+    session = Mock()
+    session.post.return_value = _response(503)
+    client = GrobidClient(session=session, max_retries=2)
+    with pytest.raises(GrobidBusyError):
+        client.extract_fulltext(pdf)
+    assert session.post.call_count == 3
+    assert client.metrics.snapshot()["failed"] == 1
+
+
+def test_other_errors_are_not_retried(pdf):
+    session = Mock()
+    session.post.return_value = _response(500)
+    client = GrobidClient(session=session, max_retries=5)
+    with pytest.raises(requests.HTTPError):
+        client.extract_fulltext(pdf)
+    assert session.post.call_count == 1
+
+
+def test_backoff_is_capped_and_honours_retry_after():
+    client = GrobidClient(session=Mock(), backoff_base=1.0, backoff_max=4.0)
+    assert all(0 <= client._backoff(10) <= 4.0 for _ in range(50))
+    assert client._backoff(0, retry_after="3") >= 3
+
+
+def test_extract_many_collects_errors(tmp_path):
+    paths = []
+    for name in ("ok", "bad"):
+        p = tmp_path / f"{name}.pdf"
+        p.write_bytes(b"%PDF")
+        paths.append(p)
+    client = GrobidClient(session=Mock(), concurrency=2)
+    client.extract_fulltext = lambda p: (_ for _ in ()).throw(ValueError("boom")) if p.stem == "bad" else "<TEI/>"
+    results = {r.path.stem: r for r in client.extract_many(paths)}
+    assert results["ok"].ok and results["ok"].tei == "<TEI/>"
+    assert isinstance(results["bad"].error, ValueError)
+
+
+def test_version_failure_is_cached_briefly():
+    session = Mock()
+    session.get.side_effect = requests.ConnectionError("down")
+    client = GrobidClient(session=session, version_retry=60)
+    assert client.version() is None
+    assert client.version() is None
+    assert session.get.call_count == 1
+
+    client.version_retry = 0
+    session.get.side_effect = None
+    session.get.return_value = _response(200, "0.8.0\n")
+    assert client.version() == "0.8.0"
+
+
+def test_retry_after_is_honoured_beyond_backoff_max():
+    client = GrobidClient(session=Mock(), backoff_base=1.0, backoff_max=4.0, retry_after_max=60.0)
+    assert client._backoff(0, retry_after="20") == 20
+    assert client._backoff(0, retry_after="3600") == 60
+    assert 0 <= client._backoff(0, retry_after="soon") <= 4.0
+    assert 0 <= client._backoff(0, retry_after="Wed, 21 Oct 2015 07:28:00 GMT") <= 4.0  # in the past
+
+
+def test_stream_fulltext_reads_the_decoded_response_body(pdf):
+    import io
+    response = _response(200)
+    response.raw = io.BytesIO(b"<TEI/>")
+    session = Mock()
+    session.post.return_value = response
+    client = GrobidClient(session=session)
+    with client.stream_fulltext(pdf) as body:
+        assert body.read(3) + body.read() == b"<TEI/>"
+    assert session.post.call_args.kwargs["stream"] is True
+    assert response.raw.decode_content is True
+    response.close.assert_called_once()
+    assert client.metrics.snapshot()["bytes_received"] == 6
@@ -0,0 +1,94 @@
+import gzip
+
+import pytest
+
+from smart_library.infrastructure.grobid.grobid_mapper import GrobidMapper
+from smart_library.infrastructure.grobid.grobid_stream_mapper import StreamingGrobidMapper
+
+TEI_DOC = """<?xml version="1.0" encoding="UTF-8"?>
+<TEI xmlns="http://www.tei-c.org/ns/1.0">
+  <teiHeader>
+    <fileDesc>
+      <titleStmt><title level="a" type="main">Streaming Things</title></titleStmt>
+      <publicationStmt><publisher>ACM</publisher><date type="published" when="2021-05-01">2021</date></publicationStmt>
+      <sourceDesc><biblStruct><analytic>
+        <author><persName><forename>Ada</forename><forename>B</forename><surname>Lovelace</surname></persName>
+          <email>ada@example.org</email>
+          <affiliation key="aff0"><orgName type="institution">Uni</orgName>
+            <address><settlement>London</settlement><country>UK</country></address></affiliation>
+        </author>
+        <title>Streaming Things</title>
+      </analytic>
+      <idno type="MD5">ABC</idno><idno type="DOI">10.1000/xyz</idno>
+      </biblStruct></sourceDesc>
+    </fileDesc>
+    <profileDesc>
+      <textClass><keywords><term>xml</term><term>memory</term></keywords></textClass>
+      <abstract><div><p>We parse <ref type="bibr">big</ref> files.</p></div></abstract>
+    </profileDesc>
+  </teiHeader>
+  <facsimile>
+    <surface n="1" ulx="0.0" uly="0.0" lrx="595.3" lry="841.9"/>
+    <surface n="2" ulx="0.0" uly="0.0" lrx="595.3" lry="841.9"/>
+  </facsimile>
+  <text>
+    <front><div><p>front matter</p></div></front>
+    <body>
+      <div n="1"><head n="1" coords="1,10,20,30,40">Introduction</head>
+        <p coords="1,1,2,3,4">Intro <ref type="bibr" target="#b0" coords="1,5,6,7,8">[1]</ref> text.</p>
+        <div n="1.1"><head>Nested</head><p>Inner paragraph.</p></div>
+        <p>After nested.</p>
+      </div>
+      <figure><head>Figure 1</head></figure>
+      <div n="2"><head>Methods</head><p>Method text.</p><p>More.</p></div>
+      <div><p>Untitled section.</p></div>
+    </body>
+    <back><div type="references"><listBibl>
+      <biblStruct xml:id="b0">
+        <analytic><title level="a" type="main">Deep Parsing</title>
+          <author><persName><forename>Grace</forename><surname>Hopper</surname></persName></author></analytic>
+        <monogr><title level="j">Journal of Things</title><imprint><date type="published" when="2019"/></imprint></monogr>
+        <idno type="DOI">10.1/DEEP</idno>
+      </biblStruct>
+      <biblStruct xml:id="b1"><monogr><title level="m">A Book</title><imprint><date>1998</date></imprint></monogr></biblStruct>
+    </listBibl></div></back>
+  </text>
+</TEI>
+"""
+
+
+@pytest.fixture
+def tree_struct():
+    return GrobidMapper().xml_to_struct(TEI_DOC)
+
+
+def test_stream_mapper_matches_tree_mapper(tree_struct):
+    assert StreamingGrobidMapper().xml_to_struct(TEI_DOC) == tree_struct
+
+
+def test_stream_mapper_keeps_body_div_order(tree_struct):
+    titles = [s.title for s in StreamingGrobidMapper().xml_to_struct(TEI_DOC)["body"].sections]
+    assert titles == ["Introduction", "Nested", "Methods", None]
+
+
+def test_stream_mapper_reads_gzip_stream(tmp_path, tree_struct):
+    path = tmp_path / "doc.tei.xml.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.write(TEI_DOC)
+    with gzip.open(path, "rb") as f:
+        assert StreamingGrobidMapper().stream_to_struct(f) == tree_struct
+
+
+def test_stream_mapper_requires_header():
+    with pytest.raises(ValueError):
+        StreamingGrobidMapper().xml_to_struct('<TEI xmlns="http://www.tei-c.org/ns/1.0"><text/></TEI>')
+
+
+def test_bibliography_parsed_and_inline_refs_resolved(tree_struct):
+    bib = {b.key: b for b in tree_struct["bibliography"]}
+    assert bib["b0"].title == "Deep Parsing"
+    assert bib["b0"].authors == ["Hopper, Grace"]
+    assert (bib["b0"].year, bib["b0"].doi, bib["b0"].venue) == (2019, "10.1/DEEP", "Journal of Things")
+    assert (bib["b1"].title, bib["b1"].year, bib["b1"].venue) == ("A Book", 1998, None)
+    ref = tree_struct["body"].sections[0].paragraphs[0].references[0]
+    assert ref.bib_key == "b0"
@@ -0,0 +1,60 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from smart_library.infrastructure.grobid.grobid_client import GrobidBusyError, GrobidClient
+from smart_library.infrastructure.grobid.replay_server import GrobidReplayServer, ReplayFixtures
+
+TEI = '<TEI xmlns="http://www.tei-c.org/ns/1.0"><teiHeader/></TEI>'
+
+
+@pytest.fixture
+def fixtures(tmp_path):
+    return ReplayFixtures(tmp_path / "fixtures")
+
+
+def _client(server, **kw):
+    return GrobidClient(
+        fulltext_url=f"{server.url}/api/processFulltextDocument",
+        header_url=f"{server.url}/api/processHeaderDocument",
+        version_url=f"{server.url}/api/version",
+        **kw,
+    )
+
+
+def test_replays_recorded_tei_by_pdf_hash(fixtures, tmp_path):
+    pdf = tmp_path / "a.pdf"
+    pdf.write_bytes(b"%PDF-1.4 recorded")
+    digest = fixtures.record(pdf, TEI)
+    assert fixtures.hashes() == [digest]
+
+    with GrobidReplayServer(fixtures, port=0, version="0.8.0") as server:
+        client = _client(server)
+        assert client.version() == "0.8.0"
+        assert client.extract_fulltext(pdf) == TEI
+
+        unknown = tmp_path / "b.pdf"
+        unknown.write_bytes(b"%PDF-1.4 never recorded")
+        with pytest.raises(requests.HTTPError):
+            client.extract_fulltext(unknown)
+        client.close()
+    assert server.stats.snapshot() == {"requests": 2, "served": 1, "missing": 1, "busy": 0}
+
+
+def test_concurrency_limit_answers_503(fixtures, tmp_path):
+    pdf = tmp_path / "a.pdf"
+    pdf.write_bytes(b"%PDF slow")
+    fixtures.record(pdf, TEI)
+
+    with GrobidReplayServer(fixtures, port=0, latency=0.5, max_concurrency=1) as server:
+        slow = threading.Thread(target=lambda: _client(server).extract_fulltext(pdf))
+        slow.start()
+        while server.stats.snapshot()["requests"] == 0:
+            time.sleep(0.01)
+        time.sleep(0.1)  # let the first request take the only slot
+        with pytest.raises(GrobidBusyError):
+            _client(server, max_retries=0).extract_fulltext(pdf)
+        slow.join()
+    assert server.stats.snapshot()["busy"] == 1
@@ -0,0 +1,167 @@
+import os
+from unittest.mock import Mock
+
+from smart_library.infrastructure.grobid.grobid_service import GrobidService
+from smart_library.infrastructure.grobid.tei_cache import TeiCache
+
+
+def test_put_get_roundtrip(tmp_path):
+    cache = TeiCache(tmp_path, max_bytes=0)
+    key = TeiCache.make_key("abc", "0.8.0", [("teiCoordinates", "p")])
+    assert cache.get(key) is None
+    cache.put(key, "<TEI>é</TEI>")
+    assert cache.get(key) == "<TEI>é</TEI>"
+    assert cache.path_for(key).name.endswith(".tei.xml.gz")
+
+
+def test_key_depends_on_version_and_params():
+    base = TeiCache.make_key("abc", "0.8.0", [("a", "1")])
+    assert base != TeiCache.make_key("abc", "0.8.1", [("a", "1")])
+    assert base != TeiCache.make_key("abc", "0.8.0", [("a", "2")])
+    assert base == TeiCache.make_key("abc", "0.8.0", [("a", "1")])
+
+
+def test_prune_evicts_least_recently_used(tmp_path):
+    cache = TeiCache(tmp_path, max_bytes=0)
+    keys = [TeiCache.make_key(str(i), "v") for i in range(3)]
+    for i, k in enumerate(keys):
+        cache.put(k, "x" * 1000)
+        os.utime(cache.path_for(k), (1000 + i, 1000 + i))
+    cache.get(keys[0])  # most recently used now
+    one = cache.path_for(keys[0]).stat().st_size
+    removed = cache.prune(max_bytes=one * 2)
+    assert removed == 1
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None and cache.get(keys[2]) is not None
+
+
+def test_service_uses_cache_before_client(tmp_path):
+    pdf = tmp_path / "a.pdf"
+    pdf.write_bytes(b"%PDF-1.4 test")
+    client = Mock(FULLTEXT_PARAMS=[("generateCoordinates", "1")])
+    client.version.return_value = "0.8.0"
+    client.extract_fulltext.return_value = "<TEI/>"
+    svc = GrobidService(client=client, mapper=Mock(), cache=TeiCache(tmp_path / "cache"))
+
+    assert svc.extract_fulltext_xml(pdf) == "<TEI/>"
+    assert svc.extract_fulltext_xml(pdf) == "<TEI/>"
+    client.extract_fulltext.assert_called_once()
+
+
+def test_service_extract_many_only_sends_cache_misses(tmp_path):
+    from smart_library.infrastructure.grobid.grobid_client import GrobidResult
+
+    pdfs = []
+    for name in ("a", "b"):
+        p = tmp_path / f"{name}.pdf"
+        p.write_bytes(name.encode())
+        pdfs.append(p)
+    client = Mock(FULLTEXT_PARAMS=[])
+    client.version.return_value = "0.8.0"
+    client.extract_many.side_effect = lambda paths, concurrency=None: iter(
+        [GrobidResult(p, tei=f"<TEI>{p.stem}</TEI>") for p in paths]
+    )
+    svc = GrobidService(client=client, mapper=Mock(), cache=TeiCache(tmp_path / "cache"))
+    svc.cache.put(svc.cache_key(pdfs[0]), "<TEI>cached</TEI>")
+
+    results = {r.path.stem: r.tei for r in svc.extract_many_xml(pdfs)}
+    assert results == {"a": "<TEI>cached</TEI>", "b": "<TEI>b</TEI>"}
+    sent = client.extract_many.call_args[0][0]
+    assert [p.stem for p in sent] == ["b"]
+
+
+def test_service_bypasses_cache_when_version_unknown(tmp_path, monkeypatch):
+    monkeypatch.setattr("smart_library.infrastructure.grobid.grobid_service.Grobid.VERSION", None)
+    pdf = tmp_path / "a.pdf"
+    pdf.write_bytes(b"%PDF-1.4 test")
+    client = Mock(FULLTEXT_PARAMS=[])
+    client.version.return_value = None
+    client.extract_fulltext.return_value = "<TEI/>"
+    cache = TeiCache(tmp_path / "cache")
+    svc = GrobidService(client=client, mapper=Mock(), cache=cache)
+
+    assert svc.extract_fulltext_xml(pdf) == "<TEI/>"
+    assert svc.extract_fulltext_xml(pdf) == "<TEI/>"
+    assert client.extract_fulltext.call_count == 2
+    assert cache.entries() == []
+
+
+TEI_DOC = """<?xml version="1.0" encoding="UTF-8"?>
+<TEI xmlns="http://www.tei-c.org/ns/1.0">
+  <teiHeader><fileDesc><titleStmt><title level="a" type="main">Streamed</title></titleStmt></fileDesc></teiHeader>
+  <text><body><div><head>Intro</head><p>Some text.</p></div></body></text>
+</TEI>
+"""
+
+
+def test_service_streams_cache_miss_into_mapper_and_cache(tmp_path):
+    import io
+    from contextlib import contextmanager
+    from smart_library.infrastructure.grobid.grobid_mapper import GrobidMapper
+    from smart_library.infrastructure.grobid.grobid_stream_mapper import StreamingGrobidMapper
+
+    pdf = tmp_path / "a.pdf"
+    pdf.write_bytes(b"%PDF-1.4 test")
+    reads = []
+
+    @contextmanager
+    def stream_fulltext(path):
+        body = io.BytesIO(TEI_DOC.encode("utf-8"))
+        original = body.read
+        body.read = lambda size=-1: reads.append(size) or original(size)
+        yield body
+
+    client = Mock(FULLTEXT_PARAMS=[], stream_fulltext=stream_fulltext)
+    client.version.return_value = "0.8.0"
+    cache = TeiCache(tmp_path / "cache")
+    svc = GrobidService(client=client, mapper=StreamingGrobidMapper(), cache=cache)
+
+    expected = GrobidMapper().xml_to_struct(TEI_DOC)
+    assert svc.extract_fulltext(pdf) == expected
+    client.extract_fulltext.assert_not_called()
+    assert reads and all(size != -1 for size in reads)  # parsed incrementally, never read whole
+    assert cache.get(svc.cache_key(pdf)) == TEI_DOC
+
+    reads.clear()
+    assert svc.extract_fulltext(pdf) == expected  # now a cache hit
+    assert reads == []
+
+
+def test_service_discards_partial_cache_entry_when_parsing_fails(tmp_path):
+    import io
+    from contextlib import contextmanager
+    import pytest
+    from smart_library.infrastructure.grobid.grobid_stream_mapper import StreamingGrobidMapper
+
+    pdf = tmp_path / "a.pdf"
+    pdf.write_bytes(b"%PDF-1.4 test")
+    client = Mock(FULLTEXT_PARAMS=[], stream_fulltext=contextmanager(lambda path: (yield io.BytesIO(b"<TEI><broken"))))
+    client.version.return_value = "0.8.0"
+    cache = TeiCache(tmp_path / "cache")
+    svc = GrobidService(client=client, mapper=StreamingGrobidMapper(), cache=cache)
+
+    with pytest.raises(Exception):
+        svc.extract_fulltext(pdf)
+    assert cache.entries() == []
+    assert not list((tmp_path / "cache").rglob("*.part"))
+
+
+def test_service_replaces_corrupt_cache_entry_from_the_server(tmp_path):
+    import io
+    from contextlib import contextmanager
+    from smart_library.infrastructure.grobid.grobid_mapper import GrobidMapper
+    from smart_library.infrastructure.grobid.grobid_stream_mapper import StreamingGrobidMapper
+
+    pdf = tmp_path / "a.pdf"
+    pdf.write_bytes(b"%PDF-1.4 test")
+    client = Mock(FULLTEXT_PARAMS=[],
+                  stream_fulltext=contextmanager(lambda path: (yield io.BytesIO(TEI_DOC.encode("utf-8")))))
+    client.version.return_value = "0.8.0"
+    cache = TeiCache(tmp_path / "cache")
+    svc = GrobidService(client=client, mapper=StreamingGrobidMapper(), cache=cache)
+    key = svc.cache_key(pdf)
+    path = cache.put(key, TEI_DOC)
+    path.write_bytes(path.read_bytes()[: path.stat().st_size // 2])  # truncated gzip
+
+    assert svc.extract_fulltext(pdf) == GrobidMapper().xml_to_struct(TEI_DOC)
+    assert cache.get(key) == TEI_DOC  # evicted and rewritten from the server response
@@ -0,0 +1,87 @@
+from smart_library.domain.entities.document import Document
+from smart_library.infrastructure.db.db import transaction
+from smart_library.infrastructure.repositories.change_log_repository import ChangeLogRepository, coalesce
+from smart_library.infrastructure.repositories.document_repository import DocumentRepository
+from smart_library.infrastructure.repositories.vector_repository import VectorRepository
+
+
+def _ops(changes):
+    return [(c.source, c.entity_id, c.op) for c in changes]
+
+
+def test_writes_are_logged_in_order(sqlite_conn, make_document):
+    log = ChangeLogRepository(sqlite_conn)
+    doc, _, texts = make_document(sqlite_conn, "Logged", n_pages=0, vectors=True)
+
+    changes = log.changes_since(0)
+    assert [c.seq for c in changes] == sorted(c.seq for c in changes)
+    assert _ops(changes)[0] == ("entity", doc.id, "insert")
+    assert {(c.source, c.op) for c in changes} == {("entity", "insert"), ("text_entity", "insert"), ("vector", "insert")}
+    assert [c.entity_id for c in log.changes_since(0, sources=["vector"])] == [t.id for t in texts]
+
+    seq = log.latest_seq()
+    sqlite_conn.execute("UPDATE entity SET metadata = '{}' WHERE id = ?", (texts[0].id,))
+    VectorRepository(sqlite_conn).delete_vector(texts[1].id)
+    VectorRepository(sqlite_conn).delete_vector("missing")  # nothing deleted, nothing logged
+    assert _ops(log.changes_since(seq)) == [("entity", texts[0].id, "update"), ("vector", texts[1].id, "delete")]
+
+    seq = log.latest_seq()
+    VectorRepository(sqlite_conn).add_many([(texts[0].id, [0.0, 1.0]), (texts[1].id, [1.0, 1.0])])
+    assert _ops(log.changes_since(seq)) == [("vector", texts[0].id, "update"), ("vector", texts[1].id, "insert")]
+
+    seq = log.latest_seq()
+    DocumentRepository(sqlite_conn).delete_subtree([doc.id])
+    deleted = coalesce(log.changes_since(seq))
+    assert {key for key, c in deleted.items() if c.op == "delete"} == {
+        ("entity", doc.id), *(("entity", t.id) for t in texts), *(("text_entity", t.id) for t in texts),
+        *(("vector", t.id) for t in texts),
+    }
+
+
+def test_rolled_back_writes_leave_no_changes(sqlite_conn):
+    log = ChangeLogRepository(sqlite_conn)
+    try:
+        with transaction(sqlite_conn):
+            DocumentRepository(sqlite_conn)._insert_row(Document(title="Never"))
+            raise RuntimeError("abort")
+    except RuntimeError:
+        pass
+    assert log.latest_seq() == 0
+
+
+def test_consumers_catch_up_from_their_checkpoint_and_compact(sqlite_conn, make_document):
+    log = ChangeLogRepository(sqlite_conn)
+    make_document(sqlite_conn, "Logged", n_pages=0, vectors=True)
+    total = log.latest_seq()
+
+    batches = []
+    assert log.catch_up("ann-index", batches.append, batch_size=4) == total
+    assert [len(b) for b in batches][:1] == [4] and log.checkpoint("ann-index") == total
+    assert log.catch_up("ann-index", batches.append) == 0  # nothing new
+
+    def failing(batch):
+        raise RuntimeError("index offline")
+
+    DocumentRepository(sqlite_conn)._insert_row(Document(title="Later"))
+    try:
+        log.catch_up("ann-index", failing)
+    except RuntimeError:
+        pass
+    assert log.checkpoint("ann-index") == total  # the failed batch is replayed next time
+    assert log.catch_up("ann-index", batches.append) == 1
+
+    log.set_checkpoint("snapshot", 3)
+    assert log.compact() == 3  # only what the slowest consumer has applied
+    assert log.changes_since(0)[0].seq == 4
+    log.drop_consumer("snapshot")
+    assert log.compact() == total + 1 - 3
+    assert log.changes_since(0) == [] and log.latest_seq() == total + 1  # seqs are never reused
+
+
+def test_compact_without_consumers_drops_the_whole_log(sqlite_conn, make_document):
+    log = ChangeLogRepository(sqlite_conn)
+    make_document(sqlite_conn, "Logged", n_pages=0, vectors=True)
+    total = log.latest_seq()
+
+    assert total and log.compact() == total
+    assert log.changes_since(0) == [] and log.latest_seq() == total
@@ -0,0 +1,106 @@
+import pytest
+
+from smart_library.domain.constants.relationship_types import RelationshipType
+from smart_library.domain.entities.heading import Heading
+from smart_library.infrastructure.repositories.document_repository import DocumentRepository
+from smart_library.infrastructure.repositories.fts_repository import (
+    FullTextRepository,
+    highlight_offsets,
+    to_match_query,
+)
+from smart_library.infrastructure.repositories.heading_repository import HeadingRepository
+from smart_library.infrastructure.repositories.relationship_repository import RelationshipRepository
+from smart_library.infrastructure.repositories.text_repository import TextRepository
+
+
+def _add_heading(conn, doc, texts, title):
+    h = Heading(parent_id=doc.id, title=title, index=0)
+    HeadingRepository(conn).add_many([h])
+    for t in texts:
+        RelationshipRepository(conn).add(f"rel-{t.id}", t.id, h.id, RelationshipType.UNDER_HEADING)
+
+
+@pytest.fixture
+def library(sqlite_conn, make_document):
+    old, _, old_texts = make_document(sqlite_conn, "doc 2010", year=2010,
+                                      contents=["BRCA1 mutations in cohort GSE12345", "unrelated text"])
+    new, _, new_texts = make_document(sqlite_conn, "doc 2021", year=2021,
+                                      contents=["brca1 and p53 interplay", "IL-6 signalling"])
+    _add_heading(sqlite_conn, new, new_texts, "Inflammation pathways")
+    return FullTextRepository(sqlite_conn), (old, old_texts), (new, new_texts)
+
+
+def test_match_query_quotes_terms_and_keeps_phrases():
+    assert to_match_query('IL-6 "gene expression" brca*') == '"IL-6" "gene expression" "brca"*'
+    assert to_match_query('say "hi') == '"say" """hi"'  # stray quote escaped, not a syntax error
+    assert to_match_query("   ") == ""
+    assert highlight_offsets("a \x02bc\x03 d \x02e\x03") == [(2, 4), (7, 8)]
+
+
+def test_bm25_search_with_snippets_offsets_and_filters(library):
+    fts, (old, old_texts), (new, new_texts) = library
+
+    hits = fts.search_texts(to_match_query("brca1"))
+    assert {h["id"] for h in hits} == {old_texts[0].id, new_texts[0].id}
+    assert all(h["score"] > 0 for h in hits)
+    first = next(h for h in hits if h["id"] == old_texts[0].id)
+    assert first["document_id"] == old.id and first["year"] == 2010
+    assert "[BRCA1]" in first["snippet"]
+    assert [old_texts[0].content[s:e] for s, e in first["highlights"]] == ["BRCA1"]
+
+    assert [h["id"] for h in fts.search_texts(to_match_query("brca1"), year_from=2015)] == [new_texts[0].id]
+    assert [h["id"] for h in fts.search_texts(to_match_query("brca1"), doc_ids=[old.id])] == [old_texts[0].id]
+    assert fts.search_texts(to_match_query("brca1"), doc_ids=[]) == []
+    assert [h["id"] for h in fts.search_texts(to_match_query("IL-6"))] == [new_texts[1].id]
+    assert [h["id"] for h in fts.search_texts(to_match_query("GSE12345"))] == [old_texts[0].id]
+
+
+def test_heading_titles_are_searchable(library):
+    fts, _, (new, new_texts) = library
+
+    hits = fts.search_headings(to_match_query("inflammation"))
+
+    assert {h["id"] for h in hits} == {t.id for t in new_texts}
+    assert hits[0]["heading"] == "Inflammation pathways"
+    assert hits[0]["heading_highlights"] == [(0, len("Inflammation"))]
+
+
+def test_index_follows_updates_and_cascading_deletes(library):
+    fts, (old, old_texts), _ = library
+    conn = fts.conn
+    text = old_texts[1]
+    text.content = "now mentions zebrafish"
+    TextRepository(conn, storage="inline").update(text)
+    assert [h["id"] for h in fts.search_texts(to_match_query("zebrafish"))] == [text.id]
+    assert fts.search_texts(to_match_query("unrelated")) == []
+
+    DocumentRepository(conn).delete(old.id)
+
+    assert fts.search_texts(to_match_query("zebrafish")) == []
+    conn.execute("INSERT INTO text_fts (text_fts) VALUES ('integrity-check')")
+    fts.rebuild()
+    assert len(fts.search_texts(to_match_query("brca1"))) == 1
+
+
+def test_blob_mode_texts_are_searchable(sqlite_conn, make_document):
+    doc, _, texts = make_document(sqlite_conn, "doc 2022", year=2022, storage="blob",
+                                  contents=["BRCA1 in zebrafish", "p53 knockout mice"])
+    fts, repo = FullTextRepository(sqlite_conn), TextRepository(sqlite_conn, storage="blob")
+    assert sqlite_conn.execute("SELECT content FROM text_entity WHERE id = ?", (texts[0].id,)).fetchone()[0] == ""
+
+    hits = fts.search_texts(to_match_query("zebrafish"))
+    assert [h["id"] for h in hits] == [texts[0].id]
+    assert hits[0]["document_id"] == doc.id and "[zebrafish]" in hits[0]["snippet"]
+    assert [texts[0].content[s:e] for s, e in hits[0]["highlights"]] == ["zebrafish"]
+
+    texts[1].content = "p53 knockout rats"
+    repo.update(texts[1])
+    assert [h["id"] for h in fts.search_texts(to_match_query("rats"))] == [texts[1].id]
+    assert fts.search_texts(to_match_query("mice")) == []
+
+    repo.delete_many([texts[0].id])
+    assert fts.search_texts(to_match_query("zebrafish")) == []
+
+    sqlite_conn.execute("DELETE FROM blob_text_fts")  # e.g. texts stored before the index existed
+    fts.rebuild()
+    assert [h["id"] for h in fts.search_texts(to_match_query("rats"))] == [texts[1].id]
@@ -0,0 +1,49 @@
+from smart_library.infrastructure.repositories.document_repository import DocumentRepository
+from smart_library.infrastructure.repositories.page_repository import PageRepository
+from smart_library.infrastructure.repositories.text_repository import TextRepository
+
+
+def _count_queries(conn):
+    statements = []
+    conn.set_trace_callback(statements.append)
+    return statements
+
+
+def test_get_many_preserves_order_in_one_query(sqlite_conn, make_document):
+    _, _, texts = make_document(sqlite_conn, "Batch hydration", n_texts=100, authors=["Ada"])
+    repo = TextRepository(sqlite_conn)
+    wanted = [t.id for t in reversed(texts)]
+
+    statements = _count_queries(sqlite_conn)
+    loaded = repo.get_many(wanted)
+    sqlite_conn.set_trace_callback(None)
+
+    assert [t.id for t in loaded] == wanted
+    assert loaded[0].content == "chunk 99" and loaded[0].index == 99
+    assert loaded[0].parent_id == texts[-1].parent_id
+    assert len(statements) == 1
+
+
+def test_get_many_skips_unknown_ids_and_keeps_duplicates(sqlite_conn, make_document):
+    doc, [page], texts = make_document(sqlite_conn, "Batch hydration", n_texts=3, authors=["Ada"])
+
+    loaded = TextRepository(sqlite_conn).get_many([texts[2].id, "missing", texts[0].id, texts[2].id])
+    assert [t.id for t in loaded] == [texts[2].id, texts[0].id, texts[2].id]
+
+    assert [p.id for p in PageRepository(sqlite_conn).get_many(["missing", page.id])] == [page.id]
+    docs = DocumentRepository(sqlite_conn).get_many([doc.id])
+    assert docs[0].title == "Batch hydration" and docs[0].authors == ["Ada"]
+    assert TextRepository(sqlite_conn).get_many([]) == []
+
+
+def test_list_hydrates_in_batches(sqlite_conn, make_document):
+    doc, [page], texts = make_document(sqlite_conn, "Batch hydration", n_texts=100, authors=["Ada"])
+    repo = TextRepository(sqlite_conn)
+
+    statements = _count_queries(sqlite_conn)
+    by_doc = repo.list(doc_id=doc.id, limit=100)
+    sqlite_conn.set_trace_callback(None)
+
+    assert {t.id for t in by_doc} == {t.id for t in texts}
+    assert len(statements) == 2  # ids, then one batch
+    assert [p.id for p in PageRepository(sqlite_conn).list(doc_id=doc.id)] == [page.id]
@@ -0,0 +1,93 @@
+import pytest
+
+from smart_library.domain.entities.document import Document
+from smart_library.domain.entities.page import Page
+from smart_library.domain.entities.text import Text
+from smart_library.infrastructure.repositories.document_repository import DocumentRepository
+from smart_library.infrastructure.repositories.page_repository import PageRepository
+from smart_library.infrastructure.repositories.text_repository import TextRepository
+
+
+@pytest.fixture
+def repo(sqlite_conn):
+    repo = DocumentRepository(sqlite_conn)
+    titles = ["beta", "Alpha", None, "gamma", "alpha", "Delta", "beta"]
+    for i, title in enumerate(titles):
+        # Equal timestamps and titles exercise the id tie-breaker
+        repo._insert_row(Document(title=title, year=2000 + i % 3, created_at=f"2024-01-0{1 + i // 2}T00:00:00"))
+    return repo
+
+
+def _walk(repo, limit, **kwargs):
+    pages, cursor = [], None
+    while True:
+        page = repo.page(limit=limit, after=cursor, **kwargs)
+        pages.append(page)
+        cursor = page.next_cursor
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.parametrize("order", ["created", "title", "year"])
+@pytest.mark.parametrize("descending", [False, True])
+def test_walking_cursors_visits_every_document_once_in_order(repo, order, descending):
+    key = {
+        "created": lambda d: (d.created_at, d.id),
+        "title": lambda d: ((d.title or "").lower(), d.id),
+        "year": lambda d: (d.year or 0, d.id),
+    }[order]
+    expected = sorted((repo.get(r["id"]) for r in repo.conn.execute("SELECT id FROM document")), key=key,
+                      reverse=descending)
+
+    pages = _walk(repo, 3, order=order, descending=descending)
+
+    assert [len(p.items) for p in pages] == [3, 3, 1]
+    assert [d.id for p in pages for d in p.items] == [d.id for d in expected]
+    assert {p.total for p in pages} == {7}
+
+
+def test_cursor_is_bound_to_its_order(repo):
+    cursor = repo.page(limit=2, order="title").next_cursor
+    with pytest.raises(ValueError):
+        repo.page(limit=2, after=cursor, order="year")
+    with pytest.raises(ValueError):
+        repo.page(limit=2, after="not-a-cursor")
+    with pytest.raises(ValueError):
+        repo.page(order="authors")
+
+
+@pytest.mark.parametrize("order, index", [("created", "idx_entity_kind_created"),
+                                          ("title", "idx_document_title_id"),
+                                          ("year", "idx_document_year_id")])
+def test_deep_pages_seek_on_an_index(repo, order, index):
+    cursor = repo.page(limit=2, order=order).next_cursor
+    statements = []
+    repo.conn.set_trace_callback(statements.append)  # traced SQL has the parameters inlined
+    repo.page(limit=2, after=cursor, order=order)
+    repo.conn.set_trace_callback(None)
+
+    select = next(s for s in statements if s.startswith("SELECT c.*"))
+    plan = " ".join(r["detail"] for r in repo.conn.execute("EXPLAIN QUERY PLAN " + select))
+    assert f"USING INDEX {index} (" in plan  # a range seek, not a scan from the start
+    assert "TEMP B-TREE" not in plan
+
+
+def test_counts_follow_inserts_and_cascading_deletes(repo):
+    conn = repo.conn
+    texts = TextRepository(conn)
+    doc = Document(title="counted")
+    repo._insert_row(doc)
+    page = Page(parent_id=doc.id, page_number=1)
+    PageRepository(conn).add(page)
+    texts.add_many([Text(parent_id=page.id, content=f"t{i}", index=i) for i in range(5)])
+
+    assert repo.count() == 8
+    assert PageRepository(conn).count() == 1
+    assert texts.count() == 5
+    assert texts.page(limit=10).total == 5
+
+    repo.delete(doc.id)  # pages and texts go through ON DELETE CASCADE
+
+    assert (repo.count(), PageRepository(conn).count(), texts.count()) == (7, 0, 0)
+    conn.execute("DROP TABLE row_count")
+    assert repo.count() == 7  # COUNT(*) fallback on older databases
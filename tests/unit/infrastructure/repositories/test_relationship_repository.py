@@ -49,4 +49,51 @@ def test_delete_relationship(repo, mock_conn):
     mock_conn.commit.return_value = None
     repo.delete("rel-1")
     mock_conn.execute.assert_called_once()
-    mock_conn.commit.assert_called_once()
\ No newline at end of file
+    mock_conn.commit.assert_called_once()
+
+def _seed_section(conn):
+    """Document with one heading and three texts under it; returns (doc, heading, texts)."""
+    from smart_library.domain.entities.document import Document
+    from smart_library.domain.entities.heading import Heading
+    from smart_library.domain.entities.text import Text
+    from smart_library.domain.entities.relationship import Relationship
+    from smart_library.domain.constants.relationship_types import RelationshipType
+    from smart_library.infrastructure.repositories.document_repository import DocumentRepository
+    from smart_library.infrastructure.repositories.heading_repository import HeadingRepository
+    from smart_library.infrastructure.repositories.text_repository import TextRepository
+
+    doc = Document(title="Paper")
+    heading = Heading(parent_id=doc.id, title="Methods", index=0, page_number=1)
+    texts = [Text(parent_id=doc.id, content=f"t{i}", index=i) for i in range(3)]
+    DocumentRepository(conn).add(doc)
+    HeadingRepository(conn).add_many([heading])
+    TextRepository(conn).add_many(texts)
+    rels = [Relationship(source_id=t.id, target_id=heading.id, type=RelationshipType.UNDER_HEADING) for t in texts]
+    rels += [Relationship(source_id=t.id, target_id=doc.id, type=RelationshipType.BELONGS_TO) for t in texts]
+    RelationshipRepository(conn).add_many(rels)
+    return doc, heading, texts
+
+
+def test_add_many_and_neighbors(sqlite_conn):
+    doc, heading, texts = _seed_section(sqlite_conn)
+    repo = RelationshipRepository(sqlite_conn)
+    out = repo.neighbors([texts[0].id, "missing"], "under_heading")
+    assert out == {texts[0].id: [heading.id], "missing": []}
+    back = repo.neighbors([heading.id], "under_heading", direction="in")
+    assert sorted(back[heading.id]) == sorted(t.id for t in texts)
+
+
+def test_neighbors_uses_source_type_index(sqlite_conn):
+    plan = sqlite_conn.execute(
+        "EXPLAIN QUERY PLAN SELECT target_id FROM relationship WHERE source_id IN (?, ?) AND type = ?",
+        ("a", "b", "under_heading"),
+    ).fetchall()
+    assert any("idx_relationship_source_type" in row[3] for row in plan)
+
+
+def test_heading_context_resolves_heading_and_siblings(sqlite_conn):
+    doc, heading, texts = _seed_section(sqlite_conn)
+    context = RelationshipRepository(sqlite_conn).heading_context([texts[1].id])
+    entry = context[texts[1].id]
+    assert entry["heading_title"] == "Methods"
+    assert entry["siblings"] == [t.id for t in texts]
@@ -0,0 +1,68 @@
+import pytest
+
+from smart_library.infrastructure.repositories.document_repository import DocumentRepository
+from smart_library.infrastructure.repositories.page_repository import PageRepository
+from smart_library.infrastructure.repositories.row_views import DocumentView, TextView
+from smart_library.infrastructure.repositories.text_repository import TextRepository
+
+
+@pytest.fixture
+def library(sqlite_conn, make_document):
+    def make(storage="inline"):
+        return make_document(sqlite_conn, "Views", year=2020, storage=storage, authors=["Ada", "Bob"],
+                             metadata={"source": "test"})
+    return make
+
+
+def test_views_decode_json_lazily_and_once(sqlite_conn, library):
+    doc, [page], _ = library()
+
+    [view] = DocumentRepository(sqlite_conn).get_views([doc.id])
+
+    assert isinstance(view, DocumentView) and not hasattr(view, "__dict__")
+    assert view._decoded is None  # nothing decoded until a JSON column is read
+    assert (view.id, view.title, view.year) == (doc.id, "Views", 2020)
+    assert view._decoded is None
+    assert view.authors == ["Ada", "Bob"] and view.authors is view.authors
+    assert view.metadata == {"source": "test"}
+    assert view.keywords is None
+    assert PageRepository(sqlite_conn).get_views([page.id])[0].paragraphs == ["p1"]
+
+
+def test_projection_selects_only_the_requested_columns(sqlite_conn, library):
+    _, _, texts = library()
+    repo = TextRepository(sqlite_conn)
+    statements = []
+    sqlite_conn.set_trace_callback(statements.append)
+    views = repo.get_views([texts[2].id, "missing", texts[0].id], columns=("page_number",))
+    sqlite_conn.set_trace_callback(None)
+
+    assert [v.id for v in views] == [texts[2].id, texts[0].id]
+    assert views[0].page_number == 1
+    assert statements[0].startswith('SELECT e."id", c."page_number" FROM')
+    with pytest.raises(AttributeError):
+        views[0].content
+    assert getattr(views[0], "metadata", "fallback") == "fallback"
+
+
+@pytest.mark.parametrize("storage", ["inline", "blob"])
+def test_text_views_resolve_content_in_both_storage_modes(sqlite_conn, library, storage):
+    _, _, texts = library(storage)
+    repo = TextRepository(sqlite_conn, storage=storage)
+
+    views = repo.get_views([t.id for t in texts], columns=("content", "index"))
+
+    assert all(isinstance(v, TextView) for v in views)
+    assert [(v.content, v.index) for v in views] == [(f"chunk {i}", i) for i in range(3)]
+    assert [v.display_content for v in views] == [t.display_content for t in repo.get_many(t.id for t in texts)]
+
+
+def test_keyset_page_can_return_projected_views(sqlite_conn, library):
+    doc, _, _ = library()
+
+    page = DocumentRepository(sqlite_conn).page(limit=10, columns=("title", "authors"))
+
+    [view] = page.items
+    assert isinstance(view, DocumentView)
+    assert view.to_dict() == {"id": doc.id, "title": "Views", "authors": ["Ada", "Bob"]}
+    assert page.total == 1
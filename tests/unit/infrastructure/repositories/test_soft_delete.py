@@ -0,0 +1,99 @@
+import sqlite3
+import time
+
+import pytest
+
+from smart_library.application.services.purge_service import PurgeWorker
+from smart_library.domain.entities.text import Text
+from smart_library.infrastructure.repositories.document_repository import DocumentRepository
+from smart_library.infrastructure.repositories.fts_repository import FullTextRepository
+from smart_library.infrastructure.repositories.text_repository import TextRepository
+
+_SEED = dict(vectors=True, content="{title} chunk {i}")
+
+
+def _count(conn, table):
+    return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_tombstoned_documents_disappear_from_search_and_listings(sqlite_conn, make_document):
+    gone, _, gone_texts = make_document(sqlite_conn, "alpha", n_texts=5, **_SEED)
+    kept, _, kept_texts = make_document(sqlite_conn, "beta", n_texts=5, **_SEED)
+    repo = DocumentRepository(sqlite_conn)
+
+    assert repo.tombstone(gone.id)
+    assert not repo.tombstone(gone.id)  # already deleted
+    assert not repo.tombstone(gone_texts[0].id)  # only documents are tombstoned
+
+    assert repo.get(gone.id) is None and repo.get(kept.id) is not None
+    assert [d.id for d in repo.list(None)] == [kept.id]
+    for order in DocumentRepository.ORDERS:
+        page = repo.page(order=order)
+        assert [d.id for d in page.items] == [kept.id] and page.total == 1
+    assert repo.tombstoned() == [gone.id]
+
+    fts = FullTextRepository(sqlite_conn)
+    assert {h["id"] for h in fts.search_texts('"chunk"', limit=20)} == {t.id for t in kept_texts}
+    ids = [gone_texts[0].id, kept_texts[0].id]
+    assert fts.filter_texts(ids) == {kept_texts[0].id}
+    assert fts.deleted_texts(ids) == {gone_texts[0].id}
+    assert _count(sqlite_conn, "text_entity") == 10  # nothing physically deleted yet
+
+
+def test_tombstoned_documents_are_hidden_from_lookups(sqlite_conn, make_document):
+    gone, _, gone_texts = make_document(sqlite_conn, "alpha", n_texts=5, **_SEED)
+    kept, _, kept_texts = make_document(sqlite_conn, "beta", n_texts=5, **_SEED)
+    direct = Text(parent_id=gone.id, content="caption on the document", index=9)  # not under a page
+    TextRepository(sqlite_conn, storage="inline").add_many([direct])
+    DocumentRepository(sqlite_conn).tombstone(gone.id)
+
+    assert [d.id for d in DocumentRepository(sqlite_conn).get_many([gone.id, kept.id])] == [kept.id]
+    texts = TextRepository(sqlite_conn)
+    assert texts.get(gone_texts[0].id) is None and texts.get(direct.id) is None
+    assert texts.get(kept_texts[0].id).content == "beta chunk 0"
+
+
+def test_purge_deletes_rows_vectors_and_pdf_in_batches(sqlite_conn, make_document, tmp_path):
+    gone, _, _ = make_document(sqlite_conn, "alpha", n_texts=7, **_SEED)
+    kept, _, _ = make_document(sqlite_conn, "beta", n_texts=5, **_SEED)
+    (tmp_path / f"{gone.id}.pdf").write_bytes(b"%PDF")
+    repo = DocumentRepository(sqlite_conn)
+
+    with pytest.raises(ValueError, match="not deleted"):
+        repo.purge_step(kept.id)
+
+    jobs = []
+
+    def execute(fn):
+        jobs.append(fn)
+        return fn(sqlite_conn)
+
+    repo.tombstone(gone.id)
+    worker = PurgeWorker(execute=execute, pdf_dir=tmp_path, batch_size=3, pause=0)
+    assert worker.purge_pending() == 1
+    # listing, 7 texts + the page in batches of 3 (deepest first), the document, empty listing
+    assert len(jobs) == 1 + 3 + 1 + 1
+    assert repo.tombstoned() == [] and repo.count() == 1
+    assert _count(sqlite_conn, "entity") == 1 + 1 + 5  # the kept document, its page and texts
+    assert _count(sqlite_conn, "vector_fallback") == 5
+    assert not (tmp_path / f"{gone.id}.pdf").exists()
+
+
+def test_background_worker_purges_after_wake(make_sqlite_conn, make_document, tmp_path):
+    make_sqlite_conn(tmp_path / "library.db")
+    # The worker thread uses this connection, like the writer thread uses its own
+    conn = sqlite3.connect(str(tmp_path / "library.db"), isolation_level=None, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    doc, _, _ = make_document(conn, "alpha", n_texts=5, **_SEED)
+    DocumentRepository(conn).tombstone(doc.id)
+
+    worker = PurgeWorker(execute=lambda fn: fn(conn), pdf_dir=tmp_path, pause=0, poll_interval=60)
+    worker.start().wake()
+    deadline = time.monotonic() + 5
+    while not worker.purged and time.monotonic() < deadline:
+        time.sleep(0.01)
+    worker.stop(timeout=5)
+
+    assert worker.purged == 1 and not worker.running
+    assert _count(conn, "entity") == 0
+    conn.close()
@@ -0,0 +1,64 @@
+import pytest
+
+from smart_library.domain.entities.text import Text
+from smart_library.infrastructure.db.db import transaction
+from smart_library.infrastructure.repositories.document_repository import DocumentRepository
+from smart_library.infrastructure.repositories.text_repository import TextRepository
+
+
+def _document(conn, make_document, title, n_pages=3, n_texts=20):
+    doc, pages, texts = make_document(conn, title, n_pages=n_pages, n_texts=n_texts)
+    # One text parented directly to the document, one nested below another text
+    extra = [Text(parent_id=doc.id, content="abstract", index=999),
+             Text(parent_id=texts[0].id, content="nested", index=1000)]
+    TextRepository(conn).add_many(extra)
+    texts += extra
+    conn.executemany("INSERT INTO vector_fallback (id, embedding) VALUES (?, '[]')", [(t.id,) for t in texts])
+    return doc, pages, texts
+
+
+@pytest.fixture
+def conn(sqlite_conn):
+    sqlite_conn.execute("CREATE TABLE vector_fallback (id TEXT PRIMARY KEY, embedding TEXT)")
+    return sqlite_conn
+
+
+def _count(conn, table):
+    return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_document_delete_removes_subtree_and_vectors(conn, make_document):
+    doc, pages, texts = _document(conn, make_document, "gone")
+    keep, _, kept_texts = _document(conn, make_document, "kept", n_pages=1, n_texts=2)
+    repo = DocumentRepository(conn)
+    assert sorted(repo._get_descendant_ids(doc.id)) == sorted([p.id for p in pages] + [t.id for t in texts])
+
+    statements = []
+    conn.set_trace_callback(statements.append)
+    deleted = repo.delete(doc.id)
+    conn.set_trace_callback(None)
+
+    assert deleted == 1 + len(pages) + len(texts)
+    assert statements[0] == "BEGIN IMMEDIATE" and statements[-1] == "COMMIT"
+    assert _count(conn, "entity") == 1 + 1 + len(kept_texts)
+    assert _count(conn, "text_entity") == len(kept_texts)
+    assert {r["id"] for r in conn.execute("SELECT id FROM vector_fallback")} == {t.id for t in kept_texts}
+    assert repo.get(keep.id) is not None
+    assert repo.delete(doc.id) == 0
+
+
+def test_delete_subtree_joins_the_callers_transaction(conn, make_document):
+    doc, _, texts = _document(conn, make_document, "doc", n_pages=1, n_texts=3)
+    repo = TextRepository(conn)
+
+    with pytest.raises(RuntimeError):
+        with transaction(conn):
+            assert repo.delete_subtree([texts[0].id, texts[1].id]) == 3  # texts[0] has a nested child
+            raise RuntimeError("abort")
+    assert _count(conn, "text_entity") == len(texts)
+    assert _count(conn, "vector_fallback") == len(texts)
+
+    with transaction(conn):
+        repo.delete_subtree([texts[0].id])
+    assert repo.get(texts[-1].id) is None  # nested text went with its parent
+    assert _count(conn, "vector_fallback") == len(texts) - 2
@@ -0,0 +1,111 @@
+from smart_library.domain.entities.document import Document
+from smart_library.domain.entities.text import Text
+from smart_library.infrastructure.repositories.document_repository import DocumentRepository
+from smart_library.infrastructure.repositories.text_repository import LazyText, TextRepository
+from smart_library.utils.chunker import TextChunker
+
+
+def _chunk_texts(doc_id, pages):
+    chunker = TextChunker(min_char=40, max_char=80, overlap=20)
+    texts = []
+    for page_number, paragraphs in pages.items():
+        non_overlap, overlap = chunker.process_chunks(paragraphs)
+        for content, embedding in zip(non_overlap, overlap):
+            texts.append(Text(parent_id=doc_id, content=content, display_content=content,
+                              embedding_content=embedding, index=len(texts), page_number=page_number,
+                              metadata={"document_id": doc_id}))
+    return texts
+
+
+PAGES = {
+    1: ["Sparse retrieval ranks documents by term overlap. Dense retrieval embeds queries and passages.",
+        "Hybrid methods fuse both rankings. Fusion is cheap and robust to score scales."],
+    2: ["Evaluation uses nDCG at ten. Ablations remove one component at a time to measure its effect."],
+}
+
+
+def test_blob_mode_round_trips_texts_lazily(sqlite_conn):
+    doc = Document(title="Retrieval notes")
+    DocumentRepository(sqlite_conn)._insert_row(doc)
+    texts = _chunk_texts(doc.id, PAGES)
+    texts.append(Text(parent_id=doc.id, content="Caption", display_content="Figure 1: Caption",
+                      embedding_content="unrelated embedding input", index=len(texts), page_number=2,
+                      metadata={"document_id": doc.id}))
+
+    repo = TextRepository(sqlite_conn, storage="blob")
+    repo.add_many(texts)
+
+    rows = sqlite_conn.execute("SELECT content, embedding_content, blob_id FROM text_entity").fetchall()
+    assert all(r["content"] == "" and r["blob_id"] == doc.id for r in rows)
+    assert sum(r["embedding_content"] is not None for r in rows) == 1  # only the unrelated one stays inline
+
+    reader = TextRepository(sqlite_conn)  # reading works in any mode
+    loaded = reader.list_for_document(doc.id)
+    assert all(isinstance(t, LazyText) for t in loaded)
+    assert "content" not in loaded[0].__dict__  # nothing materialised yet
+    for original, stored in zip(texts, loaded):
+        assert stored.content == original.content
+        assert stored.display_content == original.display_content
+        assert stored.embedding_content == original.embedding_content
+    assert reader.get(texts[1].id).embedding_content == texts[1].embedding_content
+
+    blob = reader.blobs.get(doc.id)
+    assert "\n" in blob  # pages are newline separated
+    assert len(blob) < sum(len(t.content) + len(t.embedding_content) for t in texts)
+
+
+def test_blob_mode_update_reuses_existing_text(sqlite_conn):
+    doc = Document(title="Doc")
+    DocumentRepository(sqlite_conn)._insert_row(doc)
+    texts = _chunk_texts(doc.id, PAGES)
+    repo = TextRepository(sqlite_conn, storage="blob")
+    repo.add_many(texts)
+    size = sqlite_conn.execute("SELECT char_length FROM document_text").fetchone()[0]
+
+    texts[0].token_count = 12
+    repo.update_many(texts)
+    assert sqlite_conn.execute("SELECT char_length FROM document_text").fetchone()[0] == size
+    assert TextRepository(sqlite_conn).get(texts[0].id).token_count == 12
+
+
+def test_blob_mode_keeps_display_content_none(sqlite_conn):
+    doc = Document(title="Doc")
+    DocumentRepository(sqlite_conn)._insert_row(doc)
+    txt = Text(parent_id=doc.id, content="Plain paragraph", index=0, page_number=1,
+               metadata={"document_id": doc.id})
+    repo = TextRepository(sqlite_conn, storage="blob")
+    repo.add(txt)
+
+    stored = TextRepository(sqlite_conn).get(txt.id)
+    assert stored.content == "Plain paragraph"
+    assert stored.display_content is None
+
+
+def test_blob_mode_delete_and_rewrite_compact_the_blob(sqlite_conn):
+    doc = Document(title="Doc")
+    DocumentRepository(sqlite_conn)._insert_row(doc)
+    texts = _chunk_texts(doc.id, PAGES)
+    repo = TextRepository(sqlite_conn, storage="blob")
+    for txt in texts:  # one add() per text, as ingestion does
+        repo.add(txt)
+    full = repo.blobs.get(doc.id)
+
+    repo.delete_many([texts[0].id])
+    blob = repo.blobs.get(doc.id)
+    assert texts[0].content not in blob
+    assert len(blob) < len(full)
+    for original in texts[1:]:
+        stored = TextRepository(sqlite_conn).get(original.id)
+        assert stored.content == original.content
+        assert stored.embedding_content == original.embedding_content
+
+    # Re-processed chunks append new text; compaction drops the replaced text
+    texts[1].content = texts[1].display_content = texts[1].embedding_content = "Rewritten chunk."
+    repo.update_many(texts[1:])
+    assert "Rewritten chunk." in repo.blobs.get(doc.id)
+    repo.compact_blobs([doc.id])
+    assert len(repo.blobs.get(doc.id)) < len(full)
+    assert TextRepository(sqlite_conn).get(texts[1].id).content == "Rewritten chunk."
+
+    repo.delete_many([t.id for t in texts[1:]])
+    assert sqlite_conn.execute("SELECT COUNT(*) FROM document_text").fetchone()[0] == 0
@@ -0,0 +1,86 @@
+from smart_library.domain.entities.document import Document
+from smart_library.infrastructure.repositories.document_repository import DocumentRepository
+from smart_library.joins.paper_citations import (
+    LibraryIndex, citing_documents, co_cited_documents, link_document, normalize_doi, normalize_title,
+    rebuild_citation_index,
+)
+
+
+def _store(conn, **fields):
+    doc = Document(**fields)
+    DocumentRepository(conn)._insert_row(doc)
+    return doc
+
+
+def test_normalizers():
+    assert normalize_doi("https://doi.org/10.1000/ABC") == "10.1000/abc"
+    assert normalize_doi("doi: 10.1000/abc") == "10.1000/abc"
+    assert normalize_title("Deep  Learning: A Survey!") == normalize_title("deep learning a survey")
+    assert normalize_title("Intro") is None
+
+
+def test_index_prefers_doi_then_title():
+    index = LibraryIndex()
+    index.add("d1", "10.1/x", "Attention is all you need")
+    index.add("d2", None, "Graph neural networks in practice")
+    assert index.match({"doi": "10.1/X", "title": "something else"}) == ("d1", "doi")
+    assert index.match({"title": "Graph Neural Networks in Practice."}) == ("d2", "title")
+    assert index.match({"title": "unrelated title of a paper"}) == (None, None)
+
+
+def test_link_document_outgoing_incoming_and_cocitation(sqlite_conn):
+    a = _store(sqlite_conn, title="Attention is all you need", doi="10.1/attn")
+    b = _store(sqlite_conn, title="Graph neural networks in practice")
+    for doc in (a, b):  # ingestion links every document; this persists their citation keys
+        assert link_document(sqlite_conn, doc.id) == {"outgoing": 0, "incoming": 0}
+    refs = [
+        {"key": "b0", "title": "whatever", "doi": "https://doi.org/10.1/ATTN"},
+        {"key": "b1", "title": "Graph Neural Networks in Practice"},
+        {"key": "b2", "title": "Not in the library at all"},
+    ]
+    c = _store(sqlite_conn, title="A survey citing both papers", reference_list=refs)
+    assert link_document(sqlite_conn, c.id) == {"outgoing": 2, "incoming": 0}
+
+    # A later document cited by c's bibliography is linked when it arrives
+    d = _store(sqlite_conn, title="Not in the library at all")
+    assert link_document(sqlite_conn, d.id) == {"outgoing": 0, "incoming": 1}
+    assert link_document(sqlite_conn, d.id) == {"outgoing": 0, "incoming": 1}  # idempotent
+
+    assert citing_documents(sqlite_conn, a.id) == [c.id]
+    assert sorted(doc_id for doc_id, _ in co_cited_documents(sqlite_conn, a.id)) == sorted([b.id, d.id])
+    stored = DocumentRepository(sqlite_conn).get(c.id)
+    assert sorted(stored.citations) == sorted([a.id, b.id, d.id])
+    count = sqlite_conn.execute("SELECT COUNT(*) FROM relationship WHERE type = 'references'").fetchone()[0]
+    assert count == 3
+
+
+def test_link_document_probes_unresolved_references_only(sqlite_conn):
+    refs = [{"key": "b0", "doi": "10.1/later"}, {"key": "b1", "title": "A title that is long enough to match"}]
+    a = _store(sqlite_conn, title="A citing paper with two references", reference_list=refs)
+    link_document(sqlite_conn, a.id)
+    unresolved = sqlite_conn.execute("SELECT COUNT(*) FROM citation_ref WHERE target_id IS NULL").fetchone()[0]
+    assert unresolved == 2
+
+    b = _store(sqlite_conn, title="A title that is long enough to match", doi="10.1/LATER")
+    assert link_document(sqlite_conn, b.id) == {"outgoing": 0, "incoming": 1}
+    rows = sqlite_conn.execute("SELECT entry, target_id, match FROM citation_ref ORDER BY entry").fetchall()
+    assert [tuple(r) for r in rows] == [(0, b.id, "doi"), (1, b.id, "title")]
+
+    plan = " ".join(r[3] for r in sqlite_conn.execute(
+        "EXPLAIN QUERY PLAN SELECT source_id FROM citation_ref WHERE target_id IS NULL AND doi_key = ?", ("x",)))
+    assert "idx_citation_ref_doi" in plan
+
+    # Purging the cited document makes the entries unresolved again
+    DocumentRepository(sqlite_conn).delete(b.id)
+    unresolved = sqlite_conn.execute("SELECT COUNT(*) FROM citation_ref WHERE target_id IS NULL").fetchone()[0]
+    assert unresolved == 2
+
+
+def test_rebuild_citation_index_matches_incremental_linking(sqlite_conn):
+    a = _store(sqlite_conn, title="Attention is all you need", doi="10.1/attn")
+    c = _store(sqlite_conn, title="A survey citing the attention paper", reference_list=[{"doi": "10.1/attn"}])
+    assert rebuild_citation_index(sqlite_conn) == 1
+    assert citing_documents(sqlite_conn, a.id) == [c.id]
+    assert DocumentRepository(sqlite_conn).get(c.id).citations == [a.id]
+    keys = sqlite_conn.execute("SELECT kind, key FROM citation_key WHERE document_id = ?", (a.id,)).fetchall()
+    assert sorted(tuple(k) for k in keys) == [("doi", "10.1/attn"), ("title", "attention is all you need")]
@@ -0,0 +1,40 @@
+from pathlib import Path
+
+from smart_library.utils.chunker import ChunkSpan, TextChunker
+
+PAGES = sorted((Path(__file__).resolve().parents[2] / "e2e" / "data" / "documents" / "text").glob("*/p*.txt"))
+
+
+def _squash(chunks):
+    return ["".join(c.split()) for c in chunks]
+
+
+def test_spans_point_into_source_text():
+    chunker = TextChunker(min_char=20, max_char=30, overlap=10)
+    source, spans = chunker.page_spans(["First sentence here. Second one follows!", "A   new\nparagraph"])
+    spans = list(spans)
+    assert all(isinstance(s, ChunkSpan) for s in spans)
+    assert [s.text(source) for s in spans] == ["First sentence here.", "Second one follows!", "A new paragraph"]
+    assert spans[0].overlap_start == spans[0].start
+    assert spans[1].overlap_text(source) == "First sentence here. Second one follows!"
+    assert source[spans[2].start:spans[2].end] == "A   new\nparagraph"
+
+
+def test_long_sentences_are_hard_split_at_whitespace():
+    chunker = TextChunker(min_char=5, max_char=12, overlap=0)
+    source, spans = chunker.page_spans(["alpha beta gamma delta epsilon"])
+    texts = [s.text(source) for s in spans]
+    assert all(len(t) <= 12 for t in texts)
+    assert " ".join(texts) == "alpha beta gamma delta epsilon"
+
+
+def test_matches_sentence_chunker_on_grobid_pages():
+    chunker = TextChunker()
+    assert PAGES
+    for page in PAGES:
+        paragraphs = [page.read_text(encoding="utf-8")]
+        non_overlap, overlap = chunker.process_chunks(paragraphs)
+        source, spans = chunker.page_spans(paragraphs)
+        spans = list(spans)
+        assert _squash([s.text(source) for s in spans]) == _squash(non_overlap)
+        assert _squash([s.overlap_text(source) for s in spans]) == _squash(overlap)
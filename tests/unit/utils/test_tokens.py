@@ -0,0 +1,53 @@
+from smart_library.utils.chunker import TextChunker
+from smart_library.utils.tokens import RegexTokenizer, Tokenizer, get_tokenizer
+
+
+class WordTokenizer(Tokenizer):
+    name = "words"
+
+    def __init__(self):
+        self.calls = 0
+
+    def count_many(self, texts):
+        self.calls += 1
+        return [len(t.split()) for t in texts]
+
+
+def test_regex_tokenizer_counts_dense_text_higher():
+    tok = RegexTokenizer()
+    latin, cjk, math = tok.count_many(["the cat sat", "数学公式", "∑_{i=1}^{n} x_i^2"])
+    assert latin == 3
+    assert cjk == 4
+    assert math > 10
+
+
+def test_get_tokenizer_is_cached_and_falls_back():
+    first = get_tokenizer("no-such-encoding")
+    assert isinstance(first, RegexTokenizer)
+    assert get_tokenizer("no-such-encoding") is first
+
+
+def test_token_spans_respect_budget_with_one_batch_per_page():
+    chunker = TextChunker()
+    chunker.min_tokens, chunker.max_tokens, chunker.overlap_tokens = 4, 6, 2
+    tok = WordTokenizer()
+    paragraphs = ["One two three. Four five six seven. Eight.", "a b c d e f g h i j k l m n"]
+    source, spans = chunker.page_token_spans(paragraphs, tok)
+    assert tok.calls == 2  # sentences of the page, then the words of the over-budget one
+    texts = [s.text(source) for s in spans]
+    assert all(len(t.split()) <= 6 for t in texts)
+    assert " ".join(texts).split() == " ".join(paragraphs).split()
+    assert spans[1].overlap_text(source).endswith(texts[1])
+
+
+def test_token_spans_budget_includes_the_overlap():
+    chunker = TextChunker()
+    chunker.min_tokens, chunker.max_tokens, chunker.overlap_tokens = 4, 8, 3
+    tok = WordTokenizer()
+    paragraphs = ["One two three. Four five. Six seven eight. Nine ten. Eleven twelve thirteen. Fourteen fifteen.",
+                  "a b c d e f g h i j k l m n o p q r s t"]
+    source, spans = chunker.page_token_spans(paragraphs, tok)
+    embedding = [s.overlap_text(source) for s in spans]  # what the mapper stores as embedding_content
+    assert all(len(t.split()) <= chunker.max_tokens for t in embedding)
+    assert any(s.overlap_start < s.start for s in spans)  # overlap is still added where it fits
+    assert " ".join(s.text(source) for s in spans).split() == " ".join(paragraphs).split()
@@ -8,6 +8,7 @@ import './Documents.css'
 
 function Documents() {
   const [documents, setDocuments] = useState([])
+  const [total, setTotal] = useState(0)
   const [isLoading, setIsLoading] = useState(true)
   const [error, setError] = useState(null)
   const [uploadProgress, setUploadProgress] = useState(0)
@@ -19,9 +20,13 @@ function Documents() {
   const [currentPage, setCurrentPage] = useState(1)
   const [selectedDocId, setSelectedDocId] = useState(null)
   const fileInputRef = useRef(null)
+  // cursors.current[i] fetches page i + 1 in the current sort order
+  const cursors = useRef([null])
   const location = useLocation()
   const navigate = useNavigate()
   const PAGE_SIZE = 20
+  // Orders the server can page through; others sort the current page only
+  const SERVER_ORDERS = ['title', 'year', 'created']
 
   // Open file picker when navigated from nav upload
   useEffect(() => {
@@ -35,14 +40,29 @@ function Documents() {
     loadDocuments()
   }, [])
 
-  const loadDocuments = async () => {
-    setIsLoading(true)
+  const loadDocuments = async (page = 1, field = sortField, order = sortOrder) => {
+    if (page === 1) cursors.current = [null]
+    if (documents.length === 0) setIsLoading(true)
     setError(null)
     
     try {
-      const data = await documentAPI.list()
+      // Walk forward from the closest page whose cursor is known
+      let p = Math.min(page, cursors.current.length)
+      let data
+      while (true) {
+        data = await documentAPI.list({
+          limit: PAGE_SIZE,
+          cursor: cursors.current[p - 1],
+          order: SERVER_ORDERS.includes(field) ? field : 'title',
+          descending: order === 'desc',
+        })
+        cursors.current[p] = data.next_cursor
+        if (p >= page || !data.next_cursor) break
+        p += 1
+      }
       setDocuments(data.documents)
-      setCurrentPage(1)
+      setTotal(data.total)
+      setCurrentPage(p)
     } catch (err) {
       setError('Failed to load documents. Please try again.')
       console.error('Load documents error:', err)
@@ -52,18 +72,17 @@ function Documents() {
   }
 
   const handleSort = (field) => {
-    if (sortField === field) {
-      // Toggle sort order if clicking the same field
-      setSortOrder(sortOrder === 'asc' ? 'desc' : 'asc')
-    } else {
-      // New field, default to ascending
-      setSortField(field)
-      setSortOrder('asc')
+    // Toggle sort order if clicking the same field, new fields start ascending
+    const order = sortField === field && sortOrder === 'asc' ? 'desc' : 'asc'
+    setSortField(field)
+    setSortOrder(order)
+    if (SERVER_ORDERS.includes(field)) {
+      loadDocuments(1, field, order)
     }
-    setCurrentPage(1)
   }
 
   const getSortedDocuments = () => {
+    if (SERVER_ORDERS.includes(sortField)) return documents
     const sorted = [...documents].sort((a, b) => {
       let aVal, bVal
 
@@ -97,13 +116,6 @@ function Documents() {
     return sorted
   }
 
-  const getPagedDocuments = () => {
-    const sorted = getSortedDocuments()
-    const startIndex = (currentPage - 1) * PAGE_SIZE
-    const endIndex = startIndex + PAGE_SIZE
-    return sorted.slice(startIndex, endIndex)
-  }
-
   const handleFileUpload = async (event) => {
     const files = Array.from(event.target.files || [])
     if (files.length === 0) return
@@ -200,7 +212,9 @@ function Documents() {
     
     try {
       await documentAPI.delete(docId)
+      // Cursors are positions, not offsets: the known pages stay valid
       setDocuments(documents.filter(doc => doc.id !== docId))
+      setTotal(total - 1)
     } catch (err) {
       alert('Failed to delete document. Please try again.')
       console.error('Delete error:', err)
@@ -228,18 +242,17 @@ function Documents() {
     return (
       <div className="documents-page">
         <div className="error-message">{error}</div>
-        <button onClick={loadDocuments} className="retry-button">
+        <button onClick={() => loadDocuments(currentPage)} className="retry-button">
           Retry
         </button>
       </div>
     )
   }
 
-  const sortedDocuments = getSortedDocuments()
-  const pagedDocuments = getPagedDocuments()
-  const totalPages = Math.max(1, Math.ceil(sortedDocuments.length / PAGE_SIZE))
+  const pagedDocuments = getSortedDocuments()
+  const totalPages = Math.max(1, Math.ceil(total / PAGE_SIZE))
   const showingStart = (currentPage - 1) * PAGE_SIZE + 1
-  const showingEnd = Math.min(currentPage * PAGE_SIZE, sortedDocuments.length)
+  const showingEnd = showingStart + pagedDocuments.length - 1
 
   return (
     <div className="documents-page">
@@ -293,7 +306,7 @@ function Documents() {
             <div className="documents-list-wrapper">
               <div className="documents-list-header">
                 <span>
-                  Showing {showingStart}-{showingEnd} of {sortedDocuments.length}
+                  Showing {showingStart}-{showingEnd} of {total}
                 </span>
               </div>
               <div className="documents-list-container">
@@ -370,7 +383,7 @@ function Documents() {
               <Pagination
                 currentPage={currentPage}
                 totalPages={totalPages}
-                onPageChange={(page) => setCurrentPage(page)}
+                onPageChange={(page) => loadDocuments(page)}
               />
             </div>
           </div>
@@ -32,8 +32,11 @@ export const searchAPI = {
 
 // Document API
 export const documentAPI = {
-  list: async (limit = 50) => {
-    const response = await api.get('/api/documents/', { params: { limit } })
+  // One keyset page: { documents, total, next_cursor, order }
+  list: async ({ limit = 50, cursor = null, order = 'created', descending = false } = {}) => {
+    const params = { limit, order, descending }
+    if (cursor) params.cursor = cursor
+    const response = await api.get('/api/documents/', { params })
     return response.data
   },
   